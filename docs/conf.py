@@ -75,6 +75,7 @@ html_theme_options = {
 
 rst_epilog = """
 .. _Bokeh: https://bokeh.org/
+.. _GeoArrow: https://geoarrow.org/
 .. _Matplotlib: https://matplotlib.org/
 .. _NumPy: https://numpy.org/
 .. _PyPI: https://pypi.org/project/contourpy/
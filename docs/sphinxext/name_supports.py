@@ -26,6 +26,8 @@ class NameSupports(Directive):
             "supports_corner_mask",
             "supports_quad_as_tri",
             "supports_threads",
+            "supports_transform",
+            "supports_window",
             "supports_z_interp",
         ]
 
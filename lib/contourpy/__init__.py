@@ -5,29 +5,47 @@ from typing import TYPE_CHECKING
 import numpy as np
 
 from contourpy._contourpy import (
-    ContourGenerator, FillType, LineType, Mpl2005ContourGenerator, Mpl2014ContourGenerator,
-    SerialContourGenerator, ThreadedContourGenerator, ZInterp, max_threads,
+    CancelledError, CancelToken, ContourGenerator, FillType, LineType, Mpl2005ContourGenerator,
+    Mpl2014ContourGenerator, OutputTooLargeError, SerialContourGenerator, ThreadedContourGenerator,
+    ZInterp, max_threads,
 )
 from contourpy._version import __version__
 from contourpy.chunk import calc_chunk_sizes
+from contourpy.convert import (
+    convert_filled, convert_lines, quantize, simplify, to_geojson_bytes, to_wkb,
+)
 from contourpy.enum_util import as_fill_type, as_line_type, as_z_interp
+from contourpy.pyramid import ContourPyramid
+from contourpy.result import ContourResult, to_ragged_arrays
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Callable
 
     from numpy.typing import ArrayLike
 
-    from ._contourpy import CoordinateArray, MaskArray
+    from ._contourpy import CoordinateArray, MaskArray, PointArray
 
 __all__ = [
     "__version__",
     "contour_generator",
+    "convert_filled",
+    "convert_lines",
     "max_threads",
+    "quantize",
+    "simplify",
+    "to_geojson_bytes",
+    "to_ragged_arrays",
+    "to_wkb",
     "FillType",
     "LineType",
+    "CancelledError",
+    "CancelToken",
     "ContourGenerator",
+    "ContourPyramid",
+    "ContourResult",
     "Mpl2005ContourGenerator",
     "Mpl2014ContourGenerator",
+    "OutputTooLargeError",
     "SerialContourGenerator",
     "ThreadedContourGenerator",
     "ZInterp",
@@ -73,6 +91,8 @@ def contour_generator(
     quad_as_tri: bool = False,
     z_interp: ZInterp | str | None = ZInterp.Linear,
     thread_count: int = 0,
+    transform: ArrayLike | None = None,
+    transform_callback: Callable[[PointArray], ArrayLike | None] | None = None,
 ) -> ContourGenerator:
     """Create and return a contour generator object.
 
@@ -122,6 +142,21 @@ def contour_generator(
             If ``thread_count=0`` and ``name="threaded"`` then it uses the maximum number of threads
             as determined by the C++11 call ``std::thread::hardware_concurrency()``. If ``name`` is
             something other than ``"threaded"`` then the ``thread_count`` will be set to ``1``.
+        transform (array-like of shape (2, 3) or (3, 3), optional): Affine transform applied to
+            contour points as they are calculated, so that they are returned in the target
+            coordinate system such as a map projection or pixel space without a separate pass over
+            the results. A point ``(x, y)`` is transformed to ``(a*x + b*y + c, d*x + e*y + f)``
+            where ``transform`` is ``[[a, b, c], [d, e, f]]``, optionally with a third row of
+            ``[0, 0, 1]``. Filtering, simplification and metrics use the transformed points.
+        transform_callback (callable, optional): Function that is called with the points of each
+            chunk as an array of shape (N, 2) after they have been calculated, including any
+            affine ``transform``, but before they are returned. It may either modify the points in
+            place and return ``None``, or return an array of the same shape containing the
+            transformed points. The array passed to the callback is only valid for the duration of
+            the call so a reference to it must not be kept. This is for non-affine transforms such
+            as map projections and is called once per chunk so should be vectorised. Filtering,
+            simplification and metrics use the points before they are passed to the callback. If
+            it raises an exception this is reraised by the call to ``filled()`` or ``lines()``.
 
     Return:
         :class:`~contourpy._contourpy.ContourGenerator`.
@@ -224,9 +259,16 @@ def contour_generator(
     if thread_count not in (0, 1) and not cls.supports_threads():
         raise ValueError(f"{name} contour generator does not support thread_count {thread_count}")
 
+    # Check arguments: transform and transform_callback.
+    if not cls.supports_transform():
+        if transform is not None:
+            raise ValueError(f"{name} contour generator does not support transform")
+        if transform_callback is not None:
+            raise ValueError(f"{name} contour generator does not support transform_callback")
+
     # Prepare args and kwargs for contour generator constructor.
     args = [x, y, z, mask]
-    kwargs: dict[str, int | bool | LineType | FillType | ZInterp] = {
+    kwargs: dict[str, Any] = {
         "x_chunk_size": x_chunk_size,
         "y_chunk_size": y_chunk_size,
     }
@@ -247,6 +289,10 @@ def contour_generator(
     if cls.supports_threads():
         kwargs["thread_count"] = thread_count
 
+    if cls.supports_transform():
+        kwargs["transform"] = transform
+        kwargs["transform_callback"] = transform_callback
+
     # Create contour generator.
     cont_gen = cls(*args, **kwargs)
 
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import ClassVar, NoReturn
+import os
+from typing import Any, Callable, ClassVar, Iterator, Literal, NoReturn, overload
 
 import numpy as np
 import numpy.typing as npt
 from typing_extensions import TypeAlias
 
 import contourpy._contourpy as cpy
+from contourpy.result import ContourResult
 
 # Input numpy array types, the same as in common.h
 CoordinateArray: TypeAlias = npt.NDArray[np.float64]
@@ -16,6 +18,9 @@ MaskArray: TypeAlias = npt.NDArray[np.bool_]
 PointArray: TypeAlias = npt.NDArray[np.float64]
 CodeArray: TypeAlias = npt.NDArray[np.uint8]
 OffsetArray: TypeAlias = npt.NDArray[np.uint32]
+ChunkIndexArray: TypeAlias = npt.NDArray[np.int32]
+CountArray: TypeAlias = npt.NDArray[np.uint64]
+MetricsArray: TypeAlias = npt.NDArray[np.void]
 
 # Types returned from filled()
 FillReturn_OuterCode: TypeAlias = tuple[list[PointArray], list[CodeArray]]
@@ -24,14 +29,42 @@ FillReturn_ChunkCombinedCode: TypeAlias = tuple[list[PointArray | None], list[Co
 FillReturn_ChunkCombinedOffset: TypeAlias = tuple[list[PointArray | None], list[OffsetArray | None]]
 FillReturn_ChunkCombinedCodeOffset: TypeAlias = tuple[list[PointArray | None], list[CodeArray | None], list[OffsetArray | None]]
 FillReturn_ChunkCombinedOffsetOffset: TypeAlias = tuple[list[PointArray | None], list[OffsetArray | None], list[OffsetArray | None]]
-FillReturn: TypeAlias = FillReturn_OuterCode | FillReturn_OuterOffset | FillReturn_ChunkCombinedCode | FillReturn_ChunkCombinedOffset | FillReturn_ChunkCombinedCodeOffset | FillReturn_ChunkCombinedOffsetOffset
+FillReturn_CombinedOffsetOffset: TypeAlias = tuple[PointArray, OffsetArray, OffsetArray]
+FillReturn: TypeAlias = FillReturn_OuterCode | FillReturn_OuterOffset | FillReturn_ChunkCombinedCode | FillReturn_ChunkCombinedOffset | FillReturn_ChunkCombinedCodeOffset | FillReturn_ChunkCombinedOffsetOffset | FillReturn_CombinedOffsetOffset
 
 # Types returned from lines()
 LineReturn_Separate: TypeAlias = list[PointArray]
 LineReturn_SeparateCode: TypeAlias = tuple[list[PointArray], list[CodeArray]]
 LineReturn_ChunkCombinedCode: TypeAlias = tuple[list[PointArray | None], list[CodeArray | None]]
 LineReturn_ChunkCombinedOffset: TypeAlias = tuple[list[PointArray | None], list[OffsetArray | None]]
-LineReturn: TypeAlias = LineReturn_Separate | LineReturn_SeparateCode | LineReturn_ChunkCombinedCode | LineReturn_ChunkCombinedOffset
+LineReturn_CombinedOffset: TypeAlias = tuple[PointArray, OffsetArray]
+LineReturn: TypeAlias = LineReturn_Separate | LineReturn_SeparateCode | LineReturn_ChunkCombinedCode | LineReturn_ChunkCombinedOffset | LineReturn_CombinedOffset
+
+# Caller-supplied output buffers passed as out kwarg to filled() and lines(), and what is returned.
+OutBuffers: TypeAlias = tuple[npt.NDArray[Any], ...]
+FillReturnOut: TypeAlias = tuple[FillReturn | None, tuple[int, ...]]
+LineReturnOut: TypeAlias = tuple[LineReturn | None, tuple[int, ...]]
+
+# Returned from filled() and lines() if sparse kwarg is True.
+FillReturnSparse: TypeAlias = tuple[FillReturn, ChunkIndexArray]
+LineReturnSparse: TypeAlias = tuple[LineReturn, ChunkIndexArray]
+FillReturnSparseOut: TypeAlias = tuple[FillReturnSparse | None, tuple[int, ...]]
+LineReturnSparseOut: TypeAlias = tuple[LineReturnSparse | None, tuple[int, ...]]
+
+# Returned from filled() and lines() if result kwarg is True.
+ResultOut: TypeAlias = tuple[ContourResult | None, tuple[int, ...]]
+
+# Returned from filled() and lines() if metrics kwarg is True.
+FillReturnMetrics: TypeAlias = tuple[FillReturn | FillReturnSparse | ContourResult, MetricsArray]
+LineReturnMetrics: TypeAlias = tuple[LineReturn | LineReturnSparse | ContourResult, MetricsArray]
+FillReturnMetricsOut: TypeAlias = tuple[FillReturnMetrics | None, tuple[int, ...]]
+LineReturnMetricsOut: TypeAlias = tuple[LineReturnMetrics | None, tuple[int, ...]]
+
+# Callable passed to filled_into() and lines_into()
+ChunkSink: TypeAlias = Callable[[int, PointArray, OffsetArray, OffsetArray | None], object]
+
+# Callable set as progress_callback, called with (chunks_done, total_chunks).
+ProgressCallback: TypeAlias = Callable[[int, int], object]
 
 
 CONTOURPY_NDEBUG: int
@@ -42,6 +75,7 @@ class FillType:
     ChunkCombinedCodeOffset: ClassVar[cpy.FillType]
     ChunkCombinedOffset: ClassVar[cpy.FillType]
     ChunkCombinedOffsetOffset: ClassVar[cpy.FillType]
+    CombinedOffsetOffset: ClassVar[cpy.FillType]
     OuterCode: ClassVar[cpy.FillType]
     OuterOffset: ClassVar[cpy.FillType]
     __members__: ClassVar[dict[str, cpy.FillType]]
@@ -62,6 +96,7 @@ class FillType:
 class LineType:
     ChunkCombinedCode: ClassVar[cpy.LineType]
     ChunkCombinedOffset: ClassVar[cpy.LineType]
+    CombinedOffset: ClassVar[cpy.LineType]
     Separate: ClassVar[cpy.LineType]
     SeparateCode: ClassVar[cpy.LineType]
     __members__: ClassVar[dict[str, cpy.LineType]]
@@ -97,13 +132,110 @@ class ZInterp:
     @property
     def value(self) -> int: ...
 
+class CancelToken:
+    def __init__(self) -> None: ...
+    def cancel(self) -> None: ...
+    @property
+    def cancelled(self) -> bool: ...
+
+class CancelledError(RuntimeError): ...
+
+class OutputTooLargeError(RuntimeError):
+    estimated_bytes: int
+    max_output_bytes: int
+
+def convert_filled(filled: FillReturn, fill_type_from: FillType, fill_type_to: FillType) -> FillReturn: ...
+def convert_lines(lines: LineReturn, line_type_from: LineType, line_type_to: LineType) -> LineReturn: ...
+def filled_to_geojson(filled: FillReturn, fill_type: FillType) -> bytes: ...
+def filled_to_wkb(filled: FillReturn, fill_type: FillType) -> bytes: ...
+def lines_to_geojson(lines: LineReturn, line_type: LineType) -> bytes: ...
+def lines_to_wkb(lines: LineReturn, line_type: LineType) -> bytes: ...
+def quantize_points(points: CoordinateArray, offsets: OffsetArray, x0: float, y0: float, x_scale: float, y_scale: float, dtype: npt.DTypeLike, delta: bool) -> npt.NDArray[np.int16] | npt.NDArray[np.int32]: ...
+def simplify_filled(filled: FillReturn, fill_type: FillType, tolerance: float) -> FillReturn: ...
+def simplify_lines(lines: LineReturn, line_type: LineType, tolerance: float) -> LineReturn: ...
+def encode_mvt_filled(points: CoordinateArray, offsets: OffsetArray, outer_offsets: OffsetArray, x0: float, y0: float, x1: float, y1: float, extent: int) -> bytes: ...
+def encode_mvt_lines(points: CoordinateArray, offsets: OffsetArray, x0: float, y0: float, x1: float, y1: float, extent: int) -> bytes: ...
 def max_threads() -> int: ...
 
 class ContourGenerator:
-    def create_contour(self, level: float) -> LineReturn: ...
-    def create_filled_contour(self, lower_level: float, upper_level: float) -> FillReturn: ...
-    def filled(self, lower_level: float, upper_level: float) -> FillReturn: ...
-    def lines(self, level: float) -> LineReturn: ...
+    def count_filled(self, lower_level: float, upper_level: float) -> tuple[CountArray, CountArray, CountArray]: ...
+    def count_lines(self, level: float) -> tuple[CountArray, CountArray]: ...
+    @overload
+    def create_contour(self, level: float, *, out: None = None, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturn: ...
+    @overload
+    def create_contour(self, level: float, *, out: OutBuffers, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnOut: ...
+    @overload
+    def create_contour(self, level: float, *, out: None = None, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnSparse: ...
+    @overload
+    def create_contour(self, level: float, *, out: OutBuffers, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnSparseOut: ...
+    @overload
+    def create_contour(self, level: float, *, out: None = None, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ContourResult: ...
+    @overload
+    def create_contour(self, level: float, *, out: OutBuffers, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ResultOut: ...
+    @overload
+    def create_contour(self, level: float, *, out: None = None, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnMetrics: ...
+    @overload
+    def create_contour(self, level: float, *, out: OutBuffers, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnMetricsOut: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: None = None, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturn: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnOut: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: None = None, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnSparse: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnSparseOut: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: None = None, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ContourResult: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ResultOut: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: None = None, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnMetrics: ...
+    @overload
+    def create_filled_contour(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnMetricsOut: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: None = None, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturn: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnOut: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: None = None, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnSparse: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnSparseOut: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: None = None, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ContourResult: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ResultOut: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: None = None, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnMetrics: ...
+    @overload
+    def filled(self, lower_level: float, upper_level: float, *, out: OutBuffers, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> FillReturnMetricsOut: ...
+    def filled_into(self, sink: ChunkSink, lower_level: float, upper_level: float, *, quantize_bbox: tuple[float, float, float, float] | None = None, quantize_dtype: npt.DTypeLike = ..., quantize_delta: bool = False) -> None: ...
+    def filled_progressive(self, lower_level: float, upper_level: float, *, deadline_ms: float | None = None, stride: int = 4, region_size: int = 64) -> Iterator[tuple[int, tuple[int, int, int, int], FillReturn]]: ...
+    def iter_filled(self, lower_level: float, upper_level: float, *, max_queued: int = 16) -> Iterator[tuple[int, tuple[PointArray, OffsetArray, OffsetArray]]]: ...
+    def iter_lines(self, level: float, *, max_queued: int = 16) -> Iterator[tuple[int, tuple[PointArray, OffsetArray]]]: ...
+    @overload
+    def lines(self, level: float, *, out: None = None, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturn: ...
+    @overload
+    def lines(self, level: float, *, out: OutBuffers, sparse: Literal[False] = False, result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnOut: ...
+    @overload
+    def lines(self, level: float, *, out: None = None, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnSparse: ...
+    @overload
+    def lines(self, level: float, *, out: OutBuffers, sparse: Literal[True], result: Literal[False] = False, metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnSparseOut: ...
+    @overload
+    def lines(self, level: float, *, out: None = None, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ContourResult: ...
+    @overload
+    def lines(self, level: float, *, out: OutBuffers, sparse: bool = False, result: Literal[True], metrics: Literal[False] = False, min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> ResultOut: ...
+    @overload
+    def lines(self, level: float, *, out: None = None, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnMetrics: ...
+    @overload
+    def lines(self, level: float, *, out: OutBuffers, sparse: bool = False, result: bool = False, metrics: Literal[True], min_points: int = 0, min_area: float = 0.0, min_length: float = 0.0, simplify_tolerance: float = 0.0) -> LineReturnMetricsOut: ...
+    def lines_into(self, sink: ChunkSink, level: float, *, quantize_bbox: tuple[float, float, float, float] | None = None, quantize_dtype: npt.DTypeLike = ..., quantize_delta: bool = False) -> None: ...
+    def lines_progressive(self, level: float, *, deadline_ms: float | None = None, stride: int = 4, region_size: int = 64) -> Iterator[tuple[int, tuple[int, int, int, int], LineReturn]]: ...
+    def release_buffers(self) -> None: ...
+    def stride(self, sy: int, sx: int) -> ContourGenerator: ...
+    def window(self, i0: int, i1: int, j0: int, j1: int) -> ContourGenerator: ...
+    def window_bbox(self, x0: float, y0: float, x1: float, y1: float) -> ContourGenerator | None: ...
+    def write_filled(self, path: str | os.PathLike[str], levels: npt.ArrayLike, *, format: str = "npz") -> None: ...
+    def write_lines(self, path: str | os.PathLike[str], levels: npt.ArrayLike, *, format: str = "npz") -> None: ...
     @staticmethod
     def supports_corner_mask() -> bool: ...
     @staticmethod
@@ -115,8 +247,16 @@ class ContourGenerator:
     @staticmethod
     def supports_threads() -> bool: ...
     @staticmethod
+    def supports_transform() -> bool: ...
+    @staticmethod
+    def supports_window() -> bool: ...
+    @staticmethod
     def supports_z_interp() -> bool: ...
     @property
+    def cancel_token(self) -> CancelToken | None: ...
+    @cancel_token.setter
+    def cancel_token(self, cancel_token: CancelToken | None) -> None: ...
+    @property
     def chunk_count(self) -> tuple[int, int]: ...
     @property
     def chunk_size(self) -> tuple[int, int]: ...
@@ -127,10 +267,26 @@ class ContourGenerator:
     @property
     def line_type(self) -> LineType: ...
     @property
+    def max_output_bytes(self) -> int: ...
+    @max_output_bytes.setter
+    def max_output_bytes(self, max_output_bytes: int) -> None: ...
+    @property
+    def max_retained_bytes(self) -> int: ...
+    @max_retained_bytes.setter
+    def max_retained_bytes(self, max_retained_bytes: int) -> None: ...
+    @property
+    def progress_callback(self) -> ProgressCallback | None: ...
+    @progress_callback.setter
+    def progress_callback(self, progress_callback: ProgressCallback | None) -> None: ...
+    @property
     def quad_as_tri(self) -> bool: ...
     @property
+    def retained_bytes(self) -> int: ...
+    @property
     def thread_count(self) -> int: ...
     @property
+    def transform(self) -> PointArray | None: ...
+    @property
     def z_interp(self) -> ZInterp: ...
     default_fill_type: cpy.FillType
     default_line_type: cpy.LineType
@@ -175,6 +331,8 @@ class SerialContourGenerator(ContourGenerator):
         z_interp: ZInterp,
         x_chunk_size: int = 0,
         y_chunk_size: int = 0,
+        transform: npt.ArrayLike | None = None,
+        transform_callback: Callable[[PointArray], npt.ArrayLike | None] | None = None,
     ) -> None: ...
     def _write_cache(self) -> NoReturn: ...
 
@@ -194,5 +352,7 @@ class ThreadedContourGenerator(ContourGenerator):
         x_chunk_size: int = 0,
         y_chunk_size: int = 0,
         thread_count: int = 0,
+        transform: npt.ArrayLike | None = None,
+        transform_callback: Callable[[PointArray], npt.ArrayLike | None] | None = None,
     ) -> None: ...
     def _write_cache(self) -> None: ...
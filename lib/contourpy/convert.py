@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+
+import contourpy._contourpy as cpy
+from contourpy.enum_util import as_fill_type, as_line_type
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from contourpy._contourpy import FillReturn, FillType, LineReturn, LineType, PointArray
+
+
+def convert_filled(
+    filled: FillReturn,
+    fill_type_from: FillType | str,
+    fill_type_to: FillType | str,
+) -> FillReturn:
+    """Convert filled contours from one :class:`~contourpy.FillType` to another.
+
+    When converting from a chunked ``FillType`` to a non-chunked one the chunks are combined
+    (dechunked).  When converting from a non-chunked ``FillType`` to a chunked one the output
+    contains a single chunk.
+
+    Args:
+        filled (sequence of arrays): Filled contour polygons to convert, such as those returned by
+            :meth:`.ContourGenerator.filled`.
+        fill_type_from (FillType or str): :class:`~contourpy.FillType` to convert from as enum or
+            string equivalent.
+        fill_type_to (FillType or str): :class:`~contourpy.FillType` to convert to as enum or
+            string equivalent.
+
+    Return:
+        Converted filled contour polygons.
+
+    Raises:
+        ValueError: If converting from ``FillType.ChunkCombinedCode`` or
+            ``FillType.ChunkCombinedOffset`` to a ``FillType`` that groups outer boundaries with
+            their holes, as that information is not available.
+
+    Note:
+        Returned arrays may share memory with those of ``filled`` if they do not need to change.
+    """
+    fill_type_from = as_fill_type(fill_type_from)
+    fill_type_to = as_fill_type(fill_type_to)
+    return cpy.convert_filled(filled, fill_type_from, fill_type_to)
+
+
+def convert_lines(
+    lines: LineReturn,
+    line_type_from: LineType | str,
+    line_type_to: LineType | str,
+) -> LineReturn:
+    """Convert contour lines from one :class:`~contourpy.LineType` to another.
+
+    When converting from a chunked ``LineType`` to a non-chunked one the chunks are combined
+    (dechunked).  When converting from a non-chunked ``LineType`` to a chunked one the output
+    contains a single chunk.
+
+    Args:
+        lines (sequence of arrays): Contour lines to convert, such as those returned by
+            :meth:`.ContourGenerator.lines`.
+        line_type_from (LineType or str): :class:`~contourpy.LineType` to convert from as enum or
+            string equivalent.
+        line_type_to (LineType or str): :class:`~contourpy.LineType` to convert to as enum or
+            string equivalent.
+
+    Return:
+        Converted contour lines.
+
+    Note:
+        Returned arrays may share memory with those of ``lines`` if they do not need to change.
+    """
+    line_type_from = as_line_type(line_type_from)
+    line_type_to = as_line_type(line_type_to)
+    return cpy.convert_lines(lines, line_type_from, line_type_to)
+
+
+def simplify(
+    filled_or_lines: FillReturn | LineReturn,
+    tolerance: float,
+    *,
+    fill_type: FillType | str | None = None,
+    line_type: LineType | str | None = None,
+) -> FillReturn | LineReturn:
+    """Simplify filled contours or contour lines that have already been calculated.
+
+    Each boundary or line is simplified independently using the Douglas-Peucker algorithm, removing
+    points that are within ``tolerance`` of the straight line between the points either side of
+    them that are kept. The first and last points of open lines are always kept, and closed lines
+    are not reduced to fewer than 4 points.
+
+    Args:
+        filled_or_lines (sequence of arrays): Filled contours or contour lines to simplify, such as
+            those returned by :meth:`.ContourGenerator.filled` or :meth:`.ContourGenerator.lines`.
+        tolerance (float): Maximum distance of removed points from the simplified line.
+        fill_type (FillType or str, optional): :class:`~contourpy.FillType` of filled contours as
+            enum or string equivalent.
+        line_type (LineType or str, optional): :class:`~contourpy.LineType` of contour lines as
+            enum or string equivalent.
+
+    Return:
+        Simplified filled contours or contour lines in the same format.
+
+    Raises:
+        ValueError: If not exactly one of ``fill_type`` and ``line_type`` is specified, or if
+            ``tolerance`` is negative.
+
+    Note:
+        Boundaries shared by adjacent polygons may not be simplified in the same way. Use the
+        ``simplify_tolerance`` kwarg of :meth:`.ContourGenerator.filled` instead, which keeps points
+        where boundaries meet so that shared boundaries are simplified consistently.
+    """
+    if (fill_type is None) == (line_type is None):
+        raise ValueError("Exactly one of fill_type and line_type must be specified")
+
+    if fill_type is not None:
+        return cpy.simplify_filled(
+            cast("FillReturn", filled_or_lines), as_fill_type(fill_type), tolerance)
+    else:
+        assert line_type is not None
+        return cpy.simplify_lines(
+            cast("LineReturn", filled_or_lines), as_line_type(line_type), tolerance)
+
+
+def to_geojson_bytes(
+    filled_or_lines: FillReturn | LineReturn,
+    *,
+    fill_type: FillType | str | None = None,
+    line_type: LineType | str | None = None,
+) -> bytes:
+    """Serialise filled contours or contour lines as a GeoJSON geometry object.
+
+    Filled contours are written as a single ``MultiPolygon`` and contour lines as a single
+    ``MultiLineString``, walking the offsets of the contours directly into a single bytes object
+    without creating intermediate Python objects. Numbers are written using the shortest
+    representation that round trips exactly.
+
+    Args:
+        filled_or_lines (sequence of arrays): Filled contours or contour lines to serialise, such
+            as those returned by :meth:`.ContourGenerator.filled` or
+            :meth:`.ContourGenerator.lines`.
+        fill_type (FillType or str, optional): :class:`~contourpy.FillType` of filled contours as
+            enum or string equivalent.
+        line_type (LineType or str, optional): :class:`~contourpy.LineType` of contour lines as
+            enum or string equivalent.
+
+    Return:
+        bytes: UTF-8 encoded GeoJSON geometry object.
+
+    Raises:
+        ValueError: If not exactly one of ``fill_type`` and ``line_type`` is specified, or if
+            ``fill_type`` is ``FillType.ChunkCombinedCode`` or ``FillType.ChunkCombinedOffset`` as
+            they do not identify which holes belong to which outer boundaries, or if any point
+            coordinate is not finite as JSON cannot represent NaN or infinity.
+    """
+    if (fill_type is None) == (line_type is None):
+        raise ValueError("Exactly one of fill_type and line_type must be specified")
+
+    if fill_type is not None:
+        return cpy.filled_to_geojson(cast("FillReturn", filled_or_lines), as_fill_type(fill_type))
+    else:
+        assert line_type is not None
+        return cpy.lines_to_geojson(cast("LineReturn", filled_or_lines), as_line_type(line_type))
+
+
+def to_wkb(
+    filled_or_lines: FillReturn | LineReturn,
+    *,
+    fill_type: FillType | str | None = None,
+    line_type: LineType | str | None = None,
+) -> bytes:
+    """Serialise filled contours or contour lines as Well-Known Binary (WKB).
+
+    Filled contours are written as a single ``MultiPolygon`` and contour lines as a single
+    ``MultiLineString`` in little-endian byte order, walking the offsets of the contours directly
+    into a single bytes object of the exact size required.
+
+    Args:
+        filled_or_lines (sequence of arrays): Filled contours or contour lines to serialise, such
+            as those returned by :meth:`.ContourGenerator.filled` or
+            :meth:`.ContourGenerator.lines`.
+        fill_type (FillType or str, optional): :class:`~contourpy.FillType` of filled contours as
+            enum or string equivalent.
+        line_type (LineType or str, optional): :class:`~contourpy.LineType` of contour lines as
+            enum or string equivalent.
+
+    Return:
+        bytes: WKB geometry.
+
+    Raises:
+        ValueError: If not exactly one of ``fill_type`` and ``line_type`` is specified, or if
+            ``fill_type`` is ``FillType.ChunkCombinedCode`` or ``FillType.ChunkCombinedOffset`` as
+            they do not identify which holes belong to which outer boundaries.
+    """
+    if (fill_type is None) == (line_type is None):
+        raise ValueError("Exactly one of fill_type and line_type must be specified")
+
+    if fill_type is not None:
+        return cpy.filled_to_wkb(cast("FillReturn", filled_or_lines), as_fill_type(fill_type))
+    else:
+        assert line_type is not None
+        return cpy.lines_to_wkb(cast("LineReturn", filled_or_lines), as_line_type(line_type))
+
+
+def _quantize_params(
+    bbox: tuple[float, float, float, float],
+    dtype: npt.DTypeLike,
+) -> tuple[np.dtype[Any], float, float, float, float]:
+    # Validate bbox and dtype, and return (dtype, x0, y0, x_scale, y_scale) used to quantise.
+    # Also used by ContourGenerator.filled_into() and lines_into().
+    x0, y0, x1, y1 = (float(value) for value in bbox)
+    if not (x0 <= x1 and y0 <= y1):
+        raise ValueError("bbox must have x0 <= x1 and y0 <= y1")
+
+    dtype = np.dtype(dtype)
+    if dtype not in (np.int16, np.int32):
+        raise ValueError("dtype must be int16 or int32")
+    max_value = np.iinfo(dtype).max
+    # A bbox of zero width or height still needs a positive scale.
+    x_scale = (x1 - x0) / max_value or 1.0
+    y_scale = (y1 - y0) / max_value or 1.0
+    return dtype, x0, y0, x_scale, y_scale
+
+
+def quantize(
+    filled_or_lines: FillReturn | LineReturn,
+    *,
+    fill_type: FillType | str | None = None,
+    line_type: LineType | str | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+    dtype: npt.DTypeLike = np.int32,
+    delta: bool = False,
+) -> tuple[Any, tuple[float, float], tuple[float, float]]:
+    """Quantise the points of filled contours or contour lines to compact integer coordinates.
+
+    Points are mapped from ``bbox`` onto integers from 0 to the maximum value of ``dtype`` in both
+    directions, using ``qx = round((x - x0)/x_scale)`` and ``qy = round((y - y0)/y_scale)``. The
+    original points are recovered to within half of ``scale`` using ``x = x0 + qx*x_scale`` and
+    ``y = y0 + qy*y_scale``. Quantisation is performed in C++ and the returned points arrays are
+    2 (``int16``) or 4 (``int32``) times smaller than the ``float64`` originals.
+
+    To quantise each chunk as it is calculated, so that ``float64`` points of the whole domain are
+    never held in memory, use the ``quantize_bbox`` argument of
+    :meth:`.ContourGenerator.filled_into` or :meth:`.ContourGenerator.lines_into` instead.
+
+    Args:
+        filled_or_lines (sequence of arrays): Filled contours or contour lines to quantise, such
+            as those returned by :meth:`.ContourGenerator.filled` or
+            :meth:`.ContourGenerator.lines`.
+        fill_type (FillType or str, optional): :class:`~contourpy.FillType` of filled contours as
+            enum or string equivalent.
+        line_type (LineType or str, optional): :class:`~contourpy.LineType` of contour lines as
+            enum or string equivalent.
+        bbox (tuple(float, float, float, float), optional): Bounding box ``(x0, y0, x1, y1)`` that
+            is quantised, default the bounding box of the points. Use the same ``bbox``, such as
+            that of the grid, for all calls whose output is to be combined.
+        dtype (int16 or int32): Integer dtype of the quantised points, default ``int32``.
+        delta (bool): Whether to delta encode points so that the first point of each line or
+            boundary is absolute and each subsequent point is the difference from the point
+            before, default ``False``. Small differences compress well.
+
+    Return:
+        Tuple of ``(quantized, scale, offset)`` where ``quantized`` has the same format as
+        ``filled_or_lines`` and shares its codes and offsets arrays but has integer points arrays,
+        ``scale`` is ``(x_scale, y_scale)`` and ``offset`` is ``(x0, y0)``.
+
+    Raises:
+        ValueError: If not exactly one of ``fill_type`` and ``line_type`` is specified, if
+            ``dtype`` is not ``int16`` or ``int32``, or if any points are outside ``bbox``.
+    """
+    if (fill_type is None) == (line_type is None):
+        raise ValueError("Exactly one of fill_type and line_type must be specified")
+
+    # Each points array and the offsets of the lines within it.
+    all_points: list[PointArray | None]
+    if fill_type is not None:
+        fill_type = as_fill_type(fill_type)
+        codes = fill_type in (
+            cpy.FillType.OuterCode, cpy.FillType.ChunkCombinedCode,
+            cpy.FillType.ChunkCombinedCodeOffset)
+        separate = False
+    else:
+        line_type = as_line_type(cast("LineType | str", line_type))
+        codes = line_type in (cpy.LineType.SeparateCode, cpy.LineType.ChunkCombinedCode)
+        separate = line_type == cpy.LineType.Separate
+
+    if separate:
+        lines = cast("list[PointArray]", filled_or_lines)
+        all_points = list(lines)
+        all_offsets = [np.array([0, len(points)], dtype=np.uint32) for points in lines]
+    else:
+        data = cast("tuple[Any, ...]", filled_or_lines)
+        combined = isinstance(data[0], np.ndarray)
+        all_points = [data[0]] if combined else list(data[0])
+        codes_or_offsets = [data[1]] if combined else list(data[1])
+        all_offsets = []
+        for points, line_data in zip(all_points, codes_or_offsets):
+            if points is not None and codes:
+                line_data = np.append(np.flatnonzero(line_data == 1), len(points))
+            all_offsets.append(line_data)
+
+    if bbox is None:
+        non_empty = [points for points in all_points if points is not None and len(points) > 0]
+        if non_empty:
+            mins = np.min([points.min(axis=0) for points in non_empty], axis=0)
+            maxs = np.max([points.max(axis=0) for points in non_empty], axis=0)
+            bbox = (float(mins[0]), float(mins[1]), float(maxs[0]), float(maxs[1]))
+        else:
+            bbox = (0.0, 0.0, 1.0, 1.0)
+    dtype, x0, y0, x_scale, y_scale = _quantize_params(bbox, dtype)
+
+    quantized = [
+        None if points is None else
+        cpy.quantize_points(points, offsets, x0, y0, x_scale, y_scale, dtype, delta)
+        for points, offsets in zip(all_points, all_offsets)]
+
+    ret: Any
+    if separate:
+        ret = quantized
+    elif combined:
+        ret = (quantized[0],) + data[1:]
+    else:
+        ret = (quantized,) + data[1:]
+    return ret, (x_scale, y_scale), (x0, y0)
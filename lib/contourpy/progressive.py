@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from contourpy._contourpy import ContourGenerator
+
+
+def _regions(n: int, region_size: int) -> list[tuple[int, int]]:
+    # Point index ranges [start, end) of regions of region_size quads, adjacent regions sharing
+    # their boundary points.
+    return [(start, min(start + region_size, n - 1) + 1) for start in range(0, n - 1, region_size)]
+
+
+def _coarse_range(start: int, end: int, stride: int, n: int) -> tuple[int, int]:
+    # Range of decimated points that covers the full resolution points [start, end), where
+    # decimated point k is full resolution point min(k*stride, n - 1).
+    coarse_n = (n - 1 + stride - 1) // stride + 1
+    return start // stride, min(-(-(end - 1) // stride), coarse_n - 1) + 1
+
+
+def _progressive(
+    cont_gen: ContourGenerator,
+    shape: tuple[int, int],
+    levels: tuple[float, ...],
+    deadline_ms: float | None,
+    stride: int,
+    region_size: int,
+) -> Iterator[tuple[int, tuple[int, int, int, int], Any]]:
+    """Implementation of ``filled_progressive`` and ``lines_progressive``.
+
+    Args:
+        cont_gen (ContourGenerator): Full resolution contour generator.
+        shape (tuple(int, int)): Shape ``(ny, nx)`` of the grid of ``cont_gen``.
+        levels (tuple of float): ``(lower_level, upper_level)`` for filled contours or
+            ``(level,)`` for contour lines.
+        deadline_ms (float, optional): Time in milliseconds after which no more refinements are
+            started, or ``None`` for no limit.
+        stride (int): Stride of the decimated grid in both directions.
+        region_size (int): Number of quads in each direction of refined regions.
+
+    Return:
+        Iterator of tuples of ``(stride, window, contours)``.
+    """
+    start_time = time.perf_counter()
+
+    # Check arguments here rather than in the generator so that errors are raised immediately.
+    if stride < 2:
+        raise ValueError("stride must be at least 2")
+    if region_size < 1:
+        raise ValueError("region_size must be at least 1")
+
+    return _refine(cont_gen, shape, levels, start_time, deadline_ms, stride, region_size)
+
+
+def _refine(
+    cont_gen: ContourGenerator,
+    shape: tuple[int, int],
+    levels: tuple[float, ...],
+    start_time: float,
+    deadline_ms: float | None,
+    stride: int,
+    region_size: int,
+) -> Iterator[tuple[int, tuple[int, int, int, int], Any]]:
+    filled = len(levels) == 2
+    ny, nx = shape
+
+    def contour(gen: ContourGenerator) -> Any:
+        return gen.filled(*levels) if filled else gen.lines(*levels)
+
+    def touched(gen: ContourGenerator) -> bool:
+        counts = gen.count_filled(*levels) if filled else gen.count_lines(*levels)
+        return bool(counts[0].sum() > 0)
+
+    coarse = cont_gen.stride(stride, stride)
+    yield stride, (0, nx, 0, ny), contour(coarse)
+
+    # Refine regions in which the decimated grid has contours.
+    for j0, j1 in _regions(ny, region_size):
+        cj0, cj1 = _coarse_range(j0, j1, stride, ny)
+        for i0, i1 in _regions(nx, region_size):
+            # Deadline is checked first so that no work is done for regions that are not refined.
+            if deadline_ms is not None and (time.perf_counter() - start_time)*1000 > deadline_ms:
+                return
+
+            ci0, ci1 = _coarse_range(i0, i1, stride, nx)
+            if not touched(coarse.window(ci0, ci1, cj0, cj1)):
+                continue
+
+            yield 1, (i0, i1, j0, j1), contour(cont_gen.window(i0, i1, j0, j1))
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    from numpy.typing import ArrayLike
+
+    from contourpy._contourpy import ContourGenerator, CoordinateArray, FillReturn, LineReturn
+
+
+def _kept_indices(n: int) -> npt.NDArray[np.intp]:
+    # Indices of points kept when halving the resolution, always including the last point.
+    return np.unique(np.append(np.arange(0, n, 2), n - 1))
+
+
+def _downsample(
+    z: CoordinateArray, j: npt.NDArray[np.intp], i: npt.NDArray[np.intp],
+) -> CoordinateArray:
+    # Each kept point represents the block of points from it up to the next kept point.  Its value
+    # is whichever of the block minimum or maximum is furthest from the block mean, so that peaks
+    # and troughs are not flattened by averaging.  NaN is ignored unless the whole block is NaN.
+    def reduce(ufunc: np.ufunc, values: CoordinateArray) -> CoordinateArray:
+        return ufunc.reduceat(ufunc.reduceat(values, j, axis=0), i, axis=1)
+
+    valid = ~np.isnan(z)
+    zmin = reduce(np.fmin, z)
+    zmax = reduce(np.fmax, z)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = reduce(np.add, np.where(valid, z, 0.0)) / reduce(np.add, valid.astype(np.float64))
+    return np.where(zmax - mean >= mean - zmin, zmax, zmin)
+
+
+class ContourPyramid:
+    """Multi-resolution pyramid of a large ``z`` field for level-of-detail contouring of map tiles.
+
+    The pyramid is built once by repeatedly halving the resolution of ``z`` in both directions
+    until it is no larger than ``tile_size`` in either direction. Each point of a lower resolution
+    grid represents a 2x2 block of the grid above it and takes whichever of the block minimum or
+    maximum is furthest from the block mean, so that peaks and troughs are preserved rather than
+    flattened by averaging. The first and last rows and columns are always kept so that every
+    level covers the whole domain. A :class:`~contourpy.ContourGenerator` is only created for a
+    level when it is first needed.
+
+    Tiles follow the usual slippy map convention over the bounding box of ``x`` and ``y``: at
+    zoom level ``zoom`` the domain is divided into ``2**zoom`` by ``2**zoom`` tiles with
+    ``tile_x`` increasing with ``x`` and ``tile_y`` increasing as ``y`` decreases. Each tile is
+    contoured using the coarsest level that has at least ``tile_size`` points across the tile, and
+    only the quads overlapping the tile are contoured, so the cost of a tile is bounded regardless
+    of the resolution of ``z``.
+
+    Args:
+        x (array-like of shape (ny, nx) or (nx,), optional): The x-coordinates of the ``z`` values,
+            as for :func:`~contourpy.contour_generator`.
+        y (array-like of shape (ny, nx) or (ny,), optional): The y-coordinates of the ``z`` values,
+            as for :func:`~contourpy.contour_generator`.
+        z (array-like of shape (ny, nx), may be a masked array): The 2D gridded values to calculate
+            the contours of.
+        tile_size (int): Number of points required across each tile, default 256.
+        cache_size (int): Maximum number of tile results that are cached, default 1024. The least
+            recently used results are discarded first.
+        **kwargs: Other keyword arguments passed to :func:`~contourpy.contour_generator` when
+            creating the contour generator of each level, such as ``name``, ``line_type`` and
+            ``fill_type``. The algorithm must support
+            :meth:`~contourpy.ContourGenerator.window_bbox`.
+
+    Note:
+        Tile results are cached and must not be modified. A ``ContourPyramid`` is not thread-safe.
+    """
+    _x: list[CoordinateArray]
+    _y: list[CoordinateArray]
+    _z: list[CoordinateArray]
+    _generators: list[ContourGenerator | None]
+    _cache: OrderedDict[tuple[Any, ...], Any]
+
+    def __init__(
+        self,
+        x: ArrayLike | None = None,
+        y: ArrayLike | None = None,
+        z: ArrayLike | np.ma.MaskedArray[Any, Any] | None = None,
+        *,
+        tile_size: int = 256,
+        cache_size: int = 1024,
+        **kwargs: Any,
+    ) -> None:
+        if tile_size < 2:
+            raise ValueError("tile_size must be at least 2")
+        if cache_size < 0:
+            raise ValueError("cache_size cannot be negative")
+
+        # Masked points are represented by NaN.
+        z = np.ma.filled(np.ma.asarray(z, dtype=np.float64), np.nan)
+        if z.ndim != 2 or z.shape[0] < 2 or z.shape[1] < 2:
+            raise TypeError(
+                f"Input z must be a 2D array of at least (2, 2), but has shape {z.shape}")
+        ny, nx = z.shape
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if x.ndim == 0:
+            x = np.arange(nx, dtype=np.float64)
+            y = np.arange(ny, dtype=np.float64)
+
+        self._x = [x]
+        self._y = [y]
+        self._z = [z]
+        while max(ny, nx) > tile_size and min(ny, nx) > 2:
+            j = _kept_indices(ny)
+            i = _kept_indices(nx)
+            if x.ndim == 1:
+                x, y = x[i], y[j]
+            else:
+                x, y = x[np.ix_(j, i)], y[np.ix_(j, i)]
+            z = _downsample(z, j, i)
+            ny, nx = z.shape
+            self._x.append(x)
+            self._y.append(y)
+            self._z.append(z)
+
+        self._xlim = (float(np.nanmin(self._x[0])), float(np.nanmax(self._x[0])))
+        self._ylim = (float(np.nanmin(self._y[0])), float(np.nanmax(self._y[0])))
+        self._tile_size = tile_size
+        self._cache_size = cache_size
+        self._kwargs = kwargs
+        self._generators = [None]*len(self._z)
+        self._cache = OrderedDict()
+
+    @property
+    def level_count(self) -> int:
+        """Number of resolution levels in the pyramid, level 0 being the full resolution."""
+        return len(self._z)
+
+    @property
+    def shapes(self) -> list[tuple[int, int]]:
+        """Shapes ``(ny, nx)`` of ``z`` at each resolution level."""
+        return [z.shape for z in self._z]  # type: ignore[misc]
+
+    def clear_cache(self) -> None:
+        """Discard all cached tile results."""
+        self._cache.clear()
+
+    def contours(
+        self,
+        zoom: int,
+        tile_x: int,
+        tile_y: int,
+        levels: ArrayLike,
+        *,
+        filled: bool = False,
+    ) -> list[LineReturn] | list[FillReturn] | None:
+        """Return the contours of a tile.
+
+        Results are cached so repeated requests for the same tile and levels are free.
+
+        Args:
+            zoom (int): Zoom level, at least 0.
+            tile_x (int): Tile index in the x direction, from 0 to ``2**zoom - 1``.
+            tile_y (int): Tile index in the y direction, from 0 to ``2**zoom - 1``.
+            levels (array-like of float): Contour levels.
+            filled (bool): Whether to return filled contours between each pair of adjacent
+                ``levels`` rather than contour lines at each level, default ``False``.
+
+        Return:
+            List of contour lines at each level in the ``line_type`` of the contour generators, or
+            if ``filled`` is ``True`` a list of filled contours between each pair of adjacent
+            levels in their ``fill_type``. Contours are returned for whole quads so may extend up
+            to one quad beyond the tile. Returns ``None`` if no quads overlap the tile.
+        """
+        bbox = self.tile_bbox(zoom, tile_x, tile_y)
+        levels = tuple(float(level) for level in np.ravel(levels))
+        key = (zoom, tile_x, tile_y, levels, filled)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]  # type: ignore[no-any-return]
+
+        window = self.generator(self.level_for_zoom(zoom)).window_bbox(*bbox)
+        ret: list[Any] | None
+        if window is None:
+            ret = None
+        elif filled:
+            ret = [window.filled(lower, upper) for lower, upper in zip(levels[:-1], levels[1:])]
+        else:
+            ret = [window.lines(level) for level in levels]
+
+        if self._cache_size > 0:
+            self._cache[key] = ret
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return ret
+
+    def generator(self, level: int) -> ContourGenerator:
+        """Return the contour generator of a resolution level, creating it if necessary.
+
+        Args:
+            level (int): Resolution level, from 0 (full resolution) to ``level_count - 1``.
+
+        Return:
+            :class:`~contourpy.ContourGenerator` of the whole domain at that resolution.
+        """
+        if not 0 <= level < len(self._z):
+            raise ValueError(f"level must be between 0 and {len(self._z) - 1}")
+
+        generator = self._generators[level]
+        if generator is None:
+            from contourpy import contour_generator
+
+            generator = contour_generator(
+                self._x[level], self._y[level], self._z[level], **self._kwargs)
+            if not generator.supports_window():
+                raise ValueError(f"{type(generator).__name__} does not support window_bbox")
+            self._generators[level] = generator
+        return generator
+
+    def level_for_zoom(self, zoom: int) -> int:
+        """Return the coarsest resolution level with at least ``tile_size`` points across each tile
+        of a zoom level, or 0 if there is no such level.
+
+        Args:
+            zoom (int): Zoom level, at least 0.
+
+        Return:
+            int: Resolution level.
+        """
+        if zoom < 0:
+            raise ValueError("zoom cannot be negative")
+
+        # Each tile spans 1/2**zoom of the domain in each direction.
+        required = self._tile_size*2**zoom
+        for level in range(len(self._z) - 1, 0, -1):
+            if min(self._z[level].shape) >= required:
+                return level
+        return 0
+
+    def tile_bbox(self, zoom: int, tile_x: int, tile_y: int) -> tuple[float, float, float, float]:
+        """Return the bounding box ``(x0, y0, x1, y1)`` of a tile.
+
+        Args:
+            zoom (int): Zoom level, at least 0.
+            tile_x (int): Tile index in the x direction, from 0 to ``2**zoom - 1``.
+            tile_y (int): Tile index in the y direction, from 0 to ``2**zoom - 1``.
+
+        Return:
+            tuple(float, float, float, float): Bounding box of the tile.
+        """
+        if zoom < 0:
+            raise ValueError("zoom cannot be negative")
+        n = 2**zoom
+        if not (0 <= tile_x < n and 0 <= tile_y < n):
+            raise ValueError(f"tile_x and tile_y must be between 0 and {n - 1} at zoom {zoom}")
+
+        width = (self._xlim[1] - self._xlim[0]) / n
+        height = (self._ylim[1] - self._ylim[0]) / n
+        x0 = self._xlim[0] + tile_x*width
+        y1 = self._ylim[1] - tile_y*height
+        return (x0, y1 - height, x0 + width, y1)
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+
+from contourpy._contourpy import FillType, LineType
+from contourpy.convert import convert_filled, convert_lines
+from contourpy.enum_util import as_fill_type, as_line_type
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import matplotlib.path as mpath
+
+    from contourpy._contourpy import (
+        ChunkIndexArray, FillReturn, FillReturn_ChunkCombinedOffset,
+        FillReturn_ChunkCombinedOffsetOffset, FillReturn_CombinedOffsetOffset, LineReturn,
+        LineReturn_ChunkCombinedOffset, LineReturn_CombinedOffset, LineReturn_Separate,
+        OffsetArray, PointArray,
+    )
+
+
+class ContourResult:
+    """Filled contours or contour lines together with their ``FillType`` or ``LineType``, providing
+    conversions to other formats.
+
+    Conversions and counts are calculated when they are first requested and then cached, so that
+    repeated requests are free and formats that are never requested are never calculated.
+
+    Args:
+        data (sequence of arrays): Filled contours as returned by
+            :meth:`~contourpy.ContourGenerator.filled` or contour lines as returned by
+            :meth:`~contourpy.ContourGenerator.lines`.
+        fill_or_line_type (FillType or LineType): Format of ``data``, a ``FillType`` if it is
+            filled contours or a ``LineType`` if it is contour lines.
+        chunk_indices (array of int32, optional): Chunk indices of the chunks in ``data`` if it
+            contains only the non-empty chunks, as returned using ``sparse=True``.
+
+    Note:
+        A ``ContourResult`` is returned from :meth:`~contourpy.ContourGenerator.filled` and
+        :meth:`~contourpy.ContourGenerator.lines` if they are called with ``result=True``.
+
+        The contents of returned objects must not be modified as they are cached.
+    """
+    _data: FillReturn | LineReturn
+    _fill_type: FillType | None
+    _line_type: LineType | None
+    _chunk_indices: ChunkIndexArray | None
+    _cache: dict[Any, Any]
+
+    def __init__(
+        self,
+        data: FillReturn | LineReturn,
+        fill_or_line_type: FillType | LineType,
+        chunk_indices: ChunkIndexArray | None = None,
+    ) -> None:
+        if isinstance(fill_or_line_type, FillType):
+            self._fill_type = fill_or_line_type
+            self._line_type = None
+        elif isinstance(fill_or_line_type, LineType):
+            self._fill_type = None
+            self._line_type = fill_or_line_type
+        else:
+            raise TypeError(
+                f"Expected FillType or LineType, got {type(fill_or_line_type).__name__}")
+
+        self._data = data
+        self._chunk_indices = chunk_indices
+        self._cache = {}
+
+    def __repr__(self) -> str:
+        return f"<ContourResult {self.fill_type or self.line_type}>"
+
+    def as_fill_type(self, fill_type: FillType | str) -> FillReturn:
+        """Return the filled contours converted to a particular ``FillType``.
+
+        Args:
+            fill_type (FillType or str): ``FillType`` to convert to, as enum or string equivalent.
+
+        Return:
+            Filled contours in the requested format.
+
+        Raises:
+            ValueError: If this result is contour lines rather than filled contours, or if the
+                conversion is not possible (see :func:`~contourpy.convert_filled`).
+        """
+        if self._fill_type is None:
+            raise ValueError("as_fill_type can only be used with filled contours")
+
+        fill_type = as_fill_type(fill_type)
+        if fill_type == self._fill_type:
+            return cast("FillReturn", self._data)
+
+        key = ("fill_type", fill_type)
+        ret = self._cache.get(key)
+        if ret is None:
+            ret = convert_filled(cast("FillReturn", self._data), self._fill_type, fill_type)
+            self._cache[key] = ret
+        return cast("FillReturn", ret)
+
+    def as_line_type(self, line_type: LineType | str) -> LineReturn:
+        """Return the contour lines converted to a particular ``LineType``.
+
+        Args:
+            line_type (LineType or str): ``LineType`` to convert to, as enum or string equivalent.
+
+        Return:
+            Contour lines in the requested format.
+
+        Raises:
+            ValueError: If this result is filled contours rather than contour lines.
+        """
+        if self._line_type is None:
+            raise ValueError("as_line_type can only be used with contour lines")
+
+        line_type = as_line_type(line_type)
+        if line_type == self._line_type:
+            return cast("LineReturn", self._data)
+
+        key = ("line_type", line_type)
+        ret = self._cache.get(key)
+        if ret is None:
+            ret = convert_lines(cast("LineReturn", self._data), self._line_type, line_type)
+            self._cache[key] = ret
+        return cast("LineReturn", ret)
+
+    @property
+    def chunk_indices(self) -> ChunkIndexArray | None:
+        """Chunk indices of the chunks in ``data`` if it only contains the non-empty chunks,
+        otherwise ``None``.
+        """
+        return self._chunk_indices
+
+    @property
+    def data(self) -> FillReturn | LineReturn:
+        """Filled contours or contour lines in their original format."""
+        return self._data
+
+    @property
+    def fill_type(self) -> FillType | None:
+        """``FillType`` of filled contours, or ``None`` if this result is contour lines."""
+        return self._fill_type
+
+    @property
+    def is_filled(self) -> bool:
+        """Whether this result is filled contours rather than contour lines."""
+        return self._fill_type is not None
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, or number of boundaries (outers and holes) of filled contours."""
+        ret = self._cache.get("line_count")
+        if ret is None:
+            if self._fill_type is not None:
+                chunk_filled = self.as_fill_type(FillType.ChunkCombinedOffset)
+                if TYPE_CHECKING:
+                    chunk_filled = cast(FillReturn_ChunkCombinedOffset, chunk_filled)
+                ret = sum(len(offsets) - 1 for offsets in chunk_filled[1] if offsets is not None)
+            else:
+                combined_lines = self.as_line_type(LineType.CombinedOffset)
+                if TYPE_CHECKING:
+                    combined_lines = cast(LineReturn_CombinedOffset, combined_lines)
+                ret = len(combined_lines[1]) - 1
+            self._cache["line_count"] = ret
+        return cast(int, ret)
+
+    @property
+    def line_type(self) -> LineType | None:
+        """``LineType`` of contour lines, or ``None`` if this result is filled contours."""
+        return self._line_type
+
+    @property
+    def point_count(self) -> int:
+        """Total number of points."""
+        ret = self._cache.get("point_count")
+        if ret is None:
+            if self._line_type == LineType.Separate:
+                ret = sum(len(points) for points in cast("LineReturn_Separate", self._data))
+            else:
+                # Either a single points array or a list of them, some of which may be None.
+                all_points = cast("tuple[Any, ...]", self._data)[0]
+                if isinstance(all_points, np.ndarray):
+                    ret = len(all_points)
+                else:
+                    ret = sum(len(points) for points in all_points if points is not None)
+            self._cache["point_count"] = ret
+        return cast(int, ret)
+
+    @property
+    def polygon_count(self) -> int:
+        """Number of polygons (outer boundaries) of filled contours.
+
+        Raises:
+            ValueError: If this result is contour lines, or if its ``FillType`` does not identify
+                which holes belong to which outer boundaries.
+        """
+        ret = self._cache.get("polygon_count")
+        if ret is None:
+            combined_filled = self.as_fill_type(FillType.CombinedOffsetOffset)
+            if TYPE_CHECKING:
+                combined_filled = cast(FillReturn_CombinedOffsetOffset, combined_filled)
+            ret = len(combined_filled[2]) - 1
+            self._cache["polygon_count"] = ret
+        return cast(int, ret)
+
+    def to_ragged_arrays(self) -> tuple[PointArray, tuple[OffsetArray, ...]]:
+        """Return the contours as a coordinates array and nested offsets arrays in the ragged array
+        layout used by `GeoArrow`_ and ``shapely.from_ragged_array``.
+
+        For filled contours the offsets are ``(ring_offsets, polygon_offsets)``, in which
+        ``ring_offsets`` index into the coordinates and ``polygon_offsets`` index into the rings,
+        which are the arrays of ``FillType.CombinedOffsetOffset``. For contour lines the offsets
+        are ``(line_offsets,)``, the offsets array of ``LineType.CombinedOffset``. These can be
+        passed directly to shapely 2:
+
+        >>> shapely.from_ragged_array(shapely.GeometryType.POLYGON, *result.to_ragged_arrays())
+
+        Return:
+            Tuple of ``(coords, offsets)`` where ``coords`` is an array of shape (npoints, 2) and
+            ``offsets`` is a tuple of uint32 arrays.
+
+        Raises:
+            ValueError: If this result is filled contours with a ``FillType`` that does not
+                identify which holes belong to which outer boundaries.
+
+        Note:
+            No data is copied if the contours are already in the required format, such as if they
+            were calculated using a single chunk and ``FillType.ChunkCombinedOffsetOffset``,
+            ``FillType.CombinedOffsetOffset``, ``LineType.ChunkCombinedOffset`` or
+            ``LineType.CombinedOffset``. Otherwise they are converted, combining chunks, once and
+            cached. See :func:`~contourpy.to_ragged_arrays` to combine multiple results.
+        """
+        if self._fill_type is not None:
+            if self._fill_type == FillType.ChunkCombinedOffsetOffset:
+                chunk_filled = cast("FillReturn_ChunkCombinedOffsetOffset", self._data)
+                if len(chunk_filled[0]) == 1 and chunk_filled[0][0] is not None:
+                    return chunk_filled[0][0], (
+                        cast("OffsetArray", chunk_filled[1][0]),
+                        cast("OffsetArray", chunk_filled[2][0]))
+            points, offsets, outer_offsets = cast(
+                "FillReturn_CombinedOffsetOffset",
+                self.as_fill_type(FillType.CombinedOffsetOffset))
+            return points, (offsets, outer_offsets)
+        else:
+            if self._line_type == LineType.ChunkCombinedOffset:
+                chunk_lines = cast("LineReturn_ChunkCombinedOffset", self._data)
+                if len(chunk_lines[0]) == 1 and chunk_lines[0][0] is not None:
+                    return chunk_lines[0][0], (cast("OffsetArray", chunk_lines[1][0]),)
+            points, offsets = cast(
+                "LineReturn_CombinedOffset", self.as_line_type(LineType.CombinedOffset))
+            return points, (offsets,)
+
+    def to_bokeh(self) -> tuple[list[Any], list[Any]]:
+        """Return the contours as x and y coordinates in the format required by `Bokeh`_.
+
+        Return:
+            Tuple of ``(xs, ys)``, suitable for a Bokeh ``multi_polygons`` glyph for filled
+            contours or a ``multi_line`` glyph for contour lines.
+        """
+        ret = self._cache.get("bokeh")
+        if ret is None:
+            from contourpy.util.bokeh_util import filled_to_bokeh, lines_to_bokeh
+
+            if self._fill_type is not None:
+                ret = filled_to_bokeh(cast("FillReturn", self._data), self._fill_type)
+            else:
+                assert self._line_type is not None
+                ret = lines_to_bokeh(cast("LineReturn", self._data), self._line_type)
+            self._cache["bokeh"] = ret
+        return cast("tuple[list[Any], list[Any]]", ret)
+
+    def to_mpl_paths(self) -> list[mpath.Path]:
+        """Return the contours as a list of `Matplotlib`_ ``Path`` objects.
+
+        Return:
+            List of ``Path`` objects.
+
+        Note:
+            Requires Matplotlib to be installed.
+        """
+        ret = self._cache.get("mpl_paths")
+        if ret is None:
+            from contourpy.util.mpl_util import filled_to_mpl_paths, lines_to_mpl_paths
+
+            if self._fill_type is not None:
+                ret = filled_to_mpl_paths(cast("FillReturn", self._data), self._fill_type)
+            else:
+                assert self._line_type is not None
+                ret = lines_to_mpl_paths(cast("LineReturn", self._data), self._line_type)
+            self._cache["mpl_paths"] = ret
+        return cast("list[mpath.Path]", ret)
+
+
+def to_ragged_arrays(
+    results: Sequence[ContourResult],
+) -> tuple[PointArray, tuple[OffsetArray, ...]]:
+    """Combine multiple contour results, such as those of each level or pair of adjacent levels,
+    into a single coordinates array and nested offsets arrays in the ragged array layout used by
+    `GeoArrow`_ and ``shapely.from_ragged_array``.
+
+    The offsets are those of :meth:`ContourResult.to_ragged_arrays` followed by an extra array of
+    offsets into the polygons or lines of each result. For filled contours these are
+    ``(ring_offsets, polygon_offsets, result_offsets)``, the layout of multipolygons, so each
+    result becomes a single multipolygon:
+
+    >>> results = [cont_gen.filled(lower, upper, result=True) for lower, upper in bands]
+    >>> shapely.from_ragged_array(shapely.GeometryType.MULTIPOLYGON, *to_ragged_arrays(results))
+
+    Similarly for contour lines the offsets are ``(line_offsets, result_offsets)`` for use with
+    ``shapely.GeometryType.MULTILINESTRING``.
+
+    Args:
+        results (sequence of ContourResult): Results to combine, either all filled contours or all
+            contour lines.
+
+    Return:
+        Tuple of ``(coords, offsets)`` where ``coords`` is an array of shape (npoints, 2) and
+        ``offsets`` is a tuple of uint32 arrays.
+    """
+    if len(results) == 0:
+        raise ValueError("results cannot be empty")
+    is_filled = results[0].is_filled
+    if any(result.is_filled != is_filled for result in results):
+        raise ValueError("results must be either all filled contours or all contour lines")
+
+    arrays = [result.to_ragged_arrays() for result in results]
+    points = np.concatenate([coords for coords, _ in arrays])
+    if len(points) > np.iinfo(np.uint32).max:
+        raise ValueError("Max offset too large to fit in np.uint32. Use fewer results.")
+
+    # Each offsets array indexes into the array before it, the first into the points, so is shifted
+    # by the total length of that array in the preceding results.
+    combined = []
+    lengths = [len(coords) for coords, _ in arrays]
+    for depth in range(len(arrays[0][1])):
+        starts = np.cumsum([0, *lengths])
+        combined.append(np.concatenate(
+            [offsets[depth][:-1] + start for (_, offsets), start in zip(arrays, starts)] +
+            [starts[-1:]]).astype(np.uint32))
+        lengths = [len(offsets[depth]) - 1 for _, offsets in arrays]
+    combined.append(np.cumsum([0, *lengths]).astype(np.uint32))
+
+    return points, tuple(combined)
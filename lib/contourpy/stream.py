@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from contourpy._contourpy import ContourGenerator, OffsetArray, PointArray
+
+# Put on the queue after the last chunk.
+_finished = object()
+
+
+class _Stopped(Exception):
+    # Raised by the sink if the caller has stopped iterating.
+    pass
+
+
+def _iter_chunks(
+    cont_gen: ContourGenerator,
+    levels: tuple[float, ...],
+    max_queued: int,
+) -> Iterator[tuple[int, tuple[Any, ...]]]:
+    """Implementation of ``iter_filled`` and ``iter_lines``.
+
+    Contours are calculated by ``filled_into`` or ``lines_into`` in a background thread, and copies
+    of the arrays of each chunk are passed back through a queue so that the caller can process
+    them whilst later chunks are being calculated.
+
+    Args:
+        cont_gen (ContourGenerator): Contour generator.
+        levels (tuple of float): ``(lower_level, upper_level)`` for filled contours or
+            ``(level,)`` for contour lines.
+        max_queued (int): Maximum number of chunks that are calculated but not yet yielded.
+
+    Return:
+        Iterator of tuples of ``(chunk, arrays)``.
+    """
+    filled = len(levels) == 2
+    chunks: queue.Queue[Any] = queue.Queue(maxsize=max_queued)
+    stopped = threading.Event()
+    error: BaseException | None = None
+
+    def sink(
+        chunk: int,
+        points: PointArray,
+        offsets: OffsetArray,
+        outer_offsets: OffsetArray | None,
+    ) -> None:
+        # Arrays are views of buffers that are reused by later chunks so must be copied.
+        arrays: tuple[Any, ...]
+        if filled:
+            assert outer_offsets is not None
+            arrays = (points.copy(), offsets.copy(), outer_offsets.copy())
+        else:
+            arrays = (points.copy(), offsets.copy())
+
+        # Time out periodically in case the caller has stopped iterating, in which case raising
+        # an exception stops the calculation of later chunks.
+        while not stopped.is_set():
+            try:
+                chunks.put((chunk, arrays), timeout=0.05)
+                return
+            except queue.Full:
+                pass
+        raise _Stopped
+
+    def run() -> None:
+        nonlocal error
+        try:
+            if filled:
+                cont_gen.filled_into(sink, *levels)
+            else:
+                cont_gen.lines_into(sink, *levels)
+        except BaseException as e:
+            error = e
+        chunks.put(_finished)
+
+    thread = threading.Thread(target=run, name="contourpy-iter", daemon=True)
+    thread.start()
+    try:
+        while (item := chunks.get()) is not _finished:
+            yield item
+    finally:
+        # If the caller stops iterating early, discard the remaining chunks.
+        stopped.set()
+        while thread.is_alive():
+            try:
+                chunks.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        thread.join()
+
+    if error is not None:
+        raise error
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+
+from contourpy._contourpy import FillType, LineType, encode_mvt_filled, encode_mvt_lines
+from contourpy.convert import convert_filled, convert_lines
+from contourpy.enum_util import as_fill_type, as_line_type
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import ArrayLike
+
+    import contourpy._contourpy as cpy
+    from contourpy.pyramid import ContourPyramid
+
+# MVT feature geometry types.
+_LINESTRING = 2
+_POLYGON = 3
+
+
+def _varint(value: int) -> bytes:
+    ret = bytearray()
+    while value >= 0x80:
+        ret.append((value & 0x7f) | 0x80)
+        value >>= 7
+    ret.append(value)
+    return bytes(ret)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    # Length-delimited protobuf field.
+    return _varint((number << 3) | 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _layer(
+    layer_name: str,
+    keys: Sequence[str],
+    features: Sequence[tuple[int, Sequence[float], bytes]],
+    geom_type: int,
+    extent: int,
+) -> bytes:
+    # Encode a Tile message containing a single layer.  Each feature is a tuple of its id, its
+    # property values (one per key) and its packed geometry.  Features without geometry are
+    # omitted.
+    values: dict[float, int] = {}
+    layer = _uint_field(15, 2) + _field(1, layer_name.encode())
+    for feature_id, properties, geometry in features:
+        if not geometry:
+            continue
+        tags = b"".join(
+            _varint(i) + _varint(values.setdefault(value, len(values)))
+            for i, value in enumerate(properties))
+        layer += _field(2, (
+            _uint_field(1, feature_id) + _field(2, tags) + _uint_field(3, geom_type) +
+            _field(4, geometry)))
+    for key in keys:
+        layer += _field(3, key.encode())
+    for value in values:
+        # Value message with double_value field.
+        layer += _field(4, b"\x19" + struct.pack("<d", value))
+    layer += _uint_field(5, extent)
+    return _field(3, layer)
+
+
+def _check_args(
+    bbox: tuple[float, float, float, float], levels: ArrayLike, extent: int,
+) -> tuple[tuple[float, float, float, float], list[float]]:
+    x0, y0, x1, y1 = (float(value) for value in bbox)
+    if not (x0 < x1 and y0 < y1):
+        raise ValueError("bbox must have x0 < x1 and y0 < y1")
+    if extent < 1:
+        raise ValueError("extent must be positive")
+    return (x0, y0, x1, y1), [float(level) for level in np.ravel(levels)]
+
+
+def filled_tile(
+    filled: Sequence[cpy.FillReturn] | None,
+    fill_type: FillType | str,
+    bbox: tuple[float, float, float, float],
+    levels: ArrayLike,
+    *,
+    extent: int = 4096,
+    layer_name: str = "contours",
+) -> bytes:
+    """Encode filled contours as a Mapbox Vector Tile.
+
+    The tile contains a single layer with a POLYGON feature for each pair of adjacent ``levels``
+    that has any filled contours within the tile. Each feature has properties ``lower`` and
+    ``upper`` containing its levels and an id that is its index into ``filled``.
+
+    Points are quantised to integer tile coordinates from 0 to ``extent`` across ``bbox`` with the
+    y-axis pointing down, and each polygon ring is oriented as required by the MVT specification.
+    Rings that collapse to zero area when quantised are removed, along with the holes of removed
+    outer boundaries. The geometry is encoded in C++ directly from the contour points.
+
+    Args:
+        filled (sequence of filled contours or None): Filled contours between each pair of
+            adjacent ``levels``, such as returned by
+            :meth:`~contourpy.ContourPyramid.contours`. May be ``None`` for an empty tile.
+        fill_type (FillType or str): Type of ``filled``, which may be chunked but must identify
+            which holes belong to which outer boundaries.
+        bbox (tuple(float, float, float, float)): Bounding box ``(x0, y0, x1, y1)`` of the tile.
+        levels (array-like of float): Contour levels, one more than the length of ``filled``.
+        extent (int): Number of integer tile coordinates across the tile, default 4096.
+        layer_name (str): Name of the layer, default ``"contours"``.
+
+    Return:
+        bytes: Tile encoded as protobuf.
+
+    Note:
+        Points are not clipped to the tile. Contours calculated for the quads that overlap the
+        tile, such as by :meth:`~contourpy.ContourGenerator.window_bbox`, only extend a small
+        distance beyond the tile and are trimmed by the renderer using the tile buffer.
+    """
+    bbox, levels = _check_args(bbox, levels, extent)
+    fill_type = as_fill_type(fill_type)
+    filled = filled or []
+    if filled and len(filled) != len(levels) - 1:
+        raise ValueError("filled must have one fewer item than levels")
+
+    features = []
+    for i, band in enumerate(filled):
+        points, offsets, outer_offsets = cast(
+            "cpy.FillReturn_CombinedOffsetOffset",
+            convert_filled(band, fill_type, FillType.CombinedOffsetOffset))
+        geometry = encode_mvt_filled(points, offsets, outer_offsets, *bbox, extent)
+        features.append((i, levels[i:i+2], geometry))
+
+    return _layer(layer_name, ["lower", "upper"], features, _POLYGON, extent)
+
+
+def lines_tile(
+    lines: Sequence[cpy.LineReturn] | None,
+    line_type: LineType | str,
+    bbox: tuple[float, float, float, float],
+    levels: ArrayLike,
+    *,
+    extent: int = 4096,
+    layer_name: str = "contours",
+) -> bytes:
+    """Encode contour lines as a Mapbox Vector Tile.
+
+    The tile contains a single layer with a LINESTRING feature for each of ``levels`` that has any
+    contour lines within the tile. Each feature has a property ``level`` and an id that is its
+    index into ``lines``.
+
+    Points are quantised to integer tile coordinates from 0 to ``extent`` across ``bbox`` with the
+    y-axis pointing down. Lines that collapse to a single point when quantised are removed. The
+    geometry is encoded in C++ directly from the contour points.
+
+    Args:
+        lines (sequence of contour lines or None): Contour lines at each of ``levels``, such as
+            returned by :meth:`~contourpy.ContourPyramid.contours`. May be ``None`` for an empty
+            tile.
+        line_type (LineType or str): Type of ``lines``, which may be chunked.
+        bbox (tuple(float, float, float, float)): Bounding box ``(x0, y0, x1, y1)`` of the tile.
+        levels (array-like of float): Contour levels, the same length as ``lines``.
+        extent (int): Number of integer tile coordinates across the tile, default 4096.
+        layer_name (str): Name of the layer, default ``"contours"``.
+
+    Return:
+        bytes: Tile encoded as protobuf.
+
+    Note:
+        Points are not clipped to the tile, see :func:`filled_tile`.
+    """
+    bbox, levels = _check_args(bbox, levels, extent)
+    line_type = as_line_type(line_type)
+    lines = lines or []
+    if lines and len(lines) != len(levels):
+        raise ValueError("lines must have the same length as levels")
+
+    features = []
+    for i, level_lines in enumerate(lines):
+        points, offsets = cast(
+            "cpy.LineReturn_CombinedOffset",
+            convert_lines(level_lines, line_type, LineType.CombinedOffset))
+        geometry = encode_mvt_lines(points, offsets, *bbox, extent)
+        features.append((i, levels[i:i+1], geometry))
+
+    return _layer(layer_name, ["level"], features, _LINESTRING, extent)
+
+
+def pyramid_tile(
+    pyramid: ContourPyramid,
+    zoom: int,
+    tile_x: int,
+    tile_y: int,
+    levels: ArrayLike,
+    *,
+    filled: bool = False,
+    extent: int = 4096,
+    layer_name: str = "contours",
+) -> bytes:
+    """Calculate the contours of a tile of a :class:`~contourpy.ContourPyramid` and encode them as
+    a Mapbox Vector Tile.
+
+    Args:
+        pyramid (ContourPyramid): Pyramid to contour.
+        zoom (int): Zoom level, at least 0.
+        tile_x (int): Tile index in the x direction, from 0 to ``2**zoom - 1``.
+        tile_y (int): Tile index in the y direction, from 0 to ``2**zoom - 1``.
+        levels (array-like of float): Contour levels.
+        filled (bool): Whether to encode filled contours between each pair of adjacent ``levels``
+            using :func:`filled_tile` rather than contour lines at each level using
+            :func:`lines_tile`, default ``False``.
+        extent (int): Number of integer tile coordinates across the tile, default 4096.
+        layer_name (str): Name of the layer, default ``"contours"``.
+
+    Return:
+        bytes: Tile encoded as protobuf.
+    """
+    bbox = pyramid.tile_bbox(zoom, tile_x, tile_y)
+    contours = pyramid.contours(zoom, tile_x, tile_y, levels, filled=filled)
+    cont_gen = pyramid.generator(pyramid.level_for_zoom(zoom))
+    if filled:
+        return filled_tile(
+            cast("list[cpy.FillReturn] | None", contours), cont_gen.fill_type, bbox, levels,
+            extent=extent, layer_name=layer_name)
+    else:
+        return lines_tile(
+            cast("list[cpy.LineReturn] | None", contours), cont_gen.line_type, bbox, levels,
+            extent=extent, layer_name=layer_name)
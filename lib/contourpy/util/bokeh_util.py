@@ -3,11 +3,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, cast
 
 from contourpy import FillType, LineType
-from contourpy.util.mpl_util import mpl_codes_to_offsets
+from contourpy.convert import convert_filled, convert_lines
 
 if TYPE_CHECKING:
     from contourpy._contourpy import (
-        CoordinateArray, FillReturn, LineReturn, LineReturn_Separate, LineReturn_SeparateCode,
+        CoordinateArray, FillReturn, FillReturn_ChunkCombinedOffset, FillReturn_OuterOffset,
+        LineReturn, LineReturn_Separate,
     )
 
 
@@ -17,39 +18,26 @@ def filled_to_bokeh(
 ) -> tuple[list[list[CoordinateArray]], list[list[CoordinateArray]]]:
     xs: list[list[CoordinateArray]] = []
     ys: list[list[CoordinateArray]] = []
-    if fill_type in (FillType.OuterOffset, FillType.ChunkCombinedOffset,
-                     FillType.OuterCode, FillType.ChunkCombinedCode):
-        have_codes = fill_type in (FillType.OuterCode, FillType.ChunkCombinedCode)
-
-        for points, offsets in zip(*filled):
-            if points is None:
-                continue
-            if have_codes:
-                offsets = mpl_codes_to_offsets(offsets)
-            xs.append([])  # New outer with zero or more holes.
-            ys.append([])
-            for i in range(len(offsets)-1):
-                xys = points[offsets[i]:offsets[i+1]]
-                xs[-1].append(xys[:, 0])
-                ys[-1].append(xys[:, 1])
-    elif fill_type in (FillType.ChunkCombinedCodeOffset, FillType.ChunkCombinedOffsetOffset):
-        for points, codes_or_offsets, outer_offsets in zip(*filled):
-            if points is None:
-                continue
-            for j in range(len(outer_offsets)-1):
-                if fill_type == FillType.ChunkCombinedCodeOffset:
-                    codes = codes_or_offsets[outer_offsets[j]:outer_offsets[j+1]]
-                    offsets = mpl_codes_to_offsets(codes) + outer_offsets[j]
-                else:
-                    offsets = codes_or_offsets[outer_offsets[j]:outer_offsets[j+1]+1]
-                xs.append([])  # New outer with zero or more holes.
-                ys.append([])
-                for k in range(len(offsets)-1):
-                    xys = points[offsets[k]:offsets[k+1]]
-                    xs[-1].append(xys[:, 0])
-                    ys[-1].append(xys[:, 1])
+    if fill_type in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset):
+        # Holes are not identified so each chunk is treated as a single outer with holes.
+        filled = convert_filled(filled, fill_type, FillType.ChunkCombinedOffset)
+        if TYPE_CHECKING:
+            filled = cast(FillReturn_ChunkCombinedOffset, filled)
+        all_points = [points for points in filled[0] if points is not None]
+        all_offsets = [offsets for offsets in filled[1] if offsets is not None]
     else:
-        raise RuntimeError(f"Conversion of FillType {fill_type} to Bokeh is not implemented")
+        filled = convert_filled(filled, fill_type, FillType.OuterOffset)
+        if TYPE_CHECKING:
+            filled = cast(FillReturn_OuterOffset, filled)
+        all_points, all_offsets = filled
+
+    for points, offsets in zip(all_points, all_offsets):
+        xs.append([])  # New outer with zero or more holes.
+        ys.append([])
+        for i in range(len(offsets)-1):
+            xys = points[offsets[i]:offsets[i+1]]
+            xs[-1].append(xys[:, 0])
+            ys[-1].append(xys[:, 1])
 
     return xs, ys
 
@@ -58,33 +46,9 @@ def lines_to_bokeh(
     lines: LineReturn,
     line_type: LineType,
 ) -> tuple[list[CoordinateArray], list[CoordinateArray]]:
-    xs: list[CoordinateArray] = []
-    ys: list[CoordinateArray] = []
-
-    if line_type == LineType.Separate:
-        if TYPE_CHECKING:
-            lines = cast(LineReturn_Separate, lines)
-        for line in lines:
-            xs.append(line[:, 0])
-            ys.append(line[:, 1])
-    elif line_type == LineType.SeparateCode:
-        if TYPE_CHECKING:
-            lines = cast(LineReturn_SeparateCode, lines)
-        for line in lines[0]:
-            xs.append(line[:, 0])
-            ys.append(line[:, 1])
-    elif line_type in (LineType.ChunkCombinedCode, LineType.ChunkCombinedOffset):
-        for points, offsets in zip(*lines):
-            if points is None:
-                continue
-            if line_type == LineType.ChunkCombinedCode:
-                offsets = mpl_codes_to_offsets(offsets)
-
-            for i in range(len(offsets)-1):
-                line = points[offsets[i]:offsets[i+1]]
-                xs.append(line[:, 0])
-                ys.append(line[:, 1])
-    else:
-        raise RuntimeError(f"Conversion of LineType {line_type} to Bokeh is not implemented")
-
+    lines = convert_lines(lines, line_type, LineType.Separate)
+    if TYPE_CHECKING:
+        lines = cast(LineReturn_Separate, lines)
+    xs = [line[:, 0] for line in lines]
+    ys = [line[:, 1] for line in lines]
     return xs, ys
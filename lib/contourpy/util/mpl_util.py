@@ -6,64 +6,37 @@ import matplotlib.path as mpath
 import numpy as np
 
 from contourpy import FillType, LineType
+from contourpy.convert import convert_filled, convert_lines
 
 if TYPE_CHECKING:
     from contourpy._contourpy import (
-        CodeArray, FillReturn, LineReturn, LineReturn_Separate, OffsetArray,
+        CodeArray, FillReturn, FillReturn_ChunkCombinedCode, FillReturn_OuterCode, LineReturn,
+        LineReturn_SeparateCode, OffsetArray,
     )
 
 
 def filled_to_mpl_paths(filled: FillReturn, fill_type: FillType) -> list[mpath.Path]:
-    if fill_type in (FillType.OuterCode, FillType.ChunkCombinedCode):
-        paths = [mpath.Path(points, codes) for points, codes in zip(*filled) if points is not None]
-    elif fill_type in (FillType.OuterOffset, FillType.ChunkCombinedOffset):
-        paths = [mpath.Path(points, offsets_to_mpl_codes(offsets))
-                 for points, offsets in zip(*filled) if points is not None]
-    elif fill_type == FillType.ChunkCombinedCodeOffset:
-        paths = []
-        for points, codes, outer_offsets in zip(*filled):
-            if points is None:
-                continue
-            points = np.split(points, outer_offsets[1:-1])
-            codes = np.split(codes, outer_offsets[1:-1])
-            paths += [mpath.Path(p, c) for p, c in zip(points, codes)]
-    elif fill_type == FillType.ChunkCombinedOffsetOffset:
-        paths = []
-        for points, offsets, outer_offsets in zip(*filled):
-            if points is None:
-                continue
-            for i in range(len(outer_offsets)-1):
-                offs = offsets[outer_offsets[i]:outer_offsets[i+1]+1]
-                pts = points[offs[0]:offs[-1]]
-                paths += [mpath.Path(pts, offsets_to_mpl_codes(offs - offs[0]))]
+    if fill_type in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset):
+        # Holes are not identified so each chunk is a single path.
+        chunk_filled = convert_filled(filled, fill_type, FillType.ChunkCombinedCode)
+        if TYPE_CHECKING:
+            chunk_filled = cast(FillReturn_ChunkCombinedCode, chunk_filled)
+        paths = [mpath.Path(points, codes) for points, codes in zip(*chunk_filled)
+                 if points is not None]
     else:
-        raise RuntimeError(f"Conversion of FillType {fill_type} to MPL Paths is not implemented")
+        # Each outer boundary and its holes is a separate path.
+        outer_filled = convert_filled(filled, fill_type, FillType.OuterCode)
+        if TYPE_CHECKING:
+            outer_filled = cast(FillReturn_OuterCode, outer_filled)
+        paths = [mpath.Path(points, codes) for points, codes in zip(*outer_filled)]
     return paths
 
 
 def lines_to_mpl_paths(lines: LineReturn, line_type: LineType) -> list[mpath.Path]:
-    if line_type == LineType.Separate:
-        if TYPE_CHECKING:
-            lines = cast(LineReturn_Separate, lines)
-        paths = []
-        for line in lines:
-            # Drawing as Paths so that they can be closed correctly.
-            closed = line[0, 0] == line[-1, 0] and line[0, 1] == line[-1, 1]
-            paths.append(mpath.Path(line, closed=closed))
-    elif line_type in (LineType.SeparateCode, LineType.ChunkCombinedCode):
-        paths = [mpath.Path(points, codes) for points, codes in zip(*lines) if points is not None]
-    elif line_type == LineType.ChunkCombinedOffset:
-        paths = []
-        for points, offsets in zip(*lines):
-            if points is None:
-                continue
-            for i in range(len(offsets)-1):
-                line = points[offsets[i]:offsets[i+1]]
-                closed = line[0, 0] == line[-1, 0] and line[0, 1] == line[-1, 1]
-                paths.append(mpath.Path(line, closed=closed))
-    else:
-        raise RuntimeError(f"Conversion of LineType {line_type} to MPL Paths is not implemented")
-    return paths
+    separate_lines = convert_lines(lines, line_type, LineType.SeparateCode)
+    if TYPE_CHECKING:
+        separate_lines = cast(LineReturn_SeparateCode, separate_lines)
+    return [mpath.Path(points, codes) for points, codes in zip(*separate_lines)]
 
 
 def mpl_codes_to_offsets(codes: CodeArray) -> OffsetArray:
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import contextlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, BinaryIO
+import uuid
+import zipfile
+
+import numpy as np
+
+import contourpy._contourpy as cpy
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from contourpy._contourpy import (
+        CoordinateArray, FillReturn_ChunkCombinedOffsetOffset, LineReturn_ChunkCombinedOffset,
+        OffsetArray, PointArray,
+    )
+
+
+class _Writer(ABC):
+    """Base class of writers used by ``ContourGenerator.write_filled`` and ``write_lines``.
+
+    The ContourGenerator calls ``start_level`` before each level index, ``write_chunk`` with each
+    non-empty chunk of that level as soon as it has been calculated, and then ``close`` if all
+    levels have been written or ``abort`` if an exception has been raised. The arrays passed to
+    ``write_chunk`` are views of buffers that are reused for later chunks so must not be retained
+    after the call.
+
+    Contours are written to a temporary file in the same directory as ``path`` that only replaces
+    ``path`` when ``close`` succeeds, so an incomplete file is never left at ``path``.
+
+    Args:
+        path (str or path-like): Path of the file to write.
+        levels (array of float): All levels that will be written.
+        filled (bool): Whether filled contours rather than contour lines are written.
+    """
+    def __init__(self, path: str | os.PathLike[str], levels: CoordinateArray, filled: bool) -> None:
+        self._path = os.fspath(path)
+        directory, name = os.path.split(os.path.abspath(self._path))
+        self._temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+        self._levels = levels
+        self._filled = filled
+        self._level_index = -1
+
+    @abstractmethod
+    def _close_file(self) -> None:
+        # Close the temporary file without finishing it.
+        pass
+
+    @abstractmethod
+    def _finish_file(self) -> None:
+        # Write anything remaining to the temporary file and close it.
+        pass
+
+    def abort(self) -> None:
+        """Close and delete the temporary file, ignoring any errors so that they do not mask the
+        exception that caused the abort.
+        """
+        with contextlib.suppress(Exception):
+            self._close_file()
+        with contextlib.suppress(OSError):
+            os.remove(self._temp_path)
+
+    def close(self) -> None:
+        """Finish the temporary file and move it to ``path``, replacing any existing file."""
+        try:
+            self._finish_file()
+            os.replace(self._temp_path, self._path)
+        except BaseException:
+            self.abort()
+            raise
+
+    def start_level(self, level_index: int) -> None:
+        self._level_index = level_index
+
+    @abstractmethod
+    def write_chunk(
+        self,
+        chunk: int,
+        points: PointArray,
+        offsets: OffsetArray,
+        outer_offsets: OffsetArray | None,
+    ) -> None:
+        pass
+
+
+class _GeoJsonWriter(_Writer):
+    # Newline-delimited GeoJSON with a Feature for each chunk.
+    def __init__(self, path: str | os.PathLike[str], levels: CoordinateArray, filled: bool) -> None:
+        super().__init__(path, levels, filled)
+        self._file: BinaryIO = open(self._temp_path, "xb")
+
+    def _close_file(self) -> None:
+        self._file.close()
+
+    def _finish_file(self) -> None:
+        self._file.close()
+
+    def write_chunk(
+        self,
+        chunk: int,
+        points: PointArray,
+        offsets: OffsetArray,
+        outer_offsets: OffsetArray | None,
+    ) -> None:
+        i = self._level_index
+        properties: dict[str, int | float] = {"level_index": i}
+        if self._filled:
+            assert outer_offsets is not None
+            properties["lower_level"] = float(self._levels[i])
+            properties["upper_level"] = float(self._levels[i+1])
+            filled: FillReturn_ChunkCombinedOffsetOffset = ([points], [offsets], [outer_offsets])
+            geometry = cpy.filled_to_geojson(filled, cpy.FillType.ChunkCombinedOffsetOffset)
+        else:
+            properties["level"] = float(self._levels[i])
+            lines: LineReturn_ChunkCombinedOffset = ([points], [offsets])
+            geometry = cpy.lines_to_geojson(lines, cpy.LineType.ChunkCombinedOffset)
+        properties["chunk"] = chunk
+
+        self._file.write(b'{"type":"Feature","properties":')
+        self._file.write(json.dumps(properties, separators=(",", ":")).encode())
+        self._file.write(b',"geometry":')
+        self._file.write(geometry)
+        self._file.write(b"}\n")
+
+
+class _NpzWriter(_Writer):
+    # Uncompressed .npz file, written one array at a time in the same way as np.savez.
+    def __init__(self, path: str | os.PathLike[str], levels: CoordinateArray, filled: bool) -> None:
+        super().__init__(path, levels, filled)
+        self._zip = zipfile.ZipFile(
+            self._temp_path, mode="x", compression=zipfile.ZIP_STORED, allowZip64=True)
+
+    def _write_array(self, name: str, array: npt.NDArray[Any]) -> None:
+        with self._zip.open(name + ".npy", mode="w", force_zip64=True) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+
+    def _close_file(self) -> None:
+        self._zip.close()
+
+    def _finish_file(self) -> None:
+        self._write_array("levels", np.asarray(self._levels))
+        self._zip.close()
+
+    def write_chunk(
+        self,
+        chunk: int,
+        points: PointArray,
+        offsets: OffsetArray,
+        outer_offsets: OffsetArray | None,
+    ) -> None:
+        suffix = f"_{self._level_index}_{chunk}"
+        self._write_array("points" + suffix, points)
+        self._write_array("offsets" + suffix, offsets)
+        if outer_offsets is not None:
+            self._write_array("outer_offsets" + suffix, outer_offsets)
+
+
+def _create_writer(
+    path: str | os.PathLike[str],
+    format: str,
+    levels: CoordinateArray,
+    filled: bool,
+) -> _Writer:
+    """Create the writer of the specified format for ``ContourGenerator.write_filled`` and
+    ``ContourGenerator.write_lines``.
+
+    Args:
+        path (str or path-like): Path of the file to write.
+        format (str): ``"npz"`` or ``"geojson"``.
+        levels (array of float): All levels that will be written.
+        filled (bool): Whether filled contours rather than contour lines are written.
+
+    Return:
+        Writer that has opened its temporary file.
+    """
+    if format == "npz":
+        return _NpzWriter(path, levels, filled)
+    elif format == "geojson":
+        return _GeoJsonWriter(path, levels, filled)
+    else:
+        raise ValueError(f"Unsupported format {format!r}, must be 'npz' or 'geojson'")
@@ -10,12 +10,21 @@
 #ifndef CONTOURPY_BASE_H
 #define CONTOURPY_BASE_H
 
+#include "cancel_token.h"
 #include "chunk_local.h"
 #include "contour_generator.h"
 #include "fill_type.h"
+#include "line_metrics.h"
 #include "line_type.h"
 #include "outer_or_hole.h"
+#include "output_too_large_error.h"
 #include "z_interp.h"
+#include <array>
+#include <atomic>
+#include <exception>
+#include <memory>
+#include <string>
+#include <thread>
 #include <vector>
 
 namespace contourpy {
@@ -26,9 +35,20 @@ class BaseContourGenerator : public ContourGenerator
 public:
     ~BaseContourGenerator();
 
+    // Return per-chunk counts of points, lines and holes of filled contours, without calculating
+    // the contours themselves.
+    py::tuple count_filled(double lower_level, double upper_level);
+
+    // Return per-chunk counts of points and lines of contour lines, without calculating the lines
+    // themselves.
+    py::tuple count_lines(double level);
+
     static FillType default_fill_type();
     static LineType default_line_type();
 
+    // CancelToken that is checked between chunks, or None.
+    py::object get_cancel_token() const;
+
     py::tuple get_chunk_count() const;  // Return (y_chunk_count, x_chunk_count)
     py::tuple get_chunk_size() const;   // Return (y_chunk_size, x_chunk_size)
 
@@ -37,23 +57,110 @@ public:
     FillType get_fill_type() const;
     LineType get_line_type() const;
 
+    // Maximum estimated number of bytes of output of filled() and lines(), or 0 for no limit.
+    count_t get_max_output_bytes() const;
+
+    // Maximum number of bytes of chunk buffers retained between calls.
+    count_t get_max_retained_bytes() const;
+
+    // Called with (chunks_done, total_chunks) after each chunk is processed, or None.
+    py::object get_progress_callback() const;
+
     bool get_quad_as_tri() const;
 
+    // Number of bytes currently held in retained chunk buffers.
+    count_t get_retained_bytes() const;
+
+    // Affine transform applied to output points as a (2, 3) array, or None if there is not one.
+    py::object get_transform() const;
+
     ZInterp get_z_interp() const;
 
-    py::sequence filled(double lower_level, double upper_level);
-    py::sequence lines(double level);
+    // If out is not None it is a tuple of caller-supplied NumPy arrays to write the results to.
+    // If sparse is true only non-empty chunks are returned, together with their chunk indices.
+    // If result is true the results are returned as a contourpy.ContourResult.
+    // If metrics is true the results are returned together with a MetricsArray.
+    // Lines and boundaries with fewer than min_points points, a length less than min_length or
+    // closed with an absolute area less than min_area are discarded.
+    // If simplify_tolerance is positive lines and boundaries are simplified.
+    py::object filled(
+        double lower_level, double upper_level, const py::object& out, bool sparse, bool result,
+        bool metrics, count_t min_points, double min_area, double min_length,
+        double simplify_tolerance);
+    py::object lines(
+        double level, const py::object& out, bool sparse, bool result, bool metrics,
+        count_t min_points, double min_area, double min_length, double simplify_tolerance);
+
+    // Call sink(chunk, points, offsets, outer_offsets) with each non-empty chunk as soon as it has
+    // been calculated, on the calling thread, rather than returning the contours.  The arrays are
+    // views of buffers that are reused so are only valid during the call.  Outer offsets are
+    // None for contour lines.  If quantize_bbox is not None the points are quantised within it
+    // as contourpy.quantize() does.
+    void filled_into(
+        const py::object& sink, double lower_level, double upper_level,
+        const py::object& quantize_bbox, const py::object& quantize_dtype, bool quantize_delta);
+    void lines_into(
+        const py::object& sink, double level, const py::object& quantize_bbox,
+        const py::object& quantize_dtype, bool quantize_delta);
+
+    // Return an iterator of (chunk, arrays) for each non-empty chunk in order of completion, with
+    // contours calculated in a background thread, up to max_queued chunks ahead of the caller.
+    // Implemented in contourpy.stream.
+    py::object iter_filled(double lower_level, double upper_level, index_t max_queued);
+    py::object iter_lines(double level, index_t max_queued);
+
+    // Return an iterator of contours that are first calculated on a grid decimated by stride and
+    // then refined at full resolution in regions of region_size quads that the decimated contours
+    // pass through, stopping once deadline_ms have elapsed.  Implemented in contourpy.progressive.
+    py::object filled_progressive(
+        double lower_level, double upper_level, const py::object& deadline_ms, index_t stride,
+        index_t region_size);
+    py::object lines_progressive(
+        double level, const py::object& deadline_ms, index_t stride, index_t region_size);
+
+    // Free all retained chunk buffers.
+    void release_buffers();
+
+    void set_cancel_token(const py::object& cancel_token);
+
+    void set_max_output_bytes(count_t max_output_bytes);
+
+    void set_max_retained_bytes(count_t max_retained_bytes);
+
+    void set_progress_callback(const py::object& progress_callback);
+
+    // Return a new contour generator of the same type and with the same options that contours
+    // every sy'th row and sx'th column of points, always including the last row and column.
+    py::object stride(index_t sy, index_t sx) const;
 
     static bool supports_fill_type(FillType fill_type);
     static bool supports_line_type(LineType line_type);
 
+    // Return a new contour generator of the same type and with the same options that only
+    // contours the points z[j0:j1, i0:i1].
+    py::object window(index_t i0, index_t i1, index_t j0, index_t j1) const;
+
+    // Return window() of the smallest range of quads that includes all quads overlapping the
+    // bounding box (x0, y0) to (x1, y1), or None if there are no such quads.
+    py::object window_bbox(double x0, double y0, double x1, double y1);
+
     void write_cache() const;  // For debug purposes only.
 
+    // Write filled contours between each pair of adjacent levels, or contour lines at each level,
+    // to the file at path in the specified format, one chunk at a time as each is calculated.
+    // Implemented using writers in contourpy.writer, which only replace path once all levels have
+    // been written successfully.
+    void write_filled(
+        const py::object& path, const CoordinateArray& levels, const std::string& format);
+    void write_lines(
+        const py::object& path, const CoordinateArray& levels, const std::string& format);
+
 protected:
     BaseContourGenerator(
         const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
         const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size);
+        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+        const py::object& transform, const py::object& transform_callback);
 
     typedef uint32_t CacheItem;
     typedef CacheItem ZLevel;
@@ -85,22 +192,120 @@ protected:
         bool is_upper, on_boundary;
     };
 
+    // Marks the generator as in use for the lifetime of this object, so that a contouring call made
+    // whilst another is in progress, such as from a callback or from within an iter_filled() loop,
+    // raises a RuntimeError rather than overwriting the state of the first.  Must be created with
+    // the GIL held.
+    class InUse
+    {
+    public:
+        explicit InUse(BaseContourGenerator& contour_generator)
+            : _contour_generator(contour_generator)
+        {
+            _contour_generator.check_not_in_use();
+            _contour_generator._in_use = true;
+        }
+
+        ~InUse()
+        {
+            _contour_generator._in_use = false;
+        }
+
+        // Non-copyable and non-moveable.
+        InUse(const InUse& other) = delete;
+        InUse(const InUse&& other) = delete;
+        InUse& operator=(const InUse& other) = delete;
+        InUse& operator=(const InUse&& other) = delete;
+
+    private:
+        BaseContourGenerator& _contour_generator;
+    };
+
+    // Calculate and store metrics of the line that has just been written in pass 1, which is the
+    // last point_count points.
+    void append_metrics(const ChunkLocal& local, count_t point_count);
+
+    // Set start and end so that points start to end-1 of n monotonic values, which are stride
+    // apart, include all intervals between adjacent values that overlap lower to upper.  Returns
+    // false if there are no such intervals.
+    static bool bbox_range(
+        const double* values, index_t n, index_t stride, double lower, double upper,
+        index_t& start, index_t& end);
+
     // Calculate, set and return z-level at middle of quad.
     ZLevel calc_and_set_middle_z_level(index_t quad);
 
     // Calculate and return z at middle of quad.
     double calc_middle_z(index_t quad) const;
 
-    void closed_line(const Location& start_location, OuterOrHole outer_or_hole, ChunkLocal& local);
+    // Call _chunk_callback with views of the points, line offsets and outer offsets (or None) of a
+    // non-empty chunk, storing any exception in _callback_error to be rethrown by march_into().
+    // Must be called within a Lock.
+    void call_chunk_callback(const ChunkLocal& local);
+
+    // Call _transform_callback with the points of a chunk after pass 1, storing any exception in
+    // _callback_error to be rethrown by march_wrapper().  Must be called within a Lock.
+    void call_transform_callback(ChunkLocal& local);
+
+    // Return false if the line was discarded by filtering in pass 1.
+    bool closed_line(const Location& start_location, OuterOrHole outer_or_hole, ChunkLocal& local);
 
     void closed_line_wrapper(
         const Location& start_location, OuterOrHole outer_or_hole, ChunkLocal& local);
 
+    // Remove the gaps left in the combined arrays by lines discarded by filtering or reduced by
+    // simplification, and resize the arrays accordingly.  Must be called after all chunks have
+    // been marched.
+    void compact_combined_arrays(std::vector<py::list>& return_lists);
+
     // If point/line/hole counts not consistent, throw runtime error.
     void check_consistent_counts(const ChunkLocal& local) const;
 
+    // Throw runtime error if a contouring operation is in progress.
+    void check_not_in_use() const;
+
+    // Pass 0 of march_chunk only, storing the counts of the chunk for use by
+    // create_combined_arrays() or reserve_counted_output_bytes().
+    void count_chunk(ChunkLocal& local);
+
+    // Count all chunks and return the per-chunk counts.  Used by count_filled() and count_lines().
+    py::tuple count_wrapper();
+
+    // Create the combined output arrays for the whole domain from the counts of every chunk, and
+    // the offset of each chunk within them, unless reserve_counted_output_bytes() fails in which
+    // case the march stops.  Must be called after count_chunk() has been called for every chunk,
+    // and within a Lock.
+    void create_combined_arrays(std::vector<py::list>& return_lists);
+
+    // Create a new contour generator using create_from_arrays() that also has this generator's
+    // cancel_token, progress_callback, max_output_bytes and max_retained_bytes.  Used by stride()
+    // and window().
+    py::object create_derived(
+        const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+        const MaskArray& mask, index_t x_chunk_size, index_t y_chunk_size) const;
+
+    // Concatenate per-chunk metrics into a single array, in the same order as the lines of the
+    // results.
+    MetricsArray create_metrics();
+
+    // Wrap results in a contourpy.ContourResult.
+    py::object create_result(const py::object& ret) const;
+
+    // Return the number of bytes of the NumPy arrays returned for a single chunk, or for the whole
+    // domain if output is combined, with the specified counts, excluding the overhead of the array
+    // objects themselves.  Exact unless lines are filtered or simplified, when it is an upper
+    // bound.
+    count_t estimate_output_bytes(
+        count_t point_count, count_t line_count, count_t outer_count) const;
+
     index_t find_look_S(index_t look_N_quad) const;
 
+    // Called at the end of each chunk of the final stage of march() (and of the counting stage if
+    // is_count_first()).  Calls _progress_callback if there is one and, if on the calling thread,
+    // polls for Python signals such as KeyboardInterrupt.  Any exception is stored in
+    // _callback_error and stops the march.
+    void finish_chunk();
+
     // Return true if finished (i.e. back to start quad, direction and upper).
     bool follow_boundary(
         Location& location, const Location& start_location, ChunkLocal& local,
@@ -113,6 +318,10 @@ protected:
 
     index_t get_boundary_start_point(const Location& location) const;
 
+    // Return the ChunkLocal owned by this generator for use by the thread with the specified
+    // index.  Its buffers are retained between chunks and calls.
+    ChunkLocal& get_chunk_local(index_t thread_index);
+
     // These are quad chunk limits, not point chunk limits.
     // chunk is index in range 0.._n_chunks-1.
     void get_chunk_limits(index_t chunk, ChunkLocal& local) const;
@@ -137,11 +346,34 @@ protected:
     bool has_direct_outer_offsets() const;
     bool has_direct_points() const;
 
+    // Whether the current march should stop before the next chunk, either because the cancel token
+    // has been cancelled or a callback has raised an exception.
+    bool is_cancelled() const;
+
+    // Whether all chunks are counted before any are marched, either for combined output or to
+    // check the size of chunked output against _max_output_bytes.
+    bool is_count_first() const;
+
+    // Whether only counting chunks rather than calculating contours.
+    bool is_count_only() const;
+
+    // Whether chunks are passed to a callback rather than returned.
+    bool is_output_callback() const;
+
+    // Whether output is combined into a single set of arrays for the whole domain.
+    bool is_output_combined() const;
+
     void init_cache_grid(const MaskArray& mask);
 
     // Either for a single chunk, or the whole domain (all chunks) if local == nullptr.
     void init_cache_levels_and_starts(const ChunkLocal* local = nullptr);
 
+    // Check and store caller-supplied output buffers, or clear them if out is None.
+    void init_out_buffers(const py::object& out);
+
+    // Ensure there are at least count ChunkLocals.  Must be called before starting any threads.
+    void init_chunk_locals(index_t count);
+
     // Increments local.points twice.
     void interp(index_t point0, index_t point1, bool is_upper, double*& points) const;
 
@@ -158,23 +390,98 @@ protected:
 
     bool is_quad_in_chunk(index_t quad, const ChunkLocal& local) const;
 
+    // Return whether all rows of x are the same and all columns of y are the same, both monotonic.
+    // Calculated on first use.
+    bool is_rectilinear();
+
+    // Release retained chunk buffers so that their total size does not exceed
+    // _max_retained_bytes.
+    void limit_retained_buffers();
+
+    // Return whether a line that has just been written in pass 1, which is the last point_count
+    // points, passes the filters and should be kept.
+    bool keep_line(const ChunkLocal& local, count_t point_count) const;
+
     void line(const Location& start_location, ChunkLocal& local);
 
+    // Call march(), storing a CancelledError in _callback_error if it stopped early because the
+    // cancel token was cancelled.  The caller must rethrow _callback_error.
+    void march_and_check(std::vector<py::list>& return_lists);
+
     void march_chunk(ChunkLocal& local, std::vector<py::list>& return_lists);
 
-    py::sequence march_wrapper();
+    // Trace all contours starting in the chunk for the current local.pass.
+    void march_chunk_pass(ChunkLocal& local);
+
+    // Pass 1 of march_chunk only, writing directly to the chunk's slices of the combined output
+    // arrays.  Must be called after create_combined_arrays().
+    void march_combined_chunk(ChunkLocal& local);
+
+    // March all chunks for the current levels passing each non-empty chunk to chunk_callback, via
+    // export_to_callback(), instead of collecting them into return lists.  Points are quantised
+    // within quantize_bbox if it is not None.
+    void march_into(
+        const py::object& chunk_callback, const py::object& quantize_bbox = py::none(),
+        const py::object& quantize_dtype = py::none(), bool quantize_delta = false);
+
+    py::object march_wrapper();
 
     void move_to_next_boundary_edge(index_t& quad, index_t& forward, index_t& left) const;
 
+    // Check for Python signals such as KeyboardInterrupt, storing any exception raised by a signal
+    // handler in _callback_error.  Must be called within a Lock on the calling thread.
+    void poll_signals();
+
+    // Reserve the estimated number of bytes of the whole output from the counts of every chunk,
+    // returning false if it exceeds _max_output_bytes.  Must be called after count_chunk() has been
+    // called for every chunk, and within a Lock.
+    bool reserve_counted_output_bytes();
+
+    // Add the estimated number of bytes of output of some chunks to _output_bytes.  If this exceeds
+    // _max_output_bytes store an OutputTooLargeError in _callback_error and return false, in which
+    // case the output must not be allocated.  Must be called within a Lock.
+    bool reserve_output_bytes(count_t bytes);
+
+    // Reserve space in caller-supplied output buffers for a chunk after pass 0, returning false if
+    // there is insufficient space.  Must be called within a Lock.
+    bool reserve_out_buffers(ChunkLocal& local, std::vector<py::list>& return_lists);
+
+    // Resize NumPy arrays that a chunk writes to directly to match its counts after filtering or
+    // simplification.  Must be called within a Lock.
+    void resize_direct_arrays(const ChunkLocal& local, std::vector<py::list>& return_lists) const;
+
+    // Store the first exception raised by a callback or signal handler, to be rethrown at the end
+    // of the march, and request that the march stops.  Must be called within a Lock.
+    void set_callback_error(std::exception_ptr error);
+
     void set_look_flags(index_t hole_start_quad);
 
+    // Reduce the sizes of a chunk's arrays, which are allocated using the pass 0 counts, to match
+    // its counts after lines have been discarded by filtering or simplified in pass 1.
+    void shrink_chunk_arrays(ChunkLocal& local) const;
+
+    // Simplify a line that has just been written in pass 1, which is the last point_count points,
+    // and return its new point count.
+    count_t simplify_line(ChunkLocal& local, count_t point_count) const;
+
+    // Return tuple of (lists, chunk_indices) containing only the non-empty chunks.
+    py::tuple sparse_return_lists(const std::vector<py::list>& return_lists) const;
+
+    // Split combined arrays into a separate array for each polygon or line.  These are views into
+    // a single backing array for each of points and codes/offsets.
+    py::sequence split_combined_arrays(const std::vector<py::list>& return_lists) const;
+
     void write_cache_quad(index_t quad) const;
 
+    // Write a point, applying the affine transform if there is one.  Increments points twice.
+    void write_point(double x, double y, double*& points) const;
+
     ZLevel z_to_zlevel(double z_value) const;
 
 
 private:
     const CoordinateArray _x, _y, _z;
+    const MaskArray _mask;                 // Kept for window().
     const double* _xptr;                   // For quick access to _x.data().
     const double* _yptr;
     const double* _zptr;
@@ -188,9 +495,47 @@ private:
     const FillType _fill_type;
     const bool _quad_as_tri;
     const ZInterp _z_interp;
+    int _rectilinear;                      // Whether x and y are rectilinear, -1 if not known yet.
+
+    // Output points are transformed using x' = a*x + b*y + c and y' = d*x + e*y + f, where
+    // _transform is (a, b, c, d, e, f), as they are written.
+    bool _affine;
+    std::array<double, 6> _transform;
+
+    // Called with the points of each chunk after they have been written, or None.
+    const py::object _transform_callback;
+    // Called with each chunk by march_into(), otherwise None.
+    py::object _chunk_callback;
+
+    // Quantisation of the points passed to _chunk_callback, not used if _quantize_dtype is None.
+    py::object _quantize_dtype;
+    double _quantize_x0, _quantize_y0, _quantize_x_scale, _quantize_y_scale;
+    bool _quantize_delta;
+
+    // First exception raised by a callback, or that stops the march early.
+    std::exception_ptr _callback_error;
+
+    // Cancellation and progress of the current march.
+    py::object _cancel_token;              // CancelToken or None.
+    const CancelToken* _cancel_token_ptr;  // For quick access to _cancel_token, or nullptr.
+    py::object _progress_callback;         // Called with progress after each chunk, or None.
+    std::atomic<bool> _stop_requested;     // Set whenever _callback_error is set.
+    count_t _chunks_done;                  // Number of chunks finished, for progress.
+    std::thread::id _calling_thread;       // Thread that started the march, polls signals.
+    bool _in_use;                          // Whether a contouring operation is in progress.
 
     CacheItem* _cache;
 
+    // Per-thread chunk data whose buffers are retained between chunks and calls, up to a total of
+    // _max_retained_bytes.
+    std::vector<std::unique_ptr<ChunkLocal>> _chunk_locals;
+    count_t _max_retained_bytes;
+
+    // Limit on the estimated output of filled() and lines(), and the running total of the current
+    // operation.  Not used if 0.
+    count_t _max_output_bytes;
+    count_t _output_bytes;
+
     // Current contouring operation.
     bool _filled;
     double _lower_level, _upper_level;
@@ -203,6 +548,41 @@ private:
     bool _direct_outer_offsets;       // Whether outer offsets array is written direct to Python.
     bool _outer_offsets_into_points;  // Otherwise into line offsets.  Only used if _identify_holes.
     unsigned int _return_list_count;
+    bool _output_combined;            // Single set of arrays for whole domain, not chunked.
+    bool _output_sparse;              // Only non-empty chunks returned.  Implies _output_chunked.
+    bool _output_views;               // Separate arrays returned as views into combined arrays.
+    bool _output_result;              // Returned as a contourpy.ContourResult.
+    bool _count_only;                 // Only count chunks, implies _output_combined.
+    bool _count_chunked;              // Count chunked output first to check _max_output_bytes.
+    bool _output_metrics;             // Returned together with per-line metrics.
+    bool _filter_lines;               // Whether any of the following filters are used.
+    count_t _min_points;
+    double _min_area, _min_length;
+    bool _simplify;                   // Whether lines are simplified using _simplify_tolerance.
+    double _simplify_tolerance;
+    bool _shrink_output;              // Pass 1 counts may be less than pass 0 counts due to
+                                      //   filtering or simplification.
+
+    // Per-chunk metrics of each line in the order they are written, only used if _output_metrics.
+    std::vector<std::vector<LineMetrics>> _chunk_metrics;
+
+    // Per-chunk counts and offsets into combined output arrays, only used if is_count_first().
+    struct CombinedChunk
+    {
+        count_t point_count, line_count, hole_count, outer_count;
+        count_t point_offset, line_offset, outer_offset;
+    };
+    std::vector<CombinedChunk> _combined_chunks;
+    double* _combined_points;
+    offset_t* _combined_line_offsets;
+    offset_t* _combined_outer_offsets;
+
+    // Caller-supplied output buffers, one per return list, for current contouring operation.
+    bool _use_out_buffers;
+    bool _out_buffers_overflow;            // Whether any out buffer has insufficient space.
+    std::vector<py::array> _out_buffers;
+    std::vector<count_t> _out_capacities;  // Number of elements (points for points array).
+    std::vector<count_t> _out_used;        // Number of elements used, or required if overflow.
 };
 
 } // namespace contourpy
@@ -3,6 +3,8 @@
 
 #include "base.h"
 #include "converter.h"
+#include "quantizer.h"
+#include <algorithm>
 #include <iostream>
 
 namespace contourpy {
@@ -91,10 +93,12 @@ template <typename Derived>
 BaseContourGenerator<Derived>::BaseContourGenerator(
     const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
     const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size)
+    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+    const py::object& transform, const py::object& transform_callback)
     : _x(x),
       _y(y),
       _z(z),
+      _mask(mask),
       _xptr(_x.data()),
       _yptr(_y.data()),
       _zptr(_z.data()),
@@ -111,7 +115,27 @@ BaseContourGenerator<Derived>::BaseContourGenerator(
       _fill_type(fill_type),
       _quad_as_tri(quad_as_tri),
       _z_interp(z_interp),
+      _rectilinear(-1),
+      _affine(false),
+      _transform{1.0, 0.0, 0.0, 0.0, 1.0, 0.0},
+      _transform_callback(transform_callback),
+      _chunk_callback(py::none()),
+      _quantize_dtype(py::none()),
+      _quantize_x0(0.0),
+      _quantize_y0(0.0),
+      _quantize_x_scale(1.0),
+      _quantize_y_scale(1.0),
+      _quantize_delta(false),
+      _cancel_token(py::none()),
+      _cancel_token_ptr(nullptr),
+      _progress_callback(py::none()),
+      _stop_requested(false),
+      _chunks_done(0),
+      _in_use(false),
       _cache(new CacheItem[_n]),
+      _max_retained_bytes(16*1024*1024),
+      _max_output_bytes(0),
+      _output_bytes(0),
       _filled(false),
       _lower_level(0.0),
       _upper_level(0.0),
@@ -121,7 +145,26 @@ BaseContourGenerator<Derived>::BaseContourGenerator(
       _direct_line_offsets(false),
       _direct_outer_offsets(false),
       _outer_offsets_into_points(false),
-      _return_list_count(0)
+      _return_list_count(0),
+      _output_combined(false),
+      _output_sparse(false),
+      _output_views(false),
+      _output_result(false),
+      _count_only(false),
+      _count_chunked(false),
+      _output_metrics(false),
+      _filter_lines(false),
+      _min_points(0),
+      _min_area(0.0),
+      _min_length(0.0),
+      _simplify(false),
+      _simplify_tolerance(0.0),
+      _shrink_output(false),
+      _combined_points(nullptr),
+      _combined_line_offsets(nullptr),
+      _combined_outer_offsets(nullptr),
+      _use_out_buffers(false),
+      _out_buffers_overflow(false)
 {
     if (_x.ndim() != 2 || _y.ndim() != 2 || _z.ndim() != 2)
         throw std::invalid_argument("x, y and z must all be 2D arrays");
@@ -159,6 +202,26 @@ BaseContourGenerator<Derived>::BaseContourGenerator(
         }
     }
 
+    if (!transform.is_none()) {
+        auto array = CoordinateArray::ensure(transform);
+        if (!array || array.ndim() != 2 || array.shape(1) != 3 ||
+            (array.shape(0) != 2 && array.shape(0) != 3))
+            throw std::invalid_argument("transform must be an array of shape (2, 3) or (3, 3)");
+
+        auto data = array.data();
+        if (array.shape(0) == 3 && (data[6] != 0.0 || data[7] != 0.0 || data[8] != 1.0))
+            throw std::invalid_argument("transform must be affine with a last row of (0, 0, 1)");
+
+        if (!std::all_of(data, data + 6, [](double value) {return std::isfinite(value);}))
+            throw std::invalid_argument("transform must only contain finite values");
+
+        std::copy(data, data + 6, _transform.begin());
+        _affine = true;
+    }
+
+    if (!_transform_callback.is_none() && !PyCallable_Check(_transform_callback.ptr()))
+        throw std::invalid_argument("transform_callback must be callable");
+
     init_cache_grid(mask);
 }
 
@@ -168,6 +231,56 @@ BaseContourGenerator<Derived>::~BaseContourGenerator()
     delete [] _cache;
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::append_metrics(const ChunkLocal& local, count_t point_count)
+{
+    assert(_output_metrics && local.pass > 0);
+
+    // Points of the line are still in cache having just been written.
+    _chunk_metrics[local.chunk].push_back(
+        LineMetrics::calculate(local.points.current - 2*point_count, point_count));
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::bbox_range(
+    const double* values, index_t n, index_t stride, double lower, double upper,
+    index_t& start, index_t& end)
+{
+    // Access values in increasing order whichever direction they are in.
+    const bool increasing = (values[0] <= values[(n-1)*stride]);
+    auto value = [&](index_t k) {return values[(increasing ? k : n-1-k)*stride];};
+
+    // Number of leading values for which less(value) is true, using binary search.
+    auto count = [&](auto less) {
+        index_t lo = 0, hi = n;
+        while (lo < hi) {
+            index_t mid = (lo + hi) / 2;
+            if (less(value(mid)))
+                lo = mid + 1;
+            else
+                hi = mid;
+        }
+        return lo;
+    };
+
+    // Interval k is between values k-1 and k, and overlaps if value(k-1) <= upper and
+    // value(k) >= lower.
+    index_t first = std::max<index_t>(count([&](double v) {return v < lower;}), 1);
+    index_t last = std::min(count([&](double v) {return v <= upper;}), n-1);
+    if (first > last)
+        return false;
+
+    if (increasing) {
+        start = first - 1;
+        end = last + 1;
+    }
+    else {
+        start = n - 1 - last;
+        end = n - first + 1;
+    }
+    return true;
+}
+
 template <typename Derived>
 typename BaseContourGenerator<Derived>::ZLevel
     BaseContourGenerator<Derived>::calc_and_set_middle_z_level(index_t quad)
@@ -199,6 +312,10 @@ double BaseContourGenerator<Derived>::calc_middle_z(index_t quad) const
 template <typename Derived>
 void BaseContourGenerator<Derived>::check_consistent_counts(const ChunkLocal& local) const
 {
+    // Slices of combined offset arrays do not include the final offset of each chunk as that is
+    // the first offset of the next chunk.
+    count_t final_offset = (_output_combined ? 0 : 1);
+
     if (local.total_point_count > 0) {
         if (local.points.size != 2*local.total_point_count ||
             local.points.current != local.points.start + 2*local.total_point_count) {
@@ -217,9 +334,10 @@ void BaseContourGenerator<Derived>::check_consistent_counts(const ChunkLocal& lo
     }
 
     if (local.line_count > 0) {
-        if (local.line_offsets.size != local.line_count + 1 ||
+        if (local.line_offsets.size != local.line_count + final_offset ||
             local.line_offsets.current == nullptr ||
-            local.line_offsets.current != local.line_offsets.start + local.line_count + 1) {
+            local.line_offsets.current !=
+                local.line_offsets.start + local.line_count + final_offset) {
             throw std::runtime_error(
                 "Inconsistent line_count for chunk " + std::to_string(local.chunk) +
                 ". This may indicate a bug in ContourPy.");
@@ -235,10 +353,10 @@ void BaseContourGenerator<Derived>::check_consistent_counts(const ChunkLocal& lo
     }
 
     if (_identify_holes && local.line_count > 0) {
-        if (local.outer_offsets.size != local.line_count - local.hole_count + 1 ||
+        if (local.outer_offsets.size != local.line_count - local.hole_count + final_offset ||
             local.outer_offsets.current == nullptr ||
             local.outer_offsets.current != local.outer_offsets.start + local.line_count -
-                                           local.hole_count + 1) {
+                                           local.hole_count + final_offset) {
             throw std::runtime_error(
                 "Inconsistent hole_count for chunk " + std::to_string(local.chunk) +
                 ". This may indicate a bug in ContourPy.");
@@ -255,7 +373,80 @@ void BaseContourGenerator<Derived>::check_consistent_counts(const ChunkLocal& lo
 }
 
 template <typename Derived>
-void BaseContourGenerator<Derived>::closed_line(
+void BaseContourGenerator<Derived>::check_not_in_use() const
+{
+    if (_in_use)
+        throw std::runtime_error(
+            "ContourGenerator is already in use by another call, such as from a callback or "
+            "iter_filled/iter_lines loop, and cannot be used until that call has finished");
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::call_chunk_callback(const ChunkLocal& local)
+{
+    assert(!_chunk_callback.is_none() && local.total_point_count > 0);
+
+    if (_callback_error)
+        return;  // Callback is not called again after an exception.
+
+    // Views of the chunk's buffers that do not own their memory so are only valid during the call.
+    py::capsule no_owner(local.points.start, [](void*) {});
+    PointArray points({local.total_point_count, count_t(2)}, local.points.start, no_owner);
+    OffsetArray line_offsets(local.line_count + 1, local.line_offsets.start, no_owner);
+    py::object outer_offsets = py::none();
+    if (_identify_holes)
+        outer_offsets = OffsetArray(
+            local.line_count - local.hole_count + 1, local.outer_offsets.start, no_owner);
+
+    try {
+        if (_quantize_dtype.is_none())
+            _chunk_callback(local.chunk, points, line_offsets, outer_offsets);
+        else {
+            // Quantised points are a new array so the float64 points are never returned.
+            auto quantized = Quantizer::quantize(
+                points, line_offsets, _quantize_x0, _quantize_y0, _quantize_x_scale,
+                _quantize_y_scale, _quantize_dtype, _quantize_delta);
+            _chunk_callback(local.chunk, quantized, line_offsets, outer_offsets);
+        }
+    }
+    catch (...) {
+        set_callback_error(std::current_exception());
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::call_transform_callback(ChunkLocal& local)
+{
+    assert(!_transform_callback.is_none() && local.total_point_count > 0);
+
+    if (_callback_error)
+        return;  // Callback is not called again after an exception.
+
+    // View of the chunk's points that does not own its memory so is only valid during the call.
+    auto point_count = local.total_point_count;
+    py::capsule no_owner(local.points.start, [](void*) {});
+    PointArray points({point_count, count_t(2)}, local.points.start, no_owner);
+
+    try {
+        auto ret = _transform_callback(points);
+        if (!ret.is_none() && !ret.is(points)) {
+            auto transformed = CoordinateArray::ensure(ret);
+            if (!transformed || transformed.ndim() != 2 ||
+                static_cast<count_t>(transformed.shape(0)) != point_count ||
+                transformed.shape(1) != 2)
+                throw std::invalid_argument(
+                    "transform_callback must return None or an array of the same shape as its "
+                    "argument");
+            std::copy(transformed.data(), transformed.data() + 2*point_count, local.points.start);
+        }
+    }
+    catch (...) {
+        set_callback_error(std::current_exception());
+    }
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::closed_line(
     const Location& start_location, OuterOrHole outer_or_hole, ChunkLocal& local)
 {
     assert(is_quad_in_chunk(start_location.quad, local));
@@ -267,7 +458,15 @@ void BaseContourGenerator<Derived>::closed_line(
     if (outer_or_hole == Hole && local.pass == 0 && _identify_holes)
         set_look_flags(start_location.quad);
 
+    if (local.pass > 0 && _simplify)
+        local.simplify_anchors.clear();
+
     while (!finished) {
+        // Points where the line switches between following the boundary and interior are kept
+        // when simplifying, so that boundaries shared with adjacent polygons are consistent.
+        if (local.pass > 0 && _simplify)
+            local.simplify_anchors.push_back(point_count);
+
         if (location.on_boundary)
             finished = follow_boundary(location, start_location, local, point_count);
         else
@@ -275,6 +474,23 @@ void BaseContourGenerator<Derived>::closed_line(
         location.on_boundary = !location.on_boundary;
     }
 
+    // The first point is only a switch point if the last follow is of the other kind, or only
+    // adds the closing point.  Otherwise the line started part way along a boundary or interior
+    // section which the last follow completes.
+    auto& anchors = local.simplify_anchors;
+    if (local.pass > 0 && _simplify && anchors.size() % 2 == 1 &&
+        anchors.back() != point_count - 1)
+        anchors.erase(anchors.begin());
+
+    if (local.pass > 0 && _simplify)
+        point_count = simplify_line(local, point_count);
+
+    if (local.pass > 0 && _filter_lines && !keep_line(local, point_count)) {
+        // Discard the points written, which are then overwritten by the next line.
+        local.points.current -= 2*point_count;
+        return false;
+    }
+
     if (local.pass > 0) {
         assert(local.line_offsets.current = local.line_offsets.start + local.line_count);
         *local.line_offsets.current++ = local.total_point_count;
@@ -286,12 +502,16 @@ void BaseContourGenerator<Derived>::closed_line(
             else
                 *local.outer_offsets.current++ = local.line_count;
         }
+
+        if (_output_metrics)
+            append_metrics(local, point_count);
     }
 
     local.total_point_count += point_count;
     local.line_count++;
     if (outer_or_hole == Hole)
         local.hole_count++;
+    return true;
 }
 
 template <typename Derived>
@@ -307,7 +527,8 @@ void BaseContourGenerator<Derived>::closed_line_wrapper(
         assert(outer_or_hole == Outer);
         local.look_up_quads.clear();
 
-        closed_line(start_location, outer_or_hole, local);
+        if (!closed_line(start_location, outer_or_hole, local))
+            return;  // Outer boundary discarded by filtering, so are its holes.
 
         for (py::size_t i = 0; i < local.look_up_quads.size(); ++i) {
             // Note that the collection can increase in size during this loop.
@@ -332,6 +553,234 @@ void BaseContourGenerator<Derived>::closed_line_wrapper(
     }
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::compact_combined_arrays(std::vector<py::list>& return_lists)
+{
+    assert(_output_combined && _shrink_output);
+
+    // Each chunk's counts are those after filtering and simplification, but its offsets are still
+    // those calculated from the pass 0 counts.  Move each chunk's data down to immediately follow
+    // the previous chunk's, which never overlaps in a way that std::copy cannot handle.
+    count_t point_count = 0, line_count = 0, outer_count = 0;
+    for (auto& combined : _combined_chunks) {
+        auto point_shift = static_cast<offset_t>(combined.point_offset - point_count);
+        auto line_shift = static_cast<offset_t>(combined.line_offset - line_count);
+
+        if (point_shift > 0)
+            std::copy(_combined_points + 2*combined.point_offset,
+                      _combined_points + 2*(combined.point_offset + combined.point_count),
+                      _combined_points + 2*point_count);
+
+        for (count_t i = 0; i < combined.line_count; ++i)
+            _combined_line_offsets[line_count + i] =
+                _combined_line_offsets[combined.line_offset + i] - point_shift;
+
+        if (_identify_holes) {
+            auto outer_shift = (_outer_offsets_into_points ? point_shift : line_shift);
+            for (count_t i = 0; i < combined.outer_count; ++i)
+                _combined_outer_offsets[outer_count + i] =
+                    _combined_outer_offsets[combined.outer_offset + i] - outer_shift;
+        }
+
+        combined.point_offset = point_count;
+        combined.line_offset = line_count;
+        combined.outer_offset = outer_count;
+        point_count += combined.point_count;
+        line_count += combined.line_count;
+        outer_count += combined.outer_count;
+    }
+
+    _combined_line_offsets[line_count] = point_count;
+    if (_identify_holes)
+        _combined_outer_offsets[outer_count] =
+            (_outer_offsets_into_points ? point_count : line_count);
+
+    // Resize in place.  There are no other references to the arrays so no need to check them.
+    py::array(return_lists[0][0]).resize(
+        {static_cast<index_t>(point_count), index_t(2)}, false);
+    py::array(return_lists[1][0]).resize({static_cast<index_t>(line_count + 1)}, false);
+    if (_identify_holes)
+        py::array(return_lists[2][0]).resize({static_cast<index_t>(outer_count + 1)}, false);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::count_chunk(ChunkLocal& local)
+{
+    assert(is_count_first());
+
+    local.pass = 0;
+    march_chunk_pass(local);
+
+    auto& combined = _combined_chunks[local.chunk];
+    combined.point_count = local.total_point_count;
+    combined.line_count = local.line_count;
+    combined.hole_count = local.hole_count;
+    combined.outer_count = _identify_holes ? local.line_count - local.hole_count : 0;
+
+    finish_chunk();
+}
+
+template <typename Derived>
+py::tuple BaseContourGenerator<Derived>::count_filled(double lower_level, double upper_level)
+{
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
+    if (lower_level > upper_level)
+        throw std::invalid_argument("upper and lower levels are the wrong way round");
+
+    _filled = true;
+    _lower_level = lower_level;
+    _upper_level = upper_level;
+
+    // Holes are counted in pass 0 regardless of whether they are identified, and identifying them
+    // requires extra work that is only needed by pass 1.
+    _identify_holes = false;
+
+    return count_wrapper();
+}
+
+template <typename Derived>
+py::tuple BaseContourGenerator<Derived>::count_lines(double level)
+{
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
+    _filled = false;
+    _lower_level = _upper_level = level;
+
+    _identify_holes = false;
+
+    return count_wrapper();
+}
+
+template <typename Derived>
+py::tuple BaseContourGenerator<Derived>::count_wrapper()
+{
+    // Counting uses the first stage of the combined output, without creating or writing the
+    // combined arrays.
+    _output_chunked = _output_sparse = _output_views = _output_result = _output_metrics = false;
+    _filter_lines = _simplify = _shrink_output = false;
+    _direct_points = _direct_line_offsets = _direct_outer_offsets = false;
+    _outer_offsets_into_points = false;
+    _return_list_count = 0;
+    _use_out_buffers = false;
+    _output_combined = _count_only = true;
+    _combined_chunks.assign(_n_chunks, CombinedChunk());
+
+    std::vector<py::list> return_lists;  // Not used.
+    march_and_check(return_lists);
+
+    limit_retained_buffers();
+    _count_only = false;
+
+    if (_callback_error) {
+        auto error = _callback_error;
+        _callback_error = nullptr;
+        std::rethrow_exception(error);
+    }
+
+    CountArray point_counts(_n_chunks), line_counts(_n_chunks), hole_counts(_n_chunks);
+    auto point_ptr = point_counts.mutable_data();
+    auto line_ptr = line_counts.mutable_data();
+    auto hole_ptr = hole_counts.mutable_data();
+    for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+        const auto& combined = _combined_chunks[chunk];
+        point_ptr[chunk] = combined.point_count;
+        line_ptr[chunk] = combined.line_count;
+        hole_ptr[chunk] = combined.hole_count;
+    }
+
+    if (_filled)
+        return py::make_tuple(point_counts, line_counts, hole_counts);
+    else
+        return py::make_tuple(point_counts, line_counts);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::create_combined_arrays(std::vector<py::list>& return_lists)
+{
+    assert(_output_combined);
+
+    if (!reserve_counted_output_bytes())
+        return;  // March stops without writing any chunks.
+
+    // Prefix sums of chunk counts give the offset of each chunk in the combined arrays.
+    count_t point_count = 0, line_count = 0, outer_count = 0;
+    for (auto& combined : _combined_chunks) {
+        combined.point_offset = point_count;
+        combined.line_offset = line_count;
+        combined.outer_offset = outer_count;
+        point_count += combined.point_count;
+        line_count += combined.line_count;
+        outer_count += combined.outer_count;
+    }
+
+    // The final offsets are not written by any chunk.
+    PointArray points({static_cast<index_t>(point_count), index_t(2)});
+    _combined_points = points.mutable_data();
+    return_lists[0][0] = points;
+
+    OffsetArray line_offsets(static_cast<index_t>(line_count + 1));
+    _combined_line_offsets = line_offsets.mutable_data();
+    _combined_line_offsets[line_count] = point_count;
+    return_lists[1][0] = line_offsets;
+
+    if (_identify_holes) {
+        OffsetArray outer_offsets(static_cast<index_t>(outer_count + 1));
+        _combined_outer_offsets = outer_offsets.mutable_data();
+        _combined_outer_offsets[outer_count] =
+            (_outer_offsets_into_points ? point_count : line_count);
+        return_lists[2][0] = outer_offsets;
+    }
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::create_derived(
+    const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+    const MaskArray& mask, index_t x_chunk_size, index_t y_chunk_size) const
+{
+    auto generator = static_cast<const Derived*>(this)->create_from_arrays(
+        x, y, z, mask, x_chunk_size, y_chunk_size, get_transform(), _transform_callback);
+
+    BaseContourGenerator& derived = generator.template cast<Derived&>();
+    derived.set_cancel_token(_cancel_token);
+    derived.set_progress_callback(_progress_callback);
+    derived._max_output_bytes = _max_output_bytes;
+    derived._max_retained_bytes = _max_retained_bytes;
+    return generator;
+}
+
+template <typename Derived>
+MetricsArray BaseContourGenerator<Derived>::create_metrics()
+{
+    assert(_output_metrics);
+
+    count_t line_count = 0;
+    for (const auto& metrics : _chunk_metrics)
+        line_count += metrics.size();
+
+    MetricsArray metrics_array(static_cast<index_t>(line_count));
+    auto ptr = metrics_array.mutable_data();
+    for (const auto& metrics : _chunk_metrics)
+        ptr = std::copy(metrics.begin(), metrics.end(), ptr);
+
+    _chunk_metrics.clear();
+    return metrics_array;
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::create_result(const py::object& ret) const
+{
+    auto contour_result = py::module_::import("contourpy.result").attr("ContourResult");
+    auto fill_or_line_type = (_filled ? py::cast(_fill_type) : py::cast(_line_type));
+
+    if (_output_sparse) {
+        auto sparse_ret = ret.cast<py::tuple>();  // (lists, chunk_indices)
+        return contour_result(sparse_ret[0], fill_or_line_type, sparse_ret[1]);
+    }
+    else
+        return contour_result(ret, fill_or_line_type);
+}
+
 template <typename Derived>
 FillType BaseContourGenerator<Derived>::default_fill_type()
 {
@@ -349,8 +798,68 @@ LineType BaseContourGenerator<Derived>::default_line_type()
 }
 
 template <typename Derived>
-py::sequence BaseContourGenerator<Derived>::filled(double lower_level, double upper_level)
+count_t BaseContourGenerator<Derived>::estimate_output_bytes(
+    count_t point_count, count_t line_count, count_t outer_count) const
+{
+    // Combined line and outer offsets that are only used to create codes or to split points into
+    // separate arrays are freed before returning, so are not included.
+    count_t offset_count = 0;
+    bool codes = false;
+    if (_filled) {
+        switch (_fill_type) {
+            case FillType::OuterCode:
+            case FillType::ChunkCombinedCode:
+                codes = true;
+                break;
+            case FillType::OuterOffset:
+                offset_count = line_count + outer_count;  // line_count + 1 for each polygon.
+                break;
+            case FillType::ChunkCombinedCodeOffset:
+                codes = true;
+                offset_count = outer_count + 1;
+                break;
+            case FillType::ChunkCombinedOffset:
+                offset_count = line_count + 1;
+                break;
+            case FillType::ChunkCombinedOffsetOffset:
+            case FillType::CombinedOffsetOffset:
+                offset_count = line_count + outer_count + 2;
+                break;
+        }
+    }
+    else {
+        switch (_line_type) {
+            case LineType::Separate:
+                break;
+            case LineType::SeparateCode:
+            case LineType::ChunkCombinedCode:
+                codes = true;
+                break;
+            case LineType::ChunkCombinedOffset:
+            case LineType::CombinedOffset:
+                offset_count = line_count + 1;
+                break;
+        }
+    }
+
+    count_t bytes = 2*point_count*sizeof(double) + offset_count*sizeof(offset_t);
+    if (codes)
+        bytes += point_count*sizeof(CodeArray::value_type);
+
+    if (_output_metrics)
+        bytes += line_count*sizeof(LineMetrics);
+
+    return bytes;
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::filled(
+    double lower_level, double upper_level, const py::object& out, bool sparse, bool result,
+    bool metrics, count_t min_points, double min_area, double min_length,
+    double simplify_tolerance)
 {
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
     if (lower_level > upper_level)
         throw std::invalid_argument("upper and lower levels are the wrong way round");
 
@@ -368,11 +877,77 @@ py::sequence BaseContourGenerator<Derived>::filled(double lower_level, double up
                              _fill_type == FillType::ChunkCombinedOffsetOffset);
     _outer_offsets_into_points = (_fill_type == FillType::ChunkCombinedCodeOffset);
     _return_list_count = (_fill_type == FillType::ChunkCombinedCodeOffset ||
-                          _fill_type == FillType::ChunkCombinedOffsetOffset) ? 3 : 2;
+                          _fill_type == FillType::ChunkCombinedOffsetOffset ||
+                          _fill_type == FillType::CombinedOffsetOffset) ? 3 : 2;
+    // OuterCode and OuterOffset are calculated as combined arrays and returned as views into them.
+    _output_views = (_fill_type == FillType::OuterCode || _fill_type == FillType::OuterOffset);
+    _output_combined = (_fill_type == FillType::CombinedOffsetOffset || _output_views);
+    if (_output_combined) {
+        _output_chunked = false;
+        _direct_points = _direct_line_offsets = _direct_outer_offsets = true;
+    }
+
+    if (sparse && !_output_chunked)
+        throw std::invalid_argument("sparse is only supported for chunked FillTypes");
+    _output_sparse = sparse;
+    _output_result = result;
+    _output_metrics = metrics;
+    _count_only = false;
+
+    _min_points = min_points;
+    _min_area = min_area;
+    _min_length = min_length;
+    _filter_lines = (min_points > 0 || min_area > 0.0 || min_length > 0.0);
+
+    if (simplify_tolerance < 0.0)
+        throw std::invalid_argument("simplify_tolerance cannot be negative");
+    _simplify_tolerance = simplify_tolerance;
+    _simplify = (simplify_tolerance > 0.0);
+
+    _shrink_output = (_filter_lines || _simplify);
+    if (_shrink_output && !out.is_none())
+        throw std::invalid_argument(
+            "out cannot be used with min_points, min_area, min_length or simplify_tolerance");
+
+    init_out_buffers(out);
 
     return march_wrapper();
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::filled_into(
+    const py::object& sink, double lower_level, double upper_level,
+    const py::object& quantize_bbox, const py::object& quantize_dtype, bool quantize_delta)
+{
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
+    if (!PyCallable_Check(sink.ptr()))
+        throw std::invalid_argument("sink must be callable");
+
+    if (lower_level > upper_level)
+        throw std::invalid_argument("upper and lower levels are the wrong way round");
+
+    _filled = true;
+    _lower_level = lower_level;
+    _upper_level = upper_level;
+
+    march_into(sink, quantize_bbox, quantize_dtype, quantize_delta);
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::filled_progressive(
+    double lower_level, double upper_level, const py::object& deadline_ms, index_t stride,
+    index_t region_size)
+{
+    if (lower_level > upper_level)
+        throw std::invalid_argument("upper and lower levels are the wrong way round");
+
+    return py::module_::import("contourpy.progressive").attr("_progressive")(
+        py::cast(static_cast<Derived*>(this), py::return_value_policy::reference),
+        py::make_tuple(_ny, _nx), py::make_tuple(lower_level, upper_level), deadline_ms, stride,
+        region_size);
+}
+
 template <typename Derived>
 index_t BaseContourGenerator<Derived>::find_look_S(index_t look_N_quad) const
 {
@@ -399,6 +974,42 @@ index_t BaseContourGenerator<Derived>::find_look_S(index_t look_N_quad) const
     return quad;
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::finish_chunk()
+{
+    bool calling_thread = (std::this_thread::get_id() == _calling_thread);
+    if (_progress_callback.is_none() && !calling_thread)
+        return;
+
+    {
+        typename Derived::Lock lock(static_cast<Derived&>(*this));
+
+        if (_callback_error)
+            return;  // Already stopping.
+
+        if (!_progress_callback.is_none()) {
+            // If counting first each chunk is processed twice, once to count it and once to write
+            // it.
+            count_t total = (is_count_first() && !_count_only ? 2 : 1)*_n_chunks;
+            try {
+                _progress_callback(++_chunks_done, total);
+            }
+            catch (...) {
+                set_callback_error(std::current_exception());
+            }
+        }
+
+        if (calling_thread)
+            poll_signals();
+    }
+
+    if (calling_thread && PyGILState_Check()) {
+        // The GIL is held throughout a serial march, so briefly release it to let other Python
+        // threads that are waiting for it run, such as one that cancels the cancel token.
+        py::gil_scoped_release release;  // cppcheck-suppress unreadVariable
+    }
+}
+
 template <typename Derived>
 bool BaseContourGenerator<Derived>::follow_boundary(
     Location& location, const Location& start_location, ChunkLocal& local, count_t& point_count)
@@ -904,6 +1515,21 @@ index_t BaseContourGenerator<Derived>::get_boundary_start_point(const Location&
     return start_point;
 }
 
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::get_cancel_token() const
+{
+    return _cancel_token;
+}
+
+template <typename Derived>
+ChunkLocal& BaseContourGenerator<Derived>::get_chunk_local(index_t thread_index)
+{
+    assert(thread_index >= 0 &&
+           thread_index < static_cast<index_t>(_chunk_locals.size()) &&
+           "thread index out of bounds");
+    return *_chunk_locals[thread_index];
+}
+
 template <typename Derived>
 py::tuple BaseContourGenerator<Derived>::get_chunk_count() const
 {
@@ -1041,8 +1667,7 @@ template <typename Derived>
 void BaseContourGenerator<Derived>::get_point_xy(index_t point, double*& points) const
 {
     assert(point >= 0 && point < _n && "point index out of bounds");
-    *points++ = _xptr[point];
-    *points++ = _yptr[point];
+    write_point(_xptr[point], _yptr[point], points);
 }
 
 template <typename Derived>
@@ -1066,12 +1691,50 @@ double BaseContourGenerator<Derived>::get_point_z(index_t point) const
     return _zptr[point];
 }
 
+template <typename Derived>
+count_t BaseContourGenerator<Derived>::get_max_output_bytes() const
+{
+    return _max_output_bytes;
+}
+
+template <typename Derived>
+count_t BaseContourGenerator<Derived>::get_max_retained_bytes() const
+{
+    return _max_retained_bytes;
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::get_progress_callback() const
+{
+    return _progress_callback;
+}
+
 template <typename Derived>
 bool BaseContourGenerator<Derived>::get_quad_as_tri() const
 {
     return _quad_as_tri;
 }
 
+template <typename Derived>
+count_t BaseContourGenerator<Derived>::get_retained_bytes() const
+{
+    count_t retained_bytes = 0;
+    for (const auto& local : _chunk_locals)
+        retained_bytes += local->retained_bytes();
+    return retained_bytes;
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::get_transform() const
+{
+    if (!_affine)
+        return py::none();
+
+    PointArray transform({2, 3});
+    std::copy(_transform.begin(), _transform.end(), transform.mutable_data());
+    return transform;
+}
+
 template <typename Derived>
 ZInterp BaseContourGenerator<Derived>::get_z_interp() const
 {
@@ -1849,6 +2512,59 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
         _cache[chunk_istart + (j_final_start+1)*_nx] |= MASK_NO_MORE_STARTS;
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_chunk_locals(index_t count)
+{
+    while (static_cast<index_t>(_chunk_locals.size()) < count)
+        _chunk_locals.emplace_back(new ChunkLocal());
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_out_buffers(const py::object& out)
+{
+    _use_out_buffers = !out.is_none();
+    _out_buffers_overflow = false;
+    _out_buffers.clear();
+    _out_capacities.assign(_return_list_count, 0);
+    _out_used.assign(_return_list_count, 0);
+
+    if (!_use_out_buffers)
+        return;
+
+    // Only the chunked combined types write whole chunks directly to NumPy arrays.
+    if (!_output_chunked)
+        throw std::invalid_argument(
+            "out can only be used with ChunkCombined fill_type and line_type");
+
+    if (!py::isinstance<py::tuple>(out) || py::len(out) != _return_list_count)
+        throw std::invalid_argument(
+            "out must be a tuple of " + std::to_string(_return_list_count) + " NumPy arrays");
+
+    auto out_tuple = out.cast<py::tuple>();
+    for (unsigned int i = 0; i < _return_list_count; ++i) {
+        auto item = out_tuple[i];
+        bool valid = false;
+        if (i == 0)
+            valid = py::isinstance<py::array_t<double, py::array::c_style>>(item);
+        else if (i == 1 && !_direct_line_offsets)
+            valid = py::isinstance<py::array_t<uint8_t, py::array::c_style>>(item);
+        else
+            valid = py::isinstance<py::array_t<offset_t, py::array::c_style>>(item);
+
+        auto array = py::reinterpret_borrow<py::array>(item);
+        if (!valid || array.ndim() != (i == 0 ? 2 : 1) || (i == 0 && array.shape(1) != 2))
+            throw std::invalid_argument(
+                "out[" + std::to_string(i) + "] must be a C-contiguous NumPy array of the same "
+                "dtype and number of dimensions as the corresponding returned array");
+
+        if (!array.writeable())
+            throw std::invalid_argument("out[" + std::to_string(i) + "] must be writeable");
+
+        _out_buffers.push_back(array);
+        _out_capacities[i] = array.shape(0);
+    }
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::interp(
     index_t point0, index_t point1, bool is_upper, double*& points) const
@@ -1858,8 +2574,8 @@ void BaseContourGenerator<Derived>::interp(
 
     assert(frac >= 0.0 && frac <= 1.0 && "Interp fraction out of bounds");
 
-    *points++ = get_point_x(point0)*frac + get_point_x(point1)*(1.0 - frac);
-    *points++ = get_point_y(point0)*frac + get_point_y(point1)*(1.0 - frac);
+    write_point(get_point_x(point0)*frac + get_point_x(point1)*(1.0 - frac),
+                get_point_y(point0)*frac + get_point_y(point1)*(1.0 - frac), points);
 }
 
 template <typename Derived>
@@ -1871,8 +2587,26 @@ void BaseContourGenerator<Derived>::interp(
 
     assert(frac >= 0.0 && frac <= 1.0 && "Interp fraction out of bounds");
 
-    *points++ = get_point_x(point0)*frac + x1*(1.0 - frac);
-    *points++ = get_point_y(point0)*frac + y1*(1.0 - frac);
+    write_point(get_point_x(point0)*frac + x1*(1.0 - frac),
+                get_point_y(point0)*frac + y1*(1.0 - frac), points);
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_cancelled() const
+{
+    return _stop_requested || (_cancel_token_ptr != nullptr && _cancel_token_ptr->is_cancelled());
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_count_first() const
+{
+    return _output_combined || _count_chunked;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_count_only() const
+{
+    return _count_only;
 }
 
 template <typename Derived>
@@ -1881,6 +2615,18 @@ bool BaseContourGenerator<Derived>::is_filled() const
     return _filled;
 }
 
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_output_callback() const
+{
+    return !_chunk_callback.is_none();
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_output_combined() const
+{
+    return _output_combined;
+}
+
 template <typename Derived>
 bool BaseContourGenerator<Derived>::is_point_in_chunk(index_t point, const ChunkLocal& local) const
 {
@@ -1902,11 +2648,97 @@ bool BaseContourGenerator<Derived>::is_quad_in_chunk(index_t quad, const ChunkLo
 }
 
 template <typename Derived>
-void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLocal& local)
+bool BaseContourGenerator<Derived>::is_rectilinear()
 {
-    // start_location.on_boundary indicates starts (and therefore also finishes)
+    if (_rectilinear < 0) {
+        bool rectilinear = true;
+        for (index_t j = 1; j < _ny && rectilinear; ++j)
+            rectilinear = std::equal(_xptr, _xptr + _nx, _xptr + j*_nx);
+
+        for (index_t j = 0; j < _ny && rectilinear; ++j)
+            rectilinear = std::all_of(
+                _yptr + j*_nx + 1, _yptr + (j+1)*_nx, [&](double y) {return y == _yptr[j*_nx];});
+
+        // Both must be monotonic for binary search.
+        auto monotonic = [](const double* values, index_t n, index_t stride) {
+            bool increasing = true, decreasing = true;
+            for (index_t k = 1; k < n; ++k) {
+                increasing = increasing && values[k*stride] >= values[(k-1)*stride];
+                decreasing = decreasing && values[k*stride] <= values[(k-1)*stride];
+            }
+            return increasing || decreasing;
+        };
+        rectilinear = rectilinear && monotonic(_xptr, _nx, 1) && monotonic(_yptr, _ny, _nx);
 
-    assert(is_quad_in_chunk(start_location.quad, local));
+        _rectilinear = rectilinear ? 1 : 0;
+    }
+
+    return _rectilinear == 1;
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::iter_filled(
+    double lower_level, double upper_level, index_t max_queued)
+{
+    if (lower_level > upper_level)
+        throw std::invalid_argument("upper and lower levels are the wrong way round");
+
+    if (max_queued < 1)
+        throw std::invalid_argument("max_queued must be at least 1");
+
+    return py::module_::import("contourpy.stream").attr("_iter_chunks")(
+        py::cast(static_cast<Derived*>(this), py::return_value_policy::reference),
+        py::make_tuple(lower_level, upper_level), max_queued);
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::iter_lines(double level, index_t max_queued)
+{
+    if (max_queued < 1)
+        throw std::invalid_argument("max_queued must be at least 1");
+
+    return py::module_::import("contourpy.stream").attr("_iter_chunks")(
+        py::cast(static_cast<Derived*>(this), py::return_value_policy::reference),
+        py::make_tuple(level), max_queued);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::limit_retained_buffers()
+{
+    count_t retained_bytes = 0;
+    for (auto& local : _chunk_locals) {
+        local->clear();
+        auto local_bytes = local->retained_bytes();
+        if (retained_bytes + local_bytes > _max_retained_bytes)
+            local->release();
+        else
+            retained_bytes += local_bytes;
+    }
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::keep_line(const ChunkLocal& local, count_t point_count) const
+{
+    assert(_filter_lines && local.pass > 0);
+
+    if (point_count < _min_points)
+        return false;
+
+    if (_min_area > 0.0 || _min_length > 0.0) {
+        auto metrics = LineMetrics::calculate(local.points.current - 2*point_count, point_count);
+        if (metrics.length < _min_length || (metrics.closed && std::abs(metrics.area) < _min_area))
+            return false;
+    }
+
+    return true;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLocal& local)
+{
+    // start_location.on_boundary indicates starts (and therefore also finishes)
+
+    assert(is_quad_in_chunk(start_location.quad, local));
 
     Location location = start_location;
     count_t point_count = 0;
@@ -1914,9 +2746,23 @@ void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLo
     // finished == true indicates closed line loop.
     bool finished = follow_interior(location, start_location, local, point_count);
 
+    if (local.pass > 0 && _simplify) {
+        local.simplify_anchors.clear();
+        point_count = simplify_line(local, point_count);
+    }
+
+    if (local.pass > 0 && _filter_lines && !keep_line(local, point_count)) {
+        // Discard the points written, which are then overwritten by the next line.
+        local.points.current -= 2*point_count;
+        return;
+    }
+
     if (local.pass > 0) {
         assert(local.line_offsets.current == local.line_offsets.start + local.line_count);
         *local.line_offsets.current++ = local.total_point_count;
+
+        if (_output_metrics)
+            append_metrics(local, point_count);
     }
 
     if (local.pass == 0 && !start_location.on_boundary && !finished)
@@ -1931,8 +2777,12 @@ void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLo
 }
 
 template <typename Derived>
-py::sequence BaseContourGenerator<Derived>::lines(double level)
+py::object BaseContourGenerator<Derived>::lines(
+    double level, const py::object& out, bool sparse, bool result, bool metrics,
+    count_t min_points, double min_area, double min_length, double simplify_tolerance)
 {
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
     _filled = false;
     _lower_level = _upper_level = level;
 
@@ -1943,135 +2793,95 @@ py::sequence BaseContourGenerator<Derived>::lines(double level)
     _direct_outer_offsets = false;
     _outer_offsets_into_points = false;
     _return_list_count = (_line_type == LineType::Separate) ? 1 : 2;
+    // Separate and SeparateCode are calculated as combined arrays and returned as views into them.
+    _output_views = !_output_chunked;
+    _output_combined = (_line_type == LineType::CombinedOffset || _output_views);
+    if (_output_combined) {
+        _output_chunked = false;
+        _direct_points = _direct_line_offsets = true;
+    }
 
-    return march_wrapper();
-}
-
-template <typename Derived>
-void BaseContourGenerator<Derived>::march_chunk(
-    ChunkLocal& local, std::vector<py::list>& return_lists)
-{
-    for (local.pass = 0; local.pass < 2; ++local.pass) {
-        bool ignore_holes = (_identify_holes && local.pass == 1);
-
-        index_t j_final_start = local.jstart;
-        for (index_t j = local.jstart; j <= local.jend; ++j) {
-            index_t quad = local.istart + j*_nx;
-
-            if (NO_MORE_STARTS(quad))
-                break;
-
-            if (NO_STARTS_IN_ROW(quad))
-                continue;
-
-            // Want to count number of starts in this row, so store how many starts at start of row.
-            auto prev_start_count =
-                (_identify_holes ? local.line_count - local.hole_count : local.line_count);
+    if (sparse && !_output_chunked)
+        throw std::invalid_argument("sparse is only supported for chunked LineTypes");
+    _output_sparse = sparse;
+    _output_result = result;
+    _output_metrics = metrics;
+    _count_only = false;
 
-            for (index_t i = local.istart; i <= local.iend; ++i, ++quad) {
-                if (!ANY_START(quad))
-                    continue;
+    _min_points = min_points;
+    _min_area = min_area;
+    _min_length = min_length;
+    _filter_lines = (min_points > 0 || min_area > 0.0 || min_length > 0.0);
 
-                assert(EXISTS_ANY(quad));
+    if (simplify_tolerance < 0.0)
+        throw std::invalid_argument("simplify_tolerance cannot be negative");
+    _simplify_tolerance = simplify_tolerance;
+    _simplify = (simplify_tolerance > 0.0);
 
-                if (_filled) {
-                    if (START_BOUNDARY_S(quad))
-                        closed_line_wrapper(Location(quad, 1, _nx, Z_SW == 2, true), Outer, local);
+    _shrink_output = (_filter_lines || _simplify);
+    if (_shrink_output && !out.is_none())
+        throw std::invalid_argument(
+            "out cannot be used with min_points, min_area, min_length or simplify_tolerance");
 
-                    if (START_BOUNDARY_W(quad))
-                        closed_line_wrapper(Location(quad, -_nx, 1, Z_NW == 2, true), Outer, local);
-
-                    if (START_CORNER(quad)) {
-                        switch (EXISTS_ANY_CORNER(quad)) {
-                            case MASK_EXISTS_NE_CORNER:
-                                closed_line_wrapper(
-                                    Location(quad, -_nx+1, _nx+1, Z_NW == 2, true), Outer, local);
-                                break;
-                            case MASK_EXISTS_NW_CORNER:
-                                closed_line_wrapper(
-                                    Location(quad, _nx+1, _nx-1, Z_SW == 2, true), Outer, local);
-                                break;
-                            case MASK_EXISTS_SE_CORNER:
-                                closed_line_wrapper(
-                                    Location(quad, -_nx-1, -_nx+1, Z_NE == 2, true), Outer, local);
-                                break;
-                            default:
-                                assert(EXISTS_SW_CORNER(quad));
-                                if (!ignore_holes)
-                                    closed_line_wrapper(
-                                        Location(quad, _nx-1, -_nx-1, false, true), Hole, local);
-                                break;
-                        }
-                    }
+    init_out_buffers(out);
 
-                    if (START_N(quad))
-                        closed_line_wrapper(Location(quad, -_nx, 1, Z_NW > 0, false), Outer, local);
+    return march_wrapper();
+}
 
-                    if (ignore_holes)
-                        continue;
+template <typename Derived>
+void BaseContourGenerator<Derived>::lines_into(
+    const py::object& sink, double level, const py::object& quantize_bbox,
+    const py::object& quantize_dtype, bool quantize_delta)
+{
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
 
-                    if (START_E(quad))
-                        closed_line_wrapper(Location(quad, -1, -_nx, Z_NE > 0, false), Hole, local);
+    if (!PyCallable_Check(sink.ptr()))
+        throw std::invalid_argument("sink must be callable");
 
-                    if (START_HOLE_N(quad))
-                        closed_line_wrapper(Location(quad, -1, -_nx, false, true), Hole, local);
-                }
-                else {  // !_filled
-                    if (START_BOUNDARY_S(quad))
-                        line(Location(quad, _nx, -1, false, true), local);
+    _filled = false;
+    _lower_level = _upper_level = level;
 
-                    if (START_BOUNDARY_W(quad))
-                        line(Location(quad, 1, _nx, false, true), local);
+    march_into(sink, quantize_bbox, quantize_dtype, quantize_delta);
+}
 
-                    if (START_BOUNDARY_E(quad))
-                        line(Location(quad, -1, -_nx, false, true), local);
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::lines_progressive(
+    double level, const py::object& deadline_ms, index_t stride, index_t region_size)
+{
+    return py::module_::import("contourpy.progressive").attr("_progressive")(
+        py::cast(static_cast<Derived*>(this), py::return_value_policy::reference),
+        py::make_tuple(_ny, _nx), py::make_tuple(level), deadline_ms, stride, region_size);
+}
 
-                    if (START_BOUNDARY_N(quad))
-                        line(Location(quad, -_nx, 1, false, true), local);
+template <typename Derived>
+void BaseContourGenerator<Derived>::march_and_check(std::vector<py::list>& return_lists)
+{
+    assert(_in_use);
 
-                    if (START_E(quad))
-                        line(Location(quad, -1, -_nx, false, false), local);
+    _stop_requested = false;
+    _chunks_done = 0;
+    _calling_thread = std::this_thread::get_id();
 
-                    if (START_N(quad))
-                        line(Location(quad, -_nx, 1, false, false), local);
+    static_cast<Derived*>(this)->march(return_lists);
 
-                    if (START_CORNER(quad)) {
-                        index_t forward, left;
-                        switch (EXISTS_ANY_CORNER(quad)) {
-                            case MASK_EXISTS_NE_CORNER:
-                                forward = _nx+1;
-                                left = _nx-1;
-                                break;
-                            case MASK_EXISTS_NW_CORNER:
-                                forward = _nx-1;
-                                left = -_nx-1;
-                                break;
-                            case MASK_EXISTS_SE_CORNER:
-                                forward = -_nx+1;
-                                left = _nx+1;
-                                break;
-                            default:
-                                assert(EXISTS_SW_CORNER(quad));
-                                forward = -_nx-1;
-                                left = -_nx+1;
-                                break;
-                        }
-                        line(Location(quad, forward, left, false, true), local);
-                    }
-                } // _filled
-            } // i
-
-            // Number of starts at end of row.
-            auto start_count =
-                (_identify_holes ? local.line_count - local.hole_count : local.line_count);
-            if (start_count > prev_start_count)
-                j_final_start = j;
-            else
-                _cache[local.istart + j*_nx] |= MASK_NO_STARTS_IN_ROW;
-        } // j
+    if (!_callback_error && is_cancelled())
+        _callback_error = std::make_exception_ptr(CancelledError("Contouring was cancelled"));
+}
 
-        if (j_final_start < local.jend)
-            _cache[local.istart + (j_final_start+1)*_nx] |= MASK_NO_MORE_STARTS;
+template <typename Derived>
+void BaseContourGenerator<Derived>::march_chunk(
+    ChunkLocal& local, std::vector<py::list>& return_lists)
+{
+    for (local.pass = 0; local.pass < 2; ++local.pass) {
+        if (local.pass == 0 && _count_chunked) {
+            // Pass 0 has already been run by count_chunk().
+            const auto& counted = _combined_chunks[local.chunk];
+            local.total_point_count = counted.point_count;
+            local.line_count = counted.line_count;
+            local.hole_count = counted.hole_count;
+        }
+        else
+            march_chunk_pass(local);
 
         if (local.pass == 0) {
             if (local.total_point_count == 0) {
@@ -2084,7 +2894,19 @@ void BaseContourGenerator<Derived>::march_chunk(
             // Create arrays for points, line_offsets and optionally outer_offsets.  Arrays may be
             // either C++ vectors or Python NumPy arrays.  Want to group creation of the latter as
             // threaded code needs to lock creation of these to limit access to a single thread.
-            if (_direct_points || _direct_line_offsets || _direct_outer_offsets) {
+            if (_use_out_buffers) {
+                // Direct arrays are slices of caller-supplied output buffers instead.
+                typename Derived::Lock lock(static_cast<Derived&>(*this));
+
+                if (!reserve_out_buffers(local, return_lists)) {
+                    // Insufficient space so do not need pass 1, chunk is treated as empty.
+                    local.total_point_count = 0;
+                    local.line_count = 0;
+                    local.hole_count = 0;
+                    break;
+                }
+            }
+            else if (_direct_points || _direct_line_offsets || _direct_outer_offsets) {
                 typename Derived::Lock lock(static_cast<Derived&>(*this));
 
                 // Strictly speaking adding the NumPy arrays to return_lists does not need to be
@@ -2135,6 +2957,9 @@ void BaseContourGenerator<Derived>::march_chunk(
         }
     }
 
+    if (_shrink_output)
+        shrink_chunk_arrays(local);
+
     // Throw exception if the two passes returned different number of points, lines, etc.
     check_consistent_counts(local);
 
@@ -2145,39 +2970,339 @@ void BaseContourGenerator<Derived>::march_chunk(
                 list[local.chunk] = py::none();
         }
     }
-    else if (_filled)
-        static_cast<Derived*>(this)->export_filled(local, return_lists);
-    else
-        static_cast<Derived*>(this)->export_lines(local, return_lists);
+    else {
+        if (!_transform_callback.is_none()) {
+            typename Derived::Lock lock(static_cast<Derived&>(*this));
+            call_transform_callback(local);
+        }
+
+        if (is_output_callback())
+            static_cast<Derived*>(this)->export_to_callback(local);
+        else if (_filled)
+            static_cast<Derived*>(this)->export_filled(local, return_lists);
+        else
+            static_cast<Derived*>(this)->export_lines(local, return_lists);
+
+        if (_shrink_output) {
+            typename Derived::Lock lock(static_cast<Derived&>(*this));
+            resize_direct_arrays(local, return_lists);
+        }
+    }
+
+    finish_chunk();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::march_chunk_pass(ChunkLocal& local)
+{
+    bool ignore_holes = (_identify_holes && local.pass == 1);
+
+    index_t j_final_start = local.jstart;
+    for (index_t j = local.jstart; j <= local.jend; ++j) {
+        index_t quad = local.istart + j*_nx;
+
+        if (NO_MORE_STARTS(quad))
+            break;
+
+        if (NO_STARTS_IN_ROW(quad))
+            continue;
+
+        // Want to count number of starts in this row, so store how many starts at start of row.
+        auto prev_start_count =
+            (_identify_holes ? local.line_count - local.hole_count : local.line_count);
+
+        for (index_t i = local.istart; i <= local.iend; ++i, ++quad) {
+            if (!ANY_START(quad))
+                continue;
+
+            assert(EXISTS_ANY(quad));
+
+            if (_filled) {
+                if (START_BOUNDARY_S(quad))
+                    closed_line_wrapper(Location(quad, 1, _nx, Z_SW == 2, true), Outer, local);
+
+                if (START_BOUNDARY_W(quad))
+                    closed_line_wrapper(Location(quad, -_nx, 1, Z_NW == 2, true), Outer, local);
+
+                if (START_CORNER(quad)) {
+                    switch (EXISTS_ANY_CORNER(quad)) {
+                        case MASK_EXISTS_NE_CORNER:
+                            closed_line_wrapper(
+                                Location(quad, -_nx+1, _nx+1, Z_NW == 2, true), Outer, local);
+                            break;
+                        case MASK_EXISTS_NW_CORNER:
+                            closed_line_wrapper(
+                                Location(quad, _nx+1, _nx-1, Z_SW == 2, true), Outer, local);
+                            break;
+                        case MASK_EXISTS_SE_CORNER:
+                            closed_line_wrapper(
+                                Location(quad, -_nx-1, -_nx+1, Z_NE == 2, true), Outer, local);
+                            break;
+                        default:
+                            assert(EXISTS_SW_CORNER(quad));
+                            if (!ignore_holes)
+                                closed_line_wrapper(
+                                    Location(quad, _nx-1, -_nx-1, false, true), Hole, local);
+                            break;
+                    }
+                }
+
+                if (START_N(quad))
+                    closed_line_wrapper(Location(quad, -_nx, 1, Z_NW > 0, false), Outer, local);
+
+                if (ignore_holes)
+                    continue;
+
+                if (START_E(quad))
+                    closed_line_wrapper(Location(quad, -1, -_nx, Z_NE > 0, false), Hole, local);
+
+                if (START_HOLE_N(quad))
+                    closed_line_wrapper(Location(quad, -1, -_nx, false, true), Hole, local);
+            }
+            else {  // !_filled
+                if (START_BOUNDARY_S(quad))
+                    line(Location(quad, _nx, -1, false, true), local);
+
+                if (START_BOUNDARY_W(quad))
+                    line(Location(quad, 1, _nx, false, true), local);
+
+                if (START_BOUNDARY_E(quad))
+                    line(Location(quad, -1, -_nx, false, true), local);
+
+                if (START_BOUNDARY_N(quad))
+                    line(Location(quad, -_nx, 1, false, true), local);
+
+                if (START_E(quad))
+                    line(Location(quad, -1, -_nx, false, false), local);
+
+                if (START_N(quad))
+                    line(Location(quad, -_nx, 1, false, false), local);
+
+                if (START_CORNER(quad)) {
+                    index_t forward, left;
+                    switch (EXISTS_ANY_CORNER(quad)) {
+                        case MASK_EXISTS_NE_CORNER:
+                            forward = _nx+1;
+                            left = _nx-1;
+                            break;
+                        case MASK_EXISTS_NW_CORNER:
+                            forward = _nx-1;
+                            left = -_nx-1;
+                            break;
+                        case MASK_EXISTS_SE_CORNER:
+                            forward = -_nx+1;
+                            left = _nx+1;
+                            break;
+                        default:
+                            assert(EXISTS_SW_CORNER(quad));
+                            forward = -_nx-1;
+                            left = -_nx+1;
+                            break;
+                    }
+                    line(Location(quad, forward, left, false, true), local);
+                }
+            } // _filled
+        } // i
+
+        // Number of starts at end of row.
+        auto start_count =
+            (_identify_holes ? local.line_count - local.hole_count : local.line_count);
+        if (start_count > prev_start_count)
+            j_final_start = j;
+        else
+            _cache[local.istart + j*_nx] |= MASK_NO_STARTS_IN_ROW;
+    } // j
+
+    if (j_final_start < local.jend)
+        _cache[local.istart + (j_final_start+1)*_nx] |= MASK_NO_MORE_STARTS;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::march_combined_chunk(ChunkLocal& local)
+{
+    assert(_output_combined);
+
+    assert(local.total_point_count == 0 && local.line_count == 0 && local.hole_count == 0);
+
+    auto& combined = _combined_chunks[local.chunk];
+    if (combined.point_count == 0) {
+        finish_chunk();
+        return;  // Nothing to write, and no need for pass 1.
+    }
+
+    // Local arrays are slices of the combined arrays that this chunk writes to directly.
+    local.points.create_external(
+        _combined_points + 2*combined.point_offset, 2*combined.point_count);
+    local.line_offsets.create_external(
+        _combined_line_offsets + combined.line_offset, combined.line_count);
+    if (_identify_holes)
+        local.outer_offsets.create_external(
+            _combined_outer_offsets + combined.outer_offset, combined.outer_count);
+
+    local.pass = 1;
+    march_chunk_pass(local);
+
+    if (_shrink_output) {
+        // Store counts after filtering and simplification for compact_combined_arrays().
+        shrink_chunk_arrays(local);
+        combined.point_count = local.total_point_count;
+        combined.line_count = local.line_count;
+        combined.hole_count = local.hole_count;
+        combined.outer_count = _identify_holes ? local.line_count - local.hole_count : 0;
+    }
+
+    // Throw exception if the two passes returned different number of points, lines, etc.
+    check_consistent_counts(local);
+
+    if (!_transform_callback.is_none() && local.total_point_count > 0) {
+        typename Derived::Lock lock(static_cast<Derived&>(*this));
+        call_transform_callback(local);
+    }
+
+    // Offsets written are relative to the start of the chunk, convert them to be relative to the
+    // start of the combined arrays.
+    if (combined.point_offset > 0) {
+        for (count_t i = 0; i < combined.line_count; ++i)
+            local.line_offsets.start[i] += combined.point_offset;
+    }
+
+    if (_identify_holes) {
+        auto outer_offset =
+            (_outer_offsets_into_points ? combined.point_offset : combined.line_offset);
+        if (outer_offset > 0) {
+            for (count_t i = 0; i < combined.outer_count; ++i)
+                local.outer_offsets.start[i] += outer_offset;
+        }
+    }
+
+    finish_chunk();
 }
 
 template <typename Derived>
-py::sequence BaseContourGenerator<Derived>::march_wrapper()
+void BaseContourGenerator<Derived>::march_into(
+    const py::object& chunk_callback, const py::object& quantize_bbox,
+    const py::object& quantize_dtype, bool quantize_delta)
+{
+    _quantize_dtype = py::none();
+    if (!quantize_bbox.is_none()) {
+        // Validated and calculated in the same way as contourpy.quantize().
+        auto params = py::module_::import("contourpy.convert").attr("_quantize_params")(
+            quantize_bbox, quantize_dtype).cast<py::tuple>();
+        _quantize_x0 = params[1].cast<double>();
+        _quantize_y0 = params[2].cast<double>();
+        _quantize_x_scale = params[3].cast<double>();
+        _quantize_y_scale = params[4].cast<double>();
+        _quantize_delta = quantize_delta;
+        _quantize_dtype = params[0];
+    }
+
+    // Each chunk is written to its own retained buffers, as used for non-direct arrays, with
+    // outer offsets into line offsets.  Nothing is collected into return lists.
+    _identify_holes = _filled;
+    _output_chunked = _output_sparse = _output_views = _output_result = _output_metrics = false;
+    _filter_lines = _simplify = _shrink_output = false;
+    _direct_points = _direct_line_offsets = _direct_outer_offsets = false;
+    _outer_offsets_into_points = false;
+    _return_list_count = 0;
+    _use_out_buffers = false;
+    _output_combined = _count_only = false;
+    _chunk_callback = chunk_callback;
+
+    std::vector<py::list> return_lists;  // Not used.
+    march_and_check(return_lists);
+
+    _chunk_callback = py::none();
+    limit_retained_buffers();
+
+    if (_callback_error) {
+        auto error = _callback_error;
+        _callback_error = nullptr;
+        std::rethrow_exception(error);
+    }
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::march_wrapper()
 {
     index_t list_len = _n_chunks;
-    if ((_filled && (_fill_type == FillType::OuterCode|| _fill_type == FillType::OuterOffset)) ||
-        (!_filled && (_line_type == LineType::Separate || _line_type == LineType::SeparateCode)))
-        list_len = 0;
+    auto list_count = _return_list_count;
+    if (_output_combined) {
+        list_len = 1;  // Temporarily holds the combined arrays.
+        list_count = (_identify_holes ? 3 : 2);
+        _combined_chunks.assign(_n_chunks, CombinedChunk());
+    }
+    else if (_max_output_bytes > 0 && !_use_out_buffers) {
+        // Count all chunks first so that the size of the whole output is checked before any of it
+        // is allocated.
+        _count_chunked = true;
+        _combined_chunks.assign(_n_chunks, CombinedChunk());
+    }
+    if (_output_metrics)
+        _chunk_metrics.assign(_n_chunks, std::vector<LineMetrics>());
+    _output_bytes = 0;
 
     // Prepare lists to return to python.
     std::vector<py::list> return_lists;
-    return_lists.reserve(_return_list_count);
-    for (decltype(_return_list_count) i = 0; i < _return_list_count; ++i)
+    return_lists.reserve(list_count);
+    for (decltype(list_count) i = 0; i < list_count; ++i)
         return_lists.emplace_back(list_len);
 
-    static_cast<Derived*>(this)->march(return_lists);
+    march_and_check(return_lists);
+
+    _count_chunked = false;
+    limit_retained_buffers();
+
+    if (_callback_error) {
+        _combined_points = nullptr;
+        _combined_line_offsets = _combined_outer_offsets = nullptr;
+        _out_buffers.clear();
+        auto error = _callback_error;
+        _callback_error = nullptr;
+        std::rethrow_exception(error);
+    }
 
     // Return to python objects.
-    if (_return_list_count == 1) {
-        assert(!_filled && _line_type == LineType::Separate);
-        return return_lists[0];
+    py::object ret;
+    if (_output_combined) {
+        if (_shrink_output)
+            compact_combined_arrays(return_lists);
+
+        _combined_points = nullptr;
+        _combined_line_offsets = _combined_outer_offsets = nullptr;
+        if (_output_views)
+            ret = split_combined_arrays(return_lists);
+        else if (list_count == 2)
+            ret = py::make_tuple(return_lists[0][0], return_lists[1][0]);
+        else
+            ret = py::make_tuple(return_lists[0][0], return_lists[1][0], return_lists[2][0]);
     }
+    else if (_output_sparse)
+        ret = sparse_return_lists(return_lists);
     else if (_return_list_count == 2)
-        return py::make_tuple(return_lists[0], return_lists[1]);
+        ret = py::make_tuple(return_lists[0], return_lists[1]);
     else {
         assert(_return_list_count == 3);
-        return py::make_tuple(return_lists[0], return_lists[1], return_lists[2]);
+        ret = py::make_tuple(return_lists[0], return_lists[1], return_lists[2]);
     }
+
+    if (_output_result)
+        ret = create_result(ret);
+
+    if (_output_metrics)
+        ret = py::make_tuple(ret, create_metrics());
+
+    if (_use_out_buffers) {
+        // Return the number of elements used in each out buffer, or required if any are too
+        // small in which case no results are returned.
+        py::tuple used(_return_list_count);
+        for (decltype(_return_list_count) i = 0; i < _return_list_count; ++i)
+            used[i] = _out_used[i];
+        py::object result = _out_buffers_overflow ? py::object(py::none()) : py::object(ret);
+        _out_buffers.clear();
+        return py::make_tuple(result, used);
+    }
+
+    return ret;
 }
 
 template <typename Derived>
@@ -2330,6 +3455,160 @@ void BaseContourGenerator<Derived>::move_to_next_boundary_edge(
     }
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::poll_signals()
+{
+    if (!_callback_error && PyErr_CheckSignals() != 0)
+        set_callback_error(std::make_exception_ptr(py::error_already_set()));
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::release_buffers()
+{
+    check_not_in_use();
+
+    for (auto& local : _chunk_locals)
+        local->release();
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::reserve_out_buffers(
+    ChunkLocal& local, std::vector<py::list>& return_lists)
+{
+    assert(_use_out_buffers && local.total_point_count > 0);
+
+    // Number of elements required by this chunk in each of the out buffers: points, then codes or
+    // line offsets, then optionally outer offsets.
+    count_t required[3] = {
+        local.total_point_count,
+        _direct_line_offsets ? local.line_count + 1 : local.total_point_count,
+        local.line_count - local.hole_count + 1};
+
+    count_t start[3] = {0, 0, 0};
+    for (unsigned int i = 0; i < _return_list_count; ++i) {
+        start[i] = _out_used[i];
+        _out_used[i] += required[i];
+        if (_out_used[i] > _out_capacities[i])
+            _out_buffers_overflow = true;
+    }
+
+    // Once any buffer has overflowed, the remaining chunks are only counted.
+    if (_out_buffers_overflow)
+        return false;
+
+    // Write directly to the out buffers, returning views of them.
+    auto points = static_cast<double*>(_out_buffers[0].mutable_data()) + 2*start[0];
+    local.points.create_external(points, 2*required[0]);
+    return_lists[0][local.chunk] = PointArray(
+        {static_cast<index_t>(required[0]), static_cast<index_t>(2)}, points, _out_buffers[0]);
+
+    if (_direct_line_offsets) {
+        auto offsets = static_cast<offset_t*>(_out_buffers[1].mutable_data()) + start[1];
+        local.line_offsets.create_external(offsets, required[1]);
+        return_lists[1][local.chunk] =
+            OffsetArray(static_cast<index_t>(required[1]), offsets, _out_buffers[1]);
+    }
+    else {
+        auto codes = static_cast<uint8_t*>(_out_buffers[1].mutable_data()) + start[1];
+        local.codes.create_external(codes, required[1]);
+        return_lists[1][local.chunk] =
+            CodeArray(static_cast<index_t>(required[1]), codes, _out_buffers[1]);
+    }
+
+    if (_return_list_count == 3) {
+        assert(_direct_outer_offsets);
+        auto outer_offsets = static_cast<offset_t*>(_out_buffers[2].mutable_data()) + start[2];
+        local.outer_offsets.create_external(outer_offsets, required[2]);
+        return_lists[2][local.chunk] =
+            OffsetArray(static_cast<index_t>(required[2]), outer_offsets, _out_buffers[2]);
+    }
+
+    return true;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::reserve_counted_output_bytes()
+{
+    assert(is_count_first());
+
+    count_t bytes = 0;
+    if (_output_combined) {
+        count_t point_count = 0, line_count = 0, outer_count = 0;
+        for (const auto& combined : _combined_chunks) {
+            point_count += combined.point_count;
+            line_count += combined.line_count;
+            outer_count += combined.outer_count;
+        }
+        bytes = estimate_output_bytes(point_count, line_count, outer_count);
+    }
+    else {
+        // Each non-empty chunk has its own arrays.
+        for (const auto& combined : _combined_chunks) {
+            if (combined.point_count > 0) {
+                bytes += estimate_output_bytes(
+                    combined.point_count, combined.line_count, combined.outer_count);
+                if (_output_sparse)
+                    bytes += sizeof(ChunkIndexArray::value_type);  // Index of chunk.
+            }
+        }
+    }
+
+    return reserve_output_bytes(bytes);
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::reserve_output_bytes(count_t bytes)
+{
+    _output_bytes += bytes;
+    if (_max_output_bytes == 0 || _output_bytes <= _max_output_bytes)
+        return true;
+
+    set_callback_error(
+        std::make_exception_ptr(OutputTooLargeError(_output_bytes, _max_output_bytes)));
+    return false;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::resize_direct_arrays(
+    const ChunkLocal& local, std::vector<py::list>& return_lists) const
+{
+    assert(_shrink_output && _output_chunked && local.total_point_count > 0);
+
+    // There are no other references to the arrays so no need to check them.
+    if (_direct_points)
+        py::array(return_lists[0][local.chunk]).resize(
+            {static_cast<index_t>(local.total_point_count), index_t(2)}, false);
+    if (_direct_line_offsets)
+        py::array(return_lists[1][local.chunk]).resize(
+            {static_cast<index_t>(local.line_count + 1)}, false);
+    if (_direct_outer_offsets)
+        py::array(return_lists[2][local.chunk]).resize(
+            {static_cast<index_t>(local.line_count - local.hole_count + 1)}, false);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_callback_error(std::exception_ptr error)
+{
+    if (!_callback_error)
+        _callback_error = error;
+    _stop_requested = true;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_cancel_token(const py::object& cancel_token)
+{
+    check_not_in_use();  // Worker threads read _cancel_token_ptr without a Lock.
+
+    if (cancel_token.is_none())
+        _cancel_token_ptr = nullptr;
+    else if (py::isinstance<CancelToken>(cancel_token))
+        _cancel_token_ptr = cancel_token.cast<const CancelToken*>();
+    else
+        throw std::invalid_argument("cancel_token must be a CancelToken or None");
+
+    _cancel_token = cancel_token;
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::set_look_flags(index_t hole_start_quad)
 {
@@ -2360,6 +3639,218 @@ void BaseContourGenerator<Derived>::set_look_flags(index_t hole_start_quad)
     }
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_max_output_bytes(count_t max_output_bytes)
+{
+    _max_output_bytes = max_output_bytes;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_max_retained_bytes(count_t max_retained_bytes)
+{
+    _max_retained_bytes = max_retained_bytes;
+    if (!_in_use)
+        limit_retained_buffers();  // Otherwise limited at the end of the current operation.
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_progress_callback(const py::object& progress_callback)
+{
+    check_not_in_use();
+
+    if (!progress_callback.is_none() && !PyCallable_Check(progress_callback.ptr()))
+        throw std::invalid_argument("progress_callback must be callable or None");
+
+    _progress_callback = progress_callback;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::shrink_chunk_arrays(ChunkLocal& local) const
+{
+    assert(_shrink_output);
+
+    // Slices of combined offset arrays do not include the final offset of each chunk.
+    count_t final_offset = (_output_combined ? 0 : 1);
+    bool empty = (local.line_count == 0);
+
+    local.points.shrink(2*local.total_point_count);
+    local.line_offsets.shrink(empty ? 0 : local.line_count + final_offset);
+    if (_identify_holes)
+        local.outer_offsets.shrink(empty ? 0 : local.line_count - local.hole_count + final_offset);
+}
+
+template <typename Derived>
+count_t BaseContourGenerator<Derived>::simplify_line(ChunkLocal& local, count_t point_count) const
+{
+    assert(_simplify && local.pass > 0);
+
+    // Points of the line are still in cache having just been written.
+    double* start = local.points.current - 2*point_count;
+    point_count = local.simplifier.simplify(
+        start, point_count, _simplify_tolerance, local.simplify_anchors);
+    local.points.current = start + 2*point_count;
+    return point_count;
+}
+
+template <typename Derived>
+py::tuple BaseContourGenerator<Derived>::sparse_return_lists(
+    const std::vector<py::list>& return_lists) const
+{
+    assert(_output_sparse && _return_list_count > 1);
+
+    // Empty chunks are those without a points array.
+    std::vector<int32_t> chunks;
+    for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+        if (!return_lists[0][chunk].is_none())
+            chunks.push_back(static_cast<int32_t>(chunk));
+    }
+
+    auto count = static_cast<index_t>(chunks.size());
+    py::tuple lists(_return_list_count);
+    for (decltype(_return_list_count) i = 0; i < _return_list_count; ++i) {
+        py::list list(count);
+        for (index_t j = 0; j < count; ++j)
+            list[j] = return_lists[i][chunks[j]];
+        lists[i] = list;
+    }
+
+    ChunkIndexArray chunk_indices(count);
+    std::copy(chunks.begin(), chunks.end(), chunk_indices.mutable_data());
+
+    return py::make_tuple(lists, chunk_indices);
+}
+
+template <typename Derived>
+py::sequence BaseContourGenerator<Derived>::split_combined_arrays(
+    const std::vector<py::list>& return_lists) const
+{
+    assert(_output_combined && _output_views);
+
+    auto points = return_lists[0][0].template cast<PointArray>();
+    auto line_offsets = return_lists[1][0].template cast<OffsetArray>();
+    const double* points_ptr = points.data();
+    const offset_t* line_offsets_ptr = line_offsets.data();
+    auto point_count = static_cast<count_t>(points.shape(0));
+    auto line_count = static_cast<count_t>(line_offsets.shape(0) - 1);
+
+    // Each returned item is a group of consecutive lines, either a polygon (outer boundary and its
+    // holes) or a single line.
+    OffsetArray outer_offsets;
+    const offset_t* outer_offsets_ptr = nullptr;
+    auto group_count = line_count;
+    if (_identify_holes) {
+        outer_offsets = return_lists[2][0].template cast<OffsetArray>();
+        outer_offsets_ptr = outer_offsets.data();
+        group_count = static_cast<count_t>(outer_offsets.shape(0) - 1);
+    }
+
+    bool codes = (_filled ? _fill_type == FillType::OuterCode
+                          : _line_type == LineType::SeparateCode);
+    bool offsets = (_filled && _fill_type == FillType::OuterOffset);
+
+    // Single backing array for all codes or offsets.  Offsets of each polygon are relative to the
+    // start of the polygon and include its final offset, so there is one more than the number of
+    // lines per polygon.
+    py::array second;
+    if (codes) {
+        CodeArray code_array(static_cast<index_t>(point_count));
+        if (point_count > 0) {
+            if (_filled)
+                Converter::convert_codes(
+                    point_count, line_count + 1, line_offsets_ptr, 0, code_array.mutable_data());
+            else
+                Converter::convert_codes_check_closed(
+                    point_count, line_count + 1, line_offsets_ptr, points_ptr,
+                    code_array.mutable_data());
+        }
+        second = code_array;
+    }
+    else if (offsets) {
+        OffsetArray offset_array(static_cast<index_t>(line_count + group_count));
+        auto offsets_ptr = offset_array.mutable_data();
+        for (count_t i = 0; i < group_count; ++i) {
+            auto line_start = outer_offsets_ptr[i];
+            auto line_end = outer_offsets_ptr[i+1];
+            auto point_start = line_offsets_ptr[line_start];
+            for (auto j = line_start; j <= line_end; ++j)
+                *offsets_ptr++ = line_offsets_ptr[j] - point_start;
+        }
+        second = offset_array;
+    }
+
+    py::list points_list(group_count);
+    py::list second_list(codes || offsets ? group_count : 0);
+    for (count_t i = 0; i < group_count; ++i) {
+        auto line_start = (_identify_holes ? outer_offsets_ptr[i] : i);
+        auto line_end = (_identify_holes ? outer_offsets_ptr[i+1] : i+1);
+        auto point_start = line_offsets_ptr[line_start];
+        auto point_end = line_offsets_ptr[line_end];
+
+        index_t points_shape[2] = {static_cast<index_t>(point_end - point_start), 2};
+        points_list[i] = PointArray(points_shape, points_ptr + 2*point_start, points);
+
+        if (codes) {
+            index_t codes_shape = static_cast<index_t>(point_end - point_start);
+            auto codes_ptr = static_cast<const CodeArray::value_type*>(second.data());
+            second_list[i] = CodeArray(codes_shape, codes_ptr + point_start, second);
+        }
+        else if (offsets) {
+            index_t offsets_shape = static_cast<index_t>(line_end - line_start + 1);
+            auto offsets_ptr = static_cast<const offset_t*>(second.data());
+            second_list[i] = OffsetArray(offsets_shape, offsets_ptr + line_start + i, second);
+        }
+    }
+
+    if (codes || offsets)
+        return py::make_tuple(points_list, second_list);
+    else
+        return points_list;
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::stride(index_t sy, index_t sx) const
+{
+    if (sx < 1 || sy < 1)
+        throw std::invalid_argument("stride must be at least 1 in each direction");
+
+    // Indices of points that are kept, including the last so that the whole domain is covered.
+    auto kept = [](index_t n, index_t step) {
+        std::vector<index_t> indices;
+        for (index_t k = 0; k < n; k += step)
+            indices.push_back(k);
+        if (indices.back() != n-1)
+            indices.push_back(n-1);
+        return indices;
+    };
+    const auto is = kept(_nx, sx);
+    const auto js = kept(_ny, sy);
+    const index_t nx = static_cast<index_t>(is.size());
+    const index_t ny = static_cast<index_t>(js.size());
+
+    // Only the kept points are read, so this is proportional to the size of the new grid.
+    auto decimate = [&](const auto* from, auto& array) {
+        auto to = array.mutable_data();
+        for (auto j : js)
+            for (auto i : is)
+                *to++ = from[i + j*_nx];
+    };
+
+    CoordinateArray x({ny, nx}), y({ny, nx}), z({ny, nx});
+    decimate(_xptr, x);
+    decimate(_yptr, y);
+    decimate(_zptr, z);
+
+    MaskArray mask = _mask;
+    if (_mask.ndim() != 0) {
+        mask = MaskArray({ny, nx});
+        decimate(_mask.data(), mask);
+    }
+
+    // Chunks cover approximately the same region as they do in this generator.
+    return create_derived(
+        x, y, z, mask, (_x_chunk_size + sx - 1) / sx, (_y_chunk_size + sy - 1) / sy);
+}
+
 template <typename Derived>
 bool BaseContourGenerator<Derived>::supports_fill_type(FillType fill_type)
 {
@@ -2370,6 +3861,7 @@ bool BaseContourGenerator<Derived>::supports_fill_type(FillType fill_type)
         case FillType::ChunkCombinedOffset:
         case FillType::ChunkCombinedCodeOffset:
         case FillType::ChunkCombinedOffsetOffset:
+        case FillType::CombinedOffsetOffset:
             return true;
         default:
             return false;
@@ -2384,12 +3876,71 @@ bool BaseContourGenerator<Derived>::supports_line_type(LineType line_type)
         case LineType::SeparateCode:
         case LineType::ChunkCombinedCode:
         case LineType::ChunkCombinedOffset:
+        case LineType::CombinedOffset:
             return true;
         default:
             return false;
     }
 }
 
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::window(
+    index_t i0, index_t i1, index_t j0, index_t j1) const
+{
+    if (i0 < 0 || j0 < 0 || i1 > _nx || j1 > _ny || i1 - i0 < 2 || j1 - j0 < 2)
+        throw std::invalid_argument(
+            "window must be within the grid and contain at least 2 points in each direction");
+
+    // Slices of the numpy arrays are contiguous copies so that the time taken and memory used
+    // depend on the size of the window rather than the whole grid.
+    auto slices = py::make_tuple(py::slice(j0, j1, 1), py::slice(i0, i1, 1));
+    auto x = CoordinateArray::ensure(_x[slices]);
+    auto y = CoordinateArray::ensure(_y[slices]);
+    auto z = CoordinateArray::ensure(_z[slices]);
+    auto mask = (_mask.ndim() == 0 ? _mask : MaskArray::ensure(_mask[slices]));
+
+    return create_derived(x, y, z, mask, _x_chunk_size, _y_chunk_size);
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::window_bbox(double x0, double y0, double x1, double y1)
+{
+    if (!(x0 <= x1 && y0 <= y1))
+        throw std::invalid_argument("bbox must have x0 <= x1 and y0 <= y1");
+
+    index_t i0, i1, j0, j1;
+    if (is_rectilinear()) {
+        if (!bbox_range(_xptr, _nx, 1, x0, x1, i0, i1) ||
+            !bbox_range(_yptr, _ny, _nx, y0, y1, j0, j1))
+            return py::none();
+    }
+    else {
+        // Check the extent of every quad.
+        i0 = j0 = _n;
+        i1 = j1 = -1;
+        for (index_t j = 1; j < _ny; ++j) {
+            for (index_t i = 1; i < _nx; ++i) {
+                auto quad = i + j*_nx;
+                auto [xmin, xmax] = std::minmax(
+                    {_xptr[POINT_NE], _xptr[POINT_NW], _xptr[POINT_SE], _xptr[POINT_SW]});
+                auto [ymin, ymax] = std::minmax(
+                    {_yptr[POINT_NE], _yptr[POINT_NW], _yptr[POINT_SE], _yptr[POINT_SW]});
+                if (xmin <= x1 && xmax >= x0 && ymin <= y1 && ymax >= y0) {
+                    i0 = std::min(i0, i-1);
+                    i1 = std::max(i1, i+1);
+                    j0 = std::min(j0, j-1);
+                    j1 = std::max(j1, j+1);
+                }
+            }
+        }
+
+        if (i1 < 0)
+            return py::none();
+    }
+
+    return window(i0, i1, j0, j1);
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::write_cache() const
 {
@@ -2442,6 +3993,84 @@ void BaseContourGenerator<Derived>::write_cache_quad(index_t quad) const
     std::cout << ' ';
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::write_filled(
+    const py::object& path, const CoordinateArray& levels, const std::string& format)
+{
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
+    if (levels.ndim() != 1 || levels.shape(0) < 2)
+        throw std::invalid_argument("levels must be a 1D array of at least 2 values");
+
+    auto levels_ptr = levels.data();
+    auto n_levels = levels.shape(0);
+    if (!std::is_sorted(levels_ptr, levels_ptr + n_levels))
+        throw std::invalid_argument("levels must be in increasing order");
+
+    auto writer = py::module_::import("contourpy.writer").attr("_create_writer")(
+        path, format, levels, true);
+
+    try {
+        _filled = true;
+        for (py::ssize_t i = 0; i+1 < n_levels; ++i) {
+            _lower_level = levels_ptr[i];
+            _upper_level = levels_ptr[i+1];
+            writer.attr("start_level")(i);
+            march_into(writer.attr("write_chunk"));
+        }
+    }
+    catch (...) {
+        writer.attr("abort")();  // Deletes the incomplete file and does not raise.
+        throw;
+    }
+
+    writer.attr("close")();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::write_lines(
+    const py::object& path, const CoordinateArray& levels, const std::string& format)
+{
+    InUse in_use(*this);  // cppcheck-suppress unreadVariable
+
+    if (levels.ndim() != 1 || levels.shape(0) < 1)
+        throw std::invalid_argument("levels must be a 1D array of at least 1 value");
+
+    auto levels_ptr = levels.data();
+    auto n_levels = levels.shape(0);
+
+    auto writer = py::module_::import("contourpy.writer").attr("_create_writer")(
+        path, format, levels, false);
+
+    try {
+        _filled = false;
+        for (py::ssize_t i = 0; i < n_levels; ++i) {
+            _lower_level = _upper_level = levels_ptr[i];
+            writer.attr("start_level")(i);
+            march_into(writer.attr("write_chunk"));
+        }
+    }
+    catch (...) {
+        writer.attr("abort")();  // Deletes the incomplete file and does not raise.
+        throw;
+    }
+
+    writer.attr("close")();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::write_point(double x, double y, double*& points) const
+{
+    if (_affine) {
+        *points++ = _transform[0]*x + _transform[1]*y + _transform[2];
+        *points++ = _transform[3]*x + _transform[4]*y + _transform[5];
+    }
+    else {
+        *points++ = x;
+        *points++ = y;
+    }
+}
+
 template <typename Derived>
 typename BaseContourGenerator<Derived>::ZLevel BaseContourGenerator<Derived>::z_to_zlevel(
     double z_value) const
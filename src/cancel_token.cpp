@@ -0,0 +1,19 @@
+#include "cancel_token.h"
+
+namespace contourpy {
+
+CancelToken::CancelToken()
+    : _cancelled(false)
+{}
+
+void CancelToken::cancel()
+{
+    _cancelled = true;
+}
+
+bool CancelToken::is_cancelled() const
+{
+    return _cancelled;
+}
+
+} // namespace contourpy
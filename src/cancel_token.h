@@ -0,0 +1,33 @@
+#ifndef CONTOURPY_CANCEL_TOKEN_H
+#define CONTOURPY_CANCEL_TOKEN_H
+
+#include <atomic>
+#include <stdexcept>
+
+namespace contourpy {
+
+// Thread-safe flag used to request that a contouring operation stops early.  It can be cancelled
+// from any thread and is checked by contour generators between chunks.
+class CancelToken
+{
+public:
+    CancelToken();
+
+    void cancel();
+
+    bool is_cancelled() const;
+
+private:
+    std::atomic<bool> _cancelled;
+};
+
+// Raised by a contour generator if its CancelToken is cancelled during a contouring operation.
+class CancelledError : public std::runtime_error
+{
+public:
+    using std::runtime_error::runtime_error;
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_CANCEL_TOKEN_H
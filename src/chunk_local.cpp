@@ -23,8 +23,35 @@ void ChunkLocal::clear()
     points.clear();
     line_offsets.clear();
     outer_offsets.clear();
+    codes.clear();
 
     look_up_quads.clear();
+    simplify_anchors.clear();
+}
+
+void ChunkLocal::release()
+{
+    clear();
+
+    points.release();
+    line_offsets.release();
+    outer_offsets.release();
+    codes.release();
+
+    std::vector<index_t>().swap(look_up_quads);
+    std::vector<count_t>().swap(simplify_anchors);
+    simplifier.release();
+}
+
+count_t ChunkLocal::retained_bytes() const
+{
+    return points.capacity()*sizeof(double) +
+           line_offsets.capacity()*sizeof(offset_t) +
+           outer_offsets.capacity()*sizeof(offset_t) +
+           codes.capacity()*sizeof(uint8_t) +
+           look_up_quads.capacity()*sizeof(index_t) +
+           simplify_anchors.capacity()*sizeof(count_t) +
+           simplifier.retained_bytes();
 }
 
 std::ostream &operator<<(std::ostream &os, const ChunkLocal& local)
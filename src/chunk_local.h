@@ -2,6 +2,7 @@
 #define CONTOURPY_CHUNK_LOCAL_H
 
 #include "output_array.h"
+#include "simplifier.h"
 #include <iosfwd>
 
 namespace contourpy {
@@ -10,8 +11,15 @@ struct ChunkLocal
 {
     ChunkLocal();
 
+    // Reset for a new chunk.  Buffers are retained for reuse by the next chunk.
     void clear();
 
+    // Clear and free all retained buffers.
+    void release();
+
+    // Number of bytes held in retained buffers.
+    count_t retained_bytes() const;
+
     friend std::ostream &operator<<(std::ostream &os, const ChunkLocal& local);
 
 
@@ -30,9 +38,14 @@ struct ChunkLocal
     OutputArray<offset_t> line_offsets;  // Into array of points.
     OutputArray<offset_t> outer_offsets; // Into array of points or line offsets depending on
                                          //   fill_type.
+    OutputArray<uint8_t> codes;          // Only used for caller-supplied output buffers.
 
     // Data for current outer.
     std::vector<index_t> look_up_quads;  // To find holes of current outer.
+
+    // Data for current line, only used if simplifying.
+    std::vector<count_t> simplify_anchors;  // Indices of points that must be kept.
+    Simplifier simplifier;
 };
 
 } // namespace contourpy
@@ -26,6 +26,8 @@ typedef py::array_t<bool,   py::array::c_style | py::array::forcecast> MaskArray
 typedef py::array_t<double>   PointArray;
 typedef py::array_t<uint8_t>  CodeArray;
 typedef py::array_t<offset_t> OffsetArray;
+typedef py::array_t<int32_t>  ChunkIndexArray;
+typedef py::array_t<count_t>  CountArray;
 
 } // namespace contourpy
 
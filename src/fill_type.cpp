@@ -24,6 +24,9 @@ std::ostream &operator<<(std::ostream &os, const FillType& fill_type)
         case FillType::ChunkCombinedOffsetOffset:
             os << "ChunkCombinedOffsetOffset";
             break;
+        case FillType::CombinedOffsetOffset:
+            os << "CombinedOffsetOffset";
+            break;
     }
     return os;
 }
@@ -15,6 +15,7 @@ enum class FillType
     ChunkCombinedOffset= 204,
     ChunkCombinedCodeOffset = 205,
     ChunkCombinedOffsetOffset = 206,
+    CombinedOffsetOffset = 207,
 };
 
 std::ostream &operator<<(std::ostream &os, const FillType& fill_type);
@@ -0,0 +1,106 @@
+#include "geometry_writer.h"
+#include <algorithm>
+#include <charconv>
+#include <cmath>
+#include <cstring>
+
+namespace contourpy {
+
+static bool is_little_endian()
+{
+    const uint16_t value = 1;
+    uint8_t first;
+    std::memcpy(&first, &value, 1);
+    return first == 1;
+}
+
+GeometryWriter::GeometryWriter(count_t max_size)
+    : _bytes(py::reinterpret_steal<py::object>(
+          PyBytes_FromStringAndSize(nullptr, static_cast<py::ssize_t>(max_size))))
+{
+    if (!_bytes)
+        throw py::error_already_set();
+
+    _start = _ptr = PyBytes_AS_STRING(_bytes.ptr());
+    _end = _start + max_size;
+}
+
+py::bytes GeometryWriter::finish()
+{
+    assert(_ptr <= _end);
+
+    auto size = _ptr - _start;
+    auto obj = _bytes.release().ptr();
+    if (size != _end - _start && _PyBytes_Resize(&obj, size) != 0)
+        throw py::error_already_set();
+
+    _start = _ptr = _end = nullptr;
+    return py::reinterpret_steal<py::bytes>(obj);
+}
+
+void GeometryWriter::write_json_number(double value)
+{
+    // JSON has no representation of NaN or infinity.
+    if (!std::isfinite(value))
+        throw std::invalid_argument("GeoJSON cannot contain non-finite coordinates such as NaN");
+
+    auto result = std::to_chars(_ptr, _end, value);
+    assert(result.ec == std::errc());
+    _ptr = result.ptr;
+}
+
+void GeometryWriter::write_json_points(const double* points, count_t count)
+{
+    for (count_t i = 0; i < count; ++i) {
+        if (i > 0)
+            *_ptr++ = ',';
+        *_ptr++ = '[';
+        write_json_number(points[2*i]);
+        *_ptr++ = ',';
+        write_json_number(points[2*i+1]);
+        *_ptr++ = ']';
+    }
+}
+
+void GeometryWriter::write_text(const char* text)
+{
+    auto length = std::strlen(text);
+    assert(_ptr + length <= _end);
+    std::memcpy(_ptr, text, length);
+    _ptr += length;
+}
+
+void GeometryWriter::write_text(char character)
+{
+    assert(_ptr < _end);
+    *_ptr++ = character;
+}
+
+void GeometryWriter::write_wkb_points(const double* points, count_t count)
+{
+    static const bool little_endian = is_little_endian();
+
+    auto length = 2*count*sizeof(double);
+    assert(_ptr + length <= _end);
+    std::memcpy(_ptr, points, length);
+    if (!little_endian) {
+        for (count_t i = 0; i < 2*count; ++i)
+            std::reverse(_ptr + i*sizeof(double), _ptr + (i+1)*sizeof(double));
+    }
+    _ptr += length;
+}
+
+void GeometryWriter::write_wkb_type(uint32_t type)
+{
+    write_text(static_cast<char>(1));  // Little-endian.
+    write_wkb_uint32(type);
+}
+
+void GeometryWriter::write_wkb_uint32(uint32_t value)
+{
+    assert(_ptr + 4 <= _end);
+    for (int i = 0; i < 4; ++i)
+        *_ptr++ = static_cast<char>((value >> (8*i)) & 0xff);
+}
+
+} // namespace contourpy
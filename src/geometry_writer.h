@@ -0,0 +1,49 @@
+#ifndef CONTOURPY_GEOMETRY_WRITER_H
+#define CONTOURPY_GEOMETRY_WRITER_H
+
+#include "common.h"
+
+namespace contourpy {
+
+// Writer of WKB and GeoJSON geometry directly into a Python bytes object.  The bytes object is
+// allocated once at construction with the maximum size that may be written, which is exact for
+// WKB, and is shrunk to the size actually written by finish().
+class GeometryWriter
+{
+public:
+    // Maximum number of characters written for a single GeoJSON number.
+    static constexpr count_t max_number_chars = 24;
+
+    explicit GeometryWriter(count_t max_size);
+
+    // Return the bytes written.  No further writes are allowed.
+    py::bytes finish();
+
+    // Write count (x, y) points as GeoJSON [x,y] positions separated by commas.  Throws
+    // std::invalid_argument if any coordinate is not finite.
+    void write_json_points(const double* points, count_t count);
+
+    void write_text(const char* text);
+
+    void write_text(char character);
+
+    // Write count (x, y) points as little-endian doubles.
+    void write_wkb_points(const double* points, count_t count);
+
+    // Write little-endian byte order marker and geometry type.
+    void write_wkb_type(uint32_t type);
+
+    void write_wkb_uint32(uint32_t value);
+
+private:
+    void write_json_number(double value);
+
+    py::object _bytes;
+    char* _start;
+    char* _ptr;
+    char* _end;
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_GEOMETRY_WRITER_H
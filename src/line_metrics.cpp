@@ -0,0 +1,38 @@
+#include "line_metrics.h"
+#include <algorithm>
+#include <cmath>
+
+namespace contourpy {
+
+LineMetrics LineMetrics::calculate(const double* points, count_t point_count)
+{
+    assert(points != nullptr && point_count > 0);
+
+    // Area is calculated relative to the first point to reduce loss of precision.
+    const double x0 = points[0];
+    const double y0 = points[1];
+
+    LineMetrics metrics{0.0, 0.0, x0, y0, x0, y0, false};
+    double twice_area = 0.0;
+    for (count_t i = 1; i < point_count; ++i) {
+        const double* prev = points + 2*(i-1);
+        const double* point = points + 2*i;
+
+        metrics.length += std::hypot(point[0] - prev[0], point[1] - prev[1]);
+        twice_area += (prev[0] - x0)*(point[1] - y0) - (point[0] - x0)*(prev[1] - y0);
+
+        metrics.xmin = std::min(metrics.xmin, point[0]);
+        metrics.ymin = std::min(metrics.ymin, point[1]);
+        metrics.xmax = std::max(metrics.xmax, point[0]);
+        metrics.ymax = std::max(metrics.ymax, point[1]);
+    }
+
+    const double* last = points + 2*(point_count-1);
+    metrics.closed = (point_count > 1 && last[0] == x0 && last[1] == y0);
+    if (metrics.closed)
+        metrics.area = 0.5*twice_area;
+
+    return metrics;
+}
+
+} // namespace contourpy
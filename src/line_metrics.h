@@ -0,0 +1,25 @@
+#ifndef CONTOURPY_LINE_METRICS_H
+#define CONTOURPY_LINE_METRICS_H
+
+#include "common.h"
+
+namespace contourpy {
+
+// Geometric metrics of a single contour line or boundary of a filled contour polygon.  Returned to
+// Python as a NumPy structured array with a field for each member.
+struct LineMetrics
+{
+    // Calculate metrics from point_count (x, y) points.
+    static LineMetrics calculate(const double* points, count_t point_count);
+
+    double area;                    // Signed area, positive if anticlockwise.  Zero if not closed.
+    double length;
+    double xmin, ymin, xmax, ymax;  // Bounding box.
+    bool closed;                    // Whether first and last points are the same.
+};
+
+typedef py::array_t<LineMetrics> MetricsArray;
+
+} // namespace contourpy
+
+#endif // CONTOURPY_LINE_METRICS_H
@@ -0,0 +1,173 @@
+#include "mvt_encoder.h"
+#include <algorithm>
+#include <cmath>
+
+namespace contourpy {
+
+// MVT geometry command ids.
+static const uint32_t MOVE_TO = 1;
+static const uint32_t LINE_TO = 2;
+static const uint32_t CLOSE_PATH = 7;
+
+// Quantised coordinates are clamped to this magnitude so that deltas between them fit in int32.
+static const double MAX_TILE_COORDINATE = 1 << 29;
+
+MvtEncoder::MvtEncoder(double x0, double y0, double x1, double y1, uint32_t extent)
+    : _x0(x0), _y1(y1), _cursor(0, 0)
+{
+    if (!(x0 < x1 && y0 < y1))
+        throw std::invalid_argument("bbox must have x0 < x1 and y0 < y1");
+    if (extent == 0)
+        throw std::invalid_argument("extent must be positive");
+
+    _x_scale = extent / (x1 - x0);
+    _y_scale = extent / (y1 - y0);
+}
+
+count_t MvtEncoder::check_offsets(const InputOffsetArray& offsets, count_t max_offset)
+{
+    if (offsets.ndim() != 1)
+        throw std::invalid_argument("offsets must be a 1D array");
+
+    auto size = offsets.shape(0);
+    auto ptr = offsets.data();
+    if (max_offset == 0 && size <= 1 && (size == 0 || ptr[0] == 0))
+        return 0;  // Empty, as returned by Combined types.
+
+    if (size < 2 || ptr[0] != 0 || ptr[size-1] != max_offset || !std::is_sorted(ptr, ptr + size))
+        throw std::invalid_argument(
+            "offsets must be increasing from 0 to the length of the array they index into");
+
+    return size - 1;
+}
+
+py::bytes MvtEncoder::encode_filled(
+    const CoordinateArray& points, const InputOffsetArray& offsets,
+    const InputOffsetArray& outer_offsets, double x0, double y0, double x1, double y1,
+    uint32_t extent)
+{
+    MvtEncoder encoder(x0, y0, x1, y1, extent);
+
+    if (points.ndim() != 2 || points.shape(1) != 2)
+        throw std::invalid_argument("points must be a 2D array of shape (npoints, 2)");
+    auto line_count = check_offsets(offsets, points.shape(0));
+    auto outer_count = check_offsets(outer_offsets, line_count);
+
+    auto points_ptr = points.data();
+    auto offsets_ptr = offsets.data();
+    auto outer_offsets_ptr = outer_offsets.data();
+
+    for (count_t outer = 0; outer < outer_count; ++outer) {
+        for (auto line = outer_offsets_ptr[outer]; line < outer_offsets_ptr[outer+1]; ++line) {
+            auto start = offsets_ptr[line];
+            encoder.quantise(points_ptr + 2*start, offsets_ptr[line+1] - start, true);
+
+            // Outer boundary is the first line and must have positive area, holes negative.
+            bool is_outer = (line == outer_offsets_ptr[outer]);
+            auto area = encoder._part.size() >= 3 ? encoder.twice_area() : 0;
+            if (area == 0) {
+                if (is_outer)
+                    break;  // Also drop the holes of this outer boundary.
+                continue;
+            }
+
+            if ((area > 0) != is_outer)
+                std::reverse(encoder._part.begin(), encoder._part.end());
+            encoder.write_part(true);
+        }
+    }
+
+    return py::bytes(encoder._buffer);
+}
+
+py::bytes MvtEncoder::encode_lines(
+    const CoordinateArray& points, const InputOffsetArray& offsets, double x0, double y0,
+    double x1, double y1, uint32_t extent)
+{
+    MvtEncoder encoder(x0, y0, x1, y1, extent);
+
+    if (points.ndim() != 2 || points.shape(1) != 2)
+        throw std::invalid_argument("points must be a 2D array of shape (npoints, 2)");
+    auto line_count = check_offsets(offsets, points.shape(0));
+
+    auto points_ptr = points.data();
+    auto offsets_ptr = offsets.data();
+
+    for (count_t line = 0; line < line_count; ++line) {
+        auto start = offsets_ptr[line];
+        encoder.quantise(points_ptr + 2*start, offsets_ptr[line+1] - start, false);
+        if (encoder._part.size() >= 2)
+            encoder.write_part(false);
+    }
+
+    return py::bytes(encoder._buffer);
+}
+
+void MvtEncoder::quantise(const double* points, count_t point_count, bool closed)
+{
+    _part.clear();
+    for (count_t i = 0; i < point_count; ++i) {
+        TilePoint point(
+            static_cast<int32_t>(std::lround(std::clamp(
+                (points[2*i] - _x0)*_x_scale, -MAX_TILE_COORDINATE, MAX_TILE_COORDINATE))),
+            static_cast<int32_t>(std::lround(std::clamp(
+                (_y1 - points[2*i+1])*_y_scale, -MAX_TILE_COORDINATE, MAX_TILE_COORDINATE))));
+        if (_part.empty() || point != _part.back())
+            _part.push_back(point);
+    }
+
+    if (closed) {
+        while (_part.size() > 1 && _part.back() == _part.front())
+            _part.pop_back();
+    }
+}
+
+int64_t MvtEncoder::twice_area() const
+{
+    int64_t area = 0;
+    auto prev = _part.back();
+    for (const auto& point : _part) {
+        area += static_cast<int64_t>(prev.first)*point.second -
+            static_cast<int64_t>(point.first)*prev.second;
+        prev = point;
+    }
+    return area;
+}
+
+void MvtEncoder::write_command(uint32_t id, count_t count)
+{
+    write_varint((id & 0x7) | (static_cast<uint32_t>(count) << 3));
+}
+
+void MvtEncoder::write_part(bool closed)
+{
+    assert(!_part.empty());
+
+    for (count_t i = 0; i < _part.size(); ++i) {
+        if (i == 0)
+            write_command(MOVE_TO, 1);
+        else if (i == 1)
+            write_command(LINE_TO, _part.size() - 1);
+
+        // Parameters are zigzag encoded deltas from the previous point.
+        int32_t dx = _part[i].first - _cursor.first;
+        int32_t dy = _part[i].second - _cursor.second;
+        write_varint((static_cast<uint32_t>(dx) << 1) ^ static_cast<uint32_t>(dx >> 31));
+        write_varint((static_cast<uint32_t>(dy) << 1) ^ static_cast<uint32_t>(dy >> 31));
+        _cursor = _part[i];
+    }
+
+    if (closed)
+        write_command(CLOSE_PATH, 1);
+}
+
+void MvtEncoder::write_varint(uint32_t value)
+{
+    while (value >= 0x80) {
+        _buffer.push_back(static_cast<char>((value & 0x7f) | 0x80));
+        value >>= 7;
+    }
+    _buffer.push_back(static_cast<char>(value));
+}
+
+} // namespace contourpy
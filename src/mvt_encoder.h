@@ -0,0 +1,64 @@
+#ifndef CONTOURPY_MVT_ENCODER_H
+#define CONTOURPY_MVT_ENCODER_H
+
+#include "common.h"
+#include <string>
+#include <vector>
+
+namespace contourpy {
+
+// Encoding of contour lines and filled contour polygons as the geometry of a single Mapbox Vector
+// Tile (MVT) feature.  Points are quantised to integer tile coordinates in the range 0 to extent
+// across the tile bounding box, with the y-axis pointing down, and written as a stream of MoveTo,
+// LineTo and ClosePath commands with delta and zigzag encoded parameters.  The stream is returned
+// as the packed varint bytes of the feature's geometry field.
+class MvtEncoder
+{
+public:
+    typedef py::array_t<offset_t, py::array::c_style | py::array::forcecast> InputOffsetArray;
+
+    // Encode filled contours in FillType.CombinedOffsetOffset form as a POLYGON feature.  Each
+    // ring is oriented as required by the MVT specification, rings that collapse to zero area
+    // when quantised are removed and so are the holes of removed outer boundaries.
+    static py::bytes encode_filled(
+        const CoordinateArray& points, const InputOffsetArray& offsets,
+        const InputOffsetArray& outer_offsets, double x0, double y0, double x1, double y1,
+        uint32_t extent);
+
+    // Encode contour lines in LineType.CombinedOffset form as a LINESTRING feature.  Lines that
+    // collapse to a single point when quantised are removed.
+    static py::bytes encode_lines(
+        const CoordinateArray& points, const InputOffsetArray& offsets, double x0, double y0,
+        double x1, double y1, uint32_t extent);
+
+private:
+    typedef std::pair<int32_t, int32_t> TilePoint;
+
+    MvtEncoder(double x0, double y0, double x1, double y1, uint32_t extent);
+
+    // Check offsets are ascending and within [0, max_offset], returning the number of parts.
+    static count_t check_offsets(const InputOffsetArray& offsets, count_t max_offset);
+
+    // Quantise points into _part, dropping consecutive duplicates.  If closed the closing
+    // point(s) are also dropped.
+    void quantise(const double* points, count_t point_count, bool closed);
+
+    // Twice the signed area of the ring in _part, positive if clockwise in tile coordinates.
+    int64_t twice_area() const;
+
+    void write_command(uint32_t id, count_t count);
+
+    // Write _part, which is followed by a ClosePath command if closed.
+    void write_part(bool closed);
+
+    void write_varint(uint32_t value);
+
+    double _x0, _y1, _x_scale, _y_scale;
+    TilePoint _cursor;              // Position of the last point written, starts at origin.
+    std::vector<TilePoint> _part;   // Quantised points of the line or ring being written.
+    std::string _buffer;            // Packed varints written so far.
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_MVT_ENCODER_H
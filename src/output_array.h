@@ -2,26 +2,34 @@
 #define CONTOURPY_OUTPUT_ARRAY_H
 
 #include "common.h"
-#include <vector>
+#include <memory>
 
 namespace contourpy {
 
 // A reusable array that is output from C++ to Python.  Depending on the chosen line or fill type,
 // it can either be created as a NumPy array that will be directly returned to the Python caller,
-// or as a C++ vector that will be further manipulated (such as split up) before being converted to
+// or as a C++ buffer that will be further manipulated (such as split up) before being converted to
 // NumPy array(s) for returning.  BaseContourGenerator's marching does not care which form it is as
 // it just writes values to either array using an incrementing pointer.
+//
+// The C++ buffer is retained when the array is cleared so that it can be reused by subsequent
+// chunks and calls without reallocating; it is only freed by release().
 template <typename T>
 class OutputArray
 {
 public:
     OutputArray()
-        : size(0), start(nullptr), current(nullptr)
+        : size(0), start(nullptr), current(nullptr), _capacity(0)
     {}
 
+    // Number of elements that the C++ buffer can hold without reallocating.
+    count_t capacity() const
+    {
+        return _capacity;
+    }
+
     void clear()
     {
-        vector.clear();
         size = 0;
         start = current = nullptr;
     }
@@ -29,9 +37,21 @@ public:
     void create_cpp(count_t new_size)
     {
         assert(new_size > 0);
+        if (new_size > _capacity) {
+            // Elements are not initialised as they are always written to before being read.
+            _buffer.reset(new T[new_size]);
+            _capacity = new_size;
+        }
+        size = new_size;
+        start = current = _buffer.get();
+    }
+
+    // Use memory owned by something else, such as a caller-supplied NumPy array.
+    void create_external(T* external, count_t new_size)
+    {
+        assert(external != nullptr && new_size > 0);
         size = new_size;
-        vector.resize(size);
-        start = current = vector.data();
+        start = current = external;
     }
 
     py::array_t<T> create_python(count_t new_size)
@@ -52,6 +72,25 @@ public:
         return py_array;
     }
 
+    // Clear and free the C++ buffer.
+    void release()
+    {
+        clear();
+        _buffer.reset();
+        _capacity = 0;
+    }
+
+    // Reduce the size, such as if fewer values have been written than were allocated.  Clears the
+    // array if new_size is zero.
+    void shrink(count_t new_size)
+    {
+        assert(new_size <= size);
+        if (new_size == 0)
+            clear();
+        else
+            size = new_size;
+    }
+
     // Non-copyable and non-moveable.
     OutputArray(const OutputArray& other) = delete;
     OutputArray(const OutputArray&& other) = delete;
@@ -59,10 +98,13 @@ public:
     OutputArray& operator=(const OutputArray&& other) = delete;
 
 
-    std::vector<T> vector;
     count_t size;
     T* start;               // Start of array, whether C++ or Python.
     T* current;             // Where to write next value to before incrementing.
+
+private:
+    std::unique_ptr<T[]> _buffer;  // C++ buffer, reused between calls to create_cpp().
+    count_t _capacity;             // Number of elements allocated in _buffer.
 };
 
 } // namespace contourpy
@@ -0,0 +1,24 @@
+#include "output_too_large_error.h"
+#include <string>
+
+namespace contourpy {
+
+OutputTooLargeError::OutputTooLargeError(count_t estimated_bytes, count_t max_output_bytes)
+    : std::runtime_error(
+          "Estimated output size of " + std::to_string(estimated_bytes) +
+          " bytes exceeds max_output_bytes of " + std::to_string(max_output_bytes)),
+      _estimated_bytes(estimated_bytes),
+      _max_output_bytes(max_output_bytes)
+{}
+
+count_t OutputTooLargeError::get_estimated_bytes() const
+{
+    return _estimated_bytes;
+}
+
+count_t OutputTooLargeError::get_max_output_bytes() const
+{
+    return _max_output_bytes;
+}
+
+} // namespace contourpy
@@ -0,0 +1,25 @@
+#ifndef CONTOURPY_OUTPUT_TOO_LARGE_ERROR_H
+#define CONTOURPY_OUTPUT_TOO_LARGE_ERROR_H
+
+#include "common.h"
+#include <stdexcept>
+
+namespace contourpy {
+
+// Raised by a contour generator if the estimated size of its output, calculated from the counts of
+// the first pass, exceeds its max_output_bytes.
+class OutputTooLargeError : public std::runtime_error
+{
+public:
+    OutputTooLargeError(count_t estimated_bytes, count_t max_output_bytes);
+
+    count_t get_estimated_bytes() const;
+    count_t get_max_output_bytes() const;
+
+private:
+    count_t _estimated_bytes, _max_output_bytes;
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_OUTPUT_TOO_LARGE_ERROR_H
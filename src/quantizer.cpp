@@ -0,0 +1,64 @@
+#include "quantizer.h"
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+namespace contourpy {
+
+py::array Quantizer::quantize(
+    const CoordinateArray& points, const InputOffsetArray& offsets, double x0, double y0,
+    double x_scale, double y_scale, const py::dtype& dtype, bool delta)
+{
+    if (points.ndim() != 2 || points.shape(1) != 2)
+        throw std::invalid_argument("points must be a 2D array of shape (npoints, 2)");
+    if (!(x_scale > 0.0 && y_scale > 0.0))
+        throw std::invalid_argument("scale must be positive");
+
+    if (dtype.is(py::dtype::of<int16_t>()))
+        return quantize_as<int16_t>(points, offsets, x0, y0, x_scale, y_scale, delta);
+    else if (dtype.is(py::dtype::of<int32_t>()))
+        return quantize_as<int32_t>(points, offsets, x0, y0, x_scale, y_scale, delta);
+    else
+        throw std::invalid_argument("dtype must be int16 or int32");
+}
+
+template <typename T>
+py::array Quantizer::quantize_as(
+    const CoordinateArray& points, const InputOffsetArray& offsets, double x0, double y0,
+    double x_scale, double y_scale, bool delta)
+{
+    const count_t point_count = points.shape(0);
+    const count_t offset_count = offsets.ndim() == 1 ? offsets.shape(0) : 0;
+    auto offsets_ptr = offsets.data();
+    if (offset_count == 0 || offsets_ptr[0] != 0 || offsets_ptr[offset_count-1] != point_count ||
+        !std::is_sorted(offsets_ptr, offsets_ptr + offset_count))
+        throw std::invalid_argument(
+            "offsets must be increasing from 0 to the length of the array they index into");
+
+    index_t shape[2] = {static_cast<index_t>(point_count), 2};
+    py::array_t<T> ret(shape);
+    auto ret_ptr = ret.mutable_data();
+    auto points_ptr = points.data();
+
+    const double max_value = std::numeric_limits<T>::max();
+    for (count_t i = 0; i < 2*point_count; ++i) {
+        double value = std::rint(
+            i % 2 == 0 ? (points_ptr[i] - x0)/x_scale : (points_ptr[i] - y0)/y_scale);
+        if (!(value >= 0.0 && value <= max_value))  // Also catches NaN.
+            throw std::invalid_argument("points must be within the quantisation bbox");
+        ret_ptr[i] = static_cast<T>(value);
+    }
+
+    if (delta) {
+        // Differences of values in range [0, max_value] always fit in T.  Iterate backwards
+        // through each line so that the previous point is still absolute.
+        for (count_t line = 0; line+1 < offset_count; ++line) {
+            for (count_t i = 2*offsets_ptr[line+1]; i-- > 2*offsets_ptr[line] + 2;)
+                ret_ptr[i] = static_cast<T>(ret_ptr[i] - ret_ptr[i-2]);
+        }
+    }
+
+    return ret;
+}
+
+} // namespace contourpy
@@ -0,0 +1,33 @@
+#ifndef CONTOURPY_QUANTIZER_H
+#define CONTOURPY_QUANTIZER_H
+
+#include "common.h"
+
+namespace contourpy {
+
+// Quantisation of contour points to integer coordinates relative to an origin, optionally delta
+// encoded within each line.
+class Quantizer
+{
+public:
+    typedef py::array_t<offset_t, py::array::c_style | py::array::forcecast> InputOffsetArray;
+
+    // Return points quantised as round((x - x0)/x_scale) and round((y - y0)/y_scale) in an array
+    // of the same shape with integer dtype, which must be int16 or int32.  If delta is true, all
+    // but the first point of each line, the start and end of which are given by offsets, are
+    // written as the difference from the previous point.  Raises ValueError if a quantised
+    // coordinate is outside the range 0 to the maximum value of dtype.
+    static py::array quantize(
+        const CoordinateArray& points, const InputOffsetArray& offsets, double x0, double y0,
+        double x_scale, double y_scale, const py::dtype& dtype, bool delta);
+
+private:
+    template <typename T>
+    static py::array quantize_as(
+        const CoordinateArray& points, const InputOffsetArray& offsets, double x0, double y0,
+        double x_scale, double y_scale, bool delta);
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_QUANTIZER_H
@@ -7,11 +7,24 @@ namespace contourpy {
 SerialContourGenerator::SerialContourGenerator(
     const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
     const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size)
+    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+    const py::object& transform, const py::object& transform_callback)
     : BaseContourGenerator(x, y, z, mask, corner_mask, line_type, fill_type, quad_as_tri, z_interp,
-                           x_chunk_size, y_chunk_size)
+                           x_chunk_size, y_chunk_size, transform, transform_callback)
 {}
 
+py::object SerialContourGenerator::create_from_arrays(
+    const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+    const MaskArray& mask, index_t x_chunk_size, index_t y_chunk_size,
+    const py::object& transform, const py::object& transform_callback) const
+{
+    return py::cast(
+        new SerialContourGenerator(
+            x, y, z, mask, get_corner_mask(), get_line_type(), get_fill_type(), get_quad_as_tri(),
+            get_z_interp(), x_chunk_size, y_chunk_size, transform, transform_callback),
+        py::return_value_policy::take_ownership);
+}
+
 void SerialContourGenerator::export_filled(
     const ChunkLocal& local, std::vector<py::list>& return_lists)
 {
@@ -19,33 +32,6 @@ void SerialContourGenerator::export_filled(
 
     switch (get_fill_type())
     {
-        case FillType::OuterCode:
-        case FillType::OuterOffset: {
-            assert(!has_direct_points() && !has_direct_line_offsets());
-            auto outer_count = local.line_count - local.hole_count;
-
-            for (decltype(outer_count) i = 0; i < outer_count; ++i) {
-                auto outer_start = local.outer_offsets.start[i];
-                auto outer_end = local.outer_offsets.start[i+1];
-                auto point_start = local.line_offsets.start[outer_start];
-                auto point_end = local.line_offsets.start[outer_end];
-                auto point_count = point_end - point_start;
-                assert(point_count > 2);
-
-                return_lists[0].append(Converter::convert_points(
-                    point_count, local.points.start + 2*point_start));
-
-                if (get_fill_type() == FillType::OuterCode)
-                    return_lists[1].append(Converter::convert_codes(
-                        point_count, outer_end - outer_start + 1,
-                        local.line_offsets.start + outer_start, point_start));
-                else
-                    return_lists[1].append(Converter::convert_offsets(
-                        outer_end - outer_start + 1, local.line_offsets.start + outer_start,
-                        point_start));
-            }
-            break;
-        }
         case FillType::ChunkCombinedCode:
         case FillType::ChunkCombinedCodeOffset: {
             assert(has_direct_points() && !has_direct_line_offsets());
@@ -53,8 +39,13 @@ void SerialContourGenerator::export_filled(
             // return_lists[0][local_chunk] already contains combined points.
             // If ChunkCombinedCodeOffset. return_lists[2][local.chunk] already contains outer
             //    offsets.
-            return_lists[1][local.chunk] = Converter::convert_codes(
-                local.total_point_count, local.line_count + 1, local.line_offsets.start, 0);
+            if (local.codes.start != nullptr)  // Caller-supplied output buffer.
+                Converter::convert_codes(
+                    local.total_point_count, local.line_count + 1, local.line_offsets.start, 0,
+                    local.codes.start);
+            else
+                return_lists[1][local.chunk] = Converter::convert_codes(
+                    local.total_point_count, local.line_count + 1, local.line_offsets.start, 0);
             break;
         }
         case FillType::ChunkCombinedOffset:
@@ -68,6 +59,12 @@ void SerialContourGenerator::export_filled(
             // If ChunkCombinedOffsetOffset, return_lists[2][local.chunk] already contains
             //      outer offsets.
             break;
+        case FillType::OuterCode:
+        case FillType::OuterOffset:
+        case FillType::CombinedOffsetOffset:
+            // Written directly to combined arrays by march_combined_chunk(), not exported.
+            assert(false);
+            break;
     }
 }
 
@@ -78,36 +75,18 @@ void SerialContourGenerator::export_lines(
 
     switch (get_line_type())
     {
-        case LineType::Separate:
-        case LineType::SeparateCode: {
-            assert(!has_direct_points() && !has_direct_line_offsets());
-
-            bool separate_code = (get_line_type() == LineType::SeparateCode);
-
-            for (decltype(local.line_count) i = 0; i < local.line_count; ++i) {
-                auto point_start = local.line_offsets.start[i];
-                auto point_end = local.line_offsets.start[i+1];
-                auto point_count = point_end - point_start;
-                assert(point_count > 1);
-
-                return_lists[0].append(Converter::convert_points(
-                    point_count, local.points.start + 2*point_start));
-
-                if (separate_code) {
-                    return_lists[1].append(
-                        Converter::convert_codes_check_closed_single(
-                            point_count, local.points.start + 2*point_start));
-                }
-            }
-            break;
-        }
         case LineType::ChunkCombinedCode: {
             assert(has_direct_points() && !has_direct_line_offsets());
 
             // return_lists[0][local.chunk] already contains points.
-            return_lists[1][local.chunk] = Converter::convert_codes_check_closed(
-                local.total_point_count, local.line_count + 1, local.line_offsets.start,
-                local.points.start);
+            if (local.codes.start != nullptr)  // Caller-supplied output buffer.
+                Converter::convert_codes_check_closed(
+                    local.total_point_count, local.line_count + 1, local.line_offsets.start,
+                    local.points.start, local.codes.start);
+            else
+                return_lists[1][local.chunk] = Converter::convert_codes_check_closed(
+                    local.total_point_count, local.line_count + 1, local.line_offsets.start,
+                    local.points.start);
             break;
         }
         case LineType::ChunkCombinedOffset:
@@ -115,9 +94,20 @@ void SerialContourGenerator::export_lines(
             // return_lists[0][local.chunk] already contains points.
             // return_lists[1][local.chunk] already contains line offsets.
             break;
+        case LineType::Separate:
+        case LineType::SeparateCode:
+        case LineType::CombinedOffset:
+            // Written directly to combined arrays by march_combined_chunk(), not exported.
+            assert(false);
+            break;
     }
 }
 
+void SerialContourGenerator::export_to_callback(const ChunkLocal& local)
+{
+    call_chunk_callback(local);
+}
+
 void SerialContourGenerator::march(std::vector<py::list>& return_lists)
 {
     auto n_chunks = get_n_chunks();
@@ -129,11 +119,43 @@ void SerialContourGenerator::march(std::vector<py::list>& return_lists)
         init_cache_levels_and_starts();
     }
 
-    // Stage 2: Trace contours.
-    ChunkLocal local;
-    for (index_t chunk = 0; chunk < n_chunks; ++chunk) {
+    // Stage 2: Trace contours.  Cancellation is checked between chunks.
+    init_chunk_locals(1);
+    ChunkLocal& local = get_chunk_local(0);
+    local.clear();
+
+    if (is_count_first()) {
+        // Count all chunks before any are written so that each knows where it starts in the
+        // combined arrays, or so that the size of chunked output is known.
+        for (index_t chunk = 0; chunk < n_chunks && !is_cancelled(); ++chunk) {
+            get_chunk_limits(chunk, local);
+            if (!single_chunk)
+                init_cache_levels_and_starts(&local);
+            count_chunk(local);
+            local.clear();
+        }
+
+        if (is_count_only() || is_cancelled())
+            return;
+
+        if (is_output_combined()) {
+            create_combined_arrays(return_lists);
+
+            for (index_t chunk = 0; chunk < n_chunks && !is_cancelled(); ++chunk) {
+                get_chunk_limits(chunk, local);
+                march_combined_chunk(local);
+                local.clear();
+            }
+            return;
+        }
+
+        if (!reserve_counted_output_bytes())
+            return;  // Chunked output is too large so stop without marching any chunks.
+    }
+
+    for (index_t chunk = 0; chunk < n_chunks && !is_cancelled(); ++chunk) {
         get_chunk_limits(chunk, local);
-        if (!single_chunk)
+        if (!single_chunk && !is_count_first())
             init_cache_levels_and_starts(&local);
         march_chunk(local, return_lists);
         local.clear();
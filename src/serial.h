@@ -11,7 +11,8 @@ public:
     SerialContourGenerator(
         const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
         const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size);
+        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+        const py::object& transform, const py::object& transform_callback);
 
 private:
     friend class BaseContourGenerator<SerialContourGenerator>;
@@ -26,12 +27,21 @@ private:
         {}
     };
 
+    // Create a new contour generator with this generator's options but different arrays.
+    py::object create_from_arrays(
+        const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+        const MaskArray& mask, index_t x_chunk_size, index_t y_chunk_size,
+        const py::object& transform, const py::object& transform_callback) const;
+
     // Write points and offsets/codes to output numpy arrays.
     void export_filled(const ChunkLocal& local, std::vector<py::list>& return_lists);
 
     // Write points and offsets/codes to output numpy arrays.
     void export_lines(const ChunkLocal& local, std::vector<py::list>& return_lists);
 
+    // Pass a chunk to the chunk callback.
+    void export_to_callback(const ChunkLocal& local);
+
     void march(std::vector<py::list>& return_lists);
 };
 
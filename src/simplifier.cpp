@@ -0,0 +1,178 @@
+#include "simplifier.h"
+#include <algorithm>
+
+namespace contourpy {
+
+count_t Simplifier::furthest(
+    const double* points, const Section& section, double& distance_squared) const
+{
+    assert(section.second - section.first >= 2);
+
+    const double* start = points + 2*(section.first % _modulo);
+    const double* end = points + 2*(section.second % _modulo);
+    const double dx = end[0] - start[0];
+    const double dy = end[1] - start[1];
+    const double length_squared = dx*dx + dy*dy;
+
+    count_t ret = section.first + 1;
+    distance_squared = -1.0;
+    for (count_t i = section.first + 1; i < section.second; ++i) {
+        const double* point = points + 2*(i % _modulo);
+        double px = point[0] - start[0];
+        double py = point[1] - start[1];
+
+        // Distance to line segment rather than infinite line as start and end may be the same.
+        if (length_squared > 0.0) {
+            double t = std::clamp((px*dx + py*dy) / length_squared, 0.0, 1.0);
+            px -= t*dx;
+            py -= t*dy;
+        }
+
+        double dist_squared = px*px + py*py;
+        if (dist_squared > distance_squared) {
+            distance_squared = dist_squared;
+            ret = i;
+        }
+    }
+
+    return ret;
+}
+
+void Simplifier::release()
+{
+    std::vector<uint8_t>().swap(_keep);
+    std::vector<Section>().swap(_sections);
+    std::vector<Section>().swap(_stack);
+}
+
+count_t Simplifier::retained_bytes() const
+{
+    return _keep.capacity()*sizeof(uint8_t) + _sections.capacity()*sizeof(Section) +
+        _stack.capacity()*sizeof(Section);
+}
+
+count_t Simplifier::simplify(
+    double* points, count_t point_count, double tolerance, const std::vector<count_t>& anchors)
+{
+    assert(points != nullptr);
+
+    if (point_count < 3)
+        return point_count;
+
+    const double* last = points + 2*(point_count-1);
+    const bool closed = (last[0] == points[0] && last[1] == points[1]);
+
+    _modulo = (closed ? point_count - 1 : point_count);
+    _keep.assign(_modulo, 0);
+    _sections.clear();
+
+    if (!closed) {
+        count_t start = 0;
+        for (auto anchor : anchors) {
+            if (anchor > start && anchor < point_count-1) {
+                _sections.emplace_back(start, anchor);
+                start = anchor;
+            }
+        }
+        _sections.emplace_back(start, point_count-1);
+        _keep[point_count-1] = 1;
+    }
+    else {
+        // Sections between consecutive anchors, ignoring duplicates and the closing point.
+        count_t first = 0, start = 0, anchor_count = 0;
+        for (auto anchor : anchors) {
+            if (anchor >= _modulo || (anchor_count > 0 && anchor <= start))
+                continue;
+            if (anchor_count == 0)
+                first = anchor;
+            else
+                _sections.emplace_back(start, anchor);
+            start = anchor;
+            anchor_count++;
+        }
+        if (anchor_count >= 2)
+            _sections.emplace_back(start, first + _modulo);
+    }
+
+    const bool split_at_lowest = (closed && _sections.empty());
+    if (split_at_lowest) {
+        // Split at point with lowest x (then y) and the point furthest from it.
+        count_t lowest = 0;
+        for (count_t i = 1; i < _modulo; ++i) {
+            if (points[2*i] < points[2*lowest] ||
+                (points[2*i] == points[2*lowest] && points[2*i+1] < points[2*lowest+1]))
+                lowest = i;
+        }
+
+        double distance_squared;
+        Section all(lowest, lowest + _modulo);
+        auto other = furthest(points, all, distance_squared) % _modulo;
+        auto first = std::min(lowest, other);
+        auto second = std::max(lowest, other);
+        _sections.emplace_back(first, second);
+        _sections.emplace_back(second, first + _modulo);
+    }
+
+    const double tolerance_squared = tolerance*tolerance;
+    for (const auto& section : _sections) {
+        _keep[section.first % _modulo] = 1;
+        simplify_section(points, section, tolerance_squared);
+    }
+
+    if (split_at_lowest && std::count(_keep.begin(), _keep.end(), 1) < 3) {
+        // Keep furthest point of both sections regardless of tolerance.  Both rather than just one
+        // so that the result does not depend on the direction of the line.
+        for (const auto& section : _sections) {
+            if (section.second - section.first >= 2) {
+                double distance_squared;
+                _keep[furthest(points, section, distance_squared) % _modulo] = 1;
+            }
+        }
+    }
+
+    // Move kept points down to fill the gaps, preserving order.
+    count_t count = 0;
+    for (count_t i = 0; i < _modulo; ++i) {
+        if (_keep[i]) {
+            if (count != i) {
+                points[2*count] = points[2*i];
+                points[2*count+1] = points[2*i+1];
+            }
+            count++;
+        }
+    }
+
+    if (closed) {
+        // Close line using first point kept, which may not be the original first point.
+        points[2*count] = points[0];
+        points[2*count+1] = points[1];
+        count++;
+    }
+
+    return count;
+}
+
+void Simplifier::simplify_section(
+    const double* points, const Section& section, double tolerance_squared)
+{
+    _stack.clear();
+    _stack.push_back(section);
+
+    while (!_stack.empty()) {
+        auto current = _stack.back();
+        _stack.pop_back();
+
+        if (current.second - current.first < 2)
+            continue;
+
+        double distance_squared;
+        auto index = furthest(points, current, distance_squared);
+        if (distance_squared > tolerance_squared) {
+            _keep[index % _modulo] = 1;
+            _stack.emplace_back(current.first, index);
+            _stack.emplace_back(index, current.second);
+        }
+    }
+}
+
+} // namespace contourpy
@@ -0,0 +1,50 @@
+#ifndef CONTOURPY_SIMPLIFIER_H
+#define CONTOURPY_SIMPLIFIER_H
+
+#include "common.h"
+#include <vector>
+
+namespace contourpy {
+
+// Douglas-Peucker simplification of contour lines in place.  Work buffers are retained between
+// calls for reuse.
+class Simplifier
+{
+public:
+    // Simplify a line of point_count (x, y) points in place and return the new number of points.
+    // Points are removed if they are within tolerance of the straight line segment between the
+    // points that are kept either side of them.  The first and last points of open lines are
+    // always kept.  Lines are split into sections at the indices in anchors, which must be
+    // ascending, and these points are always kept.  Closed lines with fewer than two anchors are
+    // instead split at the point with the lowest x (then y) and the point furthest from it, so
+    // that the result does not depend on where the line starts or which direction it goes, and
+    // are not reduced to fewer than 3 unique points.
+    count_t simplify(
+        double* points, count_t point_count, double tolerance,
+        const std::vector<count_t>& anchors);
+
+    // Free retained work buffers.
+    void release();
+
+    // Number of bytes held in retained work buffers.
+    count_t retained_bytes() const;
+
+private:
+    typedef std::pair<count_t, count_t> Section;  // Start and end indices, end may wrap around.
+
+    // Return index of the point furthest from the straight line segment between the start and
+    // end points of a section, and its squared distance.  Indices are modulo _modulo.
+    count_t furthest(const double* points, const Section& section, double& distance_squared) const;
+
+    // Mark points of a section that are kept.
+    void simplify_section(const double* points, const Section& section, double tolerance_squared);
+
+    count_t _modulo;                // Number of unique points, less than point_count if closed.
+    std::vector<uint8_t> _keep;     // Whether each point is kept.
+    std::vector<Section> _sections; // Sections between anchors.
+    std::vector<Section> _stack;    // Sections still to process.
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_SIMPLIFIER_H
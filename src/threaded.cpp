@@ -2,6 +2,8 @@
 #include "converter.h"
 #include "threaded.h"
 #include "util.h"
+#include <algorithm>
+#include <chrono>
 #include <thread>
 
 namespace contourpy {
@@ -10,13 +12,26 @@ ThreadedContourGenerator::ThreadedContourGenerator(
     const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
     const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
     bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
-    index_t n_threads)
+    index_t n_threads, const py::object& transform, const py::object& transform_callback)
     : BaseContourGenerator(x, y, z, mask, corner_mask, line_type, fill_type, quad_as_tri, z_interp,
-                           x_chunk_size, y_chunk_size),
+                           x_chunk_size, y_chunk_size, transform, transform_callback),
       _n_threads(limit_n_threads(n_threads, get_n_chunks())),
-      _next_chunk(0)
+      _next_chunk(0),
+      _finished_worker_count(0)
 {}
 
+py::object ThreadedContourGenerator::create_from_arrays(
+    const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+    const MaskArray& mask, index_t x_chunk_size, index_t y_chunk_size,
+    const py::object& transform, const py::object& transform_callback) const
+{
+    return py::cast(
+        new ThreadedContourGenerator(
+            x, y, z, mask, get_corner_mask(), get_line_type(), get_fill_type(), get_quad_as_tri(),
+            get_z_interp(), x_chunk_size, y_chunk_size, _n_threads, transform, transform_callback),
+        py::return_value_policy::take_ownership);
+}
+
 void ThreadedContourGenerator::export_filled(
     const ChunkLocal& local, std::vector<py::list>& return_lists)
 {
@@ -28,68 +43,6 @@ void ThreadedContourGenerator::export_filled(
 
     switch (get_fill_type())
     {
-        case FillType::OuterCode:
-        case FillType::OuterOffset: {
-            assert(!has_direct_points() && !has_direct_line_offsets());
-
-            auto outer_count = local.line_count - local.hole_count;
-            bool outer_code = (get_fill_type() == FillType::OuterCode);
-            std::vector<PointArray::value_type*> points_ptrs(outer_count);
-            std::vector<CodeArray::value_type*> codes_ptrs(outer_code ? outer_count: 0);
-            std::vector<OffsetArray::value_type*> offsets_ptrs(outer_code ? 0 : outer_count);
-
-            {
-                Lock lock(*this);  // cppcheck-suppress unreadVariable
-                for (decltype(outer_count) i = 0; i < outer_count; ++i) {
-                    auto outer_start = local.outer_offsets.start[i];
-                    auto outer_end = local.outer_offsets.start[i+1];
-                    auto point_start = local.line_offsets.start[outer_start];
-                    auto point_end = local.line_offsets.start[outer_end];
-                    auto point_count = point_end - point_start;
-                    assert(point_count > 2);
-
-                    index_t points_shape[2] = {static_cast<index_t>(point_count), 2};
-                    PointArray point_array(points_shape);
-                    return_lists[0].append(point_array);
-                    points_ptrs[i] = point_array.mutable_data();
-
-                    if (outer_code) {
-                        index_t codes_shape = static_cast<index_t>(point_count);
-                        CodeArray code_array(codes_shape);
-                        return_lists[1].append(code_array);
-                        codes_ptrs[i] = code_array.mutable_data();
-                    }
-                    else {
-                        index_t offsets_shape = static_cast<index_t>(outer_end - outer_start + 1);
-                        OffsetArray offset_array(offsets_shape);
-                        return_lists[1].append(offset_array);
-                        offsets_ptrs[i] = offset_array.mutable_data();
-                    }
-                }
-            }
-
-            for (decltype(outer_count) i = 0; i < outer_count; ++i) {
-                auto outer_start = local.outer_offsets.start[i];
-                auto outer_end = local.outer_offsets.start[i+1];
-                auto point_start = local.line_offsets.start[outer_start];
-                auto point_end = local.line_offsets.start[outer_end];
-                auto point_count = point_end - point_start;
-                assert(point_count > 2);
-
-                Converter::convert_points(
-                    point_count, local.points.start + 2*point_start, points_ptrs[i]);
-
-                if (outer_code)
-                    Converter::convert_codes(
-                        point_count, outer_end - outer_start + 1,
-                        local.line_offsets.start + outer_start, point_start, codes_ptrs[i]);
-                else
-                    Converter::convert_offsets(
-                        outer_end - outer_start + 1, local.line_offsets.start + outer_start,
-                        point_start, offsets_ptrs[i]);
-            }
-            break;
-        }
         case FillType::ChunkCombinedCode:
         case FillType::ChunkCombinedCodeOffset: {
             assert(has_direct_points() && !has_direct_line_offsets());
@@ -98,9 +51,9 @@ void ThreadedContourGenerator::export_filled(
             //    offsets.
 
             index_t codes_shape = static_cast<index_t>(local.total_point_count);
-            CodeArray::value_type* codes_ptr = nullptr;
+            CodeArray::value_type* codes_ptr = local.codes.start;  // Caller-supplied or nullptr.
 
-            {
+            if (codes_ptr == nullptr) {
                 Lock lock(*this);  // cppcheck-suppress unreadVariable
                 CodeArray code_array(codes_shape);
                 return_lists[1][local.chunk] = code_array;
@@ -123,6 +76,12 @@ void ThreadedContourGenerator::export_filled(
             // If ChunkCombinedOffsetOffset, return_lists[2][local.chunk] already contains
             //      outer offsets.
             break;
+        case FillType::OuterCode:
+        case FillType::OuterOffset:
+        case FillType::CombinedOffsetOffset:
+            // Written directly to combined arrays by march_combined_chunk(), not exported.
+            assert(false);
+            break;
     }
 }
 
@@ -137,61 +96,14 @@ void ThreadedContourGenerator::export_lines(
 
     switch (get_line_type())
     {
-        case LineType::Separate:
-        case LineType::SeparateCode: {
-            assert(!has_direct_points() && !has_direct_line_offsets());
-
-            bool separate_code = (get_line_type() == LineType::SeparateCode);
-            std::vector<PointArray::value_type*> points_ptrs(local.line_count);
-            std::vector<CodeArray::value_type*> codes_ptrs(separate_code ? local.line_count: 0);
-
-            {
-                Lock lock(*this);  // cppcheck-suppress unreadVariable
-                for (decltype(local.line_count) i = 0; i < local.line_count; ++i) {
-                    auto point_start = local.line_offsets.start[i];
-                    auto point_end = local.line_offsets.start[i+1];
-                    auto point_count = point_end - point_start;
-                    assert(point_count > 1);
-
-                    index_t points_shape[2] = {static_cast<index_t>(point_count), 2};
-                    PointArray point_array(points_shape);
-
-                    return_lists[0].append(point_array);
-                    points_ptrs[i] = point_array.mutable_data();
-
-                    if (separate_code) {
-                        index_t codes_shape = static_cast<index_t>(point_count);
-                        CodeArray code_array(codes_shape);
-                        return_lists[1].append(code_array);
-                        codes_ptrs[i] = code_array.mutable_data();
-                    }
-                }
-            }
-
-            for (decltype(local.line_count) i = 0; i < local.line_count; ++i) {
-                auto point_start = local.line_offsets.start[i];
-                auto point_end = local.line_offsets.start[i+1];
-                auto point_count = point_end - point_start;
-                assert(point_count > 1);
-
-                Converter::convert_points(
-                    point_count, local.points.start + 2*point_start, points_ptrs[i]);
-
-                if (separate_code) {
-                    Converter::convert_codes_check_closed_single(
-                        point_count, local.points.start + 2*point_start, codes_ptrs[i]);
-                }
-            }
-            break;
-        }
         case LineType::ChunkCombinedCode: {
             assert(has_direct_points() && !has_direct_line_offsets());
             // return_lists[0][local.chunk] already contains points.
 
             index_t codes_shape = static_cast<index_t>(local.total_point_count);
-            CodeArray::value_type* codes_ptr = nullptr;
+            CodeArray::value_type* codes_ptr = local.codes.start;  // Caller-supplied or nullptr.
 
-            {
+            if (codes_ptr == nullptr) {
                 Lock lock(*this);  // cppcheck-suppress unreadVariable
                 CodeArray code_array(codes_shape);
                 return_lists[1][local.chunk] = code_array;
@@ -208,7 +120,31 @@ void ThreadedContourGenerator::export_lines(
             // return_lists[0][local.chunk] already contains points.
             // return_lists[1][local.chunk] already contains line offsets.
             break;
+        case LineType::Separate:
+        case LineType::SeparateCode:
+        case LineType::CombinedOffset:
+            // Written directly to combined arrays by march_combined_chunk(), not exported.
+            assert(false);
+            break;
+    }
+}
+
+void ThreadedContourGenerator::export_to_callback(const ChunkLocal& local)
+{
+    if (_n_threads == 1) {
+        // Called on the main thread.
+        Lock lock(*this);  // cppcheck-suppress unreadVariable
+        call_chunk_callback(local);
+        return;
     }
+
+    std::unique_lock<std::mutex> lock(_callback_mutex);
+    _callback_queue.push_back(&local);
+    _callback_condition.notify_all();
+    _callback_condition.wait(lock, [&] {
+        return std::find(_callback_queue.begin(), _callback_queue.end(), &local) ==
+            _callback_queue.end();
+    });
 }
 
 index_t ThreadedContourGenerator::get_thread_count() const
@@ -232,81 +168,191 @@ void ThreadedContourGenerator::march(std::vector<py::list>& return_lists)
     //   2) Trace contours
     // Each stage is performed on a chunk by chunk basis.  There is a barrier between the two stages
     // to synchronise the threads so the cache setup is complete before being used by the trace.
+    // For combined output stage 2 is split into counting and writing, separated by another barrier
+    // during which the combined arrays are created.  If only counting, the writing is omitted.
     _next_chunk = 0;      // Next available chunk index.
-    _finished_count = 0;  // Count of threads that have finished the cache init.
+    _finished_count = 0;  // Count of threads that have reached the current barrier.
+    _barrier_generation = 0;
+
+    // Each thread uses its own ChunkLocal, created here before the threads are started.
+    init_chunk_locals(_n_threads);
 
     // Main thread releases GIL for remainder of this function.
     // It is temporarily reacquired as necessary within the scope of threaded Lock objects.
     py::gil_scoped_release release;
 
-    // Create (_n_threads-1) new worker threads.
     std::vector<std::thread> threads;
-    threads.reserve(_n_threads-1);
-    for (index_t i = 0; i < _n_threads-1; ++i)
-        threads.emplace_back(
-            &ThreadedContourGenerator::thread_function, this, std::ref(return_lists));
-
-    thread_function(std::ref(return_lists));  // Main thread work.
+    if (is_output_callback() && _n_threads > 1) {
+        // Chunks are passed to the callback on the main thread, so create _n_threads new worker
+        // threads to do all of the contouring.
+        _finished_worker_count = 0;
+        threads.reserve(_n_threads);
+        for (index_t i = 0; i < _n_threads; ++i)
+            threads.emplace_back([this, &return_lists, i]() {
+                thread_function(return_lists, i);
+
+                std::lock_guard<std::mutex> guard(_callback_mutex);
+                _finished_worker_count++;
+                _callback_condition.notify_all();
+            });
+
+        process_callback_queue();  // Main thread work.
+    }
+    else {
+        // Create (_n_threads-1) new worker threads.
+        threads.reserve(_n_threads-1);
+        for (index_t i = 1; i < _n_threads; ++i)
+            threads.emplace_back(
+                &ThreadedContourGenerator::thread_function, this, std::ref(return_lists), i);
+
+        thread_function(std::ref(return_lists), 0);  // Main thread work.
+    }
 
     for (auto& thread : threads)
         thread.join();
-    assert(_next_chunk == 2*get_n_chunks());
+    assert(is_cancelled() ||
+           _next_chunk == (is_count_first() && !is_count_only() ? 3 : 2)*get_n_chunks());
     threads.clear();
 }
 
-void ThreadedContourGenerator::thread_function(std::vector<py::list>& return_lists)
+bool ThreadedContourGenerator::next_chunk(index_t stage, index_t& chunk)
+{
+    if (is_cancelled())
+        return false;  // Stop early, but all threads still reach the barriers.
+
+    auto n_chunks = get_n_chunks();
+
+    std::lock_guard<std::mutex> guard(_chunk_mutex);
+    if (_next_chunk < (stage+1)*n_chunks) {
+        chunk = _next_chunk++ - stage*n_chunks;
+        return true;
+    }
+    else
+        return false;  // No more work to do in this stage.
+}
+
+void ThreadedContourGenerator::process_callback_queue()
+{
+    std::unique_lock<std::mutex> lock(_callback_mutex);
+    while (true) {
+        // Wake up periodically whilst waiting to poll for Python signals.
+        auto ready = _callback_condition.wait_for(lock, std::chrono::milliseconds(50), [&] {
+            return !_callback_queue.empty() || _finished_worker_count == _n_threads;
+        });
+        if (!ready) {
+            lock.unlock();
+            {
+                Lock python_lock(*this);  // cppcheck-suppress unreadVariable
+                poll_signals();
+            }
+            lock.lock();
+            continue;
+        }
+
+        if (_callback_queue.empty())
+            break;  // All worker threads have finished.
+
+        // Chunk remains in the queue until the callback has returned, so that the worker thread
+        // that owns it waits until then.
+        auto local = _callback_queue.front();
+        lock.unlock();
+        {
+            Lock python_lock(*this);  // cppcheck-suppress unreadVariable
+            call_chunk_callback(*local);
+        }
+        lock.lock();
+
+        _callback_queue.pop_front();
+        _callback_condition.notify_all();
+    }
+}
+
+void ThreadedContourGenerator::thread_function(
+    std::vector<py::list>& return_lists, index_t thread_index)
 {
     // Function that is executed by each of the threads.
     // _next_chunk starts at zero and increases up to 2*_n_chunks.  A thread in need of work reads
     // _next_chunk and incremements it, then processes that chunk.  For _next_chunk < _n_chunks this
     // is stage 1 (init cache levels and starting locations) and for _next_chunk >= _n_chunks this
     // is stage 2 (trace contours).  There is a synchronisation barrier between the two stages so
-    // that the cache initialisation is complete before being used by the contour trace.
+    // that the cache initialisation is complete before being used by the trace.  For combined
+    // output _next_chunk increases up to 3*_n_chunks as stage 2 counts the chunks and stage 3
+    // writes them to the combined arrays.  Chunked output that is counted first to check its size
+    // also has 3 stages.
 
-    auto n_chunks = get_n_chunks();
     index_t chunk;
-    ChunkLocal local;
+    ChunkLocal& local = get_chunk_local(thread_index);
+    local.clear();
 
     // Stage 1: Initialise cache z-levels and starting locations.
-    while (true) {
-        {
-            std::lock_guard<std::mutex> guard(_chunk_mutex);
-            if (_next_chunk < n_chunks)
-                chunk = _next_chunk++;
-            else
-                break;  // No more work to do.
-        }
-
+    while (next_chunk(0, chunk)) {
         get_chunk_limits(chunk, local);
         init_cache_levels_and_starts(&local);
         local.clear();
     }
 
-    {
-        // Implementation of multithreaded barrier.  Each thread increments the shared counter.
-        // Last thread to finish notifies the other threads that they can all continue.
-        std::unique_lock<std::mutex> lock(_chunk_mutex);
-        _finished_count++;
-        if (_finished_count == _n_threads)
-            _condition_variable.notify_all();
-        else
-            _condition_variable.wait(lock);
-    }
+    wait_for_threads();
 
-    // Stage 2: Trace contours.
-    while (true) {
-        {
-            std::lock_guard<std::mutex> guard(_chunk_mutex);
-            if (_next_chunk < 2*n_chunks)
-                chunk = _next_chunk++ - n_chunks;
+    index_t trace_stage = 1;
+    if (is_count_first()) {
+        // Stage 2: Count contour points and lines in each chunk.
+        while (next_chunk(1, chunk)) {
+            get_chunk_limits(chunk, local);
+            count_chunk(local);
+            local.clear();
+        }
+
+        if (is_count_only())
+            return;
+
+        wait_for_threads();
+
+        if (thread_index == 0 && !is_cancelled()) {
+            Lock lock(*this);  // cppcheck-suppress unreadVariable
+            if (is_output_combined())
+                create_combined_arrays(return_lists);
             else
-                break;  // No more work to do.
+                reserve_counted_output_bytes();  // Stops the march if it fails.
         }
 
+        wait_for_threads();
+
+        if (is_output_combined()) {
+            // Stage 3: Trace contours into each chunk's slice of the combined arrays.
+            while (next_chunk(2, chunk)) {
+                get_chunk_limits(chunk, local);
+                march_combined_chunk(local);
+                local.clear();
+            }
+            return;
+        }
+
+        trace_stage = 2;
+    }
+
+    // Final stage: Trace contours.
+    while (next_chunk(trace_stage, chunk)) {
         get_chunk_limits(chunk, local);
         march_chunk(local, return_lists);
         local.clear();
     }
 }
 
+void ThreadedContourGenerator::wait_for_threads()
+{
+    // Implementation of multithreaded barrier.  Each thread increments the shared counter.
+    // Last thread to finish notifies the other threads that they can all continue.  The barrier
+    // generation is used so that the barrier can be reused and is robust to spurious wakeups.
+    std::unique_lock<std::mutex> lock(_chunk_mutex);
+    auto generation = _barrier_generation;
+    _finished_count++;
+    if (_finished_count == _n_threads) {
+        _finished_count = 0;
+        _barrier_generation++;
+        _condition_variable.notify_all();
+    }
+    else
+        _condition_variable.wait(lock, [&] { return generation != _barrier_generation; });
+}
+
 } // namespace contourpy
@@ -3,6 +3,7 @@
 
 #include "base.h"
 #include <condition_variable>
+#include <deque>
 #include <mutex>
 
 namespace contourpy {
@@ -14,7 +15,7 @@ public:
         const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
         const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
         bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
-        index_t n_threads);
+        index_t n_threads, const py::object& transform, const py::object& transform_callback);
 
     index_t get_thread_count() const;
 
@@ -41,27 +42,57 @@ private:
         py::gil_scoped_acquire _gil;
     };
 
+    // Create a new contour generator with this generator's options but different arrays.
+    py::object create_from_arrays(
+        const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+        const MaskArray& mask, index_t x_chunk_size, index_t y_chunk_size,
+        const py::object& transform, const py::object& transform_callback) const;
+
     // Write points and offsets/codes to output numpy arrays.
     void export_filled(const ChunkLocal& local, std::vector<py::list>& return_lists);
 
     // Write points and offsets/codes to output numpy arrays.
     void export_lines(const ChunkLocal& local, std::vector<py::list>& return_lists);
 
+    // Pass a chunk to the chunk callback.  If there are worker threads the chunk is queued for the
+    // main thread and this waits until the callback has returned, as the chunk's buffers are
+    // reused by the next chunk.
+    void export_to_callback(const ChunkLocal& local);
+
     static index_t limit_n_threads(index_t n_threads, index_t n_chunks);
 
     void march(std::vector<py::list>& return_lists);
 
-    void thread_function(std::vector<py::list>& return_lists);
+    // Get the next chunk to process in the specified stage, returning false if there are none left
+    // or the march has been cancelled.
+    bool next_chunk(index_t stage, index_t& chunk);
+
+    // Pass chunks queued by export_to_callback() to the chunk callback until all worker threads
+    // have finished, polling for Python signals whilst waiting.  Executed by the main thread.
+    void process_callback_queue();
+
+    // thread_index is in range 0 to _n_threads-1 and identifies the ChunkLocal used.
+    void thread_function(std::vector<py::list>& return_lists, index_t thread_index);
+
+    // Barrier that waits until all threads have reached it.
+    void wait_for_threads();
 
 
 
     // Multithreading member variables.
     index_t _n_threads;        // Number of threads used.
     index_t _next_chunk;       // Next available chunk for thread to process.
-    index_t _finished_count;   // Count of threads that have finished the cache init.
-    std::mutex _chunk_mutex;   // Locks access to _next_chunk/_finished_count.
+    index_t _finished_count;   // Count of threads that have reached the current barrier.
+    index_t _barrier_generation;  // Incremented each time all threads reach a barrier.
+    std::mutex _chunk_mutex;   // Locks access to _next_chunk/_finished_count/_barrier_generation.
     std::mutex _python_mutex;  // Locks access to Python objects.
     std::condition_variable _condition_variable;  // Implements multithreaded barrier.
+
+    // Chunks waiting to be passed to the chunk callback by the main thread.
+    std::deque<const ChunkLocal*> _callback_queue;
+    index_t _finished_worker_count;  // Count of worker threads that have finished.
+    std::mutex _callback_mutex;      // Locks access to _callback_queue/_finished_worker_count.
+    std::condition_variable _callback_condition;  // Signals changes to the above.
 };
 
 } // namespace contourpy
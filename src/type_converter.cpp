@@ -0,0 +1,745 @@
+#include "converter.h"
+#include "geometry_writer.h"
+#include "mpl_kind_code.h"
+#include "type_converter.h"
+#include <algorithm>
+#include <cstring>
+#include <limits>
+#include <sstream>
+
+namespace contourpy {
+
+TypeConverter::Piece::Piece()
+    : point_count(0)
+{}
+
+count_t TypeConverter::Piece::line_count() const
+{
+    return line_offsets.empty() ? 0 : line_offsets.size() - 1;
+}
+
+count_t TypeConverter::Piece::outer_count() const
+{
+    return outer_offsets.empty() ? 0 : outer_offsets.size() - 1;
+}
+
+TypeConverter::Piece TypeConverter::combine(const Pieces& pieces, count_t begin, count_t end)
+{
+    Piece combined;
+    count_t non_empty_count = 0;
+    const Piece* non_empty = nullptr;
+    bool identify_holes = true;
+    for (auto i = begin; i < end; ++i) {
+        const auto& piece = pieces[i];
+        if (piece.point_count > 0) {
+            non_empty_count++;
+            non_empty = &piece;
+            combined.point_count += piece.point_count;
+            identify_holes = identify_holes && !piece.outer_offsets.empty();
+        }
+    }
+
+    if (non_empty_count == 0)
+        return combined;
+
+    if (non_empty_count == 1) {
+        combined = *non_empty;
+        if (!identify_holes)
+            combined.outer_offsets.clear();
+        return combined;
+    }
+
+    if (combined.point_count > std::numeric_limits<offset_t>::max())
+        throw std::range_error("Max offset too large to fit in np.uint32. Use smaller chunks.");
+
+    index_t points_shape[2] = {static_cast<index_t>(combined.point_count), 2};
+    combined.points = InputPointArray(points_shape);
+    auto points = combined.points.mutable_data();
+
+    combined.line_offsets.push_back(0);
+    if (identify_holes)
+        combined.outer_offsets.push_back(0);
+
+    offset_t point_offset = 0;
+    offset_t line_offset = 0;
+    for (auto i = begin; i < end; ++i) {
+        const auto& piece = pieces[i];
+        if (piece.point_count == 0)
+            continue;
+
+        Converter::convert_points(piece.point_count, piece.points.data(), points);
+        points += 2*piece.point_count;
+
+        for (count_t j = 1; j <= piece.line_count(); ++j)
+            combined.line_offsets.push_back(piece.line_offsets[j] + point_offset);
+
+        if (identify_holes) {
+            for (count_t j = 1; j <= piece.outer_count(); ++j)
+                combined.outer_offsets.push_back(piece.outer_offsets[j] + line_offset);
+        }
+
+        point_offset += static_cast<offset_t>(piece.point_count);
+        line_offset += static_cast<offset_t>(piece.line_count());
+    }
+
+    return combined;
+}
+
+py::object TypeConverter::convert_filled(
+    const py::object& filled, FillType fill_type_from, FillType fill_type_to)
+{
+    if (has_outer_offsets(fill_type_to) && !has_outer_offsets(fill_type_from)) {
+        std::ostringstream ss;
+        ss << "Conversion from FillType." << fill_type_from << " to FillType." << fill_type_to
+            << " is not supported as the former does not identify which holes belong to which "
+               "outer boundaries";
+        throw std::invalid_argument(ss.str());
+    }
+
+    return write_filled(read_filled(filled, fill_type_from), fill_type_from, fill_type_to);
+}
+
+py::object TypeConverter::convert_lines(
+    const py::object& lines, LineType line_type_from, LineType line_type_to)
+{
+    return write_lines(read_lines(lines, line_type_from), line_type_from, line_type_to);
+}
+
+py::object TypeConverter::empty_points()
+{
+    index_t points_shape[2] = {0, 2};
+    return PointArray(points_shape);
+}
+
+py::bytes TypeConverter::filled_to_geojson(const py::object& filled, FillType fill_type)
+{
+    count_t polygon_count, line_count, point_count;
+    auto pieces = read_polygons(filled, fill_type, polygon_count, line_count, point_count);
+
+    const char* header = "{\"type\":\"MultiPolygon\",\"coordinates\":[";
+    GeometryWriter writer(
+        std::strlen(header) + 2 + 3*(polygon_count + line_count) +
+        (4 + 2*GeometryWriter::max_number_chars)*point_count);
+    writer.write_text(header);
+
+    bool first_polygon = true;
+    for (const auto& piece : pieces) {
+        auto points = piece.point_count > 0 ? piece.points.data() : nullptr;
+        for (count_t outer = 0; outer < piece.outer_count(); ++outer) {
+            if (!first_polygon)
+                writer.write_text(',');
+            first_polygon = false;
+
+            writer.write_text('[');
+            for (auto line = piece.outer_offsets[outer]; line < piece.outer_offsets[outer+1];
+                 ++line) {
+                if (line > piece.outer_offsets[outer])
+                    writer.write_text(',');
+                auto start = piece.line_offsets[line];
+                writer.write_text('[');
+                writer.write_json_points(points + 2*start, piece.line_offsets[line+1] - start);
+                writer.write_text(']');
+            }
+            writer.write_text(']');
+        }
+    }
+
+    writer.write_text("]}");
+    return writer.finish();
+}
+
+py::bytes TypeConverter::filled_to_wkb(const py::object& filled, FillType fill_type)
+{
+    count_t polygon_count, line_count, point_count;
+    auto pieces = read_polygons(filled, fill_type, polygon_count, line_count, point_count);
+
+    GeometryWriter writer(9 + 9*polygon_count + 4*line_count + 16*point_count);
+    writer.write_wkb_type(6);  // MultiPolygon.
+    writer.write_wkb_uint32(static_cast<uint32_t>(polygon_count));
+
+    for (const auto& piece : pieces) {
+        auto points = piece.point_count > 0 ? piece.points.data() : nullptr;
+        for (count_t outer = 0; outer < piece.outer_count(); ++outer) {
+            auto line_begin = piece.outer_offsets[outer];
+            auto line_end = piece.outer_offsets[outer+1];
+            writer.write_wkb_type(3);  // Polygon.
+            writer.write_wkb_uint32(line_end - line_begin);
+            for (auto line = line_begin; line < line_end; ++line) {
+                auto start = piece.line_offsets[line];
+                auto count = piece.line_offsets[line+1] - start;
+                writer.write_wkb_uint32(count);
+                writer.write_wkb_points(points + 2*start, count);
+            }
+        }
+    }
+
+    return writer.finish();
+}
+
+bool TypeConverter::has_outer_offsets(FillType fill_type)
+{
+    return !(fill_type == FillType::ChunkCombinedCode || fill_type == FillType::ChunkCombinedOffset);
+}
+
+bool TypeConverter::is_chunked(FillType fill_type)
+{
+    switch (fill_type) {
+        case FillType::ChunkCombinedCode:
+        case FillType::ChunkCombinedOffset:
+        case FillType::ChunkCombinedCodeOffset:
+        case FillType::ChunkCombinedOffsetOffset:
+            return true;
+        default:
+            return false;
+    }
+}
+
+bool TypeConverter::is_chunked(LineType line_type)
+{
+    return line_type == LineType::ChunkCombinedCode || line_type == LineType::ChunkCombinedOffset;
+}
+
+py::bytes TypeConverter::lines_to_geojson(const py::object& lines, LineType line_type)
+{
+    auto pieces = read_lines(lines, line_type);
+
+    count_t line_count = 0, point_count = 0;
+    for (const auto& piece : pieces) {
+        line_count += piece.line_count();
+        point_count += piece.point_count;
+    }
+
+    const char* header = "{\"type\":\"MultiLineString\",\"coordinates\":[";
+    GeometryWriter writer(
+        std::strlen(header) + 2 + 3*line_count +
+        (4 + 2*GeometryWriter::max_number_chars)*point_count);
+    writer.write_text(header);
+
+    bool first_line = true;
+    for (const auto& piece : pieces) {
+        for (count_t line = 0; line < piece.line_count(); ++line) {
+            if (!first_line)
+                writer.write_text(',');
+            first_line = false;
+
+            auto start = piece.line_offsets[line];
+            writer.write_text('[');
+            writer.write_json_points(
+                piece.points.data() + 2*start, piece.line_offsets[line+1] - start);
+            writer.write_text(']');
+        }
+    }
+
+    writer.write_text("]}");
+    return writer.finish();
+}
+
+py::bytes TypeConverter::lines_to_wkb(const py::object& lines, LineType line_type)
+{
+    auto pieces = read_lines(lines, line_type);
+
+    count_t line_count = 0, point_count = 0;
+    for (const auto& piece : pieces) {
+        line_count += piece.line_count();
+        point_count += piece.point_count;
+    }
+
+    GeometryWriter writer(9 + 9*line_count + 16*point_count);
+    writer.write_wkb_type(5);  // MultiLineString.
+    writer.write_wkb_uint32(static_cast<uint32_t>(line_count));
+
+    for (const auto& piece : pieces) {
+        for (count_t line = 0; line < piece.line_count(); ++line) {
+            auto start = piece.line_offsets[line];
+            auto count = piece.line_offsets[line+1] - start;
+            writer.write_wkb_type(2);  // LineString.
+            writer.write_wkb_uint32(count);
+            writer.write_wkb_points(piece.points.data() + 2*start, count);
+        }
+    }
+
+    return writer.finish();
+}
+
+py::object TypeConverter::offsets_to_python(const std::vector<offset_t>& offsets)
+{
+    assert(!offsets.empty());
+    return Converter::convert_offsets(offsets.size(), offsets.data(), 0);
+}
+
+TypeConverter::Pieces TypeConverter::read_filled(const py::object& filled, FillType fill_type)
+{
+    Pieces pieces;
+
+    switch (fill_type) {
+        case FillType::OuterCode:
+        case FillType::OuterOffset: {
+            // One piece per polygon.
+            auto lists = read_tuple(filled, 2, "filled");
+            auto all_points = lists[0].cast<py::list>();
+            auto all_codes_or_offsets = lists[1].cast<py::list>();
+            if (all_points.size() != all_codes_or_offsets.size())
+                throw std::invalid_argument("filled lists must have the same length");
+
+            bool codes = (fill_type == FillType::OuterCode);
+            pieces.resize(all_points.size());
+            for (py::size_t i = 0; i < all_points.size(); ++i) {
+                auto& piece = pieces[i];
+                piece.points = read_points(all_points[i], piece.point_count);
+                piece.line_offsets =
+                    read_line_offsets(all_codes_or_offsets[i], codes, piece.point_count);
+                if (piece.point_count > 0)
+                    piece.outer_offsets = {0, static_cast<offset_t>(piece.line_count())};
+            }
+            break;
+        }
+        case FillType::ChunkCombinedCode:
+        case FillType::ChunkCombinedOffset:
+        case FillType::ChunkCombinedCodeOffset:
+        case FillType::ChunkCombinedOffsetOffset: {
+            // One piece per chunk.
+            bool have_outer_offsets = has_outer_offsets(fill_type);
+            auto lists = read_tuple(filled, have_outer_offsets ? 3 : 2, "filled");
+            auto chunk_points = lists[0].cast<py::list>();
+            auto chunk_codes_or_offsets = lists[1].cast<py::list>();
+            auto chunk_outer_offsets = have_outer_offsets ? lists[2].cast<py::list>() : py::list();
+            if (chunk_points.size() != chunk_codes_or_offsets.size() ||
+                (have_outer_offsets && chunk_points.size() != chunk_outer_offsets.size()))
+                throw std::invalid_argument("filled lists must have the same length");
+
+            bool codes = (fill_type == FillType::ChunkCombinedCode ||
+                          fill_type == FillType::ChunkCombinedCodeOffset);
+            pieces.resize(chunk_points.size());
+            for (py::size_t i = 0; i < chunk_points.size(); ++i) {
+                if (chunk_points[i].is_none())
+                    continue;  // Empty chunk.
+
+                auto& piece = pieces[i];
+                piece.points = read_points(chunk_points[i], piece.point_count);
+                piece.line_offsets =
+                    read_line_offsets(chunk_codes_or_offsets[i], codes, piece.point_count);
+                if (fill_type == FillType::ChunkCombinedOffsetOffset)
+                    piece.outer_offsets = read_offsets(
+                        chunk_outer_offsets[i], static_cast<offset_t>(piece.line_count()));
+                else if (fill_type == FillType::ChunkCombinedCodeOffset) {
+                    // Outer offsets are into points, convert them to be into line offsets.
+                    auto outer_point_offsets = read_offsets(
+                        chunk_outer_offsets[i], static_cast<offset_t>(piece.point_count));
+                    offset_t line = 0;
+                    for (auto point_offset : outer_point_offsets) {
+                        while (line < piece.line_offsets.size() &&
+                               piece.line_offsets[line] < point_offset)
+                            ++line;
+                        if (line == piece.line_offsets.size() ||
+                            piece.line_offsets[line] != point_offset)
+                            throw std::invalid_argument(
+                                "filled outer offsets must be at the start of boundaries");
+                        piece.outer_offsets.push_back(line);
+                    }
+                }
+            }
+            break;
+        }
+        case FillType::CombinedOffsetOffset: {
+            // Single piece.
+            auto arrays = read_tuple(filled, 3, "filled");
+            pieces.resize(1);
+            auto& piece = pieces[0];
+            piece.points = read_points(arrays[0], piece.point_count);
+            piece.line_offsets = read_line_offsets(arrays[1], false, piece.point_count);
+            if (piece.point_count > 0)
+                piece.outer_offsets =
+                    read_offsets(arrays[2], static_cast<offset_t>(piece.line_count()));
+            break;
+        }
+    }
+
+    return pieces;
+}
+
+std::vector<offset_t> TypeConverter::read_line_offsets(
+    const py::handle& codes_or_offsets, bool codes, count_t point_count)
+{
+    if (!codes)
+        return read_offsets(codes_or_offsets, static_cast<offset_t>(point_count));
+
+    auto codes_array = CodeArray::ensure(codes_or_offsets);
+    if (!codes_array || codes_array.ndim() != 1 ||
+        static_cast<count_t>(codes_array.shape(0)) != point_count)
+        throw std::invalid_argument(
+            "codes must be a 1D array of the same length as the corresponding points");
+
+    std::vector<offset_t> line_offsets;
+    if (point_count == 0)
+        return line_offsets;
+
+    auto codes_ptr = codes_array.data();
+    if (codes_ptr[0] != MOVETO)
+        throw std::invalid_argument("codes must start with a MOVETO kind code of 1");
+
+    for (count_t i = 0; i < point_count; ++i) {
+        if (codes_ptr[i] == MOVETO)
+            line_offsets.push_back(static_cast<offset_t>(i));
+    }
+    line_offsets.push_back(static_cast<offset_t>(point_count));
+    return line_offsets;
+}
+
+TypeConverter::Pieces TypeConverter::read_lines(const py::object& lines, LineType line_type)
+{
+    Pieces pieces;
+
+    switch (line_type) {
+        case LineType::Separate:
+        case LineType::SeparateCode: {
+            // One piece per line.
+            py::list all_points;
+            if (line_type == LineType::Separate)
+                all_points = lines.cast<py::list>();
+            else
+                all_points = read_tuple(lines, 2, "lines")[0].cast<py::list>();
+
+            pieces.resize(all_points.size());
+            for (py::size_t i = 0; i < all_points.size(); ++i) {
+                auto& piece = pieces[i];
+                piece.points = read_points(all_points[i], piece.point_count);
+                if (piece.point_count > 0)
+                    piece.line_offsets = {0, static_cast<offset_t>(piece.point_count)};
+            }
+            break;
+        }
+        case LineType::ChunkCombinedCode:
+        case LineType::ChunkCombinedOffset: {
+            // One piece per chunk.
+            auto lists = read_tuple(lines, 2, "lines");
+            auto chunk_points = lists[0].cast<py::list>();
+            auto chunk_codes_or_offsets = lists[1].cast<py::list>();
+            if (chunk_points.size() != chunk_codes_or_offsets.size())
+                throw std::invalid_argument("lines lists must have the same length");
+
+            bool codes = (line_type == LineType::ChunkCombinedCode);
+            pieces.resize(chunk_points.size());
+            for (py::size_t i = 0; i < chunk_points.size(); ++i) {
+                if (chunk_points[i].is_none())
+                    continue;  // Empty chunk.
+
+                auto& piece = pieces[i];
+                piece.points = read_points(chunk_points[i], piece.point_count);
+                piece.line_offsets =
+                    read_line_offsets(chunk_codes_or_offsets[i], codes, piece.point_count);
+            }
+            break;
+        }
+        case LineType::CombinedOffset: {
+            // Single piece.
+            auto arrays = read_tuple(lines, 2, "lines");
+            pieces.resize(1);
+            auto& piece = pieces[0];
+            piece.points = read_points(arrays[0], piece.point_count);
+            piece.line_offsets = read_line_offsets(arrays[1], false, piece.point_count);
+            break;
+        }
+    }
+
+    return pieces;
+}
+
+std::vector<offset_t> TypeConverter::read_offsets(const py::handle& offsets, offset_t max_offset)
+{
+    auto offsets_array = OffsetArray::ensure(offsets);
+    if (!offsets_array || offsets_array.ndim() != 1)
+        throw std::invalid_argument("offsets must be a 1D array");
+
+    auto size = offsets_array.shape(0);
+    auto ptr = offsets_array.data();
+    if (max_offset == 0) {
+        // Empty, as returned by Combined types.
+        if (size > 1 || (size == 1 && ptr[0] != 0))
+            throw std::invalid_argument("offsets of empty points must be [0]");
+        return std::vector<offset_t>();
+    }
+
+    if (size < 2 || ptr[0] != 0 || ptr[size-1] != max_offset ||
+        !std::is_sorted(ptr, ptr + size))
+        throw std::invalid_argument(
+            "offsets must be increasing from 0 to the length of the array they index into");
+
+    return std::vector<offset_t>(ptr, ptr + size);
+}
+
+TypeConverter::InputPointArray TypeConverter::read_points(
+    const py::handle& points, count_t& point_count)
+{
+    auto points_array = InputPointArray::ensure(points);
+    if (!points_array || points_array.ndim() != 2 || points_array.shape(1) != 2)
+        throw std::invalid_argument("points must be a 2D array of shape (npoints, 2)");
+
+    point_count = points_array.shape(0);
+    return points_array;
+}
+
+TypeConverter::Pieces TypeConverter::read_polygons(
+    const py::object& filled, FillType fill_type, count_t& polygon_count, count_t& line_count,
+    count_t& point_count)
+{
+    if (!has_outer_offsets(fill_type)) {
+        std::ostringstream ss;
+        ss << "Serialisation of FillType." << fill_type << " is not supported as it does not "
+              "identify which holes belong to which outer boundaries";
+        throw std::invalid_argument(ss.str());
+    }
+
+    auto pieces = read_filled(filled, fill_type);
+
+    polygon_count = line_count = point_count = 0;
+    for (const auto& piece : pieces) {
+        polygon_count += piece.outer_count();
+        line_count += piece.line_count();
+        point_count += piece.point_count;
+    }
+
+    return pieces;
+}
+
+py::sequence TypeConverter::read_tuple(const py::object& obj, py::size_t length, const char* name)
+{
+    if (!py::isinstance<py::tuple>(obj) || py::len(obj) != length)
+        throw std::invalid_argument(
+            std::string(name) + " must be a tuple of length " + std::to_string(length));
+    return obj.cast<py::sequence>();
+}
+
+void TypeConverter::simplify(Pieces& pieces, double tolerance)
+{
+    if (tolerance < 0.0)
+        throw std::invalid_argument("tolerance cannot be negative");
+
+    Simplifier simplifier;
+    const std::vector<count_t> no_anchors;
+
+    for (auto& piece : pieces) {
+        if (piece.point_count == 0)
+            continue;
+
+        // Copy as input points arrays may be read-only or shared with other objects.
+        index_t points_shape[2] = {static_cast<index_t>(piece.point_count), 2};
+        InputPointArray points(points_shape);
+        auto start = points.mutable_data();
+        Converter::convert_points(piece.point_count, piece.points.data(), start);
+
+        auto ptr = start;
+        for (count_t i = 0; i < piece.line_count(); ++i) {
+            auto line_start = start + 2*piece.line_offsets[i];
+            auto point_count = piece.line_offsets[i+1] - piece.line_offsets[i];
+            piece.line_offsets[i] = static_cast<offset_t>((ptr - start) / 2);
+            auto new_count = simplifier.simplify(line_start, point_count, tolerance, no_anchors);
+            ptr = std::copy(line_start, line_start + 2*new_count, ptr);
+        }
+
+        piece.point_count = (ptr - start) / 2;
+        piece.line_offsets.back() = static_cast<offset_t>(piece.point_count);
+        points.resize({static_cast<index_t>(piece.point_count), index_t(2)}, false);
+        piece.points = points;
+    }
+}
+
+py::object TypeConverter::simplify_filled(
+    const py::object& filled, FillType fill_type, double tolerance)
+{
+    auto pieces = read_filled(filled, fill_type);
+    simplify(pieces, tolerance);
+    return write_filled(pieces, fill_type, fill_type);
+}
+
+py::object TypeConverter::simplify_lines(
+    const py::object& lines, LineType line_type, double tolerance)
+{
+    auto pieces = read_lines(lines, line_type);
+    simplify(pieces, tolerance);
+    return write_lines(pieces, line_type, line_type);
+}
+
+py::object TypeConverter::write_filled(
+    const Pieces& pieces, FillType fill_type_from, FillType fill_type_to)
+{
+    count_t piece_count = pieces.size();
+
+    bool three_lists = has_outer_offsets(fill_type_to) &&
+        !(fill_type_to == FillType::OuterCode || fill_type_to == FillType::OuterOffset);
+    std::vector<py::list> return_lists(three_lists ? 3 : 2);
+
+    if (fill_type_to == FillType::CombinedOffsetOffset) {
+        write_filled(combine(pieces, 0, piece_count), fill_type_to, return_lists);
+        return py::make_tuple(return_lists[0][0], return_lists[1][0], return_lists[2][0]);
+    }
+
+    if (is_chunked(fill_type_to) && !is_chunked(fill_type_from))
+        write_filled(combine(pieces, 0, piece_count), fill_type_to, return_lists);
+    else {
+        // Either chunk to chunk, or polygons of each piece written separately.
+        for (const auto& piece : pieces)
+            write_filled(piece, fill_type_to, return_lists);
+    }
+
+    if (three_lists)
+        return py::make_tuple(return_lists[0], return_lists[1], return_lists[2]);
+    else
+        return py::make_tuple(return_lists[0], return_lists[1]);
+}
+
+py::object TypeConverter::write_lines(
+    const Pieces& pieces, LineType line_type_from, LineType line_type_to)
+{
+    count_t piece_count = pieces.size();
+
+    std::vector<py::list> return_lists(line_type_to == LineType::Separate ? 1 : 2);
+
+    if (line_type_to == LineType::CombinedOffset) {
+        write_lines(combine(pieces, 0, piece_count), line_type_to, return_lists);
+        return py::make_tuple(return_lists[0][0], return_lists[1][0]);
+    }
+
+    if (is_chunked(line_type_to) && !is_chunked(line_type_from))
+        write_lines(combine(pieces, 0, piece_count), line_type_to, return_lists);
+    else {
+        // Either chunk to chunk, or lines of each piece written separately.
+        for (const auto& piece : pieces)
+            write_lines(piece, line_type_to, return_lists);
+    }
+
+    if (line_type_to == LineType::Separate)
+        return return_lists[0];
+    else
+        return py::make_tuple(return_lists[0], return_lists[1]);
+}
+
+void TypeConverter::write_filled(
+    const Piece& piece, FillType fill_type, std::vector<py::list>& return_lists)
+{
+    auto point_count = piece.point_count;
+    if (point_count == 0) {
+        if (fill_type == FillType::CombinedOffsetOffset) {
+            std::vector<offset_t> zero = {0};
+            return_lists[0].append(empty_points());
+            return_lists[1].append(offsets_to_python(zero));
+            return_lists[2].append(offsets_to_python(zero));
+        }
+        else if (is_chunked(fill_type)) {
+            for (auto& list : return_lists)
+                list.append(py::none());
+        }
+        return;
+    }
+
+    auto points = piece.points.data();
+    auto line_count = piece.line_count();
+    auto line_offsets = piece.line_offsets.data();
+
+    switch (fill_type) {
+        case FillType::OuterCode:
+        case FillType::OuterOffset: {
+            assert(!piece.outer_offsets.empty());
+            for (count_t i = 0; i < piece.outer_count(); ++i) {
+                auto outer_start = piece.outer_offsets[i];
+                auto outer_end = piece.outer_offsets[i+1];
+                auto point_start = line_offsets[outer_start];
+                auto point_end = line_offsets[outer_end];
+                auto polygon_point_count = point_end - point_start;
+
+                if (piece.outer_count() == 1)
+                    return_lists[0].append(piece.points);  // Whole piece is a single polygon.
+                else
+                    return_lists[0].append(
+                        Converter::convert_points(polygon_point_count, points + 2*point_start));
+
+                if (fill_type == FillType::OuterCode)
+                    return_lists[1].append(Converter::convert_codes(
+                        polygon_point_count, outer_end - outer_start + 1,
+                        line_offsets + outer_start, point_start));
+                else
+                    return_lists[1].append(Converter::convert_offsets(
+                        outer_end - outer_start + 1, line_offsets + outer_start, point_start));
+            }
+            break;
+        }
+        case FillType::ChunkCombinedCode:
+        case FillType::ChunkCombinedCodeOffset:
+            return_lists[0].append(piece.points);
+            return_lists[1].append(
+                Converter::convert_codes(point_count, line_count + 1, line_offsets, 0));
+            if (fill_type == FillType::ChunkCombinedCodeOffset) {
+                // Outer offsets are into points.
+                assert(!piece.outer_offsets.empty());
+                std::vector<offset_t> outer_offsets;
+                outer_offsets.reserve(piece.outer_offsets.size());
+                for (auto outer_offset : piece.outer_offsets)
+                    outer_offsets.push_back(line_offsets[outer_offset]);
+                return_lists[2].append(offsets_to_python(outer_offsets));
+            }
+            break;
+        case FillType::ChunkCombinedOffset:
+        case FillType::ChunkCombinedOffsetOffset:
+        case FillType::CombinedOffsetOffset:
+            return_lists[0].append(piece.points);
+            return_lists[1].append(offsets_to_python(piece.line_offsets));
+            if (fill_type != FillType::ChunkCombinedOffset) {
+                assert(!piece.outer_offsets.empty());
+                return_lists[2].append(offsets_to_python(piece.outer_offsets));
+            }
+            break;
+    }
+}
+
+void TypeConverter::write_lines(
+    const Piece& piece, LineType line_type, std::vector<py::list>& return_lists)
+{
+    auto point_count = piece.point_count;
+    if (point_count == 0) {
+        if (line_type == LineType::CombinedOffset) {
+            return_lists[0].append(empty_points());
+            return_lists[1].append(offsets_to_python(std::vector<offset_t>{0}));
+        }
+        else if (is_chunked(line_type)) {
+            for (auto& list : return_lists)
+                list.append(py::none());
+        }
+        return;
+    }
+
+    auto points = piece.points.data();
+    auto line_count = piece.line_count();
+    auto line_offsets = piece.line_offsets.data();
+
+    switch (line_type) {
+        case LineType::Separate:
+        case LineType::SeparateCode: {
+            for (count_t i = 0; i < line_count; ++i) {
+                auto point_start = line_offsets[i];
+                auto line_point_count = line_offsets[i+1] - point_start;
+
+                if (line_count == 1)
+                    return_lists[0].append(piece.points);  // Whole piece is a single line.
+                else
+                    return_lists[0].append(
+                        Converter::convert_points(line_point_count, points + 2*point_start));
+
+                if (line_type == LineType::SeparateCode)
+                    return_lists[1].append(Converter::convert_codes_check_closed_single(
+                        line_point_count, points + 2*point_start));
+            }
+            break;
+        }
+        case LineType::ChunkCombinedCode:
+            return_lists[0].append(piece.points);
+            return_lists[1].append(Converter::convert_codes_check_closed(
+                point_count, line_count + 1, line_offsets, points));
+            break;
+        case LineType::ChunkCombinedOffset:
+        case LineType::CombinedOffset:
+            return_lists[0].append(piece.points);
+            return_lists[1].append(offsets_to_python(piece.line_offsets));
+            break;
+    }
+}
+
+} // namespace contourpy
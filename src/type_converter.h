@@ -0,0 +1,107 @@
+#ifndef CONTOURPY_TYPE_CONVERTER_H
+#define CONTOURPY_TYPE_CONVERTER_H
+
+#include "common.h"
+#include "fill_type.h"
+#include "line_type.h"
+#include "simplifier.h"
+#include <vector>
+
+namespace contourpy {
+
+// Conversion of filled and line contours that have already been calculated from one FillType or
+// LineType to another.  Input data is first read into a common intermediate form, one Piece per
+// chunk for chunked types or one Piece per polygon/line otherwise, which is then written out in
+// the requested form using Converter.  Converting from a chunked type to a non-chunked type
+// combines (dechunks) the chunks together.
+class TypeConverter
+{
+public:
+    static py::object convert_filled(
+        const py::object& filled, FillType fill_type_from, FillType fill_type_to);
+
+    static py::object convert_lines(
+        const py::object& lines, LineType line_type_from, LineType line_type_to);
+
+    // Serialise as a single GeoJSON MultiPolygon or MultiLineString geometry object.
+    static py::bytes filled_to_geojson(const py::object& filled, FillType fill_type);
+    static py::bytes lines_to_geojson(const py::object& lines, LineType line_type);
+
+    // Serialise as a single little-endian WKB MultiPolygon or MultiLineString.
+    static py::bytes filled_to_wkb(const py::object& filled, FillType fill_type);
+    static py::bytes lines_to_wkb(const py::object& lines, LineType line_type);
+
+    // Simplify each boundary or line, returning the same FillType or LineType.
+    static py::object simplify_filled(
+        const py::object& filled, FillType fill_type, double tolerance);
+
+    static py::object simplify_lines(const py::object& lines, LineType line_type, double tolerance);
+
+private:
+    typedef py::array_t<double, py::array::c_style | py::array::forcecast> InputPointArray;
+
+    struct Piece
+    {
+        Piece();
+
+        count_t line_count() const;
+        count_t outer_count() const;
+
+        InputPointArray points;               // Not set if point_count == 0.
+        count_t point_count;
+        std::vector<offset_t> line_offsets;   // Into points, empty if point_count == 0.
+        std::vector<offset_t> outer_offsets;  // Into line_offsets, empty if holes not identified.
+    };
+    typedef std::vector<Piece> Pieces;
+
+    // Combine pieces in range [begin, end) into a single piece.  Reuses the points array if there
+    // is only one non-empty piece.
+    static Piece combine(const Pieces& pieces, count_t begin, count_t end);
+
+    static py::object empty_points();
+
+    static bool is_chunked(FillType fill_type);
+    static bool is_chunked(LineType line_type);
+
+    static bool has_outer_offsets(FillType fill_type);
+
+    static py::object offsets_to_python(const std::vector<offset_t>& offsets);
+
+    static Pieces read_filled(const py::object& filled, FillType fill_type);
+    static Pieces read_lines(const py::object& lines, LineType line_type);
+
+    // Line offsets from either kind codes or offsets.
+    static std::vector<offset_t> read_line_offsets(
+        const py::handle& codes_or_offsets, bool codes, count_t point_count);
+
+    static std::vector<offset_t> read_offsets(const py::handle& offsets, offset_t max_offset);
+
+    static InputPointArray read_points(const py::handle& points, count_t& point_count);
+
+    // Read filled contours that identify which holes belong to which outer boundaries, counting
+    // the polygons, boundaries and points of all pieces.
+    static Pieces read_polygons(
+        const py::object& filled, FillType fill_type, count_t& polygon_count,
+        count_t& line_count, count_t& point_count);
+
+    static py::sequence read_tuple(const py::object& obj, py::size_t length, const char* name);
+
+    // Simplify each line of each piece in place, replacing their points arrays.
+    static void simplify(Pieces& pieces, double tolerance);
+
+    // Return pieces in the form required by fill_type_to/line_type_to.
+    static py::object write_filled(
+        const Pieces& pieces, FillType fill_type_from, FillType fill_type_to);
+    static py::object write_lines(
+        const Pieces& pieces, LineType line_type_from, LineType line_type_to);
+
+    // Append piece to return_lists in the form required by fill_type/line_type.
+    static void write_filled(
+        const Piece& piece, FillType fill_type, std::vector<py::list>& return_lists);
+    static void write_lines(
+        const Piece& piece, LineType line_type, std::vector<py::list>& return_lists);
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_TYPE_CONVERTER_H
@@ -1,11 +1,17 @@
 #include "base_impl.h"
+#include "cancel_token.h"
 #include "contour_generator.h"
 #include "fill_type.h"
+#include "line_metrics.h"
 #include "line_type.h"
 #include "mpl2005.h"
 #include "mpl2014.h"
+#include "mvt_encoder.h"
+#include "output_too_large_error.h"
+#include "quantizer.h"
 #include "serial.h"
 #include "threaded.h"
+#include "type_converter.h"
 #include "util.h"
 #include "z_interp.h"
 
@@ -17,7 +23,16 @@ namespace py = pybind11;
 static contourpy::LineType mpl20xx_line_type = contourpy::LineType::SeparateCode;
 static contourpy::FillType mpl20xx_fill_type = contourpy::FillType::OuterCode;
 
+// Raise a ValueError for a ContourGenerator method that a subclass does not support.
+[[noreturn]] static void not_supported(py::handle self, const char* method)
+{
+    throw std::invalid_argument(
+        py::type::of(self).attr("__name__").cast<std::string>() + " does not support " + method);
+}
+
 PYBIND11_MODULE(_contourpy, m) {
+    PYBIND11_NUMPY_DTYPE(contourpy::LineMetrics, area, length, xmin, ymin, xmax, ymax, closed);
+
     m.doc() =
         "C++11 extension module wrapped using `pybind11`_.\n\n"
         ".. note::\n"
@@ -48,6 +63,7 @@ PYBIND11_MODULE(_contourpy, m) {
         .value("ChunkCombinedOffset", contourpy::FillType::ChunkCombinedOffset)
         .value("ChunkCombinedCodeOffset", contourpy::FillType::ChunkCombinedCodeOffset)
         .value("ChunkCombinedOffsetOffset", contourpy::FillType::ChunkCombinedOffsetOffset)
+        .value("CombinedOffsetOffset", contourpy::FillType::CombinedOffsetOffset)
         .export_values();
 
     py::enum_<contourpy::LineType>(m, "LineType",
@@ -58,6 +74,7 @@ PYBIND11_MODULE(_contourpy, m) {
         .value("SeparateCode", contourpy::LineType::SeparateCode)
         .value("ChunkCombinedCode", contourpy::LineType::ChunkCombinedCode)
         .value("ChunkCombinedOffset", contourpy::LineType::ChunkCombinedOffset)
+        .value("CombinedOffset", contourpy::LineType::CombinedOffset)
         .export_values();
 
     py::enum_<contourpy::ZInterp>(m, "ZInterp",
@@ -68,15 +85,141 @@ PYBIND11_MODULE(_contourpy, m) {
         .value("Log", contourpy::ZInterp::Log)
         .export_values();
 
+    py::class_<contourpy::CancelToken>(m, "CancelToken",
+        "Token used to cancel a long-running contouring operation from another thread.\n\n"
+        "Set it as the :attr:`~contourpy.ContourGenerator.cancel_token` of a "
+        ":class:`~contourpy.SerialContourGenerator` or "
+        ":class:`~contourpy.ThreadedContourGenerator` and call :meth:`cancel` from any thread to "
+        "stop the current and any later contouring operations of that generator, which raise "
+        ":class:`~contourpy.CancelledError`. Cancellation is checked between chunks. Once "
+        "cancelled a token stays cancelled, so use a new token for each operation that may be "
+        "cancelled.")
+        .def(py::init<>())
+        .def("cancel", &contourpy::CancelToken::cancel,
+            "Request that contouring operations using this token stop as soon as possible.")
+        .def_property_readonly("cancelled", &contourpy::CancelToken::is_cancelled,
+            "Return whether :meth:`cancel` has been called.");
+
+    py::register_exception<contourpy::CancelledError>(m, "CancelledError", PyExc_RuntimeError);
+
+    py::register_exception<contourpy::OutputTooLargeError>(
+        m, "OutputTooLargeError", PyExc_RuntimeError);
+    py::register_exception_translator([](std::exception_ptr ptr) {
+        // Takes precedence over the translator of register_exception, so that the Python
+        // exception has attributes as well as a message.
+        try {
+            if (ptr)
+                std::rethrow_exception(ptr);
+        }
+        catch (const contourpy::OutputTooLargeError& e) {
+            auto error_type =
+                py::module_::import("contourpy._contourpy").attr("OutputTooLargeError");
+            auto error = error_type(e.what());
+            error.attr("estimated_bytes") = e.get_estimated_bytes();
+            error.attr("max_output_bytes") = e.get_max_output_bytes();
+            PyErr_SetObject(error_type.ptr(), error.ptr());
+        }
+    });
+
+    m.def("convert_filled", &contourpy::TypeConverter::convert_filled,
+        py::arg("filled"), py::arg("fill_type_from"), py::arg("fill_type_to"),
+        "Convert filled contours from one :class:`~contourpy.FillType` to another.\n\n"
+        "Use :func:`contourpy.convert_filled` instead, which also accepts string fill types.");
+
+    m.def("convert_lines", &contourpy::TypeConverter::convert_lines,
+        py::arg("lines"), py::arg("line_type_from"), py::arg("line_type_to"),
+        "Convert contour lines from one :class:`~contourpy.LineType` to another.\n\n"
+        "Use :func:`contourpy.convert_lines` instead, which also accepts string line types.");
+
+    m.def("filled_to_geojson", &contourpy::TypeConverter::filled_to_geojson,
+        py::arg("filled"), py::arg("fill_type"),
+        "Serialise filled contours as GeoJSON MultiPolygon bytes.\n\n"
+        "Use :func:`contourpy.to_geojson_bytes` instead, which also accepts string fill types.");
+
+    m.def("filled_to_wkb", &contourpy::TypeConverter::filled_to_wkb,
+        py::arg("filled"), py::arg("fill_type"),
+        "Serialise filled contours as WKB MultiPolygon bytes.\n\n"
+        "Use :func:`contourpy.to_wkb` instead, which also accepts string fill types.");
+
+    m.def("lines_to_geojson", &contourpy::TypeConverter::lines_to_geojson,
+        py::arg("lines"), py::arg("line_type"),
+        "Serialise contour lines as GeoJSON MultiLineString bytes.\n\n"
+        "Use :func:`contourpy.to_geojson_bytes` instead, which also accepts string line types.");
+
+    m.def("lines_to_wkb", &contourpy::TypeConverter::lines_to_wkb,
+        py::arg("lines"), py::arg("line_type"),
+        "Serialise contour lines as WKB MultiLineString bytes.\n\n"
+        "Use :func:`contourpy.to_wkb` instead, which also accepts string line types.");
+
+    m.def("quantize_points", &contourpy::Quantizer::quantize,
+        py::arg("points"), py::arg("offsets"), py::arg("x0"), py::arg("y0"), py::arg("x_scale"),
+        py::arg("y_scale"), py::arg("dtype"), py::arg("delta"),
+        "Quantise points to int16 or int32 coordinates, optionally delta encoded per line.\n\n"
+        "Use :func:`contourpy.quantize` instead, which accepts filled contours and contour "
+        "lines.");
+
+    m.def("simplify_filled", &contourpy::TypeConverter::simplify_filled,
+        py::arg("filled"), py::arg("fill_type"), py::arg("tolerance"),
+        "Simplify filled contours.\n\n"
+        "Use :func:`contourpy.simplify` instead, which also accepts string fill types.");
+
+    m.def("simplify_lines", &contourpy::TypeConverter::simplify_lines,
+        py::arg("lines"), py::arg("line_type"), py::arg("tolerance"),
+        "Simplify contour lines.\n\n"
+        "Use :func:`contourpy.simplify` instead, which also accepts string line types.");
+
+    m.def("encode_mvt_filled", &contourpy::MvtEncoder::encode_filled,
+        py::arg("points"), py::arg("offsets"), py::arg("outer_offsets"), py::arg("x0"),
+        py::arg("y0"), py::arg("x1"), py::arg("y1"), py::arg("extent"),
+        "Encode filled contours in ``FillType.CombinedOffsetOffset`` form as the packed geometry "
+        "of a Mapbox Vector Tile polygon feature.\n\n"
+        "Use :func:`contourpy.tiles.filled_tile` instead.");
+
+    m.def("encode_mvt_lines", &contourpy::MvtEncoder::encode_lines,
+        py::arg("points"), py::arg("offsets"), py::arg("x0"), py::arg("y0"), py::arg("x1"),
+        py::arg("y1"), py::arg("extent"),
+        "Encode contour lines in ``LineType.CombinedOffset`` form as the packed geometry of a "
+        "Mapbox Vector Tile linestring feature.\n\n"
+        "Use :func:`contourpy.tiles.lines_tile` instead.");
+
     m.def("max_threads", &contourpy::Util::get_max_threads,
         "Return the maximum number of threads, obtained from "
         "``std::thread::hardware_concurrency()``.\n\n"
         "This is the number of threads used by a multithreaded ContourGenerator if the kwarg "
         "``threads=0`` is passed to :func:`~contourpy.contour_generator`.");
 
+    const char* cancel_token_doc =
+        "Optional :class:`~contourpy.CancelToken` that is checked between chunks of each "
+        "contouring operation, default ``None``. If it is cancelled the operation stops early and "
+        "raises :class:`~contourpy.CancelledError`.\n\n"
+        "Cancellation is only checked between chunks, so a large grid must be divided into chunks "
+        "using ``chunk_size`` or ``chunk_count`` for an operation to stop promptly.";
     const char* chunk_count_doc = "Return tuple of (y, x) chunk counts.";
     const char* chunk_size_doc = "Return tuple of (y, x) chunk sizes.";
     const char* corner_mask_doc = "Return whether ``corner_mask`` is set or not.";
+    const char* count_filled_doc =
+        "Count the points, boundaries and holes of filled contours between two levels in each "
+        "chunk, without calculating the contours.\n\n"
+        "Only the first (counting) pass of the contouring algorithm is performed, so this is "
+        "much cheaper than :meth:`~contourpy.ContourGenerator.filled` and can be used to plan "
+        "chunking or allocate output buffers.\n\n"
+        "Args:\n"
+        "    lower_level (float): Lower z-level of the filled contours.\n"
+        "    upper_level (float): Upper z-level of the filled contours.\n\n"
+        "Return:\n"
+        "    Tuple of ``(point_counts, line_counts, hole_counts)``, each a ``uint64`` array with "
+        "an item for each chunk. ``line_counts`` includes both outer boundaries and holes.";
+    const char* count_lines_doc =
+        "Count the points and lines of contour lines at a particular level in each chunk, "
+        "without calculating the lines.\n\n"
+        "Only the first (counting) pass of the contouring algorithm is performed, so this is "
+        "much cheaper than :meth:`~contourpy.ContourGenerator.lines` and can be used to plan "
+        "chunking or allocate output buffers.\n\n"
+        "Args:\n"
+        "    level (float): z-level to count contours at.\n\n"
+        "Return:\n"
+        "    Tuple of ``(point_counts, line_counts)``, each a ``uint64`` array with an item for "
+        "each chunk.";
     const char* create_contour_doc =
         "Synonym for :func:`~contourpy.ContourGenerator.lines` to provide backward compatibility "
         "with Matplotlib.";
@@ -94,6 +237,153 @@ PYBIND11_MODULE(_contourpy, m) {
         "Return:\n"
         "    Filled contour polygons as one or more sequences of numpy arrays. The exact format is "
         "determined by the ``fill_type`` used by the ``ContourGenerator``.";
+    const char* filled_out_doc =
+        "Calculate and return filled contours between two levels.\n\n"
+        "Args:\n"
+        "    lower_level (float): Lower z-level of the filled contours.\n"
+        "    upper_level (float): Upper z-level of the filled contours.\n"
+        "    out (tuple of numpy arrays, optional): Caller-supplied arrays to write the results "
+        "to, only supported by ``ChunkCombined`` fill types. There is one array for each sequence "
+        "returned, with the same dtype and number of dimensions as the returned arrays. The "
+        "returned arrays are views into these.\n"
+        "    sparse (bool, optional): Whether to return only the chunks that contain contours, "
+        "only supported by ``ChunkCombined`` fill types. Default ``False``.\n"
+        "    result (bool, optional): Whether to return a :class:`~contourpy.ContourResult` "
+        "instead of sequences of numpy arrays. Default ``False``.\n"
+        "    metrics (bool, optional): Whether to also return geometric metrics of each "
+        "boundary (outer or hole), calculated as the contours are traced. Default ``False``.\n"
+        "    min_points (int, optional): Discard boundaries with fewer than this many points, "
+        "including the repeated closing point. Default ``0``.\n"
+        "    min_area (float, optional): Discard boundaries with an absolute area less than this. "
+        "Default ``0.0``.\n"
+        "    min_length (float, optional): Discard boundaries with a length less than this. "
+        "Default ``0.0``.\n"
+        "    simplify_tolerance (float, optional): If positive, simplify boundaries by removing "
+        "points that are within this distance of the line between the points either side of "
+        "them that are kept. Default ``0.0``.\n\n"
+        "Return:\n"
+        "    Filled contour polygons as one or more sequences of numpy arrays. The exact format is "
+        "determined by the ``fill_type`` used by the ``ContourGenerator``.\n\n"
+        "    If ``out`` is specified, returns a tuple of ``(filled, used)`` where ``used`` is a "
+        "tuple of the number of elements (points for the points array) used in each of the "
+        "``out`` arrays. If any ``out`` array is too small then ``filled`` is ``None`` and "
+        "``used`` contains the numbers of elements required instead.\n\n"
+        "    If ``sparse`` is ``True``, ``filled`` is replaced by a tuple of ``(filled, "
+        "chunk_indices)`` where the sequences in ``filled`` only contain the non-empty chunks and "
+        "``chunk_indices`` is an ``int32`` array of their chunk indices.\n\n"
+        "    If ``result`` is ``True``, ``filled`` (and ``chunk_indices`` if ``sparse`` is "
+        "``True``) is replaced by a :class:`~contourpy.ContourResult`.\n\n"
+        "    If ``metrics`` is ``True``, ``filled`` is replaced by a tuple of ``(filled, "
+        "metrics)`` where ``metrics`` is a structured numpy array with an item for each boundary "
+        "in the same order as they appear in ``filled``. It has fields ``area`` (signed area, "
+        "positive for outer boundaries and negative for holes), ``length``, ``xmin``, ``ymin``, "
+        "``xmax``, ``ymax`` and ``closed``.\n\n"
+        "    Metrics are per boundary, not per polygon. An outer boundary and each of its holes "
+        "have separate items, so the ``area`` of an outer boundary does not exclude its holes and "
+        "its ``length`` does not include them. The items of a polygon are adjacent with the outer "
+        "boundary first, so per-polygon values can be calculated from the outer offsets, such as "
+        "the net area of each polygon of ``CombinedOffsetOffset`` contours using "
+        "``np.add.reduceat(metrics[\"area\"], outer_offsets[:-1])``.\n\n"
+        "    Filtering using ``min_points``, ``min_area`` or ``min_length`` occurs as the contours "
+        "are traced so that discarded boundaries are never returned. For fill types that identify "
+        "which holes belong to which outer boundaries, if an outer boundary is discarded then so "
+        "are its holes.\n\n"
+        "    Simplification uses the Douglas-Peucker algorithm on each boundary as it is traced, "
+        "before filtering. Points where a boundary meets the domain or chunk boundary are always "
+        "kept so that boundaries shared by adjacent polygons, including those of filled contours "
+        "calculated using adjacent levels, are simplified in the same way. As a result small "
+        "boundaries may collapse to fewer than 3 unique points, use ``min_area`` to discard them."
+        "\n\n"
+        "    Filtering and simplification cannot be used with ``out``.";
+    const char* filled_into_doc =
+        "Calculate filled contours and pass each chunk to a callable as soon as it has been "
+        "calculated, rather than returning them.\n\n"
+        "``sink(chunk, points, offsets, outer_offsets)`` is called once for each chunk that "
+        "contains filled contours, where ``chunk`` is the chunk index and the arrays are those of "
+        "a ``ChunkCombinedOffsetOffset`` chunk regardless of the ``fill_type`` of this "
+        "ContourGenerator. Chunks are passed in order of completion, which is not defined if "
+        "using multiple threads, but ``sink`` is always called on the calling thread. Nothing is "
+        "retained once this returns.\n\n"
+        "If ``quantize_bbox`` is specified the points of each chunk are quantised as they are "
+        "passed to ``sink``, in the same way as :func:`~contourpy.quantize` with the same "
+        "``bbox``, ``dtype`` and ``delta``, so that ``float64`` points of the whole domain are "
+        "never held in memory. The ``scale`` and ``offset`` needed to recover the points are "
+        "those returned by :func:`~contourpy.quantize` for the same ``bbox`` and ``dtype``.\n\n"
+        "Not supported by the ``mpl2005`` and ``mpl2014`` algorithms, which raise a "
+        "``ValueError``.\n\n"
+        "Args:\n"
+        "    sink (callable): Called with each non-empty chunk.\n"
+        "    lower_level (float): Lower z-level of the filled contours.\n"
+        "    upper_level (float): Upper z-level of the filled contours.\n"
+        "    quantize_bbox (tuple(float, float, float, float), optional): Bounding box "
+        "``(x0, y0, x1, y1)`` to quantise points within, after any transform. Default ``None`` "
+        "for ``float64`` points.\n"
+        "    quantize_dtype (int16 or int32): Integer dtype of quantised points, default "
+        "``int32``.\n"
+        "    quantize_delta (bool): Whether to delta encode quantised points within each "
+        "boundary, default ``False``.\n\n"
+        "Raises:\n"
+        "    ValueError: If ``quantize_bbox`` or ``quantize_dtype`` are invalid, or if any points "
+        "are outside ``quantize_bbox``.\n\n"
+        ".. warning::\n"
+        "    The arrays are views of internal buffers that are reused for later chunks, so they "
+        "are only valid during the call to ``sink``. Copy them to keep them.";
+    const char* filled_progressive_doc =
+        "Calculate filled contours progressively from coarse to fine resolution, returning an "
+        "iterator so that an approximate result can be displayed quickly and then refined.\n\n"
+        "The first item is the filled contours of the whole grid decimated using "
+        ":meth:`~contourpy.ContourGenerator.stride` in both directions. The grid is then divided "
+        "into regions of ``region_size`` quads in each direction and each region that the "
+        "decimated contours pass through is recalculated at full resolution using "
+        ":meth:`~contourpy.ContourGenerator.window`, in row-major order. The full resolution "
+        "contours of a region replace the decimated contours within it. Features that are "
+        "too small to appear in the decimated grid at all are not refined.\n\n"
+        "Args:\n"
+        "    lower_level (float): Lower z-level of the filled contours.\n"
+        "    upper_level (float): Upper z-level of the filled contours.\n"
+        "    deadline_ms (float, optional): Time in milliseconds since the call after which no "
+        "more regions are refined, including time spent by the caller between items. The "
+        "decimated contours are always returned. Default ``None`` for no limit.\n"
+        "    stride (int): Stride of the decimated grid in both directions, at least 2, default "
+        "4.\n"
+        "    region_size (int): Number of quads in each direction of refined regions, default "
+        "64.\n\n"
+        "Return:\n"
+        "    Iterator of tuples of ``(stride, window, filled)`` where ``stride`` is the stride "
+        "used (1 for full resolution), ``window`` is the ``(i0, i1, j0, j1)`` point indices of "
+        "the region in the form used by :meth:`~contourpy.ContourGenerator.window`, and "
+        "``filled`` is the filled contours of that region in the ``fill_type`` of this "
+        "ContourGenerator.";
+    const char* iter_filled_doc =
+        "Return an iterator of the filled contours of each chunk in the order that they are "
+        "calculated.\n\n"
+        "Contours are calculated using :meth:`~contourpy.ContourGenerator.filled_into` in a "
+        "background thread, so the caller can process each chunk whilst later chunks are being "
+        "calculated. Only chunks that contain filled contours are returned. The order of chunks "
+        "is not defined if using multiple threads. This ContourGenerator cannot be used for "
+        "anything else until the iteration has finished, and attempting to do so raises a "
+        "``RuntimeError``.\n\n"
+        "Args:\n"
+        "    lower_level (float): Lower z-level of the filled contours.\n"
+        "    upper_level (float): Upper z-level of the filled contours.\n"
+        "    max_queued (int): Maximum number of chunks that have been calculated but not yet "
+        "returned, default 16. Calculation pauses whilst this many are waiting.\n\n"
+        "Return:\n"
+        "    Iterator of tuples of ``(chunk, (points, offsets, outer_offsets))`` where ``chunk`` "
+        "is the chunk index and the arrays are those of a ``ChunkCombinedOffsetOffset`` chunk "
+        "regardless of the ``fill_type`` of this ContourGenerator.";
+    const char* iter_lines_doc =
+        "Return an iterator of the contour lines of each chunk in the order that they are "
+        "calculated.\n\n"
+        "This is the contour line equivalent of :meth:`~contourpy.ContourGenerator.iter_filled`."
+        "\n\n"
+        "Args:\n"
+        "    level (float): z-level to calculate contours at.\n"
+        "    max_queued (int): Maximum number of chunks that have been calculated but not yet "
+        "returned, default 16.\n\n"
+        "Return:\n"
+        "    Iterator of tuples of ``(chunk, (points, offsets))`` where the arrays are those of a "
+        "``ChunkCombinedOffset`` chunk regardless of the ``line_type`` of this ContourGenerator.";
     const char* line_type_doc = "Return the ``LineType``.";
     const char* lines_doc =
         "Calculate and return contour lines at a particular level.\n\n"
@@ -103,7 +393,145 @@ PYBIND11_MODULE(_contourpy, m) {
         "    Contour lines (open line strips and closed line loops) as one or more sequences of "
         "numpy arrays. The exact format is determined by the ``line_type`` used by the "
         "``ContourGenerator``.";
+    const char* lines_out_doc =
+        "Calculate and return contour lines at a particular level.\n\n"
+        "Args:\n"
+        "    level (float): z-level to calculate contours at.\n"
+        "    out (tuple of numpy arrays, optional): Caller-supplied arrays to write the results "
+        "to, only supported by ``ChunkCombined`` line types. There is one array for each sequence "
+        "returned, with the same dtype and number of dimensions as the returned arrays. The "
+        "returned arrays are views into these.\n"
+        "    sparse (bool, optional): Whether to return only the chunks that contain contours, "
+        "only supported by ``ChunkCombined`` line types. Default ``False``.\n"
+        "    result (bool, optional): Whether to return a :class:`~contourpy.ContourResult` "
+        "instead of sequences of numpy arrays. Default ``False``.\n"
+        "    metrics (bool, optional): Whether to also return geometric metrics of each "
+        "line, calculated as the contours are traced. Default ``False``.\n"
+        "    min_points (int, optional): Discard lines with fewer than this many points, "
+        "including the repeated closing point of closed lines. Default ``0``.\n"
+        "    min_area (float, optional): Discard closed lines with an absolute area less than "
+        "this, open lines are not affected. Default ``0.0``.\n"
+        "    min_length (float, optional): Discard lines with a length less than this. Default "
+        "``0.0``.\n"
+        "    simplify_tolerance (float, optional): If positive, simplify lines by removing "
+        "points that are within this distance of the line between the points either side of "
+        "them that are kept. Default ``0.0``.\n\n"
+        "Return:\n"
+        "    Contour lines (open line strips and closed line loops) as one or more sequences of "
+        "numpy arrays. The exact format is determined by the ``line_type`` used by the "
+        "``ContourGenerator``.\n\n"
+        "    If ``out`` is specified, returns a tuple of ``(lines, used)`` where ``used`` is a "
+        "tuple of the number of elements (points for the points array) used in each of the "
+        "``out`` arrays. If any ``out`` array is too small then ``lines`` is ``None`` and "
+        "``used`` contains the numbers of elements required instead.\n\n"
+        "    If ``sparse`` is ``True``, ``lines`` is replaced by a tuple of ``(lines, "
+        "chunk_indices)`` where the sequences in ``lines`` only contain the non-empty chunks and "
+        "``chunk_indices`` is an ``int32`` array of their chunk indices.\n\n"
+        "    If ``result`` is ``True``, ``lines`` (and ``chunk_indices`` if ``sparse`` is "
+        "``True``) is replaced by a :class:`~contourpy.ContourResult`.\n\n"
+        "    If ``metrics`` is ``True``, ``lines`` is replaced by a tuple of ``(lines, metrics)`` "
+        "where ``metrics`` is a structured numpy array with an item for each line in the "
+        "same order as they appear in ``lines``. It has fields ``area`` (signed area, positive "
+        "for anticlockwise and zero if not closed), ``length``, ``xmin``, ``ymin``, ``xmax``, "
+        "``ymax`` and ``closed``.\n\n"
+        "    Filtering using ``min_points``, ``min_area`` or ``min_length`` occurs as the contours "
+        "are traced so that discarded lines are never returned.\n\n"
+        "    Simplification uses the Douglas-Peucker algorithm on each line as it is traced, "
+        "before filtering.\n\n"
+        "    Filtering and simplification cannot be used with ``out``.";
+    const char* lines_into_doc =
+        "Calculate contour lines and pass each chunk to a callable as soon as it has been "
+        "calculated, rather than returning them.\n\n"
+        "This is the contour line equivalent of :meth:`~contourpy.ContourGenerator.filled_into`. "
+        "``sink(chunk, points, offsets, None)`` is called with the arrays of a "
+        "``ChunkCombinedOffset`` chunk regardless of the ``line_type`` of this "
+        "ContourGenerator.\n\n"
+        "Args:\n"
+        "    sink (callable): Called with each non-empty chunk.\n"
+        "    level (float): z-level to calculate contours at.\n"
+        "    quantize_bbox (tuple(float, float, float, float), optional): Bounding box "
+        "``(x0, y0, x1, y1)`` to quantise points within, after any transform. Default ``None`` "
+        "for ``float64`` points.\n"
+        "    quantize_dtype (int16 or int32): Integer dtype of quantised points, default "
+        "``int32``.\n"
+        "    quantize_delta (bool): Whether to delta encode quantised points within each line, "
+        "default ``False``.\n\n"
+        ".. warning::\n"
+        "    The arrays are views of internal buffers that are reused for later chunks, so they "
+        "are only valid during the call to ``sink``. Copy them to keep them.";
+    const char* lines_progressive_doc =
+        "Calculate contour lines progressively from coarse to fine resolution, returning an "
+        "iterator so that an approximate result can be displayed quickly and then refined.\n\n"
+        "This is the contour line equivalent of "
+        ":meth:`~contourpy.ContourGenerator.filled_progressive`.\n\n"
+        "Args:\n"
+        "    level (float): z-level to calculate contours at.\n"
+        "    deadline_ms (float, optional): Time in milliseconds since the call after which no "
+        "more regions are refined, default ``None`` for no limit.\n"
+        "    stride (int): Stride of the decimated grid in both directions, at least 2, default "
+        "4.\n"
+        "    region_size (int): Number of quads in each direction of refined regions, default "
+        "64.\n\n"
+        "Return:\n"
+        "    Iterator of tuples of ``(stride, window, lines)`` where ``lines`` is in the "
+        "``line_type`` of this ContourGenerator.";
+    const char* max_output_bytes_doc =
+        "Maximum estimated number of bytes of the NumPy arrays returned by "
+        ":meth:`~contourpy.ContourGenerator.filled` and :meth:`~contourpy.ContourGenerator.lines`"
+        ", default ``0`` for no limit.\n\n"
+        "Every chunk is counted using the first pass of the algorithm before any output is "
+        "allocated, and the estimate is calculated from these counts for the whole output. It is "
+        "exact for all fill and line types but does not include the overhead of the array "
+        "objects, and it is an upper bound if lines are filtered or simplified using "
+        "``min_points``, ``min_area``, ``min_length`` or ``simplify_tolerance``. If it exceeds "
+        "this limit :class:`~contourpy.OutputTooLargeError` is raised with the estimate as its "
+        "``estimated_bytes`` attribute, and nothing is returned. For ``ChunkCombined`` types this "
+        "adds a counting stage, so ``progress_callback`` is called twice for each chunk.\n\n"
+        "The limit does not apply to caller-supplied ``out`` buffers or to methods that do not "
+        "return all of the contours, such as :meth:`~contourpy.ContourGenerator.filled_into` and "
+        ":meth:`~contourpy.ContourGenerator.write_filled`, which can be used instead if the limit "
+        "is exceeded.\n\n"
+        "Not supported by the ``mpl2005`` and ``mpl2014`` algorithms, for which this is always "
+        "``0`` and setting it to any other value raises a ``ValueError``.";
+    const char* max_retained_bytes_doc =
+        "Maximum number of bytes of internal chunk buffers that are retained between calls to "
+        ":meth:`~contourpy.ContourGenerator.filled` and :meth:`~contourpy.ContourGenerator.lines` "
+        "for reuse, default 16 MiB. Buffers that would exceed this are freed at the end of each "
+        "call. Set to ``0`` to free all buffers after every call.";
+    const char* progress_callback_doc =
+        "Optional callable that is called with ``(chunks_done, total_chunks)`` after each chunk "
+        "of a contouring operation has been processed, default ``None``.\n\n"
+        "Output that is combined over all chunks, such as ``FillType.OuterOffset`` or "
+        "``LineType.Separate``, or that is limited by ``max_output_bytes``, counts each chunk "
+        "before writing it so ``total_chunks`` is twice the number of chunks. It is called with "
+        "the GIL held but, if using multiple threads, not necessarily on the calling thread. If "
+        "it raises an exception the operation stops early and the exception is re-raised.\n\n"
+        "Python signals such as ``KeyboardInterrupt`` are also checked between chunks on the "
+        "calling thread regardless of whether there is a ``progress_callback``.";
     const char* quad_as_tri_doc = "Return whether ``quad_as_tri`` is set or not.";
+    const char* release_buffers_doc =
+        "Free all internal chunk buffers that have been retained for reuse between calls.";
+    const char* retained_bytes_doc =
+        "Return the number of bytes of internal chunk buffers currently retained for reuse.";
+    const char* stride_doc =
+        "Return a new ContourGenerator of the same type and with the same options that contours "
+        "a decimated grid of every ``sy``'th row and ``sx``'th column of points, such as for fast "
+        "preview contours of zoomed-out views.\n\n"
+        "The ``cancel_token``, ``progress_callback``, ``max_output_bytes`` and "
+        "``max_retained_bytes`` of this ContourGenerator are also used by the new one.\n\n"
+        "The last row and column are always included so that the decimated grid covers the whole "
+        "domain, which means that the final row and column of quads may be smaller than the "
+        "others. Only the points that are kept are read and copied, so the time taken and memory "
+        "used by this and by subsequent contouring are approximately ``1/(sy*sx)`` of those of "
+        "the full grid. A point is masked if it is masked in the full grid. The chunk size is "
+        "divided by the stride so that chunks cover approximately the same region.\n\n"
+        "Not supported by the ``mpl2005`` and ``mpl2014`` algorithms, which raise a "
+        "``ValueError``.\n\n"
+        "Args:\n"
+        "    sy (int): Stride in the ``y`` direction, at least 1.\n"
+        "    sx (int): Stride in the ``x`` direction, at least 1.\n\n"
+        "Return:\n"
+        "    ContourGenerator of the decimated grid.";
     const char* supports_corner_mask_doc =
         "Return whether this algorithm supports ``corner_mask``.";
     const char* supports_fill_type_doc =
@@ -114,27 +542,214 @@ PYBIND11_MODULE(_contourpy, m) {
         "Return whether this algorithm supports ``quad_as_tri``.";
     const char* supports_threads_doc =
         "Return whether this algorithm supports the use of threads.";
+    const char* supports_transform_doc =
+        "Return whether this algorithm supports ``transform`` and ``transform_callback``.";
+    const char* supports_window_doc =
+        "Return whether this algorithm supports :meth:`~contourpy.ContourGenerator.window`, "
+        ":meth:`~contourpy.ContourGenerator.window_bbox`, "
+        ":meth:`~contourpy.ContourGenerator.stride` and the progressive methods "
+        ":meth:`~contourpy.ContourGenerator.filled_progressive` and "
+        ":meth:`~contourpy.ContourGenerator.lines_progressive`.";
     const char* supports_z_interp_doc =
         "Return whether this algorithm supports ``z_interp`` values other than ``ZInterp.Linear`` "
         "which all support.";
     const char* thread_count_doc = "Return the number of threads used.";
+    const char* transform_doc =
+        "Return the affine ``transform`` applied to output points as an array of shape (2, 3), "
+        "or ``None`` if there is not one.";
+    const char* window_doc =
+        "Return a new ContourGenerator of the same type and with the same options that only "
+        "contours a rectangular window of the grid, the points ``z[j0:j1, i0:i1]``.\n\n"
+        "The ``cancel_token``, ``progress_callback``, ``max_output_bytes`` and "
+        "``max_retained_bytes`` of this ContourGenerator are also used by the new one.\n\n"
+        "The ``x``, ``y``, ``z`` and ``mask`` of the window are copied, so the time taken and "
+        "memory used by this and by subsequent contouring depend on the size of the window rather "
+        "than the whole grid. The edges of the window are treated as boundaries of the domain. "
+        "The chunk size is the same as this ContourGenerator's, limited to the size of the "
+        "window.\n\n"
+        "Not supported by the ``mpl2005`` and ``mpl2014`` algorithms, which raise a "
+        "``ValueError``.\n\n"
+        "Args:\n"
+        "    i0 (int): Index of the first point of the window in the ``x`` direction.\n"
+        "    i1 (int): Index one past the last point of the window in the ``x`` direction.\n"
+        "    j0 (int): Index of the first point of the window in the ``y`` direction.\n"
+        "    j1 (int): Index one past the last point of the window in the ``y`` direction.\n\n"
+        "Return:\n"
+        "    ContourGenerator of the window, which must contain at least 2 points in each "
+        "direction.";
+    const char* window_bbox_doc =
+        "Return a :meth:`~contourpy.ContourGenerator.window` that contains all quads that overlap "
+        "a bounding box.\n\n"
+        "For rectilinear grids the window is found using binary search, otherwise all quads are "
+        "checked. Contours are returned for whole quads, so they may extend up to one quad beyond "
+        "the bounding box.\n\n"
+        "Not supported by the ``mpl2005`` and ``mpl2014`` algorithms, which raise a "
+        "``ValueError``.\n\n"
+        "Args:\n"
+        "    x0 (float): Minimum ``x`` of the bounding box.\n"
+        "    y0 (float): Minimum ``y`` of the bounding box.\n"
+        "    x1 (float): Maximum ``x`` of the bounding box.\n"
+        "    y1 (float): Maximum ``y`` of the bounding box.\n\n"
+        "Return:\n"
+        "    ContourGenerator of the window, or ``None`` if no quads overlap the bounding box.";
+    const char* write_filled_doc =
+        "Calculate filled contours between each pair of adjacent levels and write them to a file, "
+        "one chunk at a time.\n\n"
+        "Each chunk is written as soon as it has been calculated and its arrays are then freed, so "
+        "peak memory use is that of a single chunk per thread rather than of all the contours. "
+        "Chunks are written in the ``ChunkCombinedOffsetOffset`` format regardless of the "
+        "``fill_type`` of this ContourGenerator, and empty chunks are not written.\n\n"
+        "The file is written to a temporary file in the same directory that only replaces "
+        "``path`` once all levels have been written, so if an exception is raised or the "
+        "operation is cancelled no incomplete file is left at ``path``.\n\n"
+        "Not supported by the ``mpl2005`` and ``mpl2014`` algorithms, which raise a "
+        "``ValueError``.\n\n"
+        "Args:\n"
+        "    path (str or path-like): Path of the file to write.\n"
+        "    levels (array-like of float): Increasing z-levels, at least 2. Filled contours are "
+        "calculated between ``levels[i]`` and ``levels[i+1]``.\n"
+        "    format (str): Either ``\"npz\"`` (default) for a NumPy ``.npz`` file containing a "
+        "``levels`` array and ``points_i_c``, ``offsets_i_c`` and ``outer_offsets_i_c`` arrays "
+        "for each non-empty chunk ``c`` of level index ``i``, or ``\"geojson\"`` for "
+        "newline-delimited GeoJSON containing a ``MultiPolygon`` Feature for each non-empty chunk "
+        "with ``level_index``, ``lower_level``, ``upper_level`` and ``chunk`` properties.";
+    const char* write_lines_doc =
+        "Calculate contour lines at each level and write them to a file, one chunk at a time.\n\n"
+        "This is the contour line equivalent of :meth:`~contourpy.ContourGenerator.write_filled`. "
+        "Chunks are written in the ``ChunkCombinedOffset`` format regardless of the ``line_type`` "
+        "of this ContourGenerator.\n\n"
+        "Args:\n"
+        "    path (str or path-like): Path of the file to write.\n"
+        "    levels (array-like of float): z-levels to calculate contour lines at, at least 1.\n"
+        "    format (str): Either ``\"npz\"`` (default) for a NumPy ``.npz`` file containing a "
+        "``levels`` array and ``points_i_c`` and ``offsets_i_c`` arrays for each non-empty chunk "
+        "``c`` of level index ``i``, or ``\"geojson\"`` for newline-delimited GeoJSON "
+        "containing a ``MultiLineString`` Feature for each non-empty chunk with ``level_index``, "
+        "``level`` and ``chunk`` properties.";
     const char* z_interp_doc = "Return the ``ZInterp``.";
 
     py::class_<contourpy::ContourGenerator>(m, "ContourGenerator",
         "Abstract base class for contour generator classes, defining the interface that they all "
         "implement.")
-        .def("create_contour",
+        .def("count_filled",
+            [](py::object /* self */, double lower_level, double upper_level) {
+                return py::make_tuple();},
+            py::arg("lower_level"), py::arg("upper_level"), count_filled_doc)
+        .def("count_lines",
             [](py::object /* self */, double level) {return py::make_tuple();},
-            py::arg("level"), create_contour_doc)
+            py::arg("level"), count_lines_doc)
+        .def("create_contour",
+            [](py::object /* self */, double level, py::object /* out */, bool /* sparse */,
+               bool /* result */, bool /* metrics */, contourpy::count_t /* min_points */,
+               double /* min_area */, double /* min_length */, double /* simplify_tolerance */) {
+                return py::make_tuple();},
+            py::arg("level"), py::kw_only(), py::arg("out") = py::none(),
+            py::arg("sparse") = false, py::arg("result") = false,
+            py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            create_contour_doc)
         .def("create_filled_contour",
-            [](py::object /* self */, double lower_level, double upper_level) {return py::make_tuple();},
-            py::arg("lower_level"), py::arg("upper_level"), create_filled_contour_doc)
+            [](py::object /* self */, double lower_level, double upper_level, py::object /* out */,
+               bool /* sparse */, bool /* result */, bool /* metrics */,
+               contourpy::count_t /* min_points */, double /* min_area */,
+               double /* min_length */, double /* simplify_tolerance */) {
+                return py::make_tuple();},
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("out") = py::none(), py::arg("sparse") = false,
+            py::arg("result") = false, py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            create_filled_contour_doc)
         .def("filled",
-            [](py::object /* self */, double lower_level, double upper_level) {return py::make_tuple();},
-            py::arg("lower_level"), py::arg("upper_level"), filled_doc)
+            [](py::object /* self */, double lower_level, double upper_level, py::object /* out */,
+               bool /* sparse */, bool /* result */, bool /* metrics */,
+               contourpy::count_t /* min_points */, double /* min_area */,
+               double /* min_length */, double /* simplify_tolerance */) {
+                return py::make_tuple();},
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("out") = py::none(), py::arg("sparse") = false,
+            py::arg("result") = false, py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            filled_out_doc)
+        .def("filled_into",
+            [](py::object self, py::object /* sink */, double /* lower_level */,
+               double /* upper_level */, py::object /* quantize_bbox */,
+               py::object /* quantize_dtype */, bool /* quantize_delta */) {
+                not_supported(self, "filled_into");},
+            py::arg("sink"), py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("quantize_bbox") = py::none(),
+            py::arg("quantize_dtype") = py::dtype::of<int32_t>(),
+            py::arg("quantize_delta") = false, filled_into_doc)
+        .def("filled_progressive",
+            [](py::object /* self */, double /* lower_level */, double /* upper_level */,
+               py::object /* deadline_ms */, contourpy::index_t /* stride */,
+               contourpy::index_t /* region_size */) {return py::none();},
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("deadline_ms") = py::none(), py::arg("stride") = 4,
+            py::arg("region_size") = 64, filled_progressive_doc)
+        .def("iter_filled",
+            [](py::object /* self */, double /* lower_level */, double /* upper_level */,
+               contourpy::index_t /* max_queued */) {return py::none();},
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("max_queued") = 16, iter_filled_doc)
+        .def("iter_lines",
+            [](py::object /* self */, double /* level */, contourpy::index_t /* max_queued */) {
+                return py::none();},
+            py::arg("level"), py::kw_only(), py::arg("max_queued") = 16, iter_lines_doc)
         .def("lines",
-            [](py::object /* self */, double level) {return py::make_tuple();},
-            py::arg("level"), lines_doc)
+            [](py::object /* self */, double level, py::object /* out */, bool /* sparse */,
+               bool /* result */, bool /* metrics */, contourpy::count_t /* min_points */,
+               double /* min_area */, double /* min_length */, double /* simplify_tolerance */) {
+                return py::make_tuple();},
+            py::arg("level"), py::kw_only(), py::arg("out") = py::none(),
+            py::arg("sparse") = false, py::arg("result") = false,
+            py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            lines_out_doc)
+        .def("lines_into",
+            [](py::object self, py::object /* sink */, double /* level */,
+               py::object /* quantize_bbox */, py::object /* quantize_dtype */,
+               bool /* quantize_delta */) {not_supported(self, "lines_into");},
+            py::arg("sink"), py::arg("level"), py::kw_only(),
+            py::arg("quantize_bbox") = py::none(),
+            py::arg("quantize_dtype") = py::dtype::of<int32_t>(),
+            py::arg("quantize_delta") = false, lines_into_doc)
+        .def("lines_progressive",
+            [](py::object /* self */, double /* level */, py::object /* deadline_ms */,
+               contourpy::index_t /* stride */, contourpy::index_t /* region_size */) {
+                return py::none();},
+            py::arg("level"), py::kw_only(), py::arg("deadline_ms") = py::none(),
+            py::arg("stride") = 4, py::arg("region_size") = 64, lines_progressive_doc)
+        .def("release_buffers", [](py::object /* self */) {}, release_buffers_doc)
+        .def("stride",
+            [](py::object self, contourpy::index_t /* sy */, contourpy::index_t /* sx */) {
+                not_supported(self, "stride");},
+            py::arg("sy"), py::arg("sx"), stride_doc)
+        .def("window",
+            [](py::object self, contourpy::index_t /* i0 */, contourpy::index_t /* i1 */,
+               contourpy::index_t /* j0 */, contourpy::index_t /* j1 */) {
+                not_supported(self, "window");},
+            py::arg("i0"), py::arg("i1"), py::arg("j0"), py::arg("j1"), window_doc)
+        .def("window_bbox",
+            [](py::object self, double /* x0 */, double /* y0 */, double /* x1 */,
+               double /* y1 */) {not_supported(self, "window_bbox");},
+            py::arg("x0"), py::arg("y0"), py::arg("x1"), py::arg("y1"), window_bbox_doc)
+        .def("write_filled",
+            [](py::object self, py::object /* path */, py::object /* levels */,
+               const std::string& /* format */) {not_supported(self, "write_filled");},
+            py::arg("path"), py::arg("levels"), py::kw_only(), py::arg("format") = "npz",
+            write_filled_doc)
+        .def("write_lines",
+            [](py::object self, py::object /* path */, py::object /* levels */,
+               const std::string& /* format */) {not_supported(self, "write_lines");},
+            py::arg("path"), py::arg("levels"), py::kw_only(), py::arg("format") = "npz",
+            write_lines_doc)
+        .def_property(
+            "cancel_token", [](py::object /* self */) {return py::none();},
+            [](py::object /* self */, py::object /* cancel_token */) {}, cancel_token_doc)
         .def_property_readonly(
             "chunk_count", [](py::object /* self */) {return py::make_tuple(1, 1);},
             chunk_count_doc)
@@ -148,10 +763,28 @@ PYBIND11_MODULE(_contourpy, m) {
         .def_property_readonly(
             "line_type", [](py::object /* self */) {return contourpy::LineType::Separate;},
             line_type_doc)
+        .def_property(
+            "max_output_bytes", [](py::object /* self */) {return 0;},
+            [](py::object self, contourpy::count_t max_output_bytes) {
+                if (max_output_bytes > 0)
+                    not_supported(self, "max_output_bytes");},
+            max_output_bytes_doc)
+        .def_property(
+            "max_retained_bytes", [](py::object /* self */) {return 0;},
+            [](py::object /* self */, contourpy::count_t /* max_retained_bytes */) {},
+            max_retained_bytes_doc)
+        .def_property(
+            "progress_callback", [](py::object /* self */) {return py::none();},
+            [](py::object /* self */, py::object /* progress_callback */) {},
+            progress_callback_doc)
         .def_property_readonly(
             "quad_as_tri", [](py::object /* self */) {return false;}, quad_as_tri_doc)
+        .def_property_readonly(
+            "retained_bytes", [](py::object /* self */) {return 0;}, retained_bytes_doc)
         .def_property_readonly(
             "thread_count", [](py::object /* self */) {return 1;}, thread_count_doc)
+        .def_property_readonly(
+            "transform", [](py::object /* self */) {return py::none();}, transform_doc)
         .def_property_readonly(
             "z_interp", [](py::object /* self */) {return contourpy::ZInterp::Linear;},
             z_interp_doc)
@@ -171,6 +804,8 @@ PYBIND11_MODULE(_contourpy, m) {
             py::arg("line_type"), supports_line_type_doc)
         .def_static("supports_quad_as_tri", []() {return false;}, supports_quad_as_tri_doc)
         .def_static("supports_threads", []() {return false;}, supports_threads_doc)
+        .def_static("supports_transform", []() {return false;}, supports_transform_doc)
+        .def_static("supports_window", []() {return false;}, supports_window_doc)
         .def_static("supports_z_interp", []() {return false;}, supports_z_interp_doc);
 
     py::class_<contourpy::Mpl2005ContourGenerator, contourpy::ContourGenerator>(
@@ -290,7 +925,8 @@ PYBIND11_MODULE(_contourpy, m) {
         m, "SerialContourGenerator",
         "ContourGenerator corresponding to ``name=\"serial\"``, the default algorithm for "
         "``contourpy``.\n\n"
-        "Supports ``corner_mask``, ``quad_as_tri`` and ``z_interp`` but not ``threads``. "
+        "Supports ``corner_mask``, ``quad_as_tri``, ``transform``, ``z_interp`` and windows but "
+        "not ``threads``. "
         "Supports all options for ``line_type`` and ``fill_type``.")
         .def(py::init<const contourpy::CoordinateArray&,
                       const contourpy::CoordinateArray&,
@@ -302,7 +938,9 @@ PYBIND11_MODULE(_contourpy, m) {
                       bool,
                       contourpy::ZInterp,
                       contourpy::index_t,
-                      contourpy::index_t>(),
+                      contourpy::index_t,
+                      const py::object&,
+                      const py::object&>(),
              py::arg("x"),
              py::arg("y"),
              py::arg("z"),
@@ -314,13 +952,81 @@ PYBIND11_MODULE(_contourpy, m) {
              py::arg("quad_as_tri"),
              py::arg("z_interp"),
              py::arg("x_chunk_size") = 0,
-             py::arg("y_chunk_size") = 0)
+             py::arg("y_chunk_size") = 0,
+             py::arg("transform") = py::none(),
+             py::arg("transform_callback") = py::none())
         .def("_write_cache", &contourpy::SerialContourGenerator::write_cache)
-        .def("create_contour", &contourpy::SerialContourGenerator::lines, create_contour_doc)
+        .def("count_filled", &contourpy::SerialContourGenerator::count_filled,
+            py::arg("lower_level"), py::arg("upper_level"), count_filled_doc)
+        .def("count_lines", &contourpy::SerialContourGenerator::count_lines, py::arg("level"),
+            count_lines_doc)
+        .def("create_contour", &contourpy::SerialContourGenerator::lines,
+            py::arg("level"), py::kw_only(), py::arg("out") = py::none(),
+            py::arg("sparse") = false, py::arg("result") = false,
+            py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            create_contour_doc)
         .def("create_filled_contour", &contourpy::SerialContourGenerator::filled,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("out") = py::none(), py::arg("sparse") = false,
+            py::arg("result") = false, py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
             create_filled_contour_doc)
-        .def("filled", &contourpy::SerialContourGenerator::filled, filled_doc)
-        .def("lines", &contourpy::SerialContourGenerator::lines, lines_doc)
+        .def("filled", &contourpy::SerialContourGenerator::filled,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("out") = py::none(), py::arg("sparse") = false,
+            py::arg("result") = false, py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            filled_out_doc)
+        .def("filled_into", &contourpy::SerialContourGenerator::filled_into,
+            py::arg("sink"), py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("quantize_bbox") = py::none(),
+            py::arg("quantize_dtype") = py::dtype::of<int32_t>(),
+            py::arg("quantize_delta") = false, filled_into_doc)
+        .def("filled_progressive", &contourpy::SerialContourGenerator::filled_progressive,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("deadline_ms") = py::none(), py::arg("stride") = 4,
+            py::arg("region_size") = 64, filled_progressive_doc)
+        .def("iter_filled", &contourpy::SerialContourGenerator::iter_filled,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("max_queued") = 16, iter_filled_doc)
+        .def("iter_lines", &contourpy::SerialContourGenerator::iter_lines,
+            py::arg("level"), py::kw_only(), py::arg("max_queued") = 16, iter_lines_doc)
+        .def("lines", &contourpy::SerialContourGenerator::lines,
+            py::arg("level"), py::kw_only(), py::arg("out") = py::none(),
+            py::arg("sparse") = false, py::arg("result") = false,
+            py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            lines_out_doc)
+        .def("lines_into", &contourpy::SerialContourGenerator::lines_into,
+            py::arg("sink"), py::arg("level"), py::kw_only(),
+            py::arg("quantize_bbox") = py::none(),
+            py::arg("quantize_dtype") = py::dtype::of<int32_t>(),
+            py::arg("quantize_delta") = false, lines_into_doc)
+        .def("lines_progressive", &contourpy::SerialContourGenerator::lines_progressive,
+            py::arg("level"), py::kw_only(), py::arg("deadline_ms") = py::none(),
+            py::arg("stride") = 4, py::arg("region_size") = 64, lines_progressive_doc)
+        .def("release_buffers", &contourpy::SerialContourGenerator::release_buffers,
+            release_buffers_doc)
+        .def("stride", &contourpy::SerialContourGenerator::stride, py::arg("sy"), py::arg("sx"),
+            stride_doc)
+        .def("window", &contourpy::SerialContourGenerator::window,
+            py::arg("i0"), py::arg("i1"), py::arg("j0"), py::arg("j1"), window_doc)
+        .def("window_bbox", &contourpy::SerialContourGenerator::window_bbox,
+            py::arg("x0"), py::arg("y0"), py::arg("x1"), py::arg("y1"), window_bbox_doc)
+        .def("write_filled", &contourpy::SerialContourGenerator::write_filled,
+            py::arg("path"), py::arg("levels"), py::kw_only(), py::arg("format") = "npz",
+            write_filled_doc)
+        .def("write_lines", &contourpy::SerialContourGenerator::write_lines,
+            py::arg("path"), py::arg("levels"), py::kw_only(), py::arg("format") = "npz",
+            write_lines_doc)
+        .def_property(
+            "cancel_token", &contourpy::SerialContourGenerator::get_cancel_token,
+            &contourpy::SerialContourGenerator::set_cancel_token, cancel_token_doc)
         .def_property_readonly(
             "chunk_count", &contourpy::SerialContourGenerator::get_chunk_count, chunk_count_doc)
         .def_property_readonly(
@@ -331,8 +1037,22 @@ PYBIND11_MODULE(_contourpy, m) {
             "fill_type", &contourpy::SerialContourGenerator::get_fill_type, fill_type_doc)
         .def_property_readonly(
             "line_type", &contourpy::SerialContourGenerator::get_line_type, line_type_doc)
+        .def_property(
+            "max_output_bytes", &contourpy::SerialContourGenerator::get_max_output_bytes,
+            &contourpy::SerialContourGenerator::set_max_output_bytes, max_output_bytes_doc)
+        .def_property(
+            "max_retained_bytes", &contourpy::SerialContourGenerator::get_max_retained_bytes,
+            &contourpy::SerialContourGenerator::set_max_retained_bytes, max_retained_bytes_doc)
+        .def_property(
+            "progress_callback", &contourpy::SerialContourGenerator::get_progress_callback,
+            &contourpy::SerialContourGenerator::set_progress_callback, progress_callback_doc)
         .def_property_readonly(
             "quad_as_tri", &contourpy::SerialContourGenerator::get_quad_as_tri, quad_as_tri_doc)
+        .def_property_readonly(
+            "retained_bytes", &contourpy::SerialContourGenerator::get_retained_bytes,
+            retained_bytes_doc)
+        .def_property_readonly(
+            "transform", &contourpy::SerialContourGenerator::get_transform, transform_doc)
         .def_property_readonly(
             "z_interp", &contourpy::SerialContourGenerator::get_z_interp, z_interp_doc)
         .def_property_readonly_static(
@@ -350,13 +1070,16 @@ PYBIND11_MODULE(_contourpy, m) {
             "supports_line_type", &contourpy::SerialContourGenerator::supports_line_type,
             supports_line_type_doc)
         .def_static("supports_quad_as_tri", []() {return true;}, supports_quad_as_tri_doc)
+        .def_static("supports_transform", []() {return true;}, supports_transform_doc)
+        .def_static("supports_window", []() {return true;}, supports_window_doc)
         .def_static("supports_z_interp", []() {return true;}, supports_z_interp_doc);
 
     py::class_<contourpy::ThreadedContourGenerator, contourpy::ContourGenerator>(
         m, "ThreadedContourGenerator",
         "ContourGenerator corresponding to ``name=\"threaded\"``, the multithreaded version of "
         ":class:`~contourpy._contourpy.SerialContourGenerator`.\n\n"
-        "Supports ``corner_mask``, ``quad_as_tri`` and ``z_interp`` and ``threads``. "
+        "Supports ``corner_mask``, ``quad_as_tri``, ``transform``, ``z_interp``, windows and "
+        "``threads``. "
         "Supports all options for ``line_type`` and ``fill_type``.")
         .def(py::init<const contourpy::CoordinateArray&,
                       const contourpy::CoordinateArray&,
@@ -369,7 +1092,9 @@ PYBIND11_MODULE(_contourpy, m) {
                       contourpy::ZInterp,
                       contourpy::index_t,
                       contourpy::index_t,
-                      contourpy::index_t>(),
+                      contourpy::index_t,
+                      const py::object&,
+                      const py::object&>(),
              py::arg("x"),
              py::arg("y"),
              py::arg("z"),
@@ -382,13 +1107,81 @@ PYBIND11_MODULE(_contourpy, m) {
              py::arg("z_interp"),
              py::arg("x_chunk_size") = 0,
              py::arg("y_chunk_size") = 0,
-             py::arg("thread_count") = 0)
+             py::arg("thread_count") = 0,
+             py::arg("transform") = py::none(),
+             py::arg("transform_callback") = py::none())
         .def("_write_cache", &contourpy::ThreadedContourGenerator::write_cache)
-        .def("create_contour", &contourpy::ThreadedContourGenerator::lines, create_contour_doc)
+        .def("count_filled", &contourpy::ThreadedContourGenerator::count_filled,
+            py::arg("lower_level"), py::arg("upper_level"), count_filled_doc)
+        .def("count_lines", &contourpy::ThreadedContourGenerator::count_lines, py::arg("level"),
+            count_lines_doc)
+        .def("create_contour", &contourpy::ThreadedContourGenerator::lines,
+            py::arg("level"), py::kw_only(), py::arg("out") = py::none(),
+            py::arg("sparse") = false, py::arg("result") = false,
+            py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            create_contour_doc)
         .def("create_filled_contour", &contourpy::ThreadedContourGenerator::filled,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("out") = py::none(), py::arg("sparse") = false,
+            py::arg("result") = false, py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
             create_filled_contour_doc)
-        .def("filled", &contourpy::ThreadedContourGenerator::filled, filled_doc)
-        .def("lines", &contourpy::ThreadedContourGenerator::lines, lines_doc)
+        .def("filled", &contourpy::ThreadedContourGenerator::filled,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("out") = py::none(), py::arg("sparse") = false,
+            py::arg("result") = false, py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            filled_out_doc)
+        .def("filled_into", &contourpy::ThreadedContourGenerator::filled_into,
+            py::arg("sink"), py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("quantize_bbox") = py::none(),
+            py::arg("quantize_dtype") = py::dtype::of<int32_t>(),
+            py::arg("quantize_delta") = false, filled_into_doc)
+        .def("filled_progressive", &contourpy::ThreadedContourGenerator::filled_progressive,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("deadline_ms") = py::none(), py::arg("stride") = 4,
+            py::arg("region_size") = 64, filled_progressive_doc)
+        .def("iter_filled", &contourpy::ThreadedContourGenerator::iter_filled,
+            py::arg("lower_level"), py::arg("upper_level"), py::kw_only(),
+            py::arg("max_queued") = 16, iter_filled_doc)
+        .def("iter_lines", &contourpy::ThreadedContourGenerator::iter_lines,
+            py::arg("level"), py::kw_only(), py::arg("max_queued") = 16, iter_lines_doc)
+        .def("lines", &contourpy::ThreadedContourGenerator::lines,
+            py::arg("level"), py::kw_only(), py::arg("out") = py::none(),
+            py::arg("sparse") = false, py::arg("result") = false,
+            py::arg("metrics") = false,
+            py::arg("min_points") = 0, py::arg("min_area") = 0.0, py::arg("min_length") = 0.0,
+            py::arg("simplify_tolerance") = 0.0,
+            lines_out_doc)
+        .def("lines_into", &contourpy::ThreadedContourGenerator::lines_into,
+            py::arg("sink"), py::arg("level"), py::kw_only(),
+            py::arg("quantize_bbox") = py::none(),
+            py::arg("quantize_dtype") = py::dtype::of<int32_t>(),
+            py::arg("quantize_delta") = false, lines_into_doc)
+        .def("lines_progressive", &contourpy::ThreadedContourGenerator::lines_progressive,
+            py::arg("level"), py::kw_only(), py::arg("deadline_ms") = py::none(),
+            py::arg("stride") = 4, py::arg("region_size") = 64, lines_progressive_doc)
+        .def("release_buffers", &contourpy::ThreadedContourGenerator::release_buffers,
+            release_buffers_doc)
+        .def("stride", &contourpy::ThreadedContourGenerator::stride, py::arg("sy"), py::arg("sx"),
+            stride_doc)
+        .def("window", &contourpy::ThreadedContourGenerator::window,
+            py::arg("i0"), py::arg("i1"), py::arg("j0"), py::arg("j1"), window_doc)
+        .def("window_bbox", &contourpy::ThreadedContourGenerator::window_bbox,
+            py::arg("x0"), py::arg("y0"), py::arg("x1"), py::arg("y1"), window_bbox_doc)
+        .def("write_filled", &contourpy::ThreadedContourGenerator::write_filled,
+            py::arg("path"), py::arg("levels"), py::kw_only(), py::arg("format") = "npz",
+            write_filled_doc)
+        .def("write_lines", &contourpy::ThreadedContourGenerator::write_lines,
+            py::arg("path"), py::arg("levels"), py::kw_only(), py::arg("format") = "npz",
+            write_lines_doc)
+        .def_property(
+            "cancel_token", &contourpy::ThreadedContourGenerator::get_cancel_token,
+            &contourpy::ThreadedContourGenerator::set_cancel_token, cancel_token_doc)
         .def_property_readonly(
             "chunk_count", &contourpy::ThreadedContourGenerator::get_chunk_count, chunk_count_doc)
         .def_property_readonly(
@@ -399,11 +1192,25 @@ PYBIND11_MODULE(_contourpy, m) {
             "fill_type", &contourpy::ThreadedContourGenerator::get_fill_type, fill_type_doc)
         .def_property_readonly(
             "line_type", &contourpy::ThreadedContourGenerator::get_line_type, line_type_doc)
+        .def_property(
+            "max_output_bytes", &contourpy::ThreadedContourGenerator::get_max_output_bytes,
+            &contourpy::ThreadedContourGenerator::set_max_output_bytes, max_output_bytes_doc)
+        .def_property(
+            "max_retained_bytes", &contourpy::ThreadedContourGenerator::get_max_retained_bytes,
+            &contourpy::ThreadedContourGenerator::set_max_retained_bytes, max_retained_bytes_doc)
+        .def_property(
+            "progress_callback", &contourpy::ThreadedContourGenerator::get_progress_callback,
+            &contourpy::ThreadedContourGenerator::set_progress_callback, progress_callback_doc)
         .def_property_readonly(
             "quad_as_tri", &contourpy::ThreadedContourGenerator::get_quad_as_tri, quad_as_tri_doc)
+        .def_property_readonly(
+            "retained_bytes", &contourpy::ThreadedContourGenerator::get_retained_bytes,
+            retained_bytes_doc)
         .def_property_readonly(
             "thread_count", &contourpy::ThreadedContourGenerator::get_thread_count,
             thread_count_doc)
+        .def_property_readonly(
+            "transform", &contourpy::ThreadedContourGenerator::get_transform, transform_doc)
         .def_property_readonly(
             "z_interp", &contourpy::ThreadedContourGenerator::get_z_interp, z_interp_doc)
         .def_property_readonly_static(
@@ -423,5 +1230,7 @@ PYBIND11_MODULE(_contourpy, m) {
             supports_line_type_doc)
         .def_static("supports_quad_as_tri", []() {return true;}, supports_quad_as_tri_doc)
         .def_static("supports_threads", []() {return true;}, supports_threads_doc)
+        .def_static("supports_transform", []() {return true;}, supports_transform_doc)
+        .def_static("supports_window", []() {return true;}, supports_window_doc)
         .def_static("supports_z_interp", []() {return true;}, supports_z_interp_doc);
 }
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+from . import util_test
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_retained_buffers(name: str) -> None:
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(
+        z=z, name=name, fill_type=FillType.OuterOffset, line_type=LineType.Separate, chunk_size=7,
+    )
+    assert cont_gen.retained_bytes == 0
+    assert cont_gen.max_retained_bytes == 16*1024*1024
+
+    filled = cont_gen.filled(0.4, 0.6)
+    retained = cont_gen.retained_bytes
+    assert retained > 0
+
+    # Reused buffers give identical results and do not need to grow.
+    filled2 = cont_gen.filled(0.4, 0.6)
+    assert cont_gen.retained_bytes == retained
+    for i in range(2):
+        assert len(filled[i]) == len(filled2[i])
+        for a, b in zip(filled[i], filled2[i]):
+            np.testing.assert_array_equal(a, b)
+
+    cont_gen.lines(0.5)
+    assert cont_gen.retained_bytes >= retained
+
+    cont_gen.release_buffers()
+    assert cont_gen.retained_bytes == 0
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_max_retained_bytes(name: str) -> None:
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(z=z, name=name, fill_type=FillType.OuterOffset, chunk_size=7)
+    cont_gen.filled(0.4, 0.6)
+    assert cont_gen.retained_bytes > 0
+
+    cont_gen.max_retained_bytes = 0
+    assert cont_gen.max_retained_bytes == 0
+    assert cont_gen.retained_bytes == 0
+
+    cont_gen.filled(0.4, 0.6)
+    assert cont_gen.retained_bytes == 0
+
+
+@pytest.mark.threads
+@pytest.mark.parametrize("thread_count", util_test.thread_counts())
+def test_retained_buffers_threads(thread_count: int) -> None:
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(
+        z=z, name="threaded", fill_type=FillType.OuterOffset, chunk_size=7,
+        thread_count=thread_count,
+    )
+    serial = contour_generator(z=z, fill_type=FillType.OuterOffset, chunk_size=7)
+    for _ in range(3):
+        filled = cont_gen.filled(0.4, 0.6)
+        expected = serial.filled(0.4, 0.6)
+        assert len(filled[0]) == len(expected[0])
+    assert cont_gen.retained_bytes > 0
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", [FillType.OuterCode, FillType.OuterOffset])
+def test_filled_views(name: str, fill_type: FillType) -> None:
+    # Polygons are views into a single backing array for each of points and codes/offsets.
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(z=z, name=name, fill_type=fill_type, chunk_size=7)
+    filled = cont_gen.filled(0.4, 0.6)
+    util_test.assert_filled(filled, fill_type)
+    for arrays in cast(tuple[list[Any], ...], filled):
+        assert len(arrays) > 1
+        base = arrays[0].base
+        assert base is not None
+        assert all(array.base is base for array in arrays)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.SeparateCode])
+def test_lines_views(name: str, line_type: LineType) -> None:
+    # Lines are views into a single backing array for each of points and codes.
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(z=z, name=name, line_type=line_type, chunk_size=7)
+    lines = cont_gen.lines(0.5)
+    util_test.assert_lines(lines, line_type)
+    if line_type == LineType.Separate:
+        all_arrays = [cast(list[Any], lines)]
+    else:
+        all_arrays = list(cast(tuple[list[Any], ...], lines))
+    for arrays in all_arrays:
+        assert len(arrays) > 1
+        base = arrays[0].base
+        assert base is not None
+        assert all(array.base is base for array in arrays)
+
+
+def _out_buffers(
+    dtypes: list[npt.DTypeLike], sizes: tuple[int, ...] | list[int],
+) -> tuple[npt.NDArray[Any], ...]:
+    return tuple(
+        np.empty((size, 2) if i == 0 else size, dtype=dtype)
+        for i, (dtype, size) in enumerate(zip(dtypes, sizes)))
+
+
+def _assert_out_views(
+    result: tuple[list[Any], ...],
+    expected: tuple[list[Any], ...],
+    out: tuple[npt.NDArray[Any], ...],
+) -> None:
+    for returned, expect, buffer in zip(result, expected, out):
+        assert len(returned) == len(expect)
+        for array, expect_array in zip(returned, expect):
+            if expect_array is None:
+                assert array is None
+            else:
+                np.testing.assert_array_equal(array, expect_array)
+                assert np.shares_memory(array, buffer)
+
+
+def _out_dtypes(type_name: str, count: int) -> list[npt.DTypeLike]:
+    dtypes: list[npt.DTypeLike] = [np.float64, np.uint8 if "Code" in type_name else np.uint32]
+    return dtypes + [np.uint32]*(count - 2)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", [
+    FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset, FillType.ChunkCombinedCodeOffset,
+    FillType.ChunkCombinedOffsetOffset,
+])
+def test_filled_out(name: str, fill_type: FillType) -> None:
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(z=z, name=name, fill_type=fill_type, chunk_size=7)
+    expected = cont_gen.filled(0.4, 0.6)
+    dtypes = _out_dtypes(fill_type.name, len(expected))
+
+    # Buffers too small, return required sizes.
+    filled, required = cont_gen.filled(0.4, 0.6, out=_out_buffers(dtypes, [10]*len(expected)))
+    assert filled is None
+    assert required[0] == sum(len(points) for points in expected[0] if points is not None)
+
+    out = _out_buffers(dtypes, [n + 5 for n in required])
+    filled, used = cont_gen.filled(0.4, 0.6, out=out)
+    assert used == required
+    assert filled is not None
+    util_test.assert_filled(filled, fill_type)
+    _assert_out_views(
+        cast(tuple[list[Any], ...], filled), cast(tuple[list[Any], ...], expected), out)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", [LineType.ChunkCombinedCode, LineType.ChunkCombinedOffset])
+def test_lines_out(name: str, line_type: LineType) -> None:
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(z=z, name=name, line_type=line_type, chunk_size=7)
+    expected = cont_gen.lines(0.5)
+    dtypes = _out_dtypes(line_type.name, 2)
+
+    lines, required = cont_gen.lines(0.5, out=_out_buffers(dtypes, [0, 0]))
+    assert lines is None
+
+    out = _out_buffers(dtypes, required)
+    lines, used = cont_gen.lines(0.5, out=out)
+    assert used == required
+    assert lines is not None
+    util_test.assert_lines(lines, line_type)
+    if TYPE_CHECKING:
+        lines = cast(cpy.LineReturn_ChunkCombinedOffset, lines)
+        expected = cast(cpy.LineReturn_ChunkCombinedOffset, expected)
+    _assert_out_views(lines, expected, out)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_out_sparse(name: str) -> None:
+    _, _, z = random((30, 40), seed=2187)
+    cont_gen = contour_generator(
+        z=z, name=name, fill_type=FillType.ChunkCombinedOffset, chunk_size=7)
+    expected, expected_indices = cont_gen.filled(0.4, 0.6, sparse=True)
+    dtypes = _out_dtypes(FillType.ChunkCombinedOffset.name, 2)
+
+    sparse, required = cont_gen.filled(0.4, 0.6, out=_out_buffers(dtypes, [0, 0]), sparse=True)
+    assert sparse is None
+
+    out = _out_buffers(dtypes, required)
+    sparse, used = cont_gen.filled(0.4, 0.6, out=out, sparse=True)
+    assert used == required
+    assert sparse is not None
+    filled, chunk_indices = sparse
+    np.testing.assert_array_equal(chunk_indices, expected_indices)
+    _assert_out_views(
+        cast(tuple[list[Any], ...], filled), cast(tuple[list[Any], ...], expected), out)
+
+
+def test_out_invalid() -> None:
+    z = [[0.0, 1.0], [2.0, 3.0]]
+    cont_gen = contour_generator(z=z, fill_type=FillType.OuterOffset)
+    with pytest.raises(ValueError, match="out can only be used with ChunkCombined"):
+        cont_gen.filled(1.0, 2.0, out=(np.empty((4, 2)), np.empty(4, dtype=np.uint32)))
+
+    cont_gen = contour_generator(z=z, fill_type=FillType.ChunkCombinedOffset)
+    with pytest.raises(ValueError, match="out must be a tuple of 2 NumPy arrays"):
+        cont_gen.filled(1.0, 2.0, out=(np.empty((4, 2)),))
+    with pytest.raises(ValueError, match=r"out\[1\] must be a C-contiguous NumPy array"):
+        cont_gen.filled(1.0, 2.0, out=(np.empty((4, 2)), np.empty(4, dtype=np.uint8)))
+    with pytest.raises(ValueError, match=r"out\[0\] must be a C-contiguous NumPy array"):
+        cont_gen.filled(1.0, 2.0, out=(np.empty((4, 3)), np.empty(4, dtype=np.uint32)))
+    points = np.empty((4, 2))
+    points.flags.writeable = False
+    with pytest.raises(ValueError, match=r"out\[0\] must be writeable"):
+        cont_gen.filled(1.0, 2.0, out=(points, np.empty(4, dtype=np.uint32)))
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import _thread
+import threading
+from typing import Any
+
+import numpy as np
+import pytest
+
+from contourpy import CancelledError, CancelToken, FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+def test_cancel_before(name: str, thread_count: int) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name, chunk_count=2, thread_count=thread_count)
+    assert cont_gen.cancel_token is None
+
+    token = CancelToken()
+    assert not token.cancelled
+    token.cancel()
+    assert token.cancelled
+    cont_gen.cancel_token = token
+    assert cont_gen.cancel_token is token
+
+    with pytest.raises(CancelledError, match="Contouring was cancelled"):
+        cont_gen.filled(0.3, 0.6)
+    with pytest.raises(CancelledError):
+        cont_gen.lines(0.5)
+    with pytest.raises(CancelledError):
+        cont_gen.count_filled(0.3, 0.6)
+    with pytest.raises(CancelledError):
+        cont_gen.lines_into(lambda *args: None, 0.5)
+
+    # Is a RuntimeError.
+    with pytest.raises(RuntimeError):
+        cont_gen.filled(0.3, 0.6)
+
+    cont_gen.cancel_token = None
+    assert len(cont_gen.lines(0.5)) > 0
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("fill_type", [FillType.OuterOffset, FillType.ChunkCombinedOffset])
+def test_cancel_during(fill_type: FillType, name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50))
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_count=(3, 4), thread_count=thread_count)
+    token = CancelToken()
+    cont_gen.cancel_token = token
+    progress = []
+
+    def progress_callback(chunks_done: int, total_chunks: int) -> None:
+        progress.append(chunks_done)
+        if chunks_done == 3:
+            token.cancel()
+
+    cont_gen.progress_callback = progress_callback
+    with pytest.raises(CancelledError):
+        cont_gen.filled(0.3, 0.6)
+    if thread_count == 1:
+        assert progress == [1, 2, 3]
+    else:
+        # Other threads may finish the chunks they have started.
+        assert len(progress) < 3 + thread_count
+
+    # Generator can be used again with a new token.
+    cont_gen.cancel_token = CancelToken()
+    cont_gen.progress_callback = None
+    cont_gen.filled(0.3, 0.6)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+def test_cancel_from_thread(name: str, thread_count: int) -> None:
+    x, y, z = random((400, 400))
+    cont_gen = contour_generator(
+        x, y, z, name=name, chunk_count=20, thread_count=thread_count)
+    token = CancelToken()
+    cont_gen.cancel_token = token
+    started = threading.Event()
+    progress = []
+
+    def progress_callback(chunks_done: int, total_chunks: int) -> None:
+        progress.append(chunks_done)
+        started.set()
+
+    cont_gen.progress_callback = progress_callback
+
+    def cancel() -> None:
+        started.wait()
+        token.cancel()
+
+    thread = threading.Thread(target=cancel)
+    thread.start()
+    with pytest.raises(CancelledError):
+        cont_gen.lines(0.5)
+    thread.join()
+    assert len(progress) < 400
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.ChunkCombinedOffset])
+def test_progress(line_type: LineType, name: str, thread_count: int) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_count=(2, 3), thread_count=thread_count)
+    assert cont_gen.progress_callback is None
+    progress: list[tuple[int, int]] = []
+
+    def progress_callback(chunks_done: int, total_chunks: int) -> None:
+        progress.append((chunks_done, total_chunks))
+
+    cont_gen.progress_callback = progress_callback
+    assert cont_gen.progress_callback is progress_callback
+
+    # Combined output counts then writes each chunk.
+    total = 12 if line_type == LineType.Separate else 6
+    cont_gen.lines(0.5)
+    assert progress == [(i, total) for i in range(1, total+1)]
+
+    progress.clear()
+    cont_gen.count_lines(0.5)
+    assert progress == [(i, 6) for i in range(1, 7)]
+
+    progress.clear()
+    cont_gen.lines_into(lambda *args: None, 0.5)
+    assert progress == [(i, 6) for i in range(1, 7)]
+
+
+@pytest.mark.parametrize("thread_count", [1, 3])
+def test_progress_callback_error(thread_count: int) -> None:
+    call_count = 0
+
+    def progress_callback(chunks_done: int, total_chunks: int) -> None:
+        nonlocal call_count
+        call_count += 1
+        raise ValueError("Error in progress callback")
+
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", chunk_count=(2, 3), thread_count=thread_count)
+    cont_gen.progress_callback = progress_callback
+    with pytest.raises(ValueError, match="Error in progress callback"):
+        cont_gen.filled(0.3, 0.6)
+    assert call_count == 1
+
+    cont_gen.progress_callback = None
+    cont_gen.filled(0.3, 0.6)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+def test_keyboard_interrupt(name: str, thread_count: int) -> None:
+    progress = []
+
+    def progress_callback(chunks_done: int, total_chunks: int) -> None:
+        progress.append(chunks_done)
+        if chunks_done == 2:
+            _thread.interrupt_main()
+
+    x, y, z = random((60, 50))
+    cont_gen = contour_generator(
+        x, y, z, name=name, chunk_count=(3, 4), thread_count=thread_count)
+    cont_gen.progress_callback = progress_callback
+    with pytest.raises(KeyboardInterrupt):
+        cont_gen.lines(0.5)
+    assert len(progress) < 24
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_cancel_derived(name: str) -> None:
+    x, y, z = random((60, 50))
+    cont_gen = contour_generator(x, y, z, name=name, chunk_count=2)
+    token = CancelToken()
+    cont_gen.cancel_token = token
+    progress: list[int] = []
+    cont_gen.progress_callback = lambda chunks_done, total_chunks: progress.append(chunks_done)
+    cont_gen.max_output_bytes = 12345
+    cont_gen.max_retained_bytes = 6789
+
+    # Generators created from this one have the same settings.
+    windows = [cont_gen.window(5, 30, 10, 40), cont_gen.window_bbox(0.2, 0.2, 0.6, 0.6)]
+    for derived in [cont_gen.stride(2, 3), *windows]:
+        assert derived is not None
+        assert derived.cancel_token is token
+        assert derived.progress_callback is cont_gen.progress_callback
+        assert derived.max_output_bytes == 12345
+        assert derived.max_retained_bytes == 6789
+
+    # So progressive contouring can be cancelled after the first item.
+    cont_gen.max_output_bytes = 0
+    progressive = cont_gen.filled_progressive(0.3, 0.6, stride=4, region_size=10)
+    next(progressive)
+    assert len(progress) > 0
+    token.cancel()
+    with pytest.raises(CancelledError):
+        next(progressive)
+
+
+def test_cancel_invalid() -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)))
+    with pytest.raises(ValueError, match="cancel_token must be a CancelToken or None"):
+        cont_gen.cancel_token = 1  # type: ignore[assignment]
+    with pytest.raises(ValueError, match="progress_callback must be callable or None"):
+        cont_gen.progress_callback = "abc"  # type: ignore[assignment]
+
+    # Algorithms that do not support cancellation ignore it.
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)), name="mpl2014")
+    token: Any = CancelToken()
+    token.cancel()
+    cont_gen.cancel_token = token
+    assert cont_gen.cancel_token is None
+    cont_gen.lines(5.0)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator, convert_filled, convert_lines
+from contourpy.util.data import random
+
+from . import util_test
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+fill_types_without_holes = [FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset]
+
+
+def _polygons(
+    filled: cpy.FillReturn, fill_type: FillType,
+) -> list[tuple[cpy.PointArray, cpy.OffsetArray]]:
+    # List of individual polygons (outers with their holes).
+    converted = convert_filled(filled, fill_type, FillType.CombinedOffsetOffset)
+    points, offsets, outer_offsets = cast("cpy.FillReturn_CombinedOffsetOffset", converted)
+    ret = []
+    for i in range(len(outer_offsets)-1):
+        offs = offsets[outer_offsets[i]:outer_offsets[i+1]+1]
+        ret.append((points[offs[0]:offs[-1]], offs - offs[0]))
+    return ret
+
+
+@pytest.mark.parametrize("chunk_count", [1, 3])
+@pytest.mark.parametrize("fill_type_to", FillType.__members__.values())
+@pytest.mark.parametrize("fill_type_from", FillType.__members__.values())
+def test_convert_filled(fill_type_from: FillType, fill_type_to: FillType, chunk_count: int) -> None:
+    if fill_type_from in fill_types_without_holes and fill_type_to not in fill_types_without_holes:
+        pytest.skip()
+
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    filled_from = contour_generator(
+        x, y, z, fill_type=fill_type_from, chunk_count=chunk_count).filled(0.3, 0.6)
+    filled_to = contour_generator(
+        x, y, z, fill_type=fill_type_to, chunk_count=chunk_count).filled(0.3, 0.6)
+
+    converted = convert_filled(filled_from, fill_type_from, fill_type_to)
+    util_test.assert_filled(converted, fill_type_to)
+
+    if fill_type_to in fill_types_without_holes:
+        # Boundaries may be in a different order.
+        def key(points: cpy.PointArray) -> bytes:
+            return points.tobytes()
+        expected = sorted(util_test.boundaries(filled_to, fill_type_to), key=key)
+        actual = sorted(util_test.boundaries(converted, fill_type_to), key=key)
+    else:
+        expected = util_test.boundaries(filled_to, fill_type_to)
+        actual = util_test.boundaries(converted, fill_type_to)
+    assert len(actual) == len(expected)
+    for act, exp in zip(actual, expected):
+        assert_array_equal(act, exp)
+
+    if fill_type_to not in fill_types_without_holes:
+        polygons = _polygons(converted, fill_type_to)
+        expected_polygons = _polygons(filled_to, fill_type_to)
+        assert len(polygons) == len(expected_polygons)
+        for (points, offsets), (expected_points, expected_offsets) in zip(
+            polygons, expected_polygons,
+        ):
+            assert_array_equal(points, expected_points)
+            assert_array_equal(offsets, expected_offsets)
+
+
+@pytest.mark.parametrize("fill_type_to", FillType.__members__.values())
+@pytest.mark.parametrize("fill_type_from", FillType.__members__.values())
+def test_convert_filled_empty(fill_type_from: FillType, fill_type_to: FillType) -> None:
+    if fill_type_from in fill_types_without_holes and fill_type_to not in fill_types_without_holes:
+        pytest.skip()
+
+    x, y, z = random((30, 40))
+    filled = contour_generator(x, y, z, fill_type=fill_type_from, chunk_count=2).filled(5.0, 6.0)
+    converted = convert_filled(filled, fill_type_from, fill_type_to)
+    util_test.assert_filled(converted, fill_type_to)
+    assert len(util_test.boundaries(converted, fill_type_to)) == 0
+
+
+@pytest.mark.parametrize("fill_type_to", FillType.__members__.values())
+@pytest.mark.parametrize("fill_type_from", fill_types_without_holes)
+def test_convert_filled_holes_not_identified(
+    fill_type_from: FillType, fill_type_to: FillType,
+) -> None:
+    if fill_type_to in fill_types_without_holes:
+        pytest.skip()
+
+    filled = contour_generator(z=[[0, 1], [2, 3]], fill_type=fill_type_from).filled(0.5, 2.5)
+    with pytest.raises(ValueError, match="does not identify which holes belong"):
+        convert_filled(filled, fill_type_from, fill_type_to)
+
+
+def test_convert_filled_str() -> None:
+    z = [[0, 1], [2, 3]]
+    filled = contour_generator(z=z, fill_type=FillType.OuterOffset).filled(0.5, 2.5)
+    converted = convert_filled(filled, "OuterOffset", "ChunkCombinedCode")
+    util_test.assert_filled(converted, FillType.ChunkCombinedCode)
+    expected = contour_generator(z=z, fill_type=FillType.ChunkCombinedCode).filled(0.5, 2.5)
+    assert_array_equal(converted[0][0], expected[0][0])
+    assert_array_equal(converted[1][0], expected[1][0])
+
+
+@pytest.mark.parametrize("chunk_count", [1, 3])
+@pytest.mark.parametrize("line_type_to", LineType.__members__.values())
+@pytest.mark.parametrize("line_type_from", LineType.__members__.values())
+def test_convert_lines(line_type_from: LineType, line_type_to: LineType, chunk_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    lines_from = contour_generator(
+        x, y, z, line_type=line_type_from, chunk_count=chunk_count).lines(0.4)
+    lines_to = contour_generator(
+        x, y, z, line_type=line_type_to, chunk_count=chunk_count).lines(0.4)
+
+    converted = convert_lines(lines_from, line_type_from, line_type_to)
+    util_test.assert_lines(converted, line_type_to)
+
+    actual = convert_lines(converted, line_type_to, LineType.Separate)
+    expected = convert_lines(lines_to, line_type_to, LineType.Separate)
+    assert len(actual) == len(expected)
+    for act, exp in zip(actual, expected):
+        assert_array_equal(act, exp)
+
+    if line_type_to == LineType.SeparateCode:
+        for codes, expected_codes in zip(converted[1], lines_to[1]):
+            assert_array_equal(codes, expected_codes)
+
+
+@pytest.mark.parametrize("line_type_to", LineType.__members__.values())
+@pytest.mark.parametrize("line_type_from", LineType.__members__.values())
+def test_convert_lines_empty(line_type_from: LineType, line_type_to: LineType) -> None:
+    x, y, z = random((30, 40))
+    lines = contour_generator(x, y, z, line_type=line_type_from, chunk_count=2).lines(5.0)
+    converted = convert_lines(lines, line_type_from, line_type_to)
+    util_test.assert_lines(converted, line_type_to)
+    assert len(convert_lines(converted, line_type_to, LineType.Separate)) == 0
+
+
+def test_convert_lines_str() -> None:
+    lines = contour_generator(z=[[0, 1], [2, 3]], line_type=LineType.Separate).lines(1.5)
+    converted = convert_lines(lines, "Separate", "SeparateCode")
+    util_test.assert_lines(converted, LineType.SeparateCode)
+    assert_array_equal(converted[0][0], lines[0])
+    assert_array_equal(converted[1][0], [1, 2])
+
+
+def test_convert_lines_closed() -> None:
+    z = np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]])
+    lines = contour_generator(z=z, line_type=LineType.ChunkCombinedOffset).lines(0.5)
+    converted = convert_lines(lines, LineType.ChunkCombinedOffset, LineType.SeparateCode)
+    codes = cast("cpy.LineReturn_SeparateCode", converted)[1][0]
+    assert codes[0] == 1
+    assert codes[-1] == 79
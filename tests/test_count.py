@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("chunk_count", [1, (3, 2)])
+def test_count_filled(name: str, chunk_count: int | tuple[int, int]) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=chunk_count)
+    n_chunks = int(np.prod(cont_gen.chunk_count))
+
+    counts = cont_gen.count_filled(0.3, 0.6)
+    assert len(counts) == 3
+    for count in counts:
+        assert count.dtype == np.uint64
+        assert count.shape == (n_chunks,)
+    point_counts, line_counts, hole_counts = counts
+
+    filled = cont_gen.filled(0.3, 0.6)
+    if TYPE_CHECKING:
+        filled = cast(cpy.FillReturn_ChunkCombinedOffsetOffset, filled)
+    for chunk, (points, offsets, outer_offsets) in enumerate(zip(*filled)):
+        if points is None:
+            assert point_counts[chunk] == line_counts[chunk] == hole_counts[chunk] == 0
+        else:
+            assert offsets is not None and outer_offsets is not None
+            assert point_counts[chunk] == len(points)
+            assert line_counts[chunk] == len(offsets) - 1
+            assert hole_counts[chunk] == len(offsets) - len(outer_offsets)
+    assert hole_counts.sum() > 0
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("chunk_count", [1, (3, 2)])
+def test_count_lines(name: str, chunk_count: int | tuple[int, int]) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=LineType.ChunkCombinedOffset, chunk_count=chunk_count)
+    n_chunks = int(np.prod(cont_gen.chunk_count))
+
+    counts = cont_gen.count_lines(0.4)
+    assert len(counts) == 2
+    for count in counts:
+        assert count.dtype == np.uint64
+        assert count.shape == (n_chunks,)
+    point_counts, line_counts = counts
+
+    lines = cont_gen.lines(0.4)
+    if TYPE_CHECKING:
+        lines = cast(cpy.LineReturn_ChunkCombinedOffset, lines)
+    expected_point_counts = [0 if points is None else len(points) for points in lines[0]]
+    expected_line_counts = [0 if offsets is None else len(offsets) - 1 for offsets in lines[1]]
+    assert_array_equal(point_counts, expected_point_counts)
+    assert_array_equal(line_counts, expected_line_counts)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_count_then_contour(name: str) -> None:
+    # Counting must not affect subsequent calls, including those using combined output.
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.OuterOffset, line_type=LineType.CombinedOffset,
+        chunk_count=2)
+    expected_filled = cont_gen.filled(0.3, 0.6)
+    expected_lines = cont_gen.lines(0.4)
+
+    point_counts, _, _ = cont_gen.count_filled(0.3, 0.6)
+    filled = cont_gen.filled(0.3, 0.6)
+    if TYPE_CHECKING:
+        filled = cast(cpy.FillReturn_OuterOffset, filled)
+        expected_filled = cast(cpy.FillReturn_OuterOffset, expected_filled)
+    assert point_counts.sum() == sum(len(points) for points in filled[0])
+    for points, expected_points in zip(filled[0], expected_filled[0]):
+        assert_array_equal(points, expected_points)
+
+    point_counts, line_counts = cont_gen.count_lines(0.4)
+    lines = cont_gen.lines(0.4)
+    if TYPE_CHECKING:
+        lines = cast(cpy.LineReturn_CombinedOffset, lines)
+        expected_lines = cast(cpy.LineReturn_CombinedOffset, expected_lines)
+    assert point_counts.sum() == len(lines[0])
+    assert line_counts.sum() == len(lines[1]) - 1
+    assert_array_equal(lines[0], expected_lines[0])
+
+
+def test_count_empty() -> None:
+    cont_gen = contour_generator(z=[[0, 1], [2, 3]], name="serial", chunk_size=1)
+    for count in cont_gen.count_filled(5.0, 6.0):
+        assert_array_equal(count, [0])
+    for count in cont_gen.count_lines(-1.0):
+        assert_array_equal(count, [0])
+
+
+def test_count_filled_invalid_levels() -> None:
+    cont_gen = contour_generator(z=[[0, 1], [2, 3]], name="serial")
+    with pytest.raises(ValueError, match="upper and lower levels are the wrong way round"):
+        cont_gen.count_filled(2.0, 1.0)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from functools import reduce
 from operator import add
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
 from numpy.testing import assert_allclose, assert_array_equal
@@ -720,6 +720,12 @@ def test_return_by_fill_type(
         assert isinstance(outer_offsets_or_none, list) and len(outer_offsets_or_none) == 1
         assert outer_offsets_or_none[0] is not None
         assert_array_equal(outer_offsets_or_none[0], [0, 2, 3])
+    elif fill_type == FillType.CombinedOffsetOffset:
+        if TYPE_CHECKING:
+            filled = cast(cpy.FillReturn_CombinedOffsetOffset, filled)
+        assert_chunk_points([filled[0]])
+        assert_chunk_offsets([filled[1]])
+        assert_array_equal(filled[2], [0, 2, 3])
     else:
         raise RuntimeError(f"Unexpected fill_type {fill_type}")
 
@@ -843,10 +849,93 @@ def test_return_by_fill_type_chunk(
             chunk_outer_offsets = outer_offsets_or_none[chunk]
             assert chunk_outer_offsets is not None
             assert_array_equal(chunk_outer_offsets, [0, 1])
+    elif fill_type == FillType.CombinedOffsetOffset:
+        if TYPE_CHECKING:
+            filled = cast(cpy.FillReturn_CombinedOffsetOffset, filled)
+        # Single set of arrays for all chunks, always in chunk order.
+        assert_allclose(filled[0], np.concatenate(expected))
+        assert_array_equal(filled[1], [0, 9, 18, 27, 36])
+        assert_array_equal(filled[2], [0, 1, 2, 3, 4])
     else:
         raise RuntimeError(f"Unexpected fill_type {fill_type}")
 
 
+@pytest.mark.parametrize("chunk_count", [1, 3, 7])
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 2)])
+def test_filled_combined(name: str, thread_count: int, chunk_count: int) -> None:
+    # CombinedOffsetOffset should be the same as concatenating the chunks of
+    # ChunkCombinedOffsetOffset.
+    x, y, z = random((50, 60), mask_fraction=0.05, seed=2187)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.CombinedOffsetOffset, chunk_count=chunk_count,
+        thread_count=thread_count,
+    )
+    chunk_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=chunk_count,
+        thread_count=thread_count,
+    )
+
+    for lower_level, upper_level in [(0.2, 0.4), (0.5, 0.55), (2.0, 3.0)]:
+        filled = cont_gen.filled(lower_level, upper_level)
+        util_test.assert_filled(filled, FillType.CombinedOffsetOffset)
+        if TYPE_CHECKING:
+            filled = cast(cpy.FillReturn_CombinedOffsetOffset, filled)
+        points, offsets, outer_offsets = filled
+
+        chunk_filled = chunk_gen.filled(lower_level, upper_level)
+        if TYPE_CHECKING:
+            chunk_filled = cast(cpy.FillReturn_ChunkCombinedOffsetOffset, chunk_filled)
+        expected_points: cpy.PointArray = np.empty((0, 2))
+        expected_offsets = [0]
+        expected_outer_offsets = [0]
+        for chunk_points, chunk_offsets, chunk_outer_offsets in zip(*chunk_filled):
+            if chunk_points is None:
+                continue
+            assert chunk_offsets is not None and chunk_outer_offsets is not None
+            expected_outer_offsets += list(chunk_outer_offsets[1:] + len(expected_offsets) - 1)
+            expected_offsets += list(chunk_offsets[1:] + len(expected_points))
+            expected_points = np.concatenate((expected_points, chunk_points))
+
+        assert_array_equal(points, expected_points)
+        assert_array_equal(offsets, expected_offsets)
+        assert_array_equal(outer_offsets, expected_outer_offsets)
+
+
+@pytest.mark.parametrize("fill_type", [
+    FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset, FillType.ChunkCombinedCodeOffset,
+    FillType.ChunkCombinedOffsetOffset,
+])
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 2)])
+def test_filled_sparse(name: str, thread_count: int, fill_type: FillType) -> None:
+    # Sparse output should be the same as the non-empty chunks of the normal output.
+    x, y, z = random((50, 60), mask_fraction=0.05, seed=2187)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_size=4, thread_count=thread_count,
+    )
+
+    for lower_level, upper_level in [(0.2, 0.4), (0.9, 0.95), (2.0, 3.0)]:
+        filled, chunk_indices = cont_gen.filled(lower_level, upper_level, sparse=True)
+        assert chunk_indices.dtype == np.int32
+        assert chunk_indices.ndim == 1
+        util_test.assert_filled(filled, fill_type)
+
+        expected = cont_gen.filled(lower_level, upper_level)
+        expected_indices = [i for i, points in enumerate(expected[0]) if points is not None]
+        assert_array_equal(chunk_indices, expected_indices)
+        for returned, expected_list in zip(
+            cast(tuple[list[Any], ...], filled), cast(tuple[list[Any], ...], expected),
+        ):
+            assert len(returned) == len(chunk_indices)
+            for array, chunk in zip(returned, chunk_indices):
+                assert_array_equal(array, expected_list[chunk])
+
+
+def test_filled_sparse_invalid() -> None:
+    cont_gen = contour_generator(z=[[0, 1], [2, 3]], fill_type=FillType.OuterOffset)
+    with pytest.raises(ValueError, match="sparse is only supported for chunked FillTypes"):
+        cont_gen.filled(0.5, 1.5, sparse=True)
+
+
 @pytest.mark.parametrize("name, fill_type", util_test.all_names_and_fill_types())
 @pytest.mark.parametrize("corner_mask", [None, False, True])
 def test_filled_random_big(name: str, fill_type: FillType, corner_mask: bool | None) -> None:
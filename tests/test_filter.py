@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator, convert_filled, convert_lines
+from contourpy.util.data import random
+
+from . import util_test
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _keep(points: cpy.PointArray, min_points: float, min_area: float, min_length: float) -> bool:
+    x, y = points[:, 0], points[:, 1]
+    closed = len(points) > 1 and bool(np.all(points[0] == points[-1]))
+    area = 0.5*abs(float(np.sum(x[:-1]*y[1:] - x[1:]*y[:-1]))) if closed else 0.0
+    length = float(np.sum(np.hypot(np.diff(x), np.diff(y))))
+    return len(points) >= min_points and length >= min_length and not (closed and area < min_area)
+
+
+filters = [
+    dict(min_points=10),
+    dict(min_area=0.5),
+    dict(min_length=3.0),
+    dict(min_points=6, min_area=0.2, min_length=1.5),
+]
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("filter", filters)
+def test_filled_filter(name: str, fill_type: FillType, filter: dict[str, float]) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    kwargs = {**dict(min_points=0, min_area=0.0, min_length=0.0), **filter}
+
+    cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_count=(2, 3))
+    unfiltered = util_test.boundaries(cont_gen.filled(0.3, 0.6), fill_type)
+
+    if fill_type in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset):
+        # Holes are not associated with outers so are filtered independently.
+        expected = [b for b in unfiltered if _keep(b, **kwargs)]
+    else:
+        # Holes of discarded outers are also discarded.
+        expected = []
+        outer_offsets = cast("cpy.FillReturn_CombinedOffsetOffset", convert_filled(
+            cont_gen.filled(0.3, 0.6), fill_type, FillType.CombinedOffsetOffset))[2]
+        for start, end in zip(outer_offsets[:-1], outer_offsets[1:]):
+            if _keep(unfiltered[start], **kwargs):
+                expected += [b for b in unfiltered[start:end] if _keep(b, **kwargs)]
+
+    filled = cont_gen.filled(0.3, 0.6, **filter)  # type: ignore[call-overload]
+    boundaries = util_test.boundaries(filled, fill_type)
+
+    assert 0 < len(boundaries) < len(unfiltered)
+    assert len(boundaries) == len(expected)
+    for boundary, expected_boundary in zip(boundaries, expected):
+        assert_array_equal(boundary, expected_boundary)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("filter", filters)
+def test_lines_filter(name: str, line_type: LineType, filter: dict[str, float]) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    kwargs = {**dict(min_points=0, min_area=0.0, min_length=0.0), **filter}
+    cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_count=(2, 3))
+
+    unfiltered = cast("cpy.LineReturn_Separate", convert_lines(
+        cont_gen.lines(0.4), line_type, LineType.Separate))
+    expected = [line for line in unfiltered if _keep(line, **kwargs)]
+
+    lines = cont_gen.lines(0.4, **filter)  # type: ignore[call-overload]
+    separate = cast("cpy.LineReturn_Separate", convert_lines(lines, line_type, LineType.Separate))
+
+    assert 0 < len(separate) < len(unfiltered)
+    assert len(separate) == len(expected)
+    for line, expected_line in zip(separate, expected):
+        assert_array_equal(line, expected_line)
+
+
+def test_filter_outer_discards_holes() -> None:
+    z = np.zeros((5, 5))
+    z[1:4, 1:4] = 1
+    z[2, 2] = 0
+    cont_gen = contour_generator(z=z, fill_type=FillType.OuterOffset)
+
+    # Outer has 13 points, hole has 5.
+    points, offsets = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(0.5, 2.0, min_points=6))
+    assert len(points) == 1 and len(points[0]) == 13
+    assert_array_equal(offsets[0], [0, 13])
+
+    points, offsets = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(0.5, 2.0, min_points=14))
+    assert len(points) == 0 and len(offsets) == 0
+
+    # Outer area is 8.5, hole area is 0.5 but would be kept.
+    points, _ = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(0.5, 2.0, min_area=9.0))
+    assert len(points) == 0
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filter_metrics_and_sparse(name: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=LineType.ChunkCombinedOffset, chunk_count=(3, 3))
+    _, unfiltered_metrics = cont_gen.lines(0.95, metrics=True)
+
+    ret, metrics = cont_gen.lines(0.95, sparse=True, metrics=True, min_length=1.2)
+    lines, chunk_indices = cast("cpy.LineReturnSparse", ret)
+    points, offsets = cast("cpy.LineReturn_ChunkCombinedOffset", lines)
+    assert_array_equal(metrics, unfiltered_metrics[unfiltered_metrics["length"] >= 1.2])
+
+    # Chunks emptied by filtering are not returned.
+    assert_array_equal(chunk_indices, [4, 7, 8])
+    assert len(points) == len(offsets) == len(chunk_indices)
+    for pts, offs in zip(points, offsets):
+        assert pts is not None and offs is not None
+        assert len(offs) > 1 and offs[-1] == len(pts)
+
+
+def test_filter_out() -> None:
+    cont_gen = contour_generator(
+        z=[[0, 1], [2, 3]], fill_type=FillType.ChunkCombinedOffset,
+        line_type=LineType.ChunkCombinedOffset)
+    out = (np.empty((10, 2)), np.empty(10, dtype=np.uint32))
+    msg = "out cannot be used with min_points, min_area, min_length or simplify_tolerance"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.lines(1.5, out=out, min_points=3)
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.filled(0.5, 1.5, out=out, min_area=1.0)
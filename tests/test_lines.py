@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
 from numpy.testing import assert_allclose, assert_array_equal
@@ -692,6 +692,11 @@ def test_return_by_line_type(
         assert offsets_or_none is not None
         assert points_or_none.shape == (7, 2)
         assert_array_equal(offsets_or_none, [0, 5, 7])
+    elif line_type == LineType.CombinedOffset:
+        if TYPE_CHECKING:
+            lines = cast(cpy.LineReturn_CombinedOffset, lines)
+        assert lines[0].shape == (7, 2)
+        assert_array_equal(lines[1], [0, 5, 7])
     else:
         raise RuntimeError(f"Unexpected line_type {line_type}")
 
@@ -769,10 +774,86 @@ def test_return_by_line_type_chunk(
             assert offsets_or_none is not None
             assert_allclose(points_or_none, expected[chunk])
             assert_array_equal(offsets_or_none, [0, len(expected[chunk])])
+    elif line_type == LineType.CombinedOffset:
+        if TYPE_CHECKING:
+            lines = cast(cpy.LineReturn_CombinedOffset, lines)
+        # Single set of arrays for all chunks, always in chunk order.
+        points, offsets = lines
+        assert_allclose(points, np.concatenate(expected))
+        assert_array_equal(offsets, np.cumsum([0] + [len(e) for e in expected]))
     else:
         raise RuntimeError(f"Unexpected line_type {line_type}")
 
 
+@pytest.mark.parametrize("chunk_count", [1, 3, 7])
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 2)])
+def test_lines_combined(name: str, thread_count: int, chunk_count: int) -> None:
+    # CombinedOffset should be the same as concatenating the chunks of ChunkCombinedOffset.
+    x, y, z = random((50, 60), mask_fraction=0.05, seed=2187)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=LineType.CombinedOffset, chunk_count=chunk_count,
+        thread_count=thread_count,
+    )
+    chunk_gen = contour_generator(
+        x, y, z, name=name, line_type=LineType.ChunkCombinedOffset, chunk_count=chunk_count,
+        thread_count=thread_count,
+    )
+
+    for level in [0.2, 0.5, 2.0]:
+        lines = cont_gen.lines(level)
+        util_test.assert_lines(lines, LineType.CombinedOffset)
+        if TYPE_CHECKING:
+            lines = cast(cpy.LineReturn_CombinedOffset, lines)
+        points, offsets = lines
+
+        chunk_lines = chunk_gen.lines(level)
+        if TYPE_CHECKING:
+            chunk_lines = cast(cpy.LineReturn_ChunkCombinedOffset, chunk_lines)
+        expected_points: cpy.PointArray = np.empty((0, 2))
+        expected_offsets = [0]
+        for chunk_points, chunk_offsets in zip(*chunk_lines):
+            if chunk_points is None:
+                continue
+            assert chunk_offsets is not None
+            expected_offsets += list(chunk_offsets[1:] + len(expected_points))
+            expected_points = np.concatenate((expected_points, chunk_points))
+
+        assert_array_equal(points, expected_points)
+        assert_array_equal(offsets, expected_offsets)
+
+
+@pytest.mark.parametrize("line_type", [LineType.ChunkCombinedCode, LineType.ChunkCombinedOffset])
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 2)])
+def test_lines_sparse(name: str, thread_count: int, line_type: LineType) -> None:
+    # Sparse output should be the same as the non-empty chunks of the normal output.
+    x, y, z = random((50, 60), mask_fraction=0.05, seed=2187)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_size=4, thread_count=thread_count,
+    )
+
+    for level in [0.2, 0.95, 2.0]:
+        lines, chunk_indices = cont_gen.lines(level, sparse=True)
+        assert chunk_indices.dtype == np.int32
+        assert chunk_indices.ndim == 1
+        util_test.assert_lines(lines, line_type)
+
+        expected = cont_gen.lines(level)
+        expected_indices = [i for i, points in enumerate(expected[0]) if points is not None]
+        assert_array_equal(chunk_indices, expected_indices)
+        for returned, expected_list in zip(
+            cast(tuple[list[Any], ...], lines), cast(tuple[list[Any], ...], expected),
+        ):
+            assert len(returned) == len(chunk_indices)
+            for array, chunk in zip(returned, chunk_indices):
+                assert_array_equal(array, expected_list[chunk])
+
+
+def test_lines_sparse_invalid() -> None:
+    cont_gen = contour_generator(z=[[0, 1], [2, 3]], line_type=LineType.CombinedOffset)
+    with pytest.raises(ValueError, match="sparse is only supported for chunked LineTypes"):
+        cont_gen.lines(1.5, sparse=True)
+
+
 @pytest.mark.parametrize("name, line_type", util_test.all_names_and_line_types())
 @pytest.mark.parametrize("corner_mask", [None, False, True])
 def test_lines_random_big(name: str, line_type: LineType, corner_mask: bool) -> None:
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from contourpy import FillType, LineType, OutputTooLargeError, contour_generator
+from contourpy.util.data import random
+
+
+def _nbytes(obj: Any) -> int:
+    # Total bytes of the distinct arrays that obj contains, or that contain its arrays.
+    bases: dict[int, Any] = {}
+    for array in _arrays(obj):
+        while isinstance(array.base, np.ndarray):
+            array = array.base
+        bases[id(array)] = array
+    return sum(array.nbytes for array in bases.values())
+
+
+def _arrays(obj: Any) -> list[Any]:
+    if isinstance(obj, np.ndarray):
+        return [obj]
+    elif isinstance(obj, (list, tuple)):
+        return [array for item in obj for array in _arrays(item)]
+    else:
+        return []
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("fill_type", [FillType.OuterCode, FillType.CombinedOffsetOffset])
+def test_max_output_bytes_combined(fill_type: FillType, name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_count=(3, 4), thread_count=thread_count)
+    assert cont_gen.max_output_bytes == 0
+    expected: Any = cont_gen.filled(0.3, 0.6)
+
+    cont_gen.max_output_bytes = 100
+    assert cont_gen.max_output_bytes == 100
+    with pytest.raises(OutputTooLargeError, match="exceeds max_output_bytes of 100") as excinfo:
+        cont_gen.filled(0.3, 0.6)
+    assert excinfo.value.max_output_bytes == 100
+
+    # All chunks are counted before the limit is checked, so the estimate is for the whole output.
+    estimated_bytes = excinfo.value.estimated_bytes
+    point_count = cont_gen.count_filled(0.3, 0.6)[0].sum()
+    assert estimated_bytes > 16*point_count
+
+    cont_gen.max_output_bytes = estimated_bytes - 1
+    with pytest.raises(OutputTooLargeError) as excinfo:
+        cont_gen.filled(0.3, 0.6)
+    assert excinfo.value.estimated_bytes == estimated_bytes
+
+    cont_gen.max_output_bytes = estimated_bytes
+    filled: Any = cont_gen.filled(0.3, 0.6)
+    for expected_list, filled_list in zip(expected, filled):
+        for expected_array, filled_array in zip(expected_list, filled_list):
+            np.testing.assert_array_equal(filled_array, expected_array)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("line_type", [LineType.ChunkCombinedCode, LineType.ChunkCombinedOffset])
+def test_max_output_bytes_chunked(line_type: LineType, name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_count=(3, 4), thread_count=thread_count)
+    expected: Any = cont_gen.lines(0.5)
+    progress: list[int] = []
+    cont_gen.progress_callback = lambda chunks_done, total_chunks: progress.append(total_chunks)
+
+    # All chunks are counted before any output is allocated, so the estimate is for the whole
+    # output.
+    cont_gen.max_output_bytes = 100
+    with pytest.raises(OutputTooLargeError) as excinfo:
+        cont_gen.lines(0.5)
+    estimated_bytes = excinfo.value.estimated_bytes
+    assert estimated_bytes == _nbytes(expected)
+    assert progress == [24]*12
+
+    cont_gen.max_output_bytes = estimated_bytes
+    progress.clear()
+    lines: Any = cont_gen.lines(0.5)
+    assert progress == [24]*24
+    for expected_list, lines_list in zip(expected, lines):
+        for expected_array, lines_array in zip(expected_list, lines_list):
+            if expected_array is None:
+                assert lines_array is None
+            else:
+                np.testing.assert_array_equal(lines_array, expected_array)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_max_output_bytes_exact(name: str, thread_count: int, sparse: bool) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    kwargs: dict[str, Any] = {"sparse": sparse}
+    for fill_type in FillType.__members__.values():
+        cont_gen = contour_generator(
+            x, y, z, name=name, fill_type=fill_type, chunk_count=(3, 4), thread_count=thread_count)
+        is_chunked = "ChunkCombined" in fill_type.name
+        if sparse and not is_chunked:
+            continue
+        filled = cont_gen.filled(0.3, 0.6, **kwargs)
+        cont_gen.max_output_bytes = 1
+        with pytest.raises(OutputTooLargeError) as excinfo:
+            cont_gen.filled(0.3, 0.6, **kwargs)
+        assert excinfo.value.estimated_bytes == _nbytes(filled), fill_type
+
+    for line_type in LineType.__members__.values():
+        cont_gen = contour_generator(
+            x, y, z, name=name, line_type=line_type, chunk_count=(3, 4), thread_count=thread_count)
+        is_chunked = "ChunkCombined" in line_type.name
+        if sparse and not is_chunked:
+            continue
+        lines = cont_gen.lines(0.5, **kwargs)
+        cont_gen.max_output_bytes = 1
+        with pytest.raises(OutputTooLargeError) as excinfo:
+            cont_gen.lines(0.5, **kwargs)
+        assert excinfo.value.estimated_bytes == _nbytes(lines), line_type
+
+    # Metrics are included, and filtering gives an upper bound.
+    cont_gen = contour_generator(x, y, z, name=name, chunk_count=(3, 4), thread_count=thread_count)
+    filled_metrics = cont_gen.filled(0.3, 0.6, metrics=True)
+    filtered = cont_gen.filled(0.3, 0.6, min_points=10)
+    cont_gen.max_output_bytes = 1
+    with pytest.raises(OutputTooLargeError) as excinfo:
+        cont_gen.filled(0.3, 0.6, metrics=True)
+    assert excinfo.value.estimated_bytes == _nbytes(filled_metrics)
+    with pytest.raises(OutputTooLargeError) as excinfo:
+        cont_gen.filled(0.3, 0.6, min_points=10)
+    assert excinfo.value.estimated_bytes > _nbytes(filtered)
+
+
+def test_max_output_bytes_not_limited() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=2)
+    cont_gen.max_output_bytes = 1
+
+    # Methods that do not return all of the contours are not limited, so can be used instead.
+    chunks: list[int] = []
+    try:
+        cont_gen.filled(0.3, 0.6)
+    except OutputTooLargeError:
+        cont_gen.filled_into(lambda chunk, *arrays: chunks.append(chunk), 0.3, 0.6)
+    assert chunks == [0, 1, 2, 3]
+
+    cont_gen.count_filled(0.3, 0.6)
+
+    point_count = cont_gen.count_filled(0.3, 0.6)[0].sum()
+    out: Any = (
+        np.empty((point_count, 2)), np.empty(1000, dtype=np.uint32),
+        np.empty(1000, dtype=np.uint32))
+    filled, used = cont_gen.filled(0.3, 0.6, out=out)
+    assert filled is not None
+    assert used[0] == point_count
+
+
+def test_max_output_bytes_error() -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)), name="threaded")
+    cont_gen.max_output_bytes = 10
+    # 5 points.
+    with pytest.raises(RuntimeError, match="Estimated output size of 80 bytes exceeds"):
+        cont_gen.lines(5.0)
+
+    # Generator can still be used.
+    cont_gen.max_output_bytes = 0
+    assert len(cont_gen.lines(5.0)) == 1
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_max_output_bytes_not_supported(name: str) -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)), name=name)
+    cont_gen.max_output_bytes = 0
+    msg = f"{type(cont_gen).__name__} does not support max_output_bytes"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.max_output_bytes = 10
+    assert cont_gen.max_output_bytes == 0
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from contourpy import (
+    ContourResult, FillType, LineType, contour_generator, convert_filled, convert_lines,
+)
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _expected_metrics(lines: list[cpy.PointArray]) -> dict[str, list[float]]:
+    ret: dict[str, list[float]] = {
+        "area": [], "length": [], "xmin": [], "ymin": [], "xmax": [], "ymax": [], "closed": [],
+    }
+    for points in lines:
+        x, y = points[:, 0], points[:, 1]
+        closed = len(points) > 1 and bool(np.all(points[0] == points[-1]))
+        ret["area"].append(0.5*float(np.sum(x[:-1]*y[1:] - x[1:]*y[:-1])) if closed else 0.0)
+        ret["length"].append(float(np.sum(np.hypot(np.diff(x), np.diff(y)))))
+        ret["xmin"].append(x.min())
+        ret["ymin"].append(y.min())
+        ret["xmax"].append(x.max())
+        ret["ymax"].append(y.max())
+        ret["closed"].append(closed)
+    return ret
+
+
+def _assert_metrics(metrics: cpy.MetricsArray, lines: list[cpy.PointArray]) -> None:
+    expected = _expected_metrics(lines)
+    assert len(metrics) == len(lines)
+    assert metrics.dtype.names == tuple(expected.keys())
+    for name, values in expected.items():
+        if name == "closed":
+            assert_array_equal(metrics[name], values)
+        else:
+            assert_allclose(metrics[name], values, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_filled_metrics(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_count=(2, 3))
+    ret, metrics = cont_gen.filled(0.3, 0.6, metrics=True)
+    filled = cast("cpy.FillReturn", ret)
+
+    # Individual boundaries in the order they are returned.
+    points, offsets = cast("cpy.FillReturn_ChunkCombinedOffset", convert_filled(
+        filled, fill_type, FillType.ChunkCombinedOffset))
+    boundaries = []
+    for pts, offs in zip(points, offsets):
+        if pts is not None:
+            assert offs is not None
+            boundaries += np.split(pts, offs[1:-1])
+    _assert_metrics(metrics, boundaries)
+
+    # Filled boundaries are always closed, outers anticlockwise and holes clockwise.
+    assert np.all(metrics["closed"])
+    if fill_type not in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset):
+        outer_offsets = cast("cpy.FillReturn_CombinedOffsetOffset", convert_filled(
+            filled, fill_type, FillType.CombinedOffsetOffset))[2]
+        is_outer = np.zeros(len(metrics), dtype=bool)
+        is_outer[outer_offsets[:-1]] = True
+        assert np.all(metrics["area"][is_outer] > 0)
+        assert np.all(metrics["area"][~is_outer] < 0)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+def test_lines_metrics(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_count=(2, 3))
+    ret, metrics = cont_gen.lines(0.4, metrics=True)
+
+    separate = cast("cpy.LineReturn_Separate", convert_lines(
+        cast("cpy.LineReturn", ret), line_type, LineType.Separate))
+    _assert_metrics(metrics, separate)
+    assert np.any(metrics["closed"]) and not np.all(metrics["closed"])
+
+
+def test_metrics_simple() -> None:
+    z = np.zeros((5, 5))
+    z[1:4, 1:4] = 1
+    z[2, 2] = 0
+    cont_gen = contour_generator(z=z, fill_type=FillType.OuterOffset)
+    _, metrics = cont_gen.filled(0.5, 2.0, metrics=True)
+    assert_allclose(metrics["area"], [8.5, -0.5])
+    assert_allclose(metrics["length"], [8 + 2*np.sqrt(2), 2*np.sqrt(2)])
+    assert_array_equal(metrics["xmin"], [0.5, 1.5])
+    assert_array_equal(metrics["ymax"], [3.5, 2.5])
+
+
+def test_metrics_per_polygon() -> None:
+    z = np.zeros((5, 7))
+    z[1:4, 1:4] = 1
+    z[2, 2] = 0
+    z[1:4, 5] = 1
+    cont_gen = contour_generator(z=z, fill_type=FillType.CombinedOffsetOffset)
+    ret, metrics = cont_gen.filled(0.5, 2.0, metrics=True)
+    outer_offsets = cast("cpy.FillReturn_CombinedOffsetOffset", ret)[2]
+
+    # One item per boundary, which can be aggregated to one per polygon.
+    assert_allclose(metrics["area"], [8.5, -0.5, 2.5])
+    assert_allclose(np.add.reduceat(metrics["area"], outer_offsets[:-1]), [8.0, 2.5])
+
+
+def test_metrics_empty() -> None:
+    cont_gen = contour_generator(z=[[0, 1], [2, 3]], fill_type=FillType.OuterOffset)
+    ret, metrics = cont_gen.filled(5.0, 6.0, metrics=True)
+    assert len(cast("cpy.FillReturn_OuterOffset", ret)[0]) == 0
+    assert len(metrics) == 0
+    assert metrics.dtype.names is not None and "area" in metrics.dtype.names
+
+
+def test_metrics_combined_options() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, line_type=LineType.ChunkCombinedOffset, chunk_count=(3, 3))
+    _, expected_metrics = cont_gen.lines(0.95, metrics=True)
+
+    sparse, metrics = cont_gen.lines(0.95, sparse=True, metrics=True)
+    lines, chunk_indices = cast("cpy.LineReturnSparse", sparse)
+    assert len(cast("cpy.LineReturn_ChunkCombinedOffset", lines)[0]) == len(chunk_indices)
+    assert_array_equal(metrics, expected_metrics)
+
+    result, metrics = cont_gen.lines(0.95, result=True, metrics=True)
+    assert isinstance(result, ContourResult)
+    assert len(metrics) == result.line_count
+    assert_array_equal(metrics, expected_metrics)
+
+    out = (np.empty((1000, 2)), np.empty(100, dtype=np.uint32))
+    ret, used = cont_gen.lines(0.95, out=out, metrics=True)
+    assert ret is not None
+    assert_array_equal(ret[1], expected_metrics)
+    assert used[1] == len(expected_metrics) + len(chunk_indices)
+
+    ret, _ = cont_gen.lines(0.95, out=(out[0][:1], out[1]), metrics=True)
+    assert ret is None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _point_set(points: list[cpy.PointArray]) -> set[tuple[float, float]]:
+    return set(map(tuple, np.concatenate(points)))  # type: ignore[arg-type]
+
+
+def _smooth(ny: int, nx: int) -> cpy.CoordinateArray:
+    x, y = np.meshgrid(np.linspace(0.0, 4.0, nx), np.linspace(0.0, 3.0, ny))
+    return cast("cpy.CoordinateArray", np.sin(x)*np.cos(y))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_progressive(name: str) -> None:
+    z = _smooth(101, 151)
+    cont_gen = contour_generator(z=z, name=name, fill_type=FillType.OuterOffset)
+    items = list(cont_gen.filled_progressive(0.2, 0.5, stride=5, region_size=20))
+
+    stride, window, filled = items[0]
+    assert stride == 5
+    assert window == (0, 151, 0, 101)
+    expected = cast("cpy.FillReturn_OuterOffset", cont_gen.stride(5, 5).filled(0.2, 0.5))
+    for points, expected_points in zip(cast("cpy.FillReturn_OuterOffset", filled)[0], expected[0]):
+        assert_array_equal(points, expected_points)
+
+    # Only some regions are refined, and together they contain the full resolution contours.
+    windows = [item[1] for item in items[1:]]
+    assert 0 < len(windows) < 8*6
+    assert all(item[0] == 1 for item in items[1:])
+    for i0, i1, j0, j1 in windows:
+        assert i0 % 20 == 0 and i1 == min(i0 + 20, 150) + 1
+        assert j0 % 20 == 0 and j1 == min(j0 + 20, 100) + 1
+
+    refined = set()
+    for stride, (i0, i1, j0, j1), filled in items[1:]:
+        region = cast("cpy.FillReturn_OuterOffset", cont_gen.window(i0, i1, j0, j1).filled(
+            0.2, 0.5))
+        for points, expected_points in zip(cast("cpy.FillReturn_OuterOffset", filled)[0],
+                                           region[0]):
+            assert_array_equal(points, expected_points)
+        refined |= _point_set(region[0])
+    full = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(0.2, 0.5))
+    assert _point_set(full[0]) <= refined
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_progressive(name: str) -> None:
+    z = _smooth(101, 151)
+    cont_gen = contour_generator(z=z, name=name, line_type=LineType.Separate)
+    items = list(cont_gen.lines_progressive(0.5, region_size=200))
+    assert items[0][0] == 4
+
+    # Single region larger than the grid.
+    assert [item[1] for item in items[1:]] == [(0, 151, 0, 101)]
+    lines = cast("cpy.LineReturn_Separate", items[1][2])
+    expected = cast("cpy.LineReturn_Separate", cont_gen.lines(0.5))
+    assert len(lines) == len(expected)
+    for line, expected_line in zip(lines, expected):
+        assert_array_equal(line, expected_line)
+
+    # Decimated contours are always returned but nothing else if deadline has passed.
+    items = list(cont_gen.lines_progressive(0.5, deadline_ms=0.0, region_size=10))
+    assert len(items) == 1
+    assert items[0][0] == 4
+
+    # Regions are not even checked for contours once the deadline has passed.
+    progress: list[int] = []
+    cont_gen.progress_callback = lambda chunks_done, total_chunks: progress.append(chunks_done)
+    progressive = cont_gen.lines_progressive(0.5, deadline_ms=0.0, region_size=10)
+    next(progressive)
+    progress_count = len(progress)
+    assert progress_count > 0
+    assert list(progressive) == []
+    assert len(progress) == progress_count
+
+
+def test_progressive_untouched() -> None:
+    z = np.zeros((50, 50))
+    z[5:15, 5:15] = 1.0
+    cont_gen = contour_generator(z=z, line_type=LineType.Separate)
+    items = list(cont_gen.lines_progressive(0.5, stride=2, region_size=24))
+    assert [item[1] for item in items[1:]] == [(0, 25, 0, 25)]
+
+    assert len(list(cont_gen.lines_progressive(2.0, stride=2))) == 1
+
+
+def test_progressive_invalid() -> None:
+    cont_gen = contour_generator(z=np.zeros((5, 6)))
+    with pytest.raises(ValueError, match="stride must be at least 2"):
+        cont_gen.filled_progressive(0.0, 1.0, stride=1)
+    with pytest.raises(ValueError, match="region_size must be at least 1"):
+        cont_gen.lines_progressive(0.5, region_size=0)
+    with pytest.raises(ValueError, match="upper and lower levels are the wrong way round"):
+        cont_gen.filled_progressive(1.0, 0.0)
+
+    for name in ["mpl2005", "mpl2014"]:
+        assert contour_generator(z=np.zeros((5, 6)), name=name).lines_progressive(0.5) is None
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import ContourPyramid, FillType, LineType, contour_generator
+from contourpy.pyramid import _downsample, _kept_indices
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _field(
+    ny: int, nx: int,
+) -> tuple[cpy.CoordinateArray, cpy.CoordinateArray, cpy.CoordinateArray]:
+    x = np.linspace(-10.0, 10.0, nx)
+    y = np.linspace(-5.0, 5.0, ny)
+    xx, yy = np.meshgrid(x, y)
+    return x, y, np.sin(xx)*np.cos(2*yy) + 0.01*xx
+
+
+def test_downsample() -> None:
+    assert_array_equal(_kept_indices(2), [0, 1])
+    assert_array_equal(_kept_indices(5), [0, 2, 4])
+    assert_array_equal(_kept_indices(6), [0, 2, 4, 5])
+
+    z = np.array([
+        [0.0, 1.0, 5.0, 6.0, 9.0],
+        [2.0, 3.0, -9.0, 7.0, 8.0],
+        [4.0, np.nan, np.nan, np.nan, 1.0],
+    ])
+    j, i = _kept_indices(3), _kept_indices(5)
+    # Block minimum or maximum, whichever is furthest from the block mean.
+    expected = [[3.0, -9.0, 9.0], [4.0, np.nan, 1.0]]
+    assert_array_equal(_downsample(z, j, i), expected)
+
+
+def test_pyramid_levels() -> None:
+    x, y, z = _field(301, 1001)
+    z[100:110, 200:220] = np.nan
+    pyramid = ContourPyramid(x, y, z, tile_size=100)
+    assert pyramid.level_count == 5
+    assert pyramid.shapes == [(301, 1001), (151, 501), (76, 251), (39, 126), (20, 64)]
+
+    # Generators are created when first needed and then reused.
+    for level in range(pyramid.level_count):
+        cont_gen = pyramid.generator(level)
+        assert cont_gen is pyramid.generator(level)
+        assert cont_gen.chunk_count == (1, 1)
+
+    assert pyramid.level_for_zoom(0) == 1
+    assert pyramid.level_for_zoom(1) == 0
+    assert pyramid.level_for_zoom(10) == 0
+    pyramid = ContourPyramid(x, y, z, tile_size=10)
+    assert pyramid.shapes[4:6] == [(20, 64), (11, 33)]
+    assert pyramid.level_for_zoom(0) == 5
+    assert pyramid.level_for_zoom(1) == 4
+
+
+@pytest.mark.parametrize("tile_size", [2, 10, 32, 50, 100, 256])
+def test_pyramid_level_for_zoom(tile_size: int) -> None:
+    x, y, z = _field(301, 1001)
+    pyramid = ContourPyramid(x, y, z, tile_size=tile_size)
+    for zoom in range(10):
+        # Coarsest level with at least tile_size points across each tile, otherwise 0.
+        level = pyramid.level_for_zoom(zoom)
+        ny, nx = pyramid.shapes[level]
+        required = tile_size*2**zoom
+        if level > 0:
+            assert min(ny, nx) >= required
+        if level < pyramid.level_count - 1:
+            assert min(pyramid.shapes[level + 1]) < required
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_pyramid_contours(name: str) -> None:
+    x, y, z = _field(201, 301)
+    pyramid = ContourPyramid(
+        x, y, z, tile_size=50, name=name, line_type=LineType.Separate,
+        fill_type=FillType.OuterOffset)
+    assert pyramid.level_count == 4
+
+    assert pyramid.tile_bbox(0, 0, 0) == (-10.0, -5.0, 10.0, 5.0)
+    assert pyramid.tile_bbox(1, 1, 0) == (0.0, 0.0, 10.0, 5.0)
+    assert pyramid.tile_bbox(2, 0, 3) == (-10.0, -5.0, -5.0, -2.5)
+
+    # Zoom 0 uses coarsest level with at least tile_size points.
+    lines = cast("list[cpy.LineReturn_Separate]", pyramid.contours(0, 0, 0, [0.0, 0.5]))
+    assert len(lines) == 2
+    assert pyramid.level_for_zoom(0) == 2
+    expected = cast("cpy.LineReturn_Separate", pyramid.generator(2).lines(0.5))
+    assert len(lines[1]) == len(expected)
+    for line, expected_line in zip(lines[1], expected):
+        assert_array_equal(line, expected_line)
+
+    # Cached.
+    assert pyramid.contours(0, 0, 0, np.array([0.0, 0.5])) is lines
+    pyramid.clear_cache()
+    assert pyramid.contours(0, 0, 0, [0.0, 0.5]) is not lines
+
+    # Higher zoom uses full resolution restricted to the tile.
+    filled = cast("list[cpy.FillReturn_OuterOffset]", pyramid.contours(
+        2, 1, 2, [-0.5, 0.0, 0.5], filled=True))
+    assert len(filled) == 2
+    x0, y0, x1, y1 = pyramid.tile_bbox(2, 1, 2)
+    full = contour_generator(x, y, z, name=name, fill_type=FillType.OuterOffset)
+    expected_window = full.window_bbox(x0, y0, x1, y1)
+    assert expected_window is not None
+    expected_filled = cast("cpy.FillReturn_OuterOffset", expected_window.filled(0.0, 0.5))
+    assert len(filled[1][0]) == len(expected_filled[0]) > 0
+    for points, expected_points in zip(filled[1][0], expected_filled[0]):
+        assert_array_equal(points, expected_points)
+        assert np.all(points[:, 0] >= x0 - 20/300) and np.all(points[:, 0] <= x1 + 20/300)
+
+
+def test_pyramid_cache_size() -> None:
+    x, y, z = _field(50, 60)
+    pyramid = ContourPyramid(x, y, z, cache_size=2)
+    first = pyramid.contours(1, 0, 0, [0.0])
+    pyramid.contours(1, 1, 0, [0.0])
+    assert pyramid.contours(1, 0, 0, [0.0]) is first
+    pyramid.contours(1, 0, 1, [0.0])
+    pyramid.contours(1, 1, 1, [0.0])
+    assert pyramid.contours(1, 0, 0, [0.0]) is not first
+
+    pyramid = ContourPyramid(x, y, z, cache_size=0)
+    assert pyramid.contours(0, 0, 0, [0.0]) is not pyramid.contours(0, 0, 0, [0.0])
+
+
+def test_pyramid_invalid() -> None:
+    x, y, z = _field(50, 60)
+    with pytest.raises(ValueError, match="tile_size must be at least 2"):
+        ContourPyramid(x, y, z, tile_size=1)
+    with pytest.raises(ValueError, match="cache_size cannot be negative"):
+        ContourPyramid(x, y, z, cache_size=-1)
+    with pytest.raises(TypeError, match="Input z must be a 2D array"):
+        ContourPyramid(z=[1.0, 2.0])
+
+    pyramid = ContourPyramid(x, y, z)
+    with pytest.raises(ValueError, match="zoom cannot be negative"):
+        pyramid.contours(-1, 0, 0, [0.0])
+    with pytest.raises(ValueError, match="tile_x and tile_y must be between 0 and 3 at zoom 2"):
+        pyramid.contours(2, 4, 0, [0.0])
+    with pytest.raises(ValueError, match="level must be between 0 and 0"):
+        pyramid.generator(1)
+
+    pyramid = ContourPyramid(x, y, z, name="mpl2014")
+    with pytest.raises(ValueError, match="Mpl2014ContourGenerator does not support window_bbox"):
+        pyramid.contours(0, 0, 0, [0.0])
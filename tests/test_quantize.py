@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator, convert_filled, convert_lines, quantize
+from contourpy._contourpy import quantize_points
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _undelta(points: Any, offsets: Any) -> Any:
+    # Reverse delta encoding of each line.
+    ret = np.empty_like(points, dtype=np.int64)
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        ret[start:end] = np.cumsum(points[start:end], axis=0)
+    return ret
+
+
+def test_quantize_points() -> None:
+    points = np.array([[0.0, 0.0], [1.0, 0.5], [2.0, 1.5], [4.0, 2.0], [0.2, 0.2]])
+    offsets = np.array([0, 4, 5], dtype=np.uint32)
+    quantized = quantize_points(points, offsets, 0.0, 0.0, 0.5, 0.25, np.dtype(np.int16), False)
+    assert quantized.dtype == np.int16
+    assert_array_equal(quantized, [[0, 0], [2, 2], [4, 6], [8, 8], [0, 1]])
+
+    quantized = quantize_points(points, offsets, 0.0, 0.0, 0.5, 0.25, np.dtype(np.int32), True)
+    assert quantized.dtype == np.int32
+    assert_array_equal(quantized, [[0, 0], [2, 2], [2, 4], [4, 2], [0, 1]])
+
+
+@pytest.mark.parametrize("delta", [False, True])
+@pytest.mark.parametrize("dtype", [np.int16, np.int32])
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_quantize_filled(fill_type: FillType, dtype: Any, delta: bool) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, fill_type=fill_type, chunk_count=2)
+    filled = cont_gen.filled(0.3, 0.6)
+    quantized, scale, offset = quantize(filled, fill_type=fill_type, dtype=dtype, delta=delta)
+
+    # Same format with integer points.
+    if fill_type == FillType.CombinedOffsetOffset:
+        assert quantized[0].dtype == dtype
+    else:
+        assert all(points is None or points.dtype == dtype for points in quantized[0])
+    for original, other in zip(cast("tuple[Any, ...]", filled)[1:], quantized[1:]):
+        assert original is other
+
+    # Dequantised points are within half of scale of the originals.
+    expected = cast("cpy.FillReturn_ChunkCombinedOffset", convert_filled(
+        filled, fill_type, FillType.ChunkCombinedOffset))
+    assert offset == (x.min(), y.min())
+    assert scale[0] == pytest.approx((x.max() - x.min()) / np.iinfo(dtype).max)
+    if fill_type == FillType.CombinedOffsetOffset:
+        all_quantized = [quantized[0]]
+    else:
+        all_quantized = [points for points in quantized[0] if points is not None]
+    all_expected = [points for points in expected[0] if points is not None]
+    all_offsets = [offsets for offsets in expected[1] if offsets is not None]
+    if fill_type in (FillType.OuterCode, FillType.OuterOffset):
+        # One array per polygon rather than per chunk.
+        all_quantized = [np.concatenate(all_quantized)]
+    assert len(all_quantized) == len(all_expected)
+    for points, expected_points, offsets in zip(all_quantized, all_expected, all_offsets):
+        points = _undelta(points, offsets) if delta else points
+        assert_allclose(points*scale + offset, expected_points, rtol=0, atol=0.51*max(scale))
+
+
+@pytest.mark.parametrize("delta", [False, True])
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+def test_quantize_lines(line_type: LineType, delta: bool) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, line_type=line_type, chunk_count=2)
+    lines = cont_gen.lines(0.4)
+    bbox = (-1.0, -2.0, x.max() + 3.0, y.max() + 4.0)
+    quantized, scale, offset = quantize(
+        lines, line_type=line_type.name, bbox=bbox, dtype="int16", delta=delta)
+    assert offset == (-1.0, -2.0)
+    assert scale == ((x.max() + 4.0) / 32767, (y.max() + 6.0) / 32767)
+
+    expected = cast("cpy.LineReturn_Separate", convert_lines(
+        lines, line_type, LineType.Separate))
+    if line_type == LineType.Separate:
+        separate = quantized
+    else:
+        # Converting integer points back to Separate is not supported, so split by hand.
+        combined = cast("cpy.LineReturn_CombinedOffset", convert_lines(
+            lines, line_type, LineType.CombinedOffset))
+        if line_type == LineType.CombinedOffset:
+            all_points = quantized[0]
+        else:
+            all_points = np.concatenate([pts for pts in quantized[0] if pts is not None])
+        offsets = combined[1]
+        separate = [all_points[offsets[i]:offsets[i+1]] for i in range(len(offsets) - 1)]
+
+    assert len(separate) == len(expected)
+    for points, expected_points in zip(separate, expected):
+        assert points.dtype == np.int16
+        if delta:
+            points = np.cumsum(points, axis=0)
+        assert_allclose(points*scale + offset, expected_points, rtol=0, atol=0.51*max(scale))
+
+
+def test_quantize_empty() -> None:
+    cont_gen = contour_generator(z=np.zeros((3, 4)), fill_type=FillType.CombinedOffsetOffset)
+    quantized, scale, offset = quantize(
+        cont_gen.filled(1.0, 2.0), fill_type=FillType.CombinedOffsetOffset)
+    assert quantized[0].shape == (0, 2)
+    assert quantized[0].dtype == np.int32
+    assert offset == (0.0, 0.0)
+
+
+def test_quantize_invalid() -> None:
+    lines = [np.array([[0.0, 0.0], [1.0, 1.0]])]
+    with pytest.raises(ValueError, match="Exactly one of fill_type and line_type must be"):
+        quantize(lines)
+    with pytest.raises(ValueError, match="dtype must be int16 or int32"):
+        quantize(lines, line_type=LineType.Separate, dtype=np.float32)
+    with pytest.raises(ValueError, match="bbox must have x0 <= x1 and y0 <= y1"):
+        quantize(lines, line_type=LineType.Separate, bbox=(1.0, 0.0, 0.0, 1.0))
+    with pytest.raises(ValueError, match="points must be within the quantisation bbox"):
+        quantize(lines, line_type=LineType.Separate, bbox=(0.0, 0.0, 0.5, 1.0))
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("dtype", [np.int16, np.int32])
+@pytest.mark.parametrize("delta", [False, True])
+def test_quantize_into(name: str, thread_count: int, dtype: Any, delta: bool) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    bbox = (x.min(), y.min(), x.max(), y.max())
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=(3, 4),
+        thread_count=thread_count, line_type=LineType.ChunkCombinedOffset)
+
+    # Each chunk is quantised in the same way as the whole.
+    filled: Any = cont_gen.filled(0.3, 0.6)
+    expected, _, _ = quantize(
+        filled, fill_type=FillType.ChunkCombinedOffsetOffset, bbox=bbox, dtype=dtype, delta=delta)
+    chunks: dict[int, Any] = {}
+    cont_gen.filled_into(
+        lambda chunk, *arrays: chunks.update({chunk: [a.copy() for a in arrays]}), 0.3, 0.6,
+        quantize_bbox=bbox, quantize_dtype=dtype, quantize_delta=delta)
+    assert sorted(chunks) == [i for i, points in enumerate(expected[0]) if points is not None]
+    for chunk, (points, offsets, outer_offsets) in chunks.items():
+        assert points.dtype == dtype
+        assert_array_equal(points, expected[0][chunk])
+        assert_array_equal(offsets, filled[1][chunk])
+        assert_array_equal(outer_offsets, filled[2][chunk])
+
+    lines: Any = cont_gen.lines(0.5)
+    expected, _, _ = quantize(
+        lines, line_type=LineType.ChunkCombinedOffset, bbox=bbox, dtype=dtype, delta=delta)
+    chunks.clear()
+    cont_gen.lines_into(
+        lambda chunk, points, offsets, _: chunks.update({chunk: points.copy()}), 0.5,
+        quantize_bbox=bbox, quantize_dtype=dtype, quantize_delta=delta)
+    assert sorted(chunks) == [i for i, points in enumerate(expected[0]) if points is not None]
+    for chunk, points in chunks.items():
+        assert_array_equal(points, expected[0][chunk])
+
+
+def test_quantize_into_invalid() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, chunk_count=2)
+    bbox = (x.min(), y.min(), x.max(), y.max())
+    with pytest.raises(ValueError, match="dtype must be int16 or int32"):
+        cont_gen.lines_into(lambda *args: None, 0.5, quantize_bbox=bbox, quantize_dtype=float)
+    with pytest.raises(ValueError, match="bbox must have x0 <= x1 and y0 <= y1"):
+        cont_gen.filled_into(lambda *args: None, 0.3, 0.6, quantize_bbox=(1, 0, 0, 1))
+
+    dtypes: list[Any] = []
+    with pytest.raises(ValueError, match="points must be within the quantisation bbox"):
+        cont_gen.lines_into(
+            lambda chunk, points, *args: dtypes.append(points.dtype), 0.5,
+            quantize_bbox=(x.min(), y.min(), x.mean(), y.mean()))
+    assert dtypes == []
+
+    # Quantisation is not retained for later calls.
+    cont_gen.lines_into(lambda chunk, points, *args: dtypes.append(points.dtype), 0.5)
+    assert dtypes == [np.float64]*4
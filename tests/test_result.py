@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import (
+    ContourResult, FillType, LineType, contour_generator, convert_filled, convert_lines,
+    to_ragged_arrays,
+)
+from contourpy.util.data import random
+
+from . import util_test
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_filled_result(fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, fill_type=fill_type, chunk_count=2)
+    result = cont_gen.filled(0.3, 0.6, result=True)
+    assert isinstance(result, ContourResult)
+    assert result.is_filled
+    assert result.fill_type == fill_type
+    assert result.line_type is None
+    assert result.chunk_indices is None
+    util_test.assert_filled(cast("cpy.FillReturn", result.data), fill_type)
+
+    combined = convert_filled(
+        cont_gen.filled(0.3, 0.6), fill_type, FillType.ChunkCombinedOffset)
+    points, offsets = cast("cpy.FillReturn_ChunkCombinedOffset", combined)
+    assert result.point_count == sum(len(pts) for pts in points if pts is not None)
+    assert result.line_count == sum(len(offs) - 1 for offs in offsets if offs is not None)
+
+    if fill_type in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset):
+        with pytest.raises(ValueError, match="does not identify which holes belong"):
+            result.polygon_count
+    else:
+        outer_offsets = cast("cpy.FillReturn_CombinedOffsetOffset", convert_filled(
+            cast("cpy.FillReturn", result.data), fill_type, FillType.CombinedOffsetOffset))[2]
+        assert result.polygon_count == len(outer_offsets) - 1
+
+    # Same type returns original data.
+    assert result.as_fill_type(fill_type) is result.data
+
+    with pytest.raises(ValueError, match="as_line_type can only be used with contour lines"):
+        result.as_line_type(LineType.Separate)
+
+
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+def test_lines_result(line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, line_type=line_type, chunk_count=2)
+    result = cont_gen.lines(0.4, result=True)
+    assert isinstance(result, ContourResult)
+    assert not result.is_filled
+    assert result.fill_type is None
+    assert result.line_type == line_type
+    util_test.assert_lines(cast("cpy.LineReturn", result.data), line_type)
+
+    separate = cast("cpy.LineReturn_Separate", convert_lines(
+        cont_gen.lines(0.4), line_type, LineType.Separate))
+    assert result.line_count == len(separate)
+    assert result.point_count == sum(len(pts) for pts in separate)
+
+    assert result.as_line_type(line_type) is result.data
+
+    with pytest.raises(ValueError, match="as_fill_type can only be used with filled contours"):
+        result.as_fill_type(FillType.OuterCode)
+    with pytest.raises(ValueError):
+        result.polygon_count
+
+
+def test_result_cached() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, fill_type=FillType.OuterOffset)
+    result = cont_gen.filled(0.3, 0.6, result=True)
+    assert isinstance(result, ContourResult)
+
+    converted = result.as_fill_type("ChunkCombinedCode")
+    util_test.assert_filled(converted, FillType.ChunkCombinedCode)
+    assert result.as_fill_type(FillType.ChunkCombinedCode) is converted
+
+    xs, ys = result.to_bokeh()
+    assert len(xs) == len(ys) == len(cast("cpy.FillReturn_OuterOffset", result.data)[0])
+    assert result.to_bokeh() is result.to_bokeh()
+
+
+def test_result_mpl_paths() -> None:
+    pytest.importorskip("matplotlib")
+    x, y, z = random((30, 40))
+    result = contour_generator(x, y, z, line_type=LineType.Separate).lines(0.4, result=True)
+    assert isinstance(result, ContourResult)
+    paths = result.to_mpl_paths()
+    assert len(paths) == result.line_count
+    assert result.to_mpl_paths() is paths
+
+
+def test_result_sparse() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(
+        x, y, z, line_type=LineType.ChunkCombinedOffset, chunk_count=(3, 3))
+    result = cont_gen.lines(0.95, sparse=True, result=True)
+    assert isinstance(result, ContourResult)
+    lines, chunk_indices = cont_gen.lines(0.95, sparse=True)
+    assert result.chunk_indices is not None
+    assert_array_equal(result.chunk_indices, chunk_indices)
+    assert len(result.data[0]) == len(chunk_indices)
+    assert result.line_count == len(convert_lines(lines, "ChunkCombinedOffset", "Separate"))
+
+
+def test_result_out() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, line_type=LineType.ChunkCombinedOffset)
+    points = np.empty((2000, 2), dtype=np.float64)
+    offsets = np.empty(500, dtype=np.uint32)
+    result, used = cont_gen.lines(0.4, out=(points, offsets), result=True)
+    assert isinstance(result, ContourResult)
+    assert used == (result.point_count, result.line_count + 1)
+
+    result, _ = cont_gen.lines(0.4, out=(points[:1], offsets[:1]), result=True)
+    assert result is None
+
+
+def test_result_invalid_type() -> None:
+    with pytest.raises(TypeError, match="Expected FillType or LineType, got str"):
+        ContourResult([], "Separate")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("chunk_count", [1, 2])
+@pytest.mark.parametrize("fill_type", [FillType.OuterOffset, FillType.ChunkCombinedOffsetOffset])
+def test_filled_ragged_arrays(fill_type: FillType, chunk_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, fill_type=fill_type, chunk_count=chunk_count)
+    result = cont_gen.filled(0.3, 0.6, result=True)
+    coords, offsets = result.to_ragged_arrays()
+    assert len(offsets) == 2
+
+    expected = cast("cpy.FillReturn_CombinedOffsetOffset", convert_filled(
+        cast("cpy.FillReturn", result.data), fill_type, FillType.CombinedOffsetOffset))
+    assert_array_equal(coords, expected[0])
+    assert_array_equal(offsets[0], expected[1])
+    assert_array_equal(offsets[1], expected[2])
+
+    if fill_type == FillType.ChunkCombinedOffsetOffset and chunk_count == 1:
+        # Zero copy.
+        data = cast("cpy.FillReturn_ChunkCombinedOffsetOffset", result.data)
+        assert coords is data[0][0]
+        assert offsets[0] is data[1][0]
+        assert offsets[1] is data[2][0]
+
+
+@pytest.mark.parametrize("chunk_count", [1, 2])
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.ChunkCombinedOffset])
+def test_lines_ragged_arrays(line_type: LineType, chunk_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, line_type=line_type, chunk_count=chunk_count)
+    result = cont_gen.lines(0.4, result=True)
+    coords, offsets = result.to_ragged_arrays()
+    assert len(offsets) == 1
+
+    expected = cast("cpy.LineReturn_CombinedOffset", convert_lines(
+        cast("cpy.LineReturn", result.data), line_type, LineType.CombinedOffset))
+    assert_array_equal(coords, expected[0])
+    assert_array_equal(offsets[0], expected[1])
+
+    if line_type == LineType.ChunkCombinedOffset and chunk_count == 1:
+        data = cast("cpy.LineReturn_ChunkCombinedOffset", result.data)
+        assert coords is data[0][0]
+        assert offsets[0] is data[1][0]
+
+
+def test_combined_ragged_arrays() -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, fill_type=FillType.OuterOffset, chunk_count=2)
+    levels = [0.1, 0.4, 0.7, 2.0, 3.0]
+    results = [
+        cont_gen.filled(lower, upper, result=True) for lower, upper in zip(levels[:-1], levels[1:])]
+    coords, (ring_offsets, polygon_offsets, result_offsets) = to_ragged_arrays(results)
+    assert ring_offsets.dtype == polygon_offsets.dtype == result_offsets.dtype == np.uint32
+    assert result_offsets[-1] == len(polygon_offsets) - 1
+    assert polygon_offsets[-1] == len(ring_offsets) - 1
+    assert ring_offsets[-1] == len(coords)
+
+    # Each result is recovered from the combined arrays.
+    assert len(result_offsets) == len(results) + 1
+    for i, result in enumerate(results):
+        expected_coords, (expected_rings, expected_polygons) = result.to_ragged_arrays()
+        polygons = polygon_offsets[result_offsets[i]:result_offsets[i+1]+1]
+        rings = ring_offsets[polygons[0]:polygons[-1]+1]
+        assert_array_equal(polygons - polygons[0], expected_polygons)
+        assert_array_equal(rings - rings[0], expected_rings)
+        assert_array_equal(coords[rings[0]:rings[-1]], expected_coords)
+    assert result_offsets[3] == result_offsets[4]  # Empty band.
+
+    lines = [cont_gen.lines(level, result=True) for level in levels]
+    coords, (line_offsets, result_offsets) = to_ragged_arrays(lines)
+    assert len(result_offsets) == len(levels) + 1
+    assert line_offsets[-1] == len(coords)
+    assert result_offsets[-1] == len(line_offsets) - 1
+
+    with pytest.raises(ValueError, match="results cannot be empty"):
+        to_ragged_arrays([])
+    with pytest.raises(ValueError, match="results must be either all filled contours or all"):
+        to_ragged_arrays(results + lines)
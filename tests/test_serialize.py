@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import struct
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import (
+    FillType, LineType, contour_generator, convert_filled, convert_lines, to_geojson_bytes, to_wkb,
+)
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _polygons(filled: cpy.FillReturn, fill_type: FillType) -> list[list[cpy.PointArray]]:
+    # List of polygons, each a list of boundaries.
+    points, offsets = cast(
+        "cpy.FillReturn_OuterOffset", convert_filled(filled, fill_type, FillType.OuterOffset))
+    return [
+        [pts[offs[i]:offs[i+1]] for i in range(len(offs)-1)] for pts, offs in zip(points, offsets)]
+
+
+def _lines(lines: cpy.LineReturn, line_type: LineType) -> list[cpy.PointArray]:
+    return cast("cpy.LineReturn_Separate", convert_lines(lines, line_type, LineType.Separate))
+
+
+class _WkbReader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def uint32(self) -> int:
+        value: int = struct.unpack_from("<I", self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def type(self) -> int:
+        assert self.data[self.pos] == 1  # Little-endian.
+        self.pos += 1
+        return self.uint32()
+
+    def points(self) -> cpy.PointArray:
+        count = self.uint32()
+        points = np.frombuffer(self.data, dtype="<f8", count=2*count, offset=self.pos)
+        self.pos += 16*count
+        return points.reshape((count, 2))
+
+
+def _read_wkb(data: bytes) -> Any:
+    reader = _WkbReader(data)
+    geom_type = reader.type()
+    ret: list[Any] = []
+    for _ in range(reader.uint32()):
+        if geom_type == 6:
+            assert reader.type() == 3
+            ret.append([reader.points() for _ in range(reader.uint32())])
+        else:
+            assert geom_type == 5
+            assert reader.type() == 2
+            ret.append(reader.points())
+    assert reader.pos == len(data)
+    return ret
+
+
+@pytest.mark.parametrize("chunk_count", [1, 3])
+@pytest.mark.parametrize(
+    "fill_type", [FillType.OuterCode, FillType.ChunkCombinedCodeOffset,
+                  FillType.ChunkCombinedOffsetOffset, FillType.CombinedOffsetOffset])
+def test_filled(fill_type: FillType, chunk_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, fill_type=fill_type, chunk_count=chunk_count)
+    filled = cont_gen.filled(0.3, 0.6)
+    expected = _polygons(filled, fill_type)
+    assert any(len(polygon) > 1 for polygon in expected)
+
+    geojson = json.loads(to_geojson_bytes(filled, fill_type=fill_type))
+    assert geojson["type"] == "MultiPolygon"
+    assert len(geojson["coordinates"]) == len(expected)
+    for polygon, expected_polygon in zip(geojson["coordinates"], expected):
+        assert len(polygon) == len(expected_polygon)
+        for ring, expected_ring in zip(polygon, expected_polygon):
+            # Exact round trip.
+            assert_array_equal(ring, expected_ring)
+
+    wkb = _read_wkb(to_wkb(filled, fill_type=fill_type.name))
+    assert len(wkb) == len(expected)
+    for polygon, expected_polygon in zip(wkb, expected):
+        assert len(polygon) == len(expected_polygon)
+        for ring, expected_ring in zip(polygon, expected_polygon):
+            assert_array_equal(ring, expected_ring)
+
+
+@pytest.mark.parametrize("chunk_count", [1, 3])
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+def test_lines(line_type: LineType, chunk_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, line_type=line_type, chunk_count=chunk_count)
+    lines = cont_gen.lines(0.4)
+    expected = _lines(lines, line_type)
+    assert len(expected) > 0
+
+    geojson = json.loads(to_geojson_bytes(lines, line_type=line_type))
+    assert geojson["type"] == "MultiLineString"
+    assert len(geojson["coordinates"]) == len(expected)
+    for line, expected_line in zip(geojson["coordinates"], expected):
+        assert_array_equal(line, expected_line)
+
+    wkb = _read_wkb(to_wkb(lines, line_type=line_type.name))
+    assert len(wkb) == len(expected)
+    for line, expected_line in zip(wkb, expected):
+        assert_array_equal(line, expected_line)
+
+
+def test_empty() -> None:
+    cont_gen = contour_generator(
+        z=np.zeros((3, 4)), fill_type=FillType.ChunkCombinedOffsetOffset,
+        line_type=LineType.ChunkCombinedOffset, chunk_count=2)
+    filled = cont_gen.filled(1.0, 2.0)
+    lines = cont_gen.lines(1.0)
+
+    fill_type = FillType.ChunkCombinedOffsetOffset
+    assert to_geojson_bytes(filled, fill_type=fill_type) == (
+        b'{"type":"MultiPolygon","coordinates":[]}')
+    assert to_wkb(filled, fill_type=fill_type) == b"\x01\x06\x00\x00\x00\x00\x00\x00\x00"
+    assert to_geojson_bytes(lines, line_type=LineType.ChunkCombinedOffset) == (
+        b'{"type":"MultiLineString","coordinates":[]}')
+    assert to_wkb(lines, line_type=LineType.ChunkCombinedOffset) == (
+        b"\x01\x05\x00\x00\x00\x00\x00\x00\x00")
+
+
+def test_number_format() -> None:
+    points = np.array([[0.1, -2.0], [1e-300, 12345678.9], [-0.0, 3.0], [0.1, -2.0]])
+    lines = [points]
+    assert to_geojson_bytes(lines, line_type=LineType.Separate) == (
+        b'{"type":"MultiLineString","coordinates":'
+        b'[[[0.1,-2],[1e-300,12345678.9],[-0,3],[0.1,-2]]]}')
+
+
+@pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf])
+def test_geojson_non_finite(value: float) -> None:
+    points = np.array([[0.1, -2.0], [1.0, value], [0.1, -2.0]])
+    msg = "GeoJSON cannot contain non-finite coordinates such as NaN"
+    with pytest.raises(ValueError, match=msg):
+        to_geojson_bytes([points], line_type=LineType.Separate)
+    with pytest.raises(ValueError, match=msg):
+        to_geojson_bytes(([points], [np.array([0, 3], dtype=np.uint32)]),
+                         fill_type=FillType.OuterOffset)
+
+    # WKB can contain them.
+    assert len(to_wkb([points], line_type=LineType.Separate)) > 0
+
+
+def test_serialize_invalid() -> None:
+    cont_gen = contour_generator(z=np.zeros((3, 4)))
+    filled = cont_gen.filled(0.5, 1.0)
+    with pytest.raises(ValueError, match="Exactly one of fill_type and line_type must be"):
+        to_wkb(filled)
+    with pytest.raises(ValueError, match="Exactly one of fill_type and line_type must be"):
+        to_geojson_bytes(filled, fill_type=FillType.OuterOffset, line_type=LineType.Separate)
+
+    for fill_type in [FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset]:
+        filled = contour_generator(z=np.zeros((3, 4)), fill_type=fill_type).filled(0.5, 1.0)
+        msg = f"Serialisation of FillType.{fill_type.name} is not supported"
+        with pytest.raises(ValueError, match=msg):
+            to_wkb(filled, fill_type=fill_type)
+        with pytest.raises(ValueError, match=msg):
+            to_geojson_bytes(filled, fill_type=fill_type)
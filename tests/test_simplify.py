@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator, convert_filled, convert_lines, simplify
+from contourpy.util.data import random
+
+from . import util_test
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _point_set(points: cpy.PointArray) -> set[tuple[float, float]]:
+    return set(map(tuple, np.round(points, 9)))  # type: ignore[arg-type]
+
+
+def _assert_simplified(
+    simplified: list[cpy.PointArray], original: list[cpy.PointArray], closed: bool,
+    min_closed_points: int = 4,
+) -> None:
+    assert len(simplified) == len(original)
+    assert sum(map(len, simplified)) < sum(map(len, original))
+    for line, orig in zip(simplified, original):
+        assert 2 <= len(line) <= len(orig)
+        assert _point_set(line) <= _point_set(orig)
+        if closed or np.array_equal(orig[0], orig[-1]):
+            # Closed lines may start at a different point.
+            assert len(line) >= min_closed_points
+            assert_array_equal(line[0], line[-1])
+        else:
+            assert_array_equal(line[[0, -1]], orig[[0, -1]])
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_filled_simplify(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_count=(2, 3))
+    original = util_test.boundaries(cont_gen.filled(0.3, 0.6), fill_type)
+    simplified = util_test.boundaries(cont_gen.filled(0.3, 0.6, simplify_tolerance=0.3), fill_type)
+    # Small boundaries that meet the domain or chunk boundary may collapse.
+    _assert_simplified(simplified, original, closed=True, min_closed_points=3)
+
+    # Collapsed boundaries have zero area so can be discarded.
+    filtered = util_test.boundaries(
+        cont_gen.filled(0.3, 0.6, simplify_tolerance=0.3, min_area=1e-10), fill_type)
+    assert 0 < len(filtered) < len(simplified)
+    assert all(len(boundary) >= 4 for boundary in filtered)
+
+    # Zero tolerance only removes collinear points.
+    unchanged = util_test.boundaries(cont_gen.filled(0.3, 0.6, simplify_tolerance=0.0), fill_type)
+    assert_array_equal(np.concatenate(unchanged), np.concatenate(original))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+def test_lines_simplify(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_count=(2, 3))
+    lines = cont_gen.lines(0.4)
+    original = cast("cpy.LineReturn_Separate", convert_lines(lines, line_type, LineType.Separate))
+
+    ret = cont_gen.lines(0.4, simplify_tolerance=0.3)
+    simplified = cast("cpy.LineReturn_Separate", convert_lines(ret, line_type, LineType.Separate))
+    _assert_simplified(simplified, original, closed=False)
+
+    # Contour lines have no shared boundaries so are the same as simplifying afterwards.
+    after = cast("cpy.LineReturn_Separate", convert_lines(
+        cast("cpy.LineReturn", simplify(lines, 0.3, line_type=line_type)), line_type,
+        LineType.Separate))
+    assert len(after) == len(simplified)
+    for line, expected in zip(after, simplified):
+        assert_array_equal(line, expected)
+
+
+@pytest.mark.parametrize("name, chunk_count", [("serial", 1), ("serial", (2, 3)), ("threaded", 3)])
+@pytest.mark.parametrize("quad_as_tri", [False, True])
+@pytest.mark.parametrize("tolerance", [0.05, 0.5, 5.0])
+def test_filled_simplify_shared_boundary(
+    name: str, chunk_count: int | tuple[int, int], quad_as_tri: bool, tolerance: float,
+) -> None:
+    # Points on the boundary between adjacent bands are the same in both bands.
+    x, y, z = random((40, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.OuterOffset, line_type=LineType.Separate,
+        chunk_count=chunk_count, quad_as_tri=quad_as_tri)
+    shared = _point_set(np.concatenate(cast("cpy.LineReturn_Separate", cont_gen.lines(0.6))))
+
+    below = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(
+        0.3, 0.6, simplify_tolerance=tolerance))[0]
+    above = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(
+        0.6, 0.9, simplify_tolerance=tolerance))[0]
+    below_shared = _point_set(np.concatenate(below)) & shared
+    above_shared = _point_set(np.concatenate(above)) & shared
+    assert len(below_shared) > 0
+    assert below_shared == above_shared
+
+
+def test_simplify_simple() -> None:
+    # Octagon with an extra point part way along each long side.
+    z = np.zeros((5, 5))
+    z[1:4, 1:4] = 1
+    cont_gen = contour_generator(z=z, fill_type=FillType.OuterOffset, line_type=LineType.Separate)
+
+    points = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(0.5, 2.0))[0][0]
+    assert len(points) == 13
+    points = cast("cpy.FillReturn_OuterOffset", cont_gen.filled(
+        0.5, 2.0, simplify_tolerance=0.2))[0][0]
+    assert len(points) == 9
+    assert _point_set(points) == {
+        (1, 0.5), (3, 0.5), (3.5, 1), (3.5, 3), (3, 3.5), (1, 3.5), (0.5, 3), (0.5, 1)}
+
+    # Closed lines are not reduced to fewer than 3 unique points.
+    line = cast("cpy.LineReturn_Separate", cont_gen.lines(0.5, simplify_tolerance=100.0))[0]
+    assert 4 <= len(line) <= 5
+    assert_array_equal(line[0], line[-1])
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_simplify_filled_function(fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, fill_type=fill_type, chunk_count=(2, 3))
+    filled = cont_gen.filled(0.3, 0.6)
+    original = util_test.boundaries(filled, fill_type)
+
+    simplified = cast("cpy.FillReturn", simplify(filled, 0.3, fill_type=fill_type))
+    _assert_simplified(util_test.boundaries(simplified, fill_type), original, closed=True)
+
+    # Input is not modified.
+    assert_array_equal(
+        np.concatenate(util_test.boundaries(filled, fill_type)), np.concatenate(original))
+
+    if fill_type in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset):
+        return
+
+    # Structure is unchanged.
+    as_offsets = cast("cpy.FillReturn_ChunkCombinedOffsetOffset", convert_filled(
+        filled, fill_type, FillType.ChunkCombinedOffsetOffset))
+    simplified_as_offsets = cast("cpy.FillReturn_ChunkCombinedOffsetOffset", convert_filled(
+        simplified, fill_type, FillType.ChunkCombinedOffsetOffset))
+    for outer_offsets, expected in zip(simplified_as_offsets[2], as_offsets[2]):
+        assert_array_equal(outer_offsets, expected)
+
+
+def test_simplify_metrics_and_filter() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, line_type=LineType.Separate)
+    lines, metrics = cont_gen.lines(0.4, simplify_tolerance=0.5, metrics=True)
+    lines = cast("cpy.LineReturn_Separate", lines)
+    assert len(metrics) == len(lines)
+    lengths = [np.sum(np.hypot(*np.diff(line, axis=0).T)) for line in lines]
+    assert_allclose(metrics["length"], lengths)
+
+    # Filtering uses the simplified lines.
+    filtered = cast("cpy.LineReturn_Separate", cont_gen.lines(
+        0.4, simplify_tolerance=0.5, min_points=5))
+    expected = [line for line in lines if len(line) >= 5]
+    assert 0 < len(filtered) == len(expected) < len(lines)
+    for line, expected_line in zip(filtered, expected):
+        assert_array_equal(line, expected_line)
+
+
+def test_simplify_invalid() -> None:
+    cont_gen = contour_generator(
+        z=[[0, 1], [2, 3]], fill_type=FillType.ChunkCombinedOffset,
+        line_type=LineType.ChunkCombinedOffset)
+    with pytest.raises(ValueError, match="simplify_tolerance cannot be negative"):
+        cont_gen.lines(1.5, simplify_tolerance=-1.0)
+    with pytest.raises(ValueError, match="simplify_tolerance cannot be negative"):
+        cont_gen.filled(0.5, 1.5, simplify_tolerance=-1.0)
+
+    out = (np.empty((10, 2)), np.empty(10, dtype=np.uint32))
+    with pytest.raises(ValueError, match="out cannot be used with"):
+        cont_gen.lines(1.5, out=out, simplify_tolerance=0.1)
+
+    lines = cont_gen.lines(1.5)
+    with pytest.raises(ValueError, match="tolerance cannot be negative"):
+        simplify(lines, -1.0, line_type=LineType.ChunkCombinedOffset)
+    with pytest.raises(ValueError, match="Exactly one of fill_type and line_type"):
+        simplify(lines, 1.0)
+    with pytest.raises(ValueError, match="Exactly one of fill_type and line_type"):
+        simplify(lines, 1.0, fill_type="OuterCode", line_type="Separate")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.chunks: dict[int, tuple[Any, ...]] = {}
+        self.thread_ids: set[int] = set()
+
+    def __call__(self, chunk: int, *arrays: Any) -> None:
+        assert chunk not in self.chunks
+        self.thread_ids.add(threading.get_ident())
+        # Arrays are only valid during the call.
+        self.chunks[chunk] = tuple(None if array is None else array.copy() for array in arrays)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("fill_type", [FillType.OuterOffset, FillType.ChunkCombinedOffsetOffset])
+def test_filled_into(fill_type: FillType, name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_count=(3, 4), thread_count=thread_count)
+    sink = _Sink()
+    cont_gen.filled_into(sink, 0.3, 0.6)
+    assert sink.thread_ids == {threading.get_ident()}
+
+    expected_gen = contour_generator(
+        x, y, z, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=(3, 4))
+    points, offsets, outer_offsets = cast(
+        "cpy.FillReturn_ChunkCombinedOffsetOffset", expected_gen.filled(0.3, 0.6))
+    assert sorted(sink.chunks) == [chunk for chunk in range(12) if points[chunk] is not None]
+    for chunk, arrays in sink.chunks.items():
+        assert_array_equal(arrays[0], points[chunk])
+        assert_array_equal(arrays[1], offsets[chunk])
+        assert_array_equal(arrays[2], outer_offsets[chunk])
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+@pytest.mark.parametrize("line_type", [LineType.SeparateCode, LineType.ChunkCombinedOffset])
+def test_lines_into(line_type: LineType, name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_count=(3, 4), thread_count=thread_count)
+    sink = _Sink()
+    cont_gen.lines_into(sink, 0.4)
+    assert sink.thread_ids == {threading.get_ident()}
+
+    expected_gen = contour_generator(
+        x, y, z, line_type=LineType.ChunkCombinedOffset, chunk_count=(3, 4))
+    points, offsets = cast("cpy.LineReturn_ChunkCombinedOffset", expected_gen.lines(0.4))
+    assert sorted(sink.chunks) == [chunk for chunk in range(12) if points[chunk] is not None]
+    for chunk, arrays in sink.chunks.items():
+        assert_array_equal(arrays[0], points[chunk])
+        assert_array_equal(arrays[1], offsets[chunk])
+        assert arrays[2] is None
+
+
+@pytest.mark.parametrize("thread_count", [1, 3])
+def test_into_sink_error(thread_count: int) -> None:
+    call_count = 0
+
+    def sink(chunk: int, *arrays: Any) -> None:
+        nonlocal call_count
+        call_count += 1
+        raise RuntimeError("Error in sink")
+
+    x, y, z = random((60, 50))
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", chunk_count=(3, 4), thread_count=thread_count)
+    with pytest.raises(RuntimeError, match="Error in sink"):
+        cont_gen.filled_into(sink, 0.3, 0.6)
+    assert call_count == 1
+
+    # Generator can still be used.
+    cont_gen.lines(0.5)
+
+
+def test_into_invalid() -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)))
+    with pytest.raises(ValueError, match="sink must be callable"):
+        cont_gen.filled_into(None, 1.0, 2.0)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="sink must be callable"):
+        cont_gen.lines_into(1, 1.0)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="upper and lower levels are the wrong way round"):
+        cont_gen.filled_into(_Sink(), 2.0, 1.0)
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_into_not_supported(name: str) -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)), name=name)
+    class_name = type(cont_gen).__name__
+    sink = _Sink()
+    with pytest.raises(ValueError, match=f"{class_name} does not support filled_into"):
+        cont_gen.filled_into(sink, 1.0, 2.0)
+    with pytest.raises(ValueError, match=f"{class_name} does not support lines_into"):
+        cont_gen.lines_into(sink, 1.0)
@@ -106,6 +106,24 @@ def test_supports_threads(class_name: str) -> None:
     assert supports == expect
 
 
+@pytest.mark.parametrize("class_name", util_test.all_class_names())
+def test_supports_transform(class_name: str) -> None:
+    cls = get_class_from_name(class_name)
+    supports = cls.supports_transform()
+    assert isinstance(supports, bool)
+    expect = class_name not in ("Mpl2005ContourGenerator", "Mpl2014ContourGenerator")
+    assert supports == expect
+
+
+@pytest.mark.parametrize("class_name", util_test.all_class_names())
+def test_supports_window(class_name: str) -> None:
+    cls = get_class_from_name(class_name)
+    supports = cls.supports_window()
+    assert isinstance(supports, bool)
+    expect = class_name not in ("Mpl2005ContourGenerator", "Mpl2014ContourGenerator")
+    assert supports == expect
+
+
 @pytest.mark.parametrize("class_name", util_test.all_class_names())
 def test_supports_z_interp(class_name: str) -> None:
     cls = get_class_from_name(class_name)
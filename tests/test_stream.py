@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("max_queued", [1, 16])
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+def test_iter_filled(name: str, thread_count: int, max_queued: int) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.OuterCode, chunk_count=(3, 4),
+        thread_count=thread_count)
+    chunks = dict(cont_gen.iter_filled(0.3, 0.6, max_queued=max_queued))
+
+    expected_gen = contour_generator(
+        x, y, z, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=(3, 4))
+    points, offsets, outer_offsets = cast(
+        "cpy.FillReturn_ChunkCombinedOffsetOffset", expected_gen.filled(0.3, 0.6))
+    assert sorted(chunks) == [chunk for chunk in range(12) if points[chunk] is not None]
+    for chunk, arrays in chunks.items():
+        assert len(arrays) == 3
+        assert_array_equal(arrays[0], points[chunk])
+        assert_array_equal(arrays[1], offsets[chunk])
+        assert_array_equal(arrays[2], outer_offsets[chunk])
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+def test_iter_lines(name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=LineType.Separate, chunk_count=(3, 4),
+        thread_count=thread_count)
+    chunks = dict(cont_gen.iter_lines(0.4))
+
+    expected_gen = contour_generator(
+        x, y, z, line_type=LineType.ChunkCombinedOffset, chunk_count=(3, 4))
+    points, offsets = cast("cpy.LineReturn_ChunkCombinedOffset", expected_gen.lines(0.4))
+    assert sorted(chunks) == [chunk for chunk in range(12) if points[chunk] is not None]
+    for chunk, arrays in chunks.items():
+        assert len(arrays) == 2
+        assert_array_equal(arrays[0], points[chunk])
+        assert_array_equal(arrays[1], offsets[chunk])
+
+
+@pytest.mark.parametrize("thread_count", [1, 3])
+def test_iter_stop_early(thread_count: int) -> None:
+    x, y, z = random((60, 50))
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", chunk_count=(3, 4), thread_count=thread_count)
+    progress = []
+    cont_gen.progress_callback = lambda chunks_done, total_chunks: progress.append(chunks_done)
+    iterator = cont_gen.iter_filled(0.3, 0.6, max_queued=1)
+    chunk, arrays = next(iterator)
+    iterator.close()  # type: ignore[attr-defined]
+
+    # Remaining chunks are not calculated.
+    assert len(progress) < 12
+    cont_gen.progress_callback = None
+
+    # Generator can be used again.
+    assert len(dict(cont_gen.iter_filled(0.3, 0.6))) == 12
+
+
+def test_iter_error() -> None:
+    def transform_callback(points: Any) -> None:
+        raise RuntimeError("Error in callback")
+
+    cont_gen = contour_generator(
+        z=np.arange(12.0).reshape((3, 4)), transform_callback=transform_callback)
+    iterator = cont_gen.iter_lines(5.0)
+    with pytest.raises(RuntimeError, match="Error in callback"):
+        list(iterator)
+
+
+def test_iter_invalid() -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)))
+    # Raised immediately rather than when iterated.
+    with pytest.raises(ValueError, match="upper and lower levels are the wrong way round"):
+        cont_gen.iter_filled(2.0, 1.0)
+    with pytest.raises(ValueError, match="max_queued must be at least 1"):
+        cont_gen.iter_filled(1.0, 2.0, max_queued=0)
+    with pytest.raises(ValueError, match="max_queued must be at least 1"):
+        cont_gen.iter_lines(1.0, max_queued=-1)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+def test_iter_in_use(name: str, thread_count: int) -> None:
+    x, y, z = random((60, 50))
+    cont_gen = contour_generator(
+        x, y, z, name=name, chunk_count=(3, 4), thread_count=thread_count)
+    iterator = cont_gen.iter_filled(0.3, 0.6, max_queued=1)
+    chunks = [next(iterator)]
+
+    # Generator cannot be used until the iteration has finished.
+    msg = "ContourGenerator is already in use by another call"
+    with pytest.raises(RuntimeError, match=msg):
+        cont_gen.filled(0.3, 0.6)
+    with pytest.raises(RuntimeError, match=msg):
+        cont_gen.count_lines(0.5)
+    with pytest.raises(RuntimeError, match=msg):
+        cont_gen.lines_into(lambda *args: None, 0.5)
+    with pytest.raises(RuntimeError, match=msg):
+        cont_gen.release_buffers()
+    with pytest.raises(RuntimeError, match=msg):
+        cont_gen.cancel_token = None
+
+    chunks += list(iterator)
+    assert len(chunks) == 12
+    assert len(cont_gen.lines(0.5)) > 0
+
+    # Nor from within a callback.
+    def sink(chunk: int, *arrays: Any) -> None:
+        cont_gen.lines(0.5)
+
+    with pytest.raises(RuntimeError, match=msg):
+        cont_gen.filled_into(sink, 0.3, 0.6)
+    assert len(cont_gen.lines(0.5)) > 0
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("stride", [(1, 1), (2, 3), (4, 4), (29, 39), (100, 100)])
+def test_stride(name: str, stride: tuple[int, int]) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    z = np.ma.masked_invalid(z)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=FillType.OuterOffset, line_type=LineType.Separate,
+        chunk_size=(8, 12), transform=[[2, 0, 1], [0, 3, 0]])
+
+    sy, sx = stride
+    decimated = cont_gen.stride(sy, sx)
+    assert type(decimated) is type(cont_gen)
+    assert_array_equal(cast("cpy.PointArray", decimated.transform), [[2, 0, 1], [0, 3, 0]])
+
+    # Same as contouring the decimated arrays directly, including the last row and column.
+    js = np.unique(np.append(np.arange(0, 30, sy), 29))
+    is_ = np.unique(np.append(np.arange(0, 40, sx), 39))
+    index = np.ix_(js, is_)
+    expected = contour_generator(
+        x[index], y[index], z[index], name=name, fill_type=FillType.OuterOffset,
+        line_type=LineType.Separate, chunk_size=(-(-8 // sy), -(-12 // sx)),
+        transform=[[2, 0, 1], [0, 3, 0]])
+    assert decimated.chunk_size == expected.chunk_size
+
+    lines = cast("cpy.LineReturn_Separate", decimated.lines(0.4))
+    expected_lines = cast("cpy.LineReturn_Separate", expected.lines(0.4))
+    assert len(lines) == len(expected_lines)
+    for line, expected_line in zip(lines, expected_lines):
+        assert_array_equal(line, expected_line)
+
+    filled = cast("cpy.FillReturn_OuterOffset", decimated.filled(0.3, 0.6))
+    expected_filled = cast("cpy.FillReturn_OuterOffset", expected.filled(0.3, 0.6))
+    assert len(filled[0]) == len(expected_filled[0])
+    for points, expected_points in zip(filled[0], expected_filled[0]):
+        assert_array_equal(points, expected_points)
+
+
+def test_stride_window() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, line_type=LineType.Separate)
+    window = cont_gen.window(5, 26, 3, 14).stride(2, 5)
+    expected = contour_generator(
+        x[3:14:2, 5:26:5], y[3:14:2, 5:26:5], z[3:14:2, 5:26:5], line_type=LineType.Separate)
+    lines = cast("cpy.LineReturn_Separate", window.lines(0.4))
+    expected_lines = cast("cpy.LineReturn_Separate", expected.lines(0.4))
+    assert len(lines) == len(expected_lines) > 0
+    for line, expected_line in zip(lines, expected_lines):
+        assert_array_equal(line, expected_line)
+
+
+def test_stride_invalid() -> None:
+    cont_gen = contour_generator(z=np.zeros((5, 6)))
+    for stride in [(0, 1), (1, 0), (-1, 2)]:
+        with pytest.raises(ValueError, match="stride must be at least 1 in each direction"):
+            cont_gen.stride(*stride)
+
+    for name in ["mpl2005", "mpl2014"]:
+        cont_gen = contour_generator(z=np.zeros((5, 6)), name=name)
+        with pytest.raises(ValueError, match=f"{type(cont_gen).__name__} does not support stride"):
+            cont_gen.stride(2, 2)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import ContourPyramid, FillType, LineType, contour_generator
+from contourpy._contourpy import encode_mvt_filled, encode_mvt_lines
+from contourpy.tiles import filled_tile, lines_tile, pyramid_tile
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+def _varints(data: bytes) -> list[int]:
+    ret = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            ret.append(value)
+            value = shift = 0
+    assert shift == 0
+    return ret
+
+
+def _fields(data: bytes) -> list[tuple[int, Any]]:
+    # Decode protobuf message into list of (field number, value).
+    ret: list[tuple[int, Any]] = []
+    pos = 0
+    while pos < len(data):
+        start = pos
+        while data[pos] >= 0x80:
+            pos += 1
+        pos += 1
+        key = _varints(data[start:pos])[0]
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            start = pos
+            while data[pos] >= 0x80:
+                pos += 1
+            pos += 1
+            ret.append((number, _varints(data[start:pos])[0]))
+        elif wire_type == 1:
+            ret.append((number, data[pos:pos+8]))
+            pos += 8
+        else:
+            assert wire_type == 2
+            start = pos
+            while data[pos] >= 0x80:
+                pos += 1
+            pos += 1
+            length = _varints(data[start:pos])[0]
+            ret.append((number, data[pos:pos+length]))
+            pos += length
+    return ret
+
+
+def _decode_geometry(geometry: bytes) -> list[list[tuple[int, int]]]:
+    # Decode packed geometry into list of parts, closed parts repeat their first point at the end.
+    commands = _varints(geometry)
+    parts: list[list[tuple[int, int]]] = []
+    x = y = i = 0
+    while i < len(commands):
+        command_id, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if command_id == 7:
+            assert count == 1
+            parts[-1].append(parts[-1][0])
+            continue
+        assert command_id in (1, 2)
+        if command_id == 1:
+            assert count == 1
+            parts.append([])
+        for _ in range(count):
+            dx, dy = ((n >> 1) ^ -(n & 1) for n in commands[i:i+2])
+            x += dx
+            y += dy
+            parts[-1].append((x, y))
+            i += 2
+    return parts
+
+
+def _decode_tile(tile: bytes) -> dict[str, Any]:
+    # Decode tile containing a single layer.
+    fields = _fields(tile)
+    assert len(fields) == 1 and fields[0][0] == 3
+    layer: dict[str, Any] = dict(keys=[], values=[], features=[])
+    for number, value in _fields(fields[0][1]):
+        if number == 1:
+            layer["name"] = value.decode()
+        elif number == 2:
+            feature: dict[Any, Any] = dict(_fields(value))
+            layer["features"].append(feature)
+        elif number == 3:
+            layer["keys"].append(value.decode())
+        elif number == 4:
+            (value_field, double), = _fields(value)
+            assert value_field == 3
+            layer["values"].append(struct.unpack("<d", double)[0])
+        elif number == 5:
+            layer["extent"] = value
+        else:
+            assert number == 15
+            layer["version"] = value
+
+    for feature in layer["features"]:
+        tags = _varints(feature[2])
+        feature["properties"] = {
+            layer["keys"][key]: layer["values"][value] for key, value in zip(tags[::2], tags[1::2])}
+        feature["parts"] = _decode_geometry(feature[4])
+    return layer
+
+
+def _twice_area(part: list[tuple[int, int]]) -> int:
+    return sum(x0*y1 - x1*y0 for (x0, y0), (x1, y1) in zip(part[:-1], part[1:]))
+
+
+def _quantise(
+    points: cpy.PointArray, bbox: tuple[float, ...], extent: int,
+) -> list[tuple[int, int]]:
+    x0, y0, x1, y1 = bbox
+    x = np.rint((points[:, 0] - x0)*extent/(x1 - x0)).astype(int)
+    y = np.rint((y1 - points[:, 1])*extent/(y1 - y0)).astype(int)
+    return list(zip(x.tolist(), y.tolist()))
+
+
+def test_encode_mvt_lines() -> None:
+    points = np.array([[0.0, 1.0], [0.5, 0.5], [0.52, 0.5], [1.0, 0.0], [0.3, 0.3], [0.31, 0.3]])
+    offsets = np.array([0, 4, 6], dtype=np.uint32)
+    geometry = encode_mvt_lines(points, offsets, 0.0, 0.0, 1.0, 1.0, 10)
+    # Second point of first line is a duplicate once quantised, second line is only one point.
+    assert _varints(geometry) == [9, 0, 0, 18, 10, 10, 10, 10]
+    assert _decode_geometry(geometry) == [[(0, 0), (5, 5), (10, 10)]]
+
+    # Cursor continues between lines.
+    offsets = np.array([0, 2, 4], dtype=np.uint32)
+    geometry = encode_mvt_lines(points[[0, 1, 3, 4]], offsets, 0.0, 0.0, 1.0, 1.0, 10)
+    assert _varints(geometry) == [9, 0, 0, 10, 10, 10, 9, 10, 10, 10, 13, 5]
+
+    empty = encode_mvt_lines(np.empty((0, 2)), np.array([0], dtype=np.uint32), 0, 0, 1, 1, 10)
+    assert empty == b""
+
+
+def test_encode_mvt_filled() -> None:
+    # Anticlockwise outer boundary with clockwise hole, then a polygon that collapses.
+    points = np.array([
+        [0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0],
+        [0.2, 0.2], [0.2, 0.8], [0.8, 0.8], [0.8, 0.2], [0.2, 0.2],
+        [0.5, 0.5], [0.51, 0.5], [0.51, 0.51], [0.5, 0.5],
+        [0.5, 0.5], [0.51, 0.51], [0.5, 0.51], [0.5, 0.5],
+    ])
+    offsets = np.array([0, 5, 10, 14, 18], dtype=np.uint32)
+    outer_offsets = np.array([0, 2, 4], dtype=np.uint32)
+    geometry = encode_mvt_filled(points, offsets, outer_offsets, 0.0, 0.0, 1.0, 1.0, 10)
+    parts = _decode_geometry(geometry)
+    assert len(parts) == 2
+    assert parts[0] == [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    assert parts[1] == [(8, 8), (8, 2), (2, 2), (2, 8), (8, 8)]
+    assert _twice_area(parts[0]) > 0
+    assert _twice_area(parts[1]) < 0
+
+    # Orientation is corrected.
+    reverse = np.array([0, 3, 2, 1, 0, 5, 8, 7, 6, 5])
+    geometry = encode_mvt_filled(points[reverse], offsets[:3], outer_offsets[:2], 0, 0, 1, 1, 10)
+    parts = _decode_geometry(geometry)
+    assert _twice_area(parts[0]) > 0
+    assert _twice_area(parts[1]) < 0
+
+
+@pytest.mark.parametrize("fill_type", [FillType.OuterOffset, FillType.ChunkCombinedCodeOffset])
+def test_filled_tile(fill_type: FillType) -> None:
+    x, y = np.meshgrid(np.linspace(0.0, 2.0, 41), np.linspace(0.0, 1.0, 21))
+    z = np.hypot(x - 1.0, y - 0.5)
+    cont_gen = contour_generator(x, y, z, fill_type=fill_type)
+    levels = [-1.0, 0.3, 0.45, 10.0, 11.0]
+    filled = [cont_gen.filled(lower, upper) for lower, upper in zip(levels[:-1], levels[1:])]
+    bbox = (0.0, 0.0, 2.0, 1.0)
+
+    layer = _decode_tile(filled_tile(filled, fill_type, bbox, levels, extent=512, layer_name="z"))
+    assert layer["version"] == 2
+    assert layer["name"] == "z"
+    assert layer["extent"] == 512
+    assert layer["keys"] == ["lower", "upper"]
+
+    # Last band is empty.
+    features = layer["features"]
+    assert [feature[1] for feature in features] == [0, 1, 2]
+    assert all(feature[3] == 3 for feature in features)
+    for i, feature in enumerate(features):
+        assert feature["properties"] == dict(lower=levels[i], upper=levels[i+1])
+
+    # Central disc is a single outer boundary, the next band has a hole.
+    assert len(features[0]["parts"]) == 1
+    assert len(features[1]["parts"]) == 2
+    assert _twice_area(features[1]["parts"][0]) > 0
+    assert _twice_area(features[1]["parts"][1]) < 0
+
+    expected = cast("cpy.FillReturn_OuterOffset", contour_generator(
+        x, y, z, fill_type=FillType.OuterOffset).filled(-1.0, 0.3))
+    quantised = _quantise(expected[0][0], bbox, 512)
+    assert set(features[0]["parts"][0]) == set(quantised)
+
+
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.ChunkCombinedOffset])
+def test_lines_tile(line_type: LineType) -> None:
+    x, y = np.meshgrid(np.linspace(0.0, 2.0, 41), np.linspace(0.0, 1.0, 21))
+    z = np.hypot(x - 1.0, y - 0.5)
+    cont_gen = contour_generator(x, y, z, line_type=line_type)
+    levels = np.array([0.2, 0.4, 5.0])
+    lines = [cont_gen.lines(level) for level in levels]
+    bbox = (0.0, 0.0, 2.0, 1.0)
+
+    layer = _decode_tile(lines_tile(lines, line_type.name, bbox, levels))
+    assert layer["extent"] == 4096
+    assert layer["name"] == "contours"
+    assert layer["keys"] == ["level"]
+    features = layer["features"]
+    assert [feature[1] for feature in features] == [0, 1]
+    assert all(feature[3] == 2 for feature in features)
+    assert [feature["properties"] for feature in features] == [dict(level=0.2), dict(level=0.4)]
+
+    expected = cast("cpy.LineReturn_Separate", contour_generator(
+        x, y, z, line_type=LineType.Separate).lines(0.2))
+    assert len(expected) == 1
+    quantised = _quantise(expected[0], bbox, 4096)
+    deduplicated = [point for i, point in enumerate(quantised) if i == 0 or point != quantised[i-1]]
+    assert features[0]["parts"] == [deduplicated]
+
+
+def test_pyramid_tile() -> None:
+    x = np.linspace(-10.0, 10.0, 201)
+    y = np.linspace(-5.0, 5.0, 101)
+    z = np.sin(x)[np.newaxis, :]*np.cos(y)[:, np.newaxis]
+    pyramid = ContourPyramid(x, y, z, tile_size=20, fill_type=FillType.ChunkCombinedOffsetOffset)
+    levels = [-0.5, 0.0, 0.5]
+
+    tile = pyramid_tile(pyramid, 2, 1, 2, levels, filled=True)
+    contours = pyramid.contours(2, 1, 2, levels, filled=True)
+    bbox = pyramid.tile_bbox(2, 1, 2)
+    assert tile == filled_tile(
+        cast("list[cpy.FillReturn]", contours), FillType.ChunkCombinedOffsetOffset, bbox, levels)
+    assert len(_decode_tile(tile)["features"]) == 2
+
+    tile = pyramid_tile(pyramid, 1, 0, 0, levels, extent=256)
+    contours = pyramid.contours(1, 0, 0, levels)
+    bbox = pyramid.tile_bbox(1, 0, 0)
+    assert tile == lines_tile(
+        cast("list[cpy.LineReturn]", contours), LineType.Separate, bbox, levels, extent=256)
+    layer = _decode_tile(tile)
+    assert len(layer["features"]) == 3
+    for feature in layer["features"]:
+        for part in feature["parts"]:
+            assert_array_equal(np.clip(part, -16, 272), part)
+
+
+def test_empty_tile() -> None:
+    layer = _decode_tile(lines_tile(None, LineType.Separate, (0, 0, 1, 1), [0.5]))
+    assert layer["features"] == []
+    assert layer["keys"] == ["level"]
+    assert layer["values"] == []
+
+
+def test_tiles_invalid() -> None:
+    with pytest.raises(ValueError, match="bbox must have x0 < x1 and y0 < y1"):
+        lines_tile(None, LineType.Separate, (0, 1, 1, 1), [0.5])
+    with pytest.raises(ValueError, match="extent must be positive"):
+        filled_tile(None, FillType.OuterCode, (0, 0, 1, 1), [0.5], extent=0)
+    with pytest.raises(ValueError, match="filled must have one fewer item than levels"):
+        filled_tile([cast("cpy.FillReturn", ([], []))], FillType.OuterCode, (0, 0, 1, 1), [0.5])
+    with pytest.raises(ValueError, match="lines must have the same length as levels"):
+        lines_tile([[], []], LineType.Separate, (0, 0, 1, 1), [0.5])
+
+    points = np.zeros((3, 2))
+    with pytest.raises(ValueError, match="offsets must be increasing from 0 to the length"):
+        encode_mvt_lines(points, np.array([0, 2], dtype=np.uint32), 0, 0, 1, 1, 10)
+    with pytest.raises(ValueError, match="bbox must have x0 < x1 and y0 < y1"):
+        encode_mvt_lines(points, np.array([0, 3], dtype=np.uint32), 1, 0, 0, 1, 10)
+    with pytest.raises(ValueError, match="points must be a 2D array of shape"):
+        encode_mvt_filled(
+            np.zeros(3), np.array([0, 3], dtype=np.uint32), np.array([0, 1], dtype=np.uint32),
+            0, 0, 1, 1, 10)
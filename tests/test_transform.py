@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator, convert_filled, convert_lines
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+transform = np.array([[2.0, 0.5, 3.0], [-0.3, 1.5, -7.0]])
+
+
+def _apply(points: cpy.PointArray) -> cpy.PointArray:
+    return cast("cpy.PointArray", points @ transform[:, :2].T + transform[:, 2])
+
+
+def _separate_filled(filled: cpy.FillReturn, fill_type: FillType) -> list[cpy.PointArray]:
+    points = cast("cpy.FillReturn_ChunkCombinedOffset", convert_filled(
+        filled, fill_type, FillType.ChunkCombinedOffset))[0]
+    return [pts for pts in points if pts is not None]
+
+
+def _separate_lines(lines: cpy.LineReturn, line_type: LineType) -> list[cpy.PointArray]:
+    return cast("cpy.LineReturn_Separate", convert_lines(lines, line_type, LineType.Separate))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_filled_transform(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    kwargs: dict[str, Any] = dict(name=name, fill_type=fill_type, chunk_count=(2, 3))
+    expected = _separate_filled(contour_generator(x, y, z, **kwargs).filled(0.3, 0.6), fill_type)
+
+    cont_gen = contour_generator(x, y, z, transform=transform, **kwargs)
+    assert_array_equal(cast("cpy.PointArray", cont_gen.transform), transform)
+    filled = _separate_filled(cont_gen.filled(0.3, 0.6), fill_type)
+    assert len(filled) == len(expected) > 0
+    for points, expected_points in zip(filled, expected):
+        assert_allclose(points, _apply(expected_points), rtol=1e-13, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+def test_lines_transform(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    kwargs: dict[str, Any] = dict(
+        name=name, line_type=line_type, chunk_count=(2, 3), quad_as_tri=True)
+    expected = _separate_lines(contour_generator(x, y, z, **kwargs).lines(0.4), line_type)
+
+    # Last row of a (3, 3) transform is ignored.
+    cont_gen = contour_generator(x, y, z, transform=np.vstack((transform, [0, 0, 1])), **kwargs)
+    assert_array_equal(cast("cpy.PointArray", cont_gen.transform), transform)
+    lines = _separate_lines(cont_gen.lines(0.4), line_type)
+    assert len(lines) == len(expected) > 0
+    for points, expected_points in zip(lines, expected):
+        assert_allclose(points, _apply(expected_points), rtol=1e-13, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", [FillType.OuterOffset, FillType.ChunkCombinedOffsetOffset])
+def test_filled_transform_callback(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    kwargs: dict[str, Any] = dict(name=name, fill_type=fill_type, chunk_count=(2, 3))
+    expected = _separate_filled(contour_generator(x, y, z, **kwargs).filled(0.3, 0.6), fill_type)
+
+    point_counts = []
+
+    def callback(points: cpy.PointArray) -> None:
+        point_counts.append(len(points))
+        points[:, 0] = np.sqrt(points[:, 0])  # In place.
+
+    cont_gen = contour_generator(x, y, z, transform_callback=callback, **kwargs)
+    assert cont_gen.transform is None
+    filled = _separate_filled(cont_gen.filled(0.3, 0.6), fill_type)
+
+    # Called once per non-empty chunk.
+    assert sum(point_counts) == sum(map(len, expected))
+    assert 1 < len(point_counts) <= 6
+    assert len(filled) == len(expected)
+    for points, expected_points in zip(filled, expected):
+        assert_allclose(points[:, 0], np.sqrt(expected_points[:, 0]))
+        assert_array_equal(points[:, 1], expected_points[:, 1])
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.CombinedOffset])
+def test_lines_transform_callback(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    kwargs: dict[str, Any] = dict(name=name, line_type=line_type, chunk_count=(2, 3))
+    expected = _separate_lines(contour_generator(x, y, z, transform=transform, **kwargs).lines(
+        0.4, simplify_tolerance=0.1), line_type)
+
+    # Returns new array, applied after affine transform and simplification.
+    cont_gen = contour_generator(
+        x, y, z, transform=transform, transform_callback=lambda points: 2*points, **kwargs)
+    lines = _separate_lines(cont_gen.lines(0.4, simplify_tolerance=0.1), line_type)
+    assert len(lines) == len(expected) > 0
+    for points, expected_points in zip(lines, expected):
+        assert_array_equal(points, 2*expected_points)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_transform_metrics_and_out(name: str) -> None:
+    z = np.zeros((5, 5))
+    z[1:4, 1:4] = 1
+    cont_gen = contour_generator(
+        z=z, name=name, line_type=LineType.ChunkCombinedOffset, transform=[[2, 0, 1], [0, 3, 0]])
+
+    # Metrics are of transformed points.
+    _, metrics = cont_gen.lines(0.5, metrics=True)
+    assert_allclose(metrics["area"], [8.5*6])
+    assert_array_equal(metrics["xmin"], [2.0])
+    assert_array_equal(metrics["ymax"], [10.5])
+
+    out = (np.empty((20, 2)), np.empty(5, dtype=np.uint32))
+    ret, used = cont_gen.lines(0.5, out=out)
+    assert ret is not None
+    lines = cast("cpy.LineReturn_ChunkCombinedOffset", ret[0])
+    assert np.shares_memory(lines[0][0], out[0])
+    assert_array_equal(out[0][:used[0]], cast("cpy.LineReturn_ChunkCombinedOffset",
+                                              cont_gen.lines(0.5))[0][0])
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.ChunkCombinedOffset])
+def test_transform_callback_exception(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40))
+    calls = []
+
+    def callback(points: cpy.PointArray) -> None:
+        calls.append(len(points))
+        raise RuntimeError("Callback failed")
+
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_count=2, transform_callback=callback)
+    with pytest.raises(RuntimeError, match="Callback failed"):
+        cont_gen.lines(0.4)
+    assert len(calls) == 1
+
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, transform_callback=lambda points: points[:1])
+    msg = "transform_callback must return None or an array of the same shape as its argument"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.lines(0.4)
+
+
+def test_transform_invalid() -> None:
+    z = [[0, 1], [2, 3]]
+    msg = r"transform must be an array of shape \(2, 3\) or \(3, 3\)"
+    with pytest.raises(ValueError, match=msg):
+        contour_generator(z=z, transform=np.eye(2))
+    with pytest.raises(ValueError, match=msg):
+        contour_generator(z=z, transform=[1, 0, 0, 0, 1, 0])
+    with pytest.raises(ValueError, match="transform must be affine"):
+        contour_generator(z=z, transform=[[1, 0, 0], [0, 1, 0], [0, 1, 1]])
+    for value in [np.nan, np.inf, -np.inf]:
+        with pytest.raises(ValueError, match="transform must only contain finite values"):
+            contour_generator(z=z, transform=[[1, 0, value], [0, 1, 0]])
+    with pytest.raises(ValueError, match="transform_callback must be callable"):
+        contour_generator(z=z, transform_callback=1)  # type: ignore[arg-type]
+
+    for name in ["mpl2005", "mpl2014"]:
+        msg = f"{name} contour generator does not support transform"
+        with pytest.raises(ValueError, match=msg):
+            contour_generator(z=z, name=name, transform=np.eye(3))
+        with pytest.raises(ValueError, match="does not support transform_callback"):
+            contour_generator(z=z, name=name, transform_callback=lambda points: None)
+        assert contour_generator(z=z, name=name).transform is None
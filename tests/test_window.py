@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import FillType, LineType, contour_generator
+from contourpy.util.data import random
+
+if TYPE_CHECKING:
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("fill_type", [FillType.OuterCode, FillType.ChunkCombinedOffsetOffset])
+@pytest.mark.parametrize("corner_mask", [False, True])
+def test_window_filled(name: str, fill_type: FillType, corner_mask: bool) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    z = np.ma.masked_invalid(z)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, corner_mask=corner_mask, chunk_size=7,
+        quad_as_tri=True, transform=[[2, 0, 1], [0, 3, 0]])
+
+    window = cont_gen.window(5, 20, 3, 17)
+    assert type(window) is type(cont_gen)
+    assert window.chunk_size == (7, 7)
+    assert window.chunk_count == (2, 2)
+    assert window.fill_type == fill_type
+    assert window.corner_mask == corner_mask
+    assert window.quad_as_tri
+    assert_array_equal(cast("cpy.PointArray", window.transform), [[2, 0, 1], [0, 3, 0]])
+
+    # Same as contouring the slices directly, with edges of the window treated as boundaries.
+    expected = contour_generator(
+        x[3:17, 5:20], y[3:17, 5:20], z[3:17, 5:20], name=name, fill_type=fill_type,
+        corner_mask=corner_mask, chunk_size=7, quad_as_tri=True, transform=[[2, 0, 1], [0, 3, 0]])
+    filled = cast("tuple[list[cpy.PointArray], ...]", window.filled(0.3, 0.6))
+    expected_filled = cast("tuple[list[cpy.PointArray], ...]", expected.filled(0.3, 0.6))
+    for arrays, expected_arrays in zip(filled, expected_filled):
+        assert len(arrays) == len(expected_arrays)
+        for array, expected_array in zip(arrays, expected_arrays):
+            assert_array_equal(array, expected_array)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_window_lines(name: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name, line_type=LineType.Separate)
+    window = cont_gen.window(10, 40, 0, 12)
+    assert window.chunk_count == (1, 1)
+
+    # Line points within the window are the same as for the whole grid.
+    lines = np.concatenate(cast("cpy.LineReturn_Separate", window.lines(0.4)))
+    all_lines = np.concatenate(cast("cpy.LineReturn_Separate", cont_gen.lines(0.4)))
+    inside = ((all_lines[:, 0] > x[0, 10]) & (all_lines[:, 0] < x[0, 39]) &
+              (all_lines[:, 1] > y[0, 0]) & (all_lines[:, 1] < y[11, 0]))
+    assert np.count_nonzero(inside) > 0
+    assert {tuple(p) for p in lines} >= {tuple(p) for p in all_lines[inside]}
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("x_increasing", [False, True])
+@pytest.mark.parametrize("rectilinear", [False, True])
+def test_window_bbox(name: str, x_increasing: bool, rectilinear: bool) -> None:
+    _, _, z = random((30, 40))
+    x = np.linspace(0.0, 10.0, 40) if x_increasing else np.linspace(10.0, 0.0, 40)
+    y = np.linspace(5.0, -5.0, 30)
+    x, y = np.meshgrid(x, y)
+    if not rectilinear:
+        x = x + 0.01*y
+    cont_gen = contour_generator(x, y, z, name=name, line_type=LineType.Separate)
+
+    for bbox in [(2.1, -1.2, 4.0, 3.3), (-1.0, -1.0, 1.0, 1.0), (5.0, 4.9, 5.0, 4.9),
+                 (-100.0, -100.0, 100.0, 100.0)]:
+        window = cont_gen.window_bbox(*bbox)
+        assert window is not None
+
+        # Smallest window containing all quads that overlap bbox.
+        x0, y0, x1, y1 = bbox
+        xs = np.stack((x[1:, 1:], x[1:, :-1], x[:-1, 1:], x[:-1, :-1]))
+        ys = np.stack((y[1:, 1:], y[1:, :-1], y[:-1, 1:], y[:-1, :-1]))
+        overlap = ((xs.min(axis=0) <= x1) & (xs.max(axis=0) >= x0) &
+                   (ys.min(axis=0) <= y1) & (ys.max(axis=0) >= y0))
+        j, i = np.nonzero(overlap)
+        expected = cont_gen.window(i.min(), i.max() + 2, j.min(), j.max() + 2)
+        assert window.chunk_size == expected.chunk_size
+        lines = cast("cpy.LineReturn_Separate", window.lines(0.4))
+        expected_lines = cast("cpy.LineReturn_Separate", expected.lines(0.4))
+        assert len(lines) == len(expected_lines)
+        for line, expected_line in zip(lines, expected_lines):
+            assert_array_equal(line, expected_line)
+
+    assert cont_gen.window_bbox(20.0, 0.0, 30.0, 1.0) is None
+    assert cont_gen.window_bbox(0.0, 5.1, 10.0, 6.0) is None
+
+
+def test_window_invalid() -> None:
+    cont_gen = contour_generator(z=np.zeros((5, 6)))
+    msg = "window must be within the grid and contain at least 2 points in each direction"
+    for indices in [(-1, 3, 0, 3), (0, 7, 0, 3), (0, 3, 0, 6), (2, 3, 0, 3), (0, 3, 2, 2)]:
+        with pytest.raises(ValueError, match=msg):
+            cont_gen.window(*indices)
+    assert cont_gen.window(0, 6, 0, 5).chunk_size == (4, 5)
+
+    with pytest.raises(ValueError, match="bbox must have x0 <= x1 and y0 <= y1"):
+        cont_gen.window_bbox(2.0, 0.0, 1.0, 1.0)
+    with pytest.raises(ValueError, match="bbox must have x0 <= x1 and y0 <= y1"):
+        cont_gen.window_bbox(0.0, np.nan, 1.0, 1.0)
+
+    for name in ["mpl2005", "mpl2014"]:
+        cont_gen = contour_generator(z=np.zeros((5, 6)), name=name)
+        class_name = type(cont_gen).__name__
+        with pytest.raises(ValueError, match=f"{class_name} does not support window$"):
+            cont_gen.window(0, 3, 0, 3)
+        with pytest.raises(ValueError, match=f"{class_name} does not support window_bbox"):
+            cont_gen.window_bbox(0.0, 0.0, 1.0, 1.0)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from contourpy import CancelledError, CancelToken, FillType, LineType, contour_generator
+from contourpy.util.data import random
+from contourpy.writer import _create_writer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import contourpy._contourpy as cpy
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 1), ("threaded", 3)])
+@pytest.mark.parametrize("fill_type", [FillType.OuterCode, FillType.ChunkCombinedOffsetOffset])
+def test_write_filled(tmp_path: Path, fill_type: FillType, name: str, thread_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_count=(2, 3), thread_count=thread_count)
+    expected_gen = contour_generator(
+        x, y, z, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_count=(2, 3))
+    levels = [0.2, 0.5, 0.8]
+    expected = [
+        cast("cpy.FillReturn_ChunkCombinedOffsetOffset", expected_gen.filled(lower, upper))
+        for lower, upper in zip(levels[:-1], levels[1:])]
+
+    path = tmp_path / "filled.npz"
+    cont_gen.write_filled(path, levels)
+    with np.load(path) as npz:
+        assert_array_equal(npz["levels"], levels)
+        count = 0
+        for i, (points, offsets, outer_offsets) in enumerate(expected):
+            for chunk in range(6):
+                if points[chunk] is None:
+                    assert f"points_{i}_{chunk}" not in npz
+                    continue
+                assert_array_equal(npz[f"points_{i}_{chunk}"], points[chunk])
+                assert_array_equal(npz[f"offsets_{i}_{chunk}"], offsets[chunk])
+                assert_array_equal(npz[f"outer_offsets_{i}_{chunk}"], outer_offsets[chunk])
+                count += 1
+        assert count > 0
+        assert len(npz.files) == 3*count + 1
+
+    path = tmp_path / "filled.geojson"
+    cont_gen.write_filled(str(path), np.array(levels), format="geojson")
+    features = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(features) == count
+    # Order of chunks is not defined if using multiple threads.
+    features.sort(key=lambda f: (f["properties"]["level_index"], f["properties"]["chunk"]))
+    for feature in features:
+        props = feature["properties"]
+        i, chunk = props["level_index"], props["chunk"]
+        assert (props["lower_level"], props["upper_level"]) == (levels[i], levels[i+1])
+        assert feature["geometry"]["type"] == "MultiPolygon"
+        points, offsets, outer_offsets = expected[i]
+        boundary_count = sum(len(polygon) for polygon in feature["geometry"]["coordinates"])
+        assert boundary_count == len(cast("cpy.OffsetArray", offsets[chunk])) - 1
+        assert len(feature["geometry"]["coordinates"]) == (
+            len(cast("cpy.OffsetArray", outer_offsets[chunk])) - 1)
+
+
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+@pytest.mark.parametrize("line_type", [LineType.Separate, LineType.ChunkCombinedOffset])
+def test_write_lines(tmp_path: Path, line_type: LineType, name: str, thread_count: int) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_count=(2, 3), thread_count=thread_count)
+    expected_gen = contour_generator(
+        x, y, z, line_type=LineType.ChunkCombinedOffset, chunk_count=(2, 3))
+    levels = [0.7, 0.3]  # Need not be increasing.
+    expected = [
+        cast("cpy.LineReturn_ChunkCombinedOffset", expected_gen.lines(level)) for level in levels]
+
+    path = tmp_path / "lines.npz"
+    cont_gen.write_lines(path, levels, format="npz")
+    with np.load(path) as npz:
+        assert_array_equal(npz["levels"], levels)
+        count = 0
+        for i, (points, offsets) in enumerate(expected):
+            for chunk in range(6):
+                if points[chunk] is not None:
+                    assert_array_equal(npz[f"points_{i}_{chunk}"], points[chunk])
+                    assert_array_equal(npz[f"offsets_{i}_{chunk}"], offsets[chunk])
+                    count += 1
+        assert len(npz.files) == 2*count + 1
+
+    path = tmp_path / "lines.geojson"
+    cont_gen.write_lines(path, levels, format="geojson")
+    features = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(features) == count
+    for feature in features:
+        props = feature["properties"]
+        i, chunk = props["level_index"], props["chunk"]
+        assert props["level"] == levels[i]
+        assert feature["geometry"]["type"] == "MultiLineString"
+        chunk_points = cast("cpy.PointArray", expected[i][0][chunk])
+        chunk_offsets = cast("cpy.OffsetArray", expected[i][1][chunk])
+        for line, start, end in zip(
+            feature["geometry"]["coordinates"], chunk_offsets[:-1], chunk_offsets[1:],
+        ):
+            assert_array_equal(line, chunk_points[start:end])
+
+
+def test_write_transform_callback_error(tmp_path: Path) -> None:
+    def transform_callback(points: Any) -> None:
+        raise RuntimeError("Error in callback")
+
+    cont_gen = contour_generator(
+        z=np.arange(12.0).reshape((3, 4)), transform_callback=transform_callback)
+    path = tmp_path / "filled.geojson"
+    with pytest.raises(RuntimeError, match="Error in callback"):
+        cont_gen.write_filled(path, [1.0, 5.0], format="geojson")
+    # Incomplete file is deleted.
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_geojson_non_finite(tmp_path: Path) -> None:
+    def transform_callback(points: Any) -> Any:
+        points = points.copy()
+        points[0, 0] = np.nan
+        return points
+
+    cont_gen = contour_generator(
+        z=np.arange(12.0).reshape((3, 4)), transform_callback=transform_callback)
+    path = tmp_path / "filled.geojson"
+    with pytest.raises(ValueError, match="GeoJSON cannot contain non-finite coordinates"):
+        cont_gen.write_filled(path, [1.0, 5.0], format="geojson")
+    assert list(tmp_path.iterdir()) == []
+
+    # npz files can contain them.
+    cont_gen.write_lines(tmp_path / "lines.npz", [5.0])
+    with np.load(tmp_path / "lines.npz") as npz:
+        assert np.isnan(npz["points_0_0"][0, 0])
+
+
+@pytest.mark.parametrize("format", ["npz", "geojson"])
+@pytest.mark.parametrize("name, thread_count", [("serial", 1), ("threaded", 3)])
+def test_write_cancelled(tmp_path: Path, name: str, thread_count: int, format: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name, chunk_count=3, thread_count=thread_count)
+    path = tmp_path / f"filled.{format}"
+    path.write_bytes(b"existing")
+
+    token = CancelToken()
+    cont_gen.cancel_token = token
+
+    def progress_callback(chunks_done: int, total_chunks: int) -> None:
+        if chunks_done == 4:
+            token.cancel()
+
+    cont_gen.progress_callback = progress_callback
+    with pytest.raises(CancelledError):
+        cont_gen.write_filled(path, [0.2, 0.5, 0.8], format=format)
+
+    # Existing file is not replaced and incomplete file is deleted.
+    assert path.read_bytes() == b"existing"
+    assert list(tmp_path.iterdir()) == [path]
+
+    cont_gen.cancel_token = None
+    cont_gen.progress_callback = None
+    cont_gen.write_filled(path, [0.2, 0.5, 0.8], format=format)
+    assert path.read_bytes() != b"existing"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_close_error(tmp_path: Path) -> None:
+    path = tmp_path / "filled.npz"
+    writer = _create_writer(path, "npz", np.array([1.0, 2.0]), True)
+    writer._levels = np.array([object()])  # Cannot be written without pickle.
+    with pytest.raises(ValueError, match="Object arrays cannot be saved"):
+        writer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_invalid(tmp_path: Path) -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)))
+    path = tmp_path / "out.npz"
+    with pytest.raises(ValueError, match="Unsupported format 'wkb', must be 'npz' or 'geojson'"):
+        cont_gen.write_filled(path, [1.0, 2.0], format="wkb")
+    with pytest.raises(ValueError, match="levels must be a 1D array of at least 2 values"):
+        cont_gen.write_filled(path, [1.0])
+    with pytest.raises(ValueError, match="levels must be in increasing order"):
+        cont_gen.write_filled(path, [2.0, 1.0])
+    with pytest.raises(ValueError, match="levels must be a 1D array of at least 1 value"):
+        cont_gen.write_lines(path, [])
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_write_not_supported(tmp_path: Path, name: str) -> None:
+    cont_gen = contour_generator(z=np.arange(12.0).reshape((3, 4)), name=name)
+    class_name = type(cont_gen).__name__
+    path = tmp_path / "out.npz"
+    with pytest.raises(ValueError, match=f"{class_name} does not support write_filled"):
+        cont_gen.write_filled(path, [1.0, 2.0])
+    with pytest.raises(ValueError, match=f"{class_name} does not support write_lines"):
+        cont_gen.write_lines(path, [1.0])
+    assert list(tmp_path.iterdir()) == []
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, cast, overload
 
 import numpy as np
 
-from contourpy import FillType, LineType, max_threads
+from contourpy import FillType, LineType, convert_filled, max_threads
 
 if TYPE_CHECKING:
     import numpy.typing as npt
@@ -43,12 +43,14 @@ def all_names_and_fill_types() -> list[tuple[str, FillType]]:
         ("serial", FillType.ChunkCombinedOffset),
         ("serial", FillType.ChunkCombinedCodeOffset),
         ("serial", FillType.ChunkCombinedOffsetOffset),
+        ("serial", FillType.CombinedOffsetOffset),
         ("threaded", FillType.OuterCode),
         ("threaded", FillType.OuterOffset),
         ("threaded", FillType.ChunkCombinedCode),
         ("threaded", FillType.ChunkCombinedOffset),
         ("threaded", FillType.ChunkCombinedCodeOffset),
         ("threaded", FillType.ChunkCombinedOffsetOffset),
+        ("threaded", FillType.CombinedOffsetOffset),
     ]
 
 
@@ -60,10 +62,12 @@ def all_names_and_line_types() -> list[tuple[str, LineType]]:
         ("serial", LineType.SeparateCode),
         ("serial", LineType.ChunkCombinedCode),
         ("serial", LineType.ChunkCombinedOffset),
+        ("serial", LineType.CombinedOffset),
         ("threaded", LineType.Separate),
         ("threaded", LineType.SeparateCode),
         ("threaded", LineType.ChunkCombinedCode),
         ("threaded", LineType.ChunkCombinedOffset),
+        ("threaded", LineType.CombinedOffset),
     ]
 
 
@@ -83,6 +87,7 @@ def all_fill_types_str_value() -> list[tuple[str, int]]:
         ("ChunkCombinedOffset", 204),
         ("ChunkCombinedCodeOffset", 205),
         ("ChunkCombinedOffsetOffset", 206),
+        ("CombinedOffsetOffset", 207),
     ]
 
 
@@ -92,6 +97,7 @@ def all_line_types_str_value() -> list[tuple[str, int]]:
         ("SeparateCode", 102),
         ("ChunkCombinedCode", 103),
         ("ChunkCombinedOffset", 104),
+        ("CombinedOffset", 105),
     ]
 
 
@@ -136,6 +142,14 @@ def assert_offset_array(offsets: cpy.OffsetArray, max_offset: int) -> int:
     return len(offsets)
 
 
+def assert_empty_offset_array(offsets: cpy.OffsetArray) -> None:
+    assert isinstance(offsets, np.ndarray)
+    assert offsets.dtype == offset_dtype
+    assert offsets.ndim == 1
+    assert len(offsets) == 1
+    assert offsets[0] == 0
+
+
 def assert_filled(filled: cpy.FillReturn, fill_type: FillType) -> None:
     if fill_type == FillType.OuterCode:
         if TYPE_CHECKING:
@@ -229,6 +243,18 @@ def assert_filled(filled: cpy.FillReturn, fill_type: FillType) -> None:
                 npoints = assert_point_array(polygons_or_none)
                 noffsets = assert_offset_array(offsets_or_none, npoints)
                 assert_offset_array(outer_offsets_or_none, noffsets-1)
+    elif fill_type == FillType.CombinedOffsetOffset:
+        if TYPE_CHECKING:
+            filled = cast(cpy.FillReturn_CombinedOffsetOffset, filled)
+        assert isinstance(filled, tuple) and len(filled) == 3
+        if len(filled[0]) == 0:
+            assert filled[0].shape == (0, 2) and filled[0].dtype == point_dtype
+            assert_empty_offset_array(filled[1])
+            assert_empty_offset_array(filled[2])
+        else:
+            npoints = assert_point_array(filled[0])
+            noffsets = assert_offset_array(filled[1], npoints)
+            assert_offset_array(filled[2], noffsets-1)
     else:
         raise RuntimeError(f"Unexpected fill_type {fill_type}")
 
@@ -283,10 +309,32 @@ def assert_lines(lines: cpy.LineReturn, line_type: LineType) -> None:
                     assert offsets_or_none is not None
                 npoints = assert_point_array(lines_or_none)
                 assert_offset_array(offsets_or_none, npoints)
+    elif line_type == LineType.CombinedOffset:
+        if TYPE_CHECKING:
+            lines = cast(cpy.LineReturn_CombinedOffset, lines)
+        assert isinstance(lines, tuple) and len(lines) == 2
+        if len(lines[0]) == 0:
+            assert lines[0].shape == (0, 2) and lines[0].dtype == point_dtype
+            assert_empty_offset_array(lines[1])
+        else:
+            npoints = assert_point_array(lines[0])
+            assert_offset_array(lines[1], npoints)
     else:
         raise RuntimeError(f"Unexpected line_type {line_type}")
 
 
+def boundaries(filled: cpy.FillReturn, fill_type: FillType) -> list[cpy.PointArray]:
+    # List of individual boundaries (outers and holes) in the order they are returned.
+    points, offsets = cast("cpy.FillReturn_ChunkCombinedOffset", convert_filled(
+        filled, fill_type, FillType.ChunkCombinedOffset))
+    ret = []
+    for pts, offs in zip(points, offsets):
+        if pts is not None:
+            assert offs is not None
+            ret += np.split(pts, offs[1:-1])
+    return ret
+
+
 @overload
 def sort_by_first_xy(lines: list[cpy.PointArray]) -> list[cpy.PointArray]:
     ...